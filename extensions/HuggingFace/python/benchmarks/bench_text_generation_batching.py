@@ -0,0 +1,91 @@
+"""
+Benchmark: micro-batched local text generation on CPU.
+
+Runs the same prompt with N parameter sets through HuggingFaceTextGenerationTransformer with run_batch,
+once with micro-batching disabled (max_batch_size=1, one pipeline call per run) and once with it enabled,
+using a tiny model so the benchmark runs in seconds on a CPU. The model is downloaded on first use.
+
+Usage:
+    python benchmarks/bench_text_generation_batching.py [--num-runs 64] [--max-batch-size 16] [--model sshleifer/tiny-gpt2]
+"""
+
+import argparse
+import asyncio
+import time
+
+import torch
+from aiconfig.model_parser import InferenceOptions
+from aiconfig.registry import ModelParserRegistry
+from aiconfig_extension_hugging_face import (
+    HuggingFaceTextGenerationTransformer,
+)
+
+from aiconfig import AIConfigRuntime
+from aiconfig.schema import Prompt, PromptMetadata
+
+
+def make_aiconfig(model: str, max_batch_size: int) -> AIConfigRuntime:
+    parser = HuggingFaceTextGenerationTransformer(
+        max_batch_size=max_batch_size
+    )
+    ModelParserRegistry.register_model_parser(parser)
+    aiconfig = AIConfigRuntime.create("text_generation_batching_benchmark")
+    aiconfig.add_prompt(
+        "generate",
+        Prompt(
+            name="generate",
+            input="Tell me a story about {{topic}}",
+            metadata=PromptMetadata(
+                model={
+                    "name": parser.id(),
+                    "settings": {
+                        "model": model,
+                        "max_new_tokens": 16,
+                        "do_sample": False,
+                    },
+                }
+            ),
+        ),
+    )
+    return aiconfig
+
+
+async def time_run_batch(
+    model: str, max_batch_size: int, parameters_list: list[dict]
+) -> float:
+    aiconfig = make_aiconfig(model, max_batch_size)
+    options = InferenceOptions(stream=False)
+    # Load the pipeline before timing
+    await aiconfig.run("generate", parameters_list[0], options)
+
+    start = time.perf_counter()
+    await aiconfig.run_batch("generate", parameters_list, options)
+    return time.perf_counter() - start
+
+
+async def benchmark(num_runs: int, max_batch_size: int, model: str) -> None:
+    torch.manual_seed(0)
+    parameters_list = [
+        {"topic": f"a {'very ' * (i % 4)}small robot number {i}"}
+        for i in range(num_runs)
+    ]
+
+    unbatched_s = await time_run_batch(model, 1, parameters_list)
+    batched_s = await time_run_batch(model, max_batch_size, parameters_list)
+
+    print(f"{num_runs} runs of {model} on CPU")
+    print(
+        f"  one call per run:       {unbatched_s:.3f}s ({num_runs / unbatched_s:.1f} runs/s)"
+    )
+    print(
+        f"  batches of up to {max_batch_size:<3d}:   {batched_s:.3f}s ({num_runs / batched_s:.1f} runs/s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-runs", type=int, default=64)
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--model", default="sshleifer/tiny-gpt2")
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.num_runs, args.max_batch_size, args.model))
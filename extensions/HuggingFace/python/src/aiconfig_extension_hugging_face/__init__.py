@@ -13,6 +13,10 @@ from .local_inference.text_summarization import (
 from .local_inference.text_translation import (
     HuggingFaceTextTranslationTransformer,
 )
+from .local_inference.pipeline_pool import (
+    configure_pipeline_pool,
+    get_pipeline_pool,
+)
 from .local_inference.util import get_hf_model
 from .remote_inference_client.image_2_text import (
     HuggingFaceImage2TextRemoteInference,
@@ -39,7 +43,7 @@ from .remote_inference_client.conversational import (
     HuggingFaceConversationalRemoteInference,
 )
 
-UTILS = [get_hf_model]
+UTILS = [get_hf_model, get_pipeline_pool, configure_pipeline_pool]
 
 LOCAL_INFERENCE_CLASSES = [
     "HuggingFaceAutomaticSpeechRecognitionTransformer",
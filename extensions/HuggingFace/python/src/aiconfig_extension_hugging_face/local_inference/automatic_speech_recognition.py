@@ -2,8 +2,13 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 import torch
 from aiconfig.callback import CallbackEvent
+from aiconfig.util.thread_pool import run_in_thread_pool
+from aiconfig_extension_hugging_face.local_inference.pipeline_pool import (
+    get_pipeline_pool,
+    make_pipeline_key,
+)
 from aiconfig_extension_hugging_face.local_inference.util import get_hf_model
-from transformers import Pipeline, pipeline
+from transformers import pipeline
 
 from aiconfig import InferenceOptions, ModelParser
 from aiconfig.schema import (
@@ -36,7 +41,6 @@ class HuggingFaceAutomaticSpeechRecognitionTransformer(ModelParser):
                 config.register_model_parser(parser)
         """
         super().__init__()
-        self.pipelines: dict[str, Pipeline] = {}
 
     def id(self) -> str:
         """
@@ -138,25 +142,30 @@ class HuggingFaceAutomaticSpeechRecognitionTransformer(ModelParser):
             model_settings
         )
         model_name = get_hf_model(aiconfig, prompt, self)
-        key = model_name if model_name is not None else "__default__"
-
-        if key not in self.pipelines:
-            device = self._get_device()
-            if pipeline_creation_data.get("device", None) is None:
-                pipeline_creation_data["device"] = device
-            self.pipelines[key] = pipeline(
+        if pipeline_creation_data.get("device", None) is None:
+            pipeline_creation_data["device"] = self._get_device()
+        async with get_pipeline_pool().acquire_async(
+            make_pipeline_key(
+                "automatic-speech-recognition",
+                model_name,
+                pipeline_creation_data,
+            ),
+            lambda: pipeline(
                 task="automatic-speech-recognition",
                 model=model_name,
                 **pipeline_creation_data,
+            ),
+        ) as asr_pipeline:
+            completion_data = await self.deserialize(
+                prompt, aiconfig, parameters
             )
 
-        asr_pipeline = self.pipelines[key]
-        completion_data = await self.deserialize(prompt, aiconfig, parameters)
-
-        response = asr_pipeline(**completion_data)
+            response = await run_in_thread_pool(
+                asr_pipeline, **completion_data
+            )
 
-        # response is a list of text outputs. This can be tested by running an asr pipeline and noticing the outputs are a list of text.
-        outputs = construct_outputs(response)
+            # response is a list of text outputs. This can be tested by running an asr pipeline and noticing the outputs are a list of text.
+            outputs = construct_outputs(response)
 
         prompt.outputs = outputs
         await aiconfig.callback_manager.run_callbacks(
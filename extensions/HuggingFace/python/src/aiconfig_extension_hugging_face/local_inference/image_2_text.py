@@ -4,10 +4,15 @@ from io import BytesIO
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 
 from aiconfig.callback import CallbackEvent
+from aiconfig.util.thread_pool import run_in_thread_pool
+from aiconfig_extension_hugging_face.local_inference.pipeline_pool import (
+    get_pipeline_pool,
+    make_pipeline_key,
+)
 from aiconfig_extension_hugging_face.local_inference.util import get_hf_model
 from PIL import Image as img_module
 from PIL.Image import Image as ImageType
-from transformers import Pipeline, pipeline
+from transformers import pipeline
 
 from aiconfig import InferenceOptions, ModelParser
 from aiconfig.schema import (
@@ -36,7 +41,6 @@ class HuggingFaceImage2TextTransformer(ModelParser):
                 config.register_model_parser(parser)
         """
         super().__init__()
-        self.pipelines: dict[str, Pipeline] = {}
 
     def id(self) -> str:
         """
@@ -161,19 +165,17 @@ class HuggingFaceImage2TextTransformer(ModelParser):
         inputs = completion_data.pop("inputs")
 
         model_name = get_hf_model(aiconfig, prompt, self)
-        key = model_name if model_name is not None else "__default__"
-
-        if key not in self.pipelines:
-            self.pipelines[key] = pipeline(
-                task="image-to-text", model=model_name
+        async with get_pipeline_pool().acquire_async(
+            make_pipeline_key("image-to-text", model_name),
+            lambda: pipeline(task="image-to-text", model=model_name),
+        ) as captioner:
+            outputs: List[Output] = []
+            response: List[Any] = await run_in_thread_pool(
+                captioner, inputs, **completion_data
             )
-        captioner = self.pipelines[key]
-
-        outputs: List[Output] = []
-        response: List[Any] = captioner(inputs, **completion_data)
-        for count, result in enumerate(response):
-            output: Output = construct_regular_output(result, count)
-            outputs.append(output)
+            for count, result in enumerate(response):
+                output: Output = construct_regular_output(result, count)
+                outputs.append(output)
 
         prompt.outputs = outputs
         await aiconfig.callback_manager.run_callbacks(
@@ -0,0 +1,139 @@
+"""
+Dynamic micro-batching for the local inference model parsers: concurrent requests for the same
+pipeline and settings are coalesced into one batched pipeline call, which is much faster than
+one call per request, especially on CPU.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from aiconfig.util.thread_pool import get_inference_thread_pool
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 8
+# How long the first request of a batch waits for others to join it
+DEFAULT_MAX_BATCH_WAIT_MS = 10.0
+
+# Runs a batch of inputs, and returns one result per input, in order
+BatchFunction = Callable[[List[Any]], List[Any]]
+
+
+@dataclass
+class _PendingBatch:
+    run_batch: BatchFunction
+    deadline: float
+    inputs: List[Any] = field(default_factory=list)
+    futures: List["Future[Any]"] = field(default_factory=list)
+
+
+class MicroBatcher:
+    """
+    Groups the inputs submitted with the same key into batches of up to `max_batch_size` inputs.
+    A batch is run as soon as it is full, or `max_wait_ms` after its first input was submitted,
+    in the inference thread pool (see aiconfig.util.thread_pool), so callers never block the event loop.
+    Each caller gets its own result (or the batch's exception) through the returned future.
+
+    Usage:
+        batcher = MicroBatcher(max_batch_size=16)
+        result = await asyncio.wrap_future(batcher.submit(key, text, lambda texts: generator(texts)))
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_BATCH_WAIT_MS,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(
+                f"max_batch_size must be at least 1, got {max_batch_size}"
+            )
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self._pending: Dict[Hashable, _PendingBatch] = {}
+        self._condition = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+
+    def submit(
+        self, key: Hashable, input: Any, run_batch: BatchFunction
+    ) -> "Future[Any]":
+        """
+        Adds the input to the pending batch for the key, creating it if needed.
+        `run_batch` is only called for the batch's first input, so it must be equivalent for a given key.
+        """
+        future: "Future[Any]" = Future()
+        with self._condition:
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = _PendingBatch(
+                    run_batch, time.monotonic() + self.max_wait_s
+                )
+                self._pending[key] = batch
+            batch.inputs.append(input)
+            batch.futures.append(future)
+
+            if len(batch.inputs) >= self.max_batch_size:
+                del self._pending[key]
+                self._dispatch(batch)
+            else:
+                self._ensure_dispatcher()
+                self._condition.notify()
+        return future
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_expired_batches,
+                name="aiconfig-hf-micro-batcher",
+                daemon=True,
+            )
+            self._dispatcher.start()
+
+    def _dispatch_expired_batches(self) -> None:
+        with self._condition:
+            while True:
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+                now = time.monotonic()
+                next_deadline = min(
+                    batch.deadline for batch in self._pending.values()
+                )
+                if next_deadline > now:
+                    self._condition.wait(next_deadline - now)
+                    continue
+                for key, batch in list(self._pending.items()):
+                    if batch.deadline <= now:
+                        del self._pending[key]
+                        self._dispatch(batch)
+
+    def _dispatch(self, batch: _PendingBatch) -> None:
+        get_inference_thread_pool().submit(self._run, batch)
+
+    @staticmethod
+    def _run(batch: _PendingBatch) -> None:
+        # Skip the inputs whose callers have gone away
+        live = [
+            (input, future)
+            for input, future in zip(batch.inputs, batch.futures)
+            if future.set_running_or_notify_cancel()
+        ]
+        if not live:
+            return
+        try:
+            results = batch.run_batch([input for input, _ in live])
+            if len(results) != len(live):
+                raise ValueError(
+                    f"Batch of {len(live)} inputs returned {len(results)} results"
+                )
+        except BaseException as e:
+            LOGGER.warning(f"Batch of {len(live)} inputs failed: {e}")
+            for _, future in live:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(live, results):
+            future.set_result(result)
@@ -0,0 +1,311 @@
+"""
+A process-wide pool of the pipelines loaded by the local inference model parsers, so that a model
+is loaded once for every parser, and idle pipelines are evicted when the pool exceeds its memory budget.
+"""
+
+import asyncio
+import gc
+import json
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field, replace
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+from aiconfig.util.thread_pool import get_inference_thread_pool
+
+LOGGER = logging.getLogger(__name__)
+
+# Parameters of the loaded pipelines count towards the budget. Pipelines in use are never evicted,
+# so the pool can temporarily exceed it.
+DEFAULT_MAX_PIPELINE_POOL_BYTES = 8 * 1024**3
+
+# (task, model name, pipeline creation params as JSON)
+PipelineKey = Tuple[str, Optional[str], str]
+
+
+def make_pipeline_key(
+    task: str,
+    model_name: Optional[str],
+    creation_params: Optional[Dict[str, Any]] = None,
+) -> PipelineKey:
+    return (
+        task,
+        model_name,
+        json.dumps(creation_params or {}, sort_keys=True, default=str),
+    )
+
+
+def estimate_pipeline_memory_bytes(pipeline: Any) -> int:
+    """
+    Estimates the memory used by a pipeline from the parameters and buffers of its torch modules:
+    `model` for transformers pipelines, `components` for diffusers pipelines. Returns 0 if unknown.
+    """
+    modules = []
+    components = getattr(pipeline, "components", None)
+    if isinstance(components, dict):
+        modules.extend(components.values())
+    else:
+        modules.append(getattr(pipeline, "model", None))
+
+    num_bytes = 0
+    for module in modules:
+        if not hasattr(module, "parameters") or not hasattr(module, "buffers"):
+            continue
+        for tensor in [*module.parameters(), *module.buffers()]:
+            num_bytes += tensor.numel() * tensor.element_size()
+    return num_bytes
+
+
+@dataclass
+class PipelinePoolMetrics:
+    num_loads: int = 0
+    num_hits: int = 0
+    num_evictions: int = 0
+    total_load_time_s: float = 0.0
+    resident_bytes: int = 0
+    num_resident_pipelines: int = 0
+    # Pipeline key -> time it took to load, in seconds
+    load_times_s: Dict[PipelineKey, float] = field(default_factory=dict)
+
+
+@dataclass
+class _PoolEntry:
+    pipeline: Any
+    memory_bytes: int
+    num_users: int = 0
+
+
+class PipelinePool:
+    """
+    Loaded pipelines, keyed by task, model and creation params, evicted least recently used first
+    when their estimated memory exceeds `max_memory_bytes`.
+
+    Pipelines are reference counted while in use (see `acquire`), and only idle pipelines are evicted.
+    A pipeline is loaded once even if several threads request it at the same time.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = DEFAULT_MAX_PIPELINE_POOL_BYTES,
+        estimate_memory_bytes: Callable[
+            [Any], int
+        ] = estimate_pipeline_memory_bytes,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.estimate_memory_bytes = estimate_memory_bytes
+        # Least recently used first
+        self._entries: OrderedDict[PipelineKey, _PoolEntry] = OrderedDict()
+        self._loading_locks: Dict[PipelineKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._metrics = PipelinePoolMetrics()
+
+    @contextmanager
+    def acquire(
+        self, key: PipelineKey, load: Callable[[], Any]
+    ) -> Iterator[Any]:
+        """
+        Yields the pipeline for the key, loading it with `load()` if it isn't in the pool.
+        The pipeline can't be evicted until the `with` block exits.
+
+        Usage:
+            with get_pipeline_pool().acquire(key, lambda: pipeline("summarization", model)) as summarizer:
+                summarizer(inputs)
+        """
+        entry = self._get_entry(key, load)
+        try:
+            yield entry.pipeline
+        finally:
+            if self._release(entry):
+                _release_memory()
+
+    @asynccontextmanager
+    async def acquire_async(
+        self, key: PipelineKey, load: Callable[[], Any]
+    ) -> AsyncIterator[Any]:
+        """
+        Same as `acquire`, for coroutines: the pipeline is loaded in the inference thread pool
+        (see aiconfig.util.thread_pool), so loading a model doesn't block the event loop.
+
+        Usage:
+            async with get_pipeline_pool().acquire_async(key, lambda: pipeline("summarization", model)) as summarizer:
+                await run_in_thread_pool(summarizer, inputs)
+        """
+        entry_future = get_inference_thread_pool().submit(
+            self._get_entry, key, load
+        )
+        try:
+            entry = await asyncio.wrap_future(entry_future)
+        except asyncio.CancelledError:
+            # A load can't be interrupted: release the pipeline once it's loaded
+            entry_future.add_done_callback(self._release_loaded_entry)
+            raise
+        try:
+            yield entry.pipeline
+        finally:
+            if self._release(entry):
+                get_inference_thread_pool().submit(_release_memory)
+
+    def _release_loaded_entry(
+        self, entry_future: "Future[_PoolEntry]"
+    ) -> None:
+        if entry_future.cancelled() or entry_future.exception() is not None:
+            return
+        if self._release(entry_future.result()):
+            _release_memory()
+
+    def _release(self, entry: _PoolEntry) -> bool:
+        """
+        Releases a use of the entry. Returns whether idle pipelines were evicted.
+        """
+        with self._lock:
+            entry.num_users -= 1
+            return self._evict_idle_entries()
+
+    def _get_entry(
+        self, key: PipelineKey, load: Callable[[], Any]
+    ) -> _PoolEntry:
+        with self._lock:
+            entry = self._use_entry(key)
+            if entry is not None:
+                self._metrics.num_hits += 1
+                return entry
+            loading_lock = self._loading_locks.setdefault(
+                key, threading.Lock()
+            )
+
+        # Load outside of the pool lock, so other pipelines can be used meanwhile
+        with loading_lock:
+            with self._lock:
+                entry = self._use_entry(key)
+                if entry is not None:
+                    # Loaded by another thread while this one was waiting
+                    self._metrics.num_hits += 1
+                    return entry
+
+            start_time = time.perf_counter()
+            try:
+                pipeline = load()
+                load_time_s = time.perf_counter() - start_time
+                entry = _PoolEntry(
+                    pipeline,
+                    self.estimate_memory_bytes(pipeline),
+                    num_users=1,
+                )
+            except BaseException:
+                with self._lock:
+                    self._loading_locks.pop(key, None)
+                raise
+            LOGGER.info(
+                f"Loaded pipeline {key} in {load_time_s:.1f}s ({entry.memory_bytes / 1e6:.0f} MB)"
+            )
+
+            with self._lock:
+                # Drop the loading lock only once the entry is in the pool, otherwise a thread
+                # coming in between would find neither and load the pipeline again
+                self._entries[key] = entry
+                self._loading_locks.pop(key, None)
+                self._metrics.num_loads += 1
+                self._metrics.total_load_time_s += load_time_s
+                self._metrics.load_times_s[key] = load_time_s
+                evicted = self._evict_idle_entries()
+        if evicted:
+            _release_memory()
+        return entry
+
+    def _use_entry(self, key: PipelineKey) -> Optional[_PoolEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.num_users += 1
+            self._entries.move_to_end(key)
+        return entry
+
+    def _evict_idle_entries(self) -> bool:
+        resident_bytes = sum(
+            entry.memory_bytes for entry in self._entries.values()
+        )
+        evicted = False
+        for key in list(self._entries):
+            if resident_bytes <= self.max_memory_bytes:
+                break
+            entry = self._entries[key]
+            if entry.num_users > 0:
+                continue
+            del self._entries[key]
+            resident_bytes -= entry.memory_bytes
+            self._metrics.num_evictions += 1
+            evicted = True
+            LOGGER.info(
+                f"Evicted pipeline {key} ({entry.memory_bytes / 1e6:.0f} MB)"
+            )
+        return evicted
+
+    def get_metrics(self) -> PipelinePoolMetrics:
+        with self._lock:
+            return replace(
+                self._metrics,
+                resident_bytes=sum(
+                    entry.memory_bytes for entry in self._entries.values()
+                ),
+                num_resident_pipelines=len(self._entries),
+                load_times_s=dict(self._metrics.load_times_s),
+            )
+
+    def __contains__(self, key: PipelineKey) -> bool:
+        return key in self._entries
+
+    def clear(self) -> None:
+        """
+        Removes the idle pipelines from the pool.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if self._entries[key].num_users == 0:
+                    del self._entries[key]
+        _release_memory()
+
+
+def _release_memory() -> None:
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+_pipeline_pool: Optional[PipelinePool] = None
+_pipeline_pool_lock = threading.Lock()
+
+
+def get_pipeline_pool() -> PipelinePool:
+    """
+    Returns the pipeline pool shared by the local inference model parsers.
+    """
+    global _pipeline_pool
+    with _pipeline_pool_lock:
+        if _pipeline_pool is None:
+            _pipeline_pool = PipelinePool()
+        return _pipeline_pool
+
+
+def configure_pipeline_pool(max_memory_bytes: int) -> None:
+    """
+    Sets the memory budget of the shared pipeline pool, evicting idle pipelines if they exceed it.
+    """
+    pool = get_pipeline_pool()
+    with pool._lock:
+        pool.max_memory_bytes = max_memory_bytes
+        evicted = pool._evict_idle_entries()
+    if evicted:
+        _release_memory()
@@ -1,4 +1,3 @@
-import base64
 import copy
 import io
 import itertools
@@ -10,7 +9,16 @@ from aiconfig.default_parsers.parameterized_model_parser import (
     ParameterizedModelParser,
 )
 from aiconfig.model_parser import InferenceOptions
+from aiconfig.util.blob_store import (
+    make_binary_output_data,
+    resolve_blob_data,
+)
 from aiconfig.util.params import resolve_prompt
+from aiconfig.util.thread_pool import run_in_thread_pool
+from aiconfig_extension_hugging_face.local_inference.pipeline_pool import (
+    get_pipeline_pool,
+    make_pipeline_key,
+)
 from aiconfig_extension_hugging_face.local_inference.util import get_hf_model
 from diffusers import AutoPipelineForText2Image
 from diffusers.pipelines.stable_diffusion import StableDiffusionPipelineOutput
@@ -18,7 +26,6 @@ from diffusers.pipelines.stable_diffusion_xl.pipeline_output import (
     StableDiffusionXLPipelineOutput,
 )
 from PIL import Image
-from transformers import Pipeline
 
 from aiconfig.schema import (
     ExecuteResult,
@@ -149,25 +156,26 @@ class ImageData:
         self.nsfw_content_detected = nsfw_content_detected
 
 
-def construct_output(image_data: ImageData, execution_count: int) -> Output:
+def construct_output(
+    image_data: ImageData,
+    execution_count: int,
+    aiconfig: Optional["AIConfigRuntime"] = None,
+) -> Output:
     """
     Construct output based on the response data
     """
 
-    # TODO (rossdanlm): These 64 bit strings can be extremely long (ex: the Stable
-    # Diffusion XL model output in
+    # Base64 images can be extremely long (ex: the Stable Diffusion XL model output in
     # https://github.com/lastmile-ai/aiconfig/pull/460#issuecomment-1851376017
-    # is 1.36 MB, 1,424,248 chars).
-    # Would be nice to save images locally with local URL instead.
+    # is 1.36 MB, 1,424,248 chars), so they're stored in the config's blob store if it has one.
     # https://github.com/lastmile-ai/aiconfig/issues/468
-    def pillow_image_to_base64_string(img: Image.Image):
+    def pillow_image_to_png_bytes(img: Image.Image) -> bytes:
         buffered = io.BytesIO()
         img.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode("utf-8")
+        return buffered.getvalue()
 
-    data = OutputDataWithStringValue(
-        kind="base64",
-        value=pillow_image_to_base64_string(image_data.image),
+    data = make_binary_output_data(
+        pillow_image_to_png_bytes(image_data.image), aiconfig
     )
     output = ExecuteResult(
         **{
@@ -203,7 +211,6 @@ class HuggingFaceText2ImageDiffusor(ParameterizedModelParser):
                 config.register_model_parser(parser)
         """
         super().__init__()
-        self.generators: dict[str, Pipeline] = {}
 
     def id(self) -> str:
         """
@@ -257,7 +264,6 @@ class HuggingFaceText2ImageDiffusor(ParameterizedModelParser):
         self,
         prompt: Prompt,
         aiconfig: "AIConfigRuntime",
-        _options,
         params: Optional[Dict[str, Any]] = {},
     ) -> Dict[str, Any]:
         """
@@ -321,20 +327,23 @@ https://huggingface.co/docs/diffusers/using-diffusers/loading
         print(pipeline_building_disclaimer_message)
 
         model_name = get_hf_model(aiconfig, prompt, self)
-        key = model_name if model_name is not None else "__default__"
 
         # TODO (rossdanlm): Figure out a way to save model and re-use checkpoint
         # Otherwise right now a lot of these models are taking 5 mins to load with 50
         # num_inference_steps (default value). See here for more details:
         # https://huggingface.co/docs/diffusers/using-diffusers/loading#checkpoint-variants
-        if key not in self.generators:
-            device = self._get_device()
-            self.generators[key] = AutoPipelineForText2Image.from_pretrained(
+        device = self._get_device()
+        async with get_pipeline_pool().acquire_async(
+            make_pipeline_key(
+                "text-to-image",
+                model_name,
+                {**pipeline_creation_data, "device": device},
+            ),
+            lambda: AutoPipelineForText2Image.from_pretrained(
                 pretrained_model_or_path=model_name, **pipeline_creation_data
-            ).to(device)
-        generator = self.generators[key]
-
-        disclaimer_long_response_print_message = """\n
+            ).to(device),
+        ) as generator:
+            disclaimer_long_response_print_message = """\n
 Calling image generation. This can take a long time, (up to SEVERAL MINUTES depending
 on the model), please hold on...
 
@@ -345,33 +354,33 @@ https://huggingface.co/docs/diffusers/main/en/api/pipelines/stable_diffusion/tex
 
 If that doesn't work, you can also try less computationally intensive models. 
         """
-        print(disclaimer_long_response_print_message)
-
-        completion_data = await self.deserialize(
-            prompt, aiconfig, options, parameters
-        )
-        response: Union[
-            StableDiffusionPipelineOutput, StableDiffusionXLPipelineOutput
-        ] = generator(**completion_data)
-        nsfw_content_detected = []
-        if hasattr(response, "nsfw_content_detected"):
-            # StableDiffusionPipelineOutput has "nsfw_content_detected" field  but
-            # StableDiffusionXLPipelineOutput does not. Both have "images" field
-            nsfw_content_detected = response.nsfw_content_detected
-
-        outputs: List[Output] = []
-        # TODO (rossdanlm): Check if "image" field is present for other image
-        # diffusers other than StableDiffusion and StableDiffusionXL
-        # https://github.com/lastmile-ai/aiconfig/issues/471
-        refined_responses = _refine_responses(
-            response.images or [], nsfw_content_detected
-        )
-        for count, image_data in enumerate(refined_responses):
-            # TODO (rossdanlm): It's possible for image to be of type np.ndarray
-            # Update `construct_output` to process this type.
-            # See StableDiffusionPipelineOutput
-            output = construct_output(image_data, count)
-            outputs.append(output)
+            print(disclaimer_long_response_print_message)
+
+            completion_data = await self.deserialize(
+                prompt, aiconfig, parameters
+            )
+            response: Union[
+                StableDiffusionPipelineOutput, StableDiffusionXLPipelineOutput
+            ] = await run_in_thread_pool(generator, **completion_data)
+            nsfw_content_detected = []
+            if hasattr(response, "nsfw_content_detected"):
+                # StableDiffusionPipelineOutput has "nsfw_content_detected" field  but
+                # StableDiffusionXLPipelineOutput does not. Both have "images" field
+                nsfw_content_detected = response.nsfw_content_detected
+
+            outputs: List[Output] = []
+            # TODO (rossdanlm): Check if "image" field is present for other image
+            # diffusers other than StableDiffusion and StableDiffusionXL
+            # https://github.com/lastmile-ai/aiconfig/issues/471
+            refined_responses = _refine_responses(
+                response.images or [], nsfw_content_detected
+            )
+            for count, image_data in enumerate(refined_responses):
+                # TODO (rossdanlm): It's possible for image to be of type np.ndarray
+                # Update `construct_output` to process this type.
+                # See StableDiffusionPipelineOutput
+                output = construct_output(image_data, count, aiconfig)
+                outputs.append(output)
 
         prompt.outputs = outputs
         return prompt.outputs
@@ -393,7 +402,7 @@ If that doesn't work, you can also try less computationally intensive models.
         if output.output_type == "execute_result":
             output_data = output.data
             if isinstance(output_data, OutputDataWithStringValue):
-                return output_data.value
+                return resolve_blob_data(output_data, aiconfig).value
             # HuggingFace text to image outputs should only ever be in
             # outputDataWithStringValue format so shouldn't get here, but
             # just being safe
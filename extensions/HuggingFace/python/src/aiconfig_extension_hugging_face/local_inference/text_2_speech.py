@@ -1,4 +1,3 @@
-import base64
 import copy
 import io
 import json
@@ -9,10 +8,19 @@ from aiconfig.default_parsers.parameterized_model_parser import (
     ParameterizedModelParser,
 )
 from aiconfig.model_parser import InferenceOptions
+from aiconfig.util.blob_store import (
+    make_binary_output_data,
+    resolve_blob_data,
+)
 from aiconfig.util.params import resolve_prompt
+from aiconfig.util.thread_pool import run_in_thread_pool
+from aiconfig_extension_hugging_face.local_inference.pipeline_pool import (
+    get_pipeline_pool,
+    make_pipeline_key,
+)
 from aiconfig_extension_hugging_face.local_inference.util import get_hf_model
 from scipy.io.wavfile import write as write_wav
-from transformers import Pipeline, pipeline
+from transformers import pipeline
 
 from aiconfig.schema import (
     ExecuteResult,
@@ -87,10 +95,11 @@ def refine_completion_params(
     return completion_params
 
 
-def construct_output(audio, execution_count: int) -> Output:
-    def _b64_encode_bytes(byte_array: bytes) -> str:
-        return base64.b64encode(byte_array).decode("utf-8")
-
+def construct_output(
+    audio,
+    execution_count: int,
+    aiconfig: Optional["AIConfigRuntime"] = None,
+) -> Output:
     def _audio_ndarray_to_wav_bytes(
         audio: np.ndarray, sampling_rate: int
     ) -> bytes:
@@ -101,17 +110,12 @@ def construct_output(audio, execution_count: int) -> Output:
         byte_array = buffered.getvalue()
         return byte_array
 
-    def _audio_ndarray_to_b64_str(
-        audio: np.ndarray, sampling_rate: int
-    ) -> str:
-        byte_array = _audio_ndarray_to_wav_bytes(audio, sampling_rate)
-        return _b64_encode_bytes(byte_array)
-
-    data = dict(
-        kind="base64",
-        value=_audio_ndarray_to_b64_str(
+    # Stored in the config's blob store (if any) rather than inlined as base64
+    data = make_binary_output_data(
+        _audio_ndarray_to_wav_bytes(
             np.squeeze(audio["audio"]), audio["sampling_rate"]
         ),
+        aiconfig,
     )
     output = ExecuteResult(
         **{
@@ -128,7 +132,6 @@ def construct_output(audio, execution_count: int) -> Output:
 class HuggingFaceText2SpeechTransformer(ParameterizedModelParser):
     def __init__(self):
         super().__init__()
-        self.synthesizers: dict[str, Pipeline] = {}
 
     def id(self) -> str:
         """
@@ -180,7 +183,6 @@ class HuggingFaceText2SpeechTransformer(ParameterizedModelParser):
         self,
         prompt: Prompt,
         aiconfig: "AIConfigRuntime",
-        _options,
         params: Optional[Dict[str, Any]] = {},
     ) -> Dict[str, Any]:
         """
@@ -232,24 +234,23 @@ class HuggingFaceText2SpeechTransformer(ParameterizedModelParser):
         )
 
         model_name = get_hf_model(aiconfig, prompt, self)
-        key = model_name if model_name is not None else "__default__"
-        if key not in self.synthesizers:
-            self.synthesizers[key] = pipeline(
-                "text-to-speech", model=model_name
+        async with get_pipeline_pool().acquire_async(
+            make_pipeline_key("text-to-speech", model_name),
+            lambda: pipeline("text-to-speech", model=model_name),
+        ) as synthesizer:
+            completion_data = await self.deserialize(
+                prompt, aiconfig, parameters
+            )
+            inputs = completion_data.pop("prompt", None)
+            response = await run_in_thread_pool(
+                synthesizer, inputs, **completion_data
             )
-        synthesizer = self.synthesizers[key]
-
-        completion_data = await self.deserialize(
-            prompt, aiconfig, options, parameters
-        )
-        inputs = completion_data.pop("prompt", None)
-        response = synthesizer(inputs, **completion_data)
 
-        outputs: List[Output] = []
-        assert not isinstance(response, list)
-        for count, audio in enumerate([response]):
-            output = construct_output(audio, count)
-            outputs.append(output)
+            outputs: List[Output] = []
+            assert not isinstance(response, list)
+            for count, audio in enumerate([response]):
+                output = construct_output(audio, count, aiconfig)
+                outputs.append(output)
 
         prompt.outputs = outputs
         return prompt.outputs
@@ -271,7 +272,7 @@ class HuggingFaceText2SpeechTransformer(ParameterizedModelParser):
         if output.output_type == "execute_result":
             output_data = output.data
             if isinstance(output_data, OutputDataWithStringValue):
-                return output_data.value
+                return resolve_blob_data(output_data, aiconfig).value
             # HuggingFace text to image outputs should only ever be in
             # outputDataWithStringValue format so shouldn't get here, but
             # just being safe
@@ -1,6 +1,9 @@
+import asyncio
 import copy
+import functools
 import json
 import threading
+import weakref
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from aiconfig.default_parsers.parameterized_model_parser import (
@@ -8,6 +11,19 @@ from aiconfig.default_parsers.parameterized_model_parser import (
 )
 from aiconfig.model_parser import InferenceOptions
 from aiconfig.util.params import resolve_prompt
+from aiconfig.util.thread_pool import (
+    iterate_in_thread_pool,
+    run_in_thread_pool,
+)
+from aiconfig_extension_hugging_face.local_inference.micro_batching import (
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_BATCH_WAIT_MS,
+    MicroBatcher,
+)
+from aiconfig_extension_hugging_face.local_inference.pipeline_pool import (
+    get_pipeline_pool,
+    make_pipeline_key,
+)
 from aiconfig_extension_hugging_face.local_inference.util import get_hf_model
 from transformers import (
     AutoTokenizer,
@@ -106,7 +122,7 @@ def construct_regular_output(
     return output
 
 
-def construct_stream_output(
+async def construct_stream_output(
     streamer: TextIteratorStreamer,
     options: InferenceOptions,
 ) -> Output:
@@ -129,7 +145,7 @@ def construct_stream_output(
         }
     )
     accumulated_message = ""
-    for new_text in streamer:
+    async for new_text in iterate_in_thread_pool(streamer):
         if isinstance(new_text, str):
             accumulated_message += new_text
             options.stream_callback(new_text, accumulated_message, 0)
@@ -137,13 +153,69 @@ def construct_stream_output(
     return output
 
 
+# Tokenizers used for batched generation, by pipeline. See `get_batch_generator`.
+_batch_tokenizers: "weakref.WeakKeyDictionary[Pipeline, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+_batch_tokenizers_lock = threading.Lock()
+
+
+def get_batch_generator(generator: Pipeline) -> Pipeline:
+    """
+    Returns a copy of the pipeline, sharing its model, with a tokenizer set up for batches.
+
+    Batched inputs are padded to the same length. Decoder-only models (most text generation
+    models) need a pad token and left padding, so generation continues right after each prompt.
+    The padding settings go on a dedicated copy of the tokenizer, since the pipeline is shared
+    with the other runs (see PipelinePool), e.g. streamed runs.
+    """
+    with _batch_tokenizers_lock:
+        tokenizer = _batch_tokenizers.get(generator)
+        if tokenizer is None:
+            tokenizer = copy.deepcopy(generator.tokenizer)
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            if not generator.model.config.is_encoder_decoder:
+                tokenizer.padding_side = "left"
+            _batch_tokenizers[generator] = tokenizer
+    batch_generator = copy.copy(generator)
+    batch_generator.tokenizer = tokenizer
+    return batch_generator
+
+
+def generate_batch(
+    generator: Pipeline,
+    completion_data: Dict[str, Any],
+    text_inputs: List[str],
+) -> List[List[Dict[str, str]]]:
+    """
+    Runs the text generation pipeline on a batch of inputs with the same completion params.
+    Returns the generated sequences of each input, in order.
+    """
+    if len(text_inputs) == 1:
+        return [generator(text_inputs[0], **completion_data)]
+
+    return get_batch_generator(generator)(
+        text_inputs, batch_size=len(text_inputs), **completion_data
+    )
+
+
 class HuggingFaceTextGenerationTransformer(ParameterizedModelParser):
     """
     A model parser for HuggingFace models of type text generation task using transformers.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_batch_wait_ms: float = DEFAULT_MAX_BATCH_WAIT_MS,
+    ):
         """
+        Args:
+            max_batch_size (int): Maximum number of concurrent non-streamed runs (e.g. from run_batch)
+                with the same model and settings that are generated in one batched pipeline call.
+            max_batch_wait_ms (float): How long a run waits for other runs to join its batch.
+
         Returns:
             HuggingFaceTextGenerationTransformer
 
@@ -154,7 +226,7 @@ class HuggingFaceTextGenerationTransformer(ParameterizedModelParser):
                 config.register_model_parser(parser)
         """
         super().__init__()
-        self.generators: dict[str, Pipeline] = {}
+        self.batcher = MicroBatcher(max_batch_size, max_batch_wait_ms)
 
     def id(self) -> str:
         """
@@ -202,7 +274,6 @@ class HuggingFaceTextGenerationTransformer(ParameterizedModelParser):
         self,
         prompt: Prompt,
         aiconfig: "AIConfigRuntime",
-        _options,
         params: Optional[Dict[str, Any]] = {},
     ) -> Dict[str, Any]:
         """
@@ -242,55 +313,68 @@ class HuggingFaceTextGenerationTransformer(ParameterizedModelParser):
         Returns:
             InferenceResponse: The response from the model.
         """
-        completion_data = await self.deserialize(
-            prompt, aiconfig, options, parameters
-        )
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
         completion_data["text_inputs"] = completion_data.pop("prompt", None)
 
         model_name = get_hf_model(aiconfig, prompt, self)
-        key = model_name if model_name is not None else "__default__"
-        if key not in self.generators:
-            self.generators[key] = pipeline(
-                "text-generation", model=model_name
+        pipeline_key = make_pipeline_key("text-generation", model_name)
+        async with get_pipeline_pool().acquire_async(
+            pipeline_key,
+            lambda: pipeline("text-generation", model=model_name),
+        ) as generator:
+            # if stream enabled in runtime options and config, then stream. Otherwise don't stream.
+            streamer = None
+            should_stream = (options.stream if options else False) and (
+                not "stream" in completion_data
+                or completion_data.get("stream") != False
             )
-        generator = self.generators[key]
-
-        # if stream enabled in runtime options and config, then stream. Otherwise don't stream.
-        streamer = None
-        should_stream = (options.stream if options else False) and (
-            not "stream" in completion_data
-            or completion_data.get("stream") != False
-        )
-        if should_stream:
-            tokenizer: AutoTokenizer = AutoTokenizer.from_pretrained(
-                model_name
-            )
-            streamer = TextIteratorStreamer(tokenizer)
-            completion_data["streamer"] = streamer
-
-        outputs: List[Output] = []
-        output = None
-        if not should_stream:
-            response: List[Any] = generator(**completion_data)
-            for count, result in enumerate(response):
-                output = construct_regular_output(result, count)
-                outputs.append(output)
-        else:
-            if completion_data.get("num_return_sequences", 1) > 1:
-                raise ValueError(
-                    "Sorry, TextIteratorStreamer does not support multiple return sequences, please set `num_return_sequences` to 1"
+            if should_stream:
+                tokenizer: AutoTokenizer = await run_in_thread_pool(
+                    AutoTokenizer.from_pretrained, model_name
                 )
-            if not streamer:
-                raise ValueError(
-                    "Stream option is selected but streamer is not initialized"
+                streamer = TextIteratorStreamer(tokenizer)
+                completion_data["streamer"] = streamer
+
+            outputs: List[Output] = []
+            output = None
+            if not should_stream:
+                # Concurrent runs with the same model and settings are generated together
+                text_inputs = completion_data.pop("text_inputs")
+                batch_key = (
+                    pipeline_key,
+                    json.dumps(completion_data, sort_keys=True, default=str),
                 )
-
-            # For streaming, cannot call `generator` directly otherwise response will be blocking
-            thread = threading.Thread(target=generator, kwargs=completion_data)
-            thread.start()
-            output = construct_stream_output(streamer, options)
-            if output is not None:
-                outputs.append(output)
+                response: List[Any] = await asyncio.wrap_future(
+                    self.batcher.submit(
+                        batch_key,
+                        text_inputs,
+                        functools.partial(
+                            generate_batch, generator, completion_data
+                        ),
+                    )
+                )
+                for count, result in enumerate(response):
+                    output = construct_regular_output(result, count)
+                    outputs.append(output)
+            else:
+                if completion_data.get("num_return_sequences", 1) > 1:
+                    raise ValueError(
+                        "Sorry, TextIteratorStreamer does not support multiple return sequences, please set `num_return_sequences` to 1"
+                    )
+                if not streamer:
+                    raise ValueError(
+                        "Stream option is selected but streamer is not initialized"
+                    )
+
+                # For streaming, cannot call `generator` directly otherwise response will be blocking
+                thread = threading.Thread(
+                    target=generator, kwargs=completion_data
+                )
+                thread.start()
+                output = await construct_stream_output(streamer, options)
+                await run_in_thread_pool(thread.join)
+                if output is not None:
+                    outputs.append(output)
 
         prompt.outputs = outputs
         return prompt.outputs
@@ -8,10 +8,17 @@ from aiconfig.default_parsers.parameterized_model_parser import (
 )
 from aiconfig.model_parser import InferenceOptions
 from aiconfig.util.params import resolve_prompt
+from aiconfig.util.thread_pool import (
+    iterate_in_thread_pool,
+    run_in_thread_pool,
+)
+from aiconfig_extension_hugging_face.local_inference.pipeline_pool import (
+    get_pipeline_pool,
+    make_pipeline_key,
+)
 from aiconfig_extension_hugging_face.local_inference.util import get_hf_model
 from transformers import (
     AutoTokenizer,
-    Pipeline,
     TextIteratorStreamer,
     pipeline,
 )
@@ -106,7 +113,7 @@ def construct_regular_output(
     return output
 
 
-def construct_stream_output(
+async def construct_stream_output(
     streamer: TextIteratorStreamer,
     options: InferenceOptions,
 ) -> Output:
@@ -130,7 +137,7 @@ def construct_stream_output(
     )
 
     accumulated_message = ""
-    for new_text in streamer:
+    async for new_text in iterate_in_thread_pool(streamer):
         if isinstance(new_text, str):
             # For some reason these symbols aren't filtered out by the streamer
             new_text = new_text.replace("</s>", "")
@@ -160,7 +167,6 @@ class HuggingFaceTextSummarizationTransformer(ParameterizedModelParser):
                 config.register_model_parser(parser)
         """
         super().__init__()
-        self.summarizers: dict[str, Pipeline] = {}
 
     def id(self) -> str:
         """
@@ -208,7 +214,6 @@ class HuggingFaceTextSummarizationTransformer(ParameterizedModelParser):
         self,
         prompt: Prompt,
         aiconfig: "AIConfigRuntime",
-        _options,
         params: Optional[Dict[str, Any]] = {},
     ) -> Dict[str, Any]:
         """
@@ -248,55 +253,53 @@ class HuggingFaceTextSummarizationTransformer(ParameterizedModelParser):
         Returns:
             InferenceResponse: The response from the model.
         """
-        completion_data = await self.deserialize(
-            prompt, aiconfig, options, parameters
-        )
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
         inputs = completion_data.pop("prompt", None)
 
         model_name = get_hf_model(aiconfig, prompt, self)
-        key = model_name if model_name is not None else "__default__"
-        if key not in self.summarizers:
-            self.summarizers[key] = pipeline("summarization", model=model_name)
-        summarizer = self.summarizers[key]
-
-        # if stream enabled in runtime options and config, then stream. Otherwise don't stream.
-        streamer = None
-        should_stream = (options.stream if options else False) and (
-            not "stream" in completion_data
-            or completion_data.get("stream") != False
-        )
-        if should_stream:
-            tokenizer: AutoTokenizer = AutoTokenizer.from_pretrained(
-                model_name
+        async with get_pipeline_pool().acquire_async(
+            make_pipeline_key("summarization", model_name),
+            lambda: pipeline("summarization", model=model_name),
+        ) as summarizer:
+            # if stream enabled in runtime options and config, then stream. Otherwise don't stream.
+            streamer = None
+            should_stream = (options.stream if options else False) and (
+                not "stream" in completion_data
+                or completion_data.get("stream") != False
             )
-            streamer = TextIteratorStreamer(tokenizer)
-            completion_data["streamer"] = streamer
-
-        def _summarize():
-            return summarizer(inputs, **completion_data)
-
-        outputs: List[Output] = []
-        if not should_stream:
-            response: List[Any] = _summarize()
-            for count, result in enumerate(response):
-                output = construct_regular_output(result, count)
-                outputs.append(output)
-        else:
-            if completion_data.get("num_return_sequences", 1) > 1:
-                raise ValueError(
-                    "Sorry, TextIteratorStreamer does not support multiple return sequences, please set `num_return_sequences` to 1"
-                )
-            if not streamer:
-                raise ValueError(
-                    "Stream option is selected but streamer is not initialized"
+            if should_stream:
+                tokenizer: AutoTokenizer = await run_in_thread_pool(
+                    AutoTokenizer.from_pretrained, model_name
                 )
-
-            # For streaming, cannot call `summarizer` directly otherwise response will be blocking
-            thread = threading.Thread(target=_summarize)
-            thread.start()
-            output = construct_stream_output(streamer, options)
-            if output is not None:
-                outputs.append(output)
+                streamer = TextIteratorStreamer(tokenizer)
+                completion_data["streamer"] = streamer
+
+            def _summarize():
+                return summarizer(inputs, **completion_data)
+
+            outputs: List[Output] = []
+            if not should_stream:
+                response: List[Any] = await run_in_thread_pool(_summarize)
+                for count, result in enumerate(response):
+                    output = construct_regular_output(result, count)
+                    outputs.append(output)
+            else:
+                if completion_data.get("num_return_sequences", 1) > 1:
+                    raise ValueError(
+                        "Sorry, TextIteratorStreamer does not support multiple return sequences, please set `num_return_sequences` to 1"
+                    )
+                if not streamer:
+                    raise ValueError(
+                        "Stream option is selected but streamer is not initialized"
+                    )
+
+                # For streaming, cannot call `summarizer` directly otherwise response will be blocking
+                thread = threading.Thread(target=_summarize)
+                thread.start()
+                output = await construct_stream_output(streamer, options)
+                await run_in_thread_pool(thread.join)
+                if output is not None:
+                    outputs.append(output)
 
         prompt.outputs = outputs
         return prompt.outputs
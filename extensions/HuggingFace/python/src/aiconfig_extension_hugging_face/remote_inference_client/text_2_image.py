@@ -1,4 +1,3 @@
-import base64
 import copy
 import io
 import json
@@ -19,6 +18,10 @@ from aiconfig.schema import (
     Prompt,
     PromptMetadata,
 )
+from aiconfig.util.blob_store import (
+    make_binary_output_data,
+    resolve_blob_data,
+)
 from aiconfig.util.config_utils import get_api_key_from_environment
 from aiconfig.util.params import resolve_prompt
 from PIL.Image import Image as ImageType
@@ -54,17 +57,17 @@ def refine_completion_params(model_settings: dict[Any, Any]) -> dict[str, Any]:
     return completion_data
 
 
-def construct_output(response: ImageType) -> Output:
-    # TODO: save images locally with local URL instead.
-    # https://github.com/lastmile-ai/aiconfig/issues/468
-    def pillow_image_to_base64_string(img: ImageType):
+def construct_output(
+    response: ImageType, aiconfig: Optional["AIConfigRuntime"] = None
+) -> Output:
+    def pillow_image_to_png_bytes(img: ImageType) -> bytes:
         buffered = io.BytesIO()
         img.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode("utf-8")
+        return buffered.getvalue()
 
-    data = OutputDataWithStringValue(
-        kind="base64",
-        value=pillow_image_to_base64_string(response),
+    # Stored in the config's blob store (if any) rather than inlined as base64
+    data = make_binary_output_data(
+        pillow_image_to_png_bytes(response), aiconfig
     )
     output = ExecuteResult(
         **{
@@ -274,7 +277,7 @@ class HuggingFaceText2ImageRemoteInference(ParameterizedModelParser):
 
         # HF Text to Image api doesn't support multiple outputs. Expect only one output.
         # Output spec: response is PIL.Image
-        outputs = [construct_output(response)]  # type: ignore client incorrectly types as PIL.Image module
+        outputs = [construct_output(response, aiconfig)]  # type: ignore client incorrectly types as PIL.Image module
 
         prompt.outputs = outputs
 
@@ -299,7 +302,7 @@ class HuggingFaceText2ImageRemoteInference(ParameterizedModelParser):
         if output.output_type == "execute_result":
             output_data = output.data
             if isinstance(output_data, OutputDataWithStringValue):
-                return output_data.value
+                return resolve_blob_data(output_data, aiconfig).value
             # HuggingFace text to image outputs should only ever be in
             # outputDataWithStringValue format so shouldn't get here, but
             # just being safe
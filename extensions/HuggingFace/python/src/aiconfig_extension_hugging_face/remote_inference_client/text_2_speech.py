@@ -1,4 +1,3 @@
-import base64
 import copy
 import io
 import json
@@ -20,6 +19,10 @@ from aiconfig.schema import (
     Prompt,
     PromptMetadata,
 )
+from aiconfig.util.blob_store import (
+    make_binary_output_data,
+    resolve_blob_data,
+)
 from aiconfig.util.config_utils import get_api_key_from_environment
 from aiconfig.util.params import resolve_prompt
 from scipy.io.wavfile import write as write_wav
@@ -57,14 +60,11 @@ def refine_completion_params(model_settings: dict[Any, Any]) -> dict[str, Any]:
     return completion_data
 
 
-def construct_output(audio: bytes) -> Output:
-    def _b64_encode_bytes(byte_array: bytes) -> str:
-        return base64.b64encode(byte_array).decode("utf-8")
-
-    data = dict(
-        kind="base64",
-        value=_b64_encode_bytes(audio),
-    )
+def construct_output(
+    audio: bytes, aiconfig: Optional["AIConfigRuntime"] = None
+) -> Output:
+    # Stored in the config's blob store (if any) rather than inlined as base64
+    data = make_binary_output_data(audio, aiconfig)
 
     # TODO: Do we need to encode this for different mime types? For now, we
     # just set to audio/wav (works for a few models tested)
@@ -281,7 +281,7 @@ class HuggingFaceText2SpeechRemoteInference(ParameterizedModelParser):
 
         # HF Text to Speech api doesn't support multiple outputs. Expect only one output.
         # Output spec: audio in bytes
-        outputs = [construct_output(response)]  # type: ignore client incorrectly types as PIL.Image module
+        outputs = [construct_output(response, aiconfig)]  # type: ignore client incorrectly types as PIL.Image module
 
         prompt.outputs = outputs
 
@@ -306,7 +306,7 @@ class HuggingFaceText2SpeechRemoteInference(ParameterizedModelParser):
         if output.output_type == "execute_result":
             output_data = output.data
             if isinstance(output_data, OutputDataWithStringValue):
-                return output_data.value
+                return resolve_blob_data(output_data, aiconfig).value
             # HuggingFace text to speech outputs should only ever be in
             # outputDataWithStringValue format so shouldn't get here, but
             # just being safe
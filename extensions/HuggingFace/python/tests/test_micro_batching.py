@@ -0,0 +1,126 @@
+import asyncio
+import threading
+from concurrent.futures import wait
+
+import pytest
+from aiconfig_extension_hugging_face.local_inference.micro_batching import (
+    MicroBatcher,
+)
+
+
+class RecordingBatchFunction:
+    """
+    Returns the inputs in upper case, and records the batches it was called with.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def __call__(self, inputs):
+        with self._lock:
+            self.batches.append(list(inputs))
+        return [input.upper() for input in inputs]
+
+
+def test_full_batch_runs_without_waiting():
+    batcher = MicroBatcher(max_batch_size=3, max_wait_ms=60_000)
+    run_batch = RecordingBatchFunction()
+
+    futures = [batcher.submit("key", input, run_batch) for input in "abc"]
+
+    assert [future.result(timeout=5) for future in futures] == ["A", "B", "C"]
+    assert run_batch.batches == [["a", "b", "c"]]
+
+
+def test_partial_batch_runs_after_the_wait():
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=20)
+    run_batch = RecordingBatchFunction()
+
+    futures = [batcher.submit("key", input, run_batch) for input in "ab"]
+
+    assert [future.result(timeout=5) for future in futures] == ["A", "B"]
+    assert run_batch.batches == [["a", "b"]]
+
+
+def test_inputs_are_batched_by_key():
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=20)
+    run_batch = RecordingBatchFunction()
+
+    futures = [
+        batcher.submit(key, input, run_batch)
+        for key, input in [("k1", "a"), ("k2", "b"), ("k1", "c")]
+    ]
+
+    assert [future.result(timeout=5) for future in futures] == ["A", "B", "C"]
+    assert sorted(run_batch.batches) == [["a", "c"], ["b"]]
+
+
+def test_inputs_over_the_batch_size_start_a_new_batch():
+    batcher = MicroBatcher(max_batch_size=2, max_wait_ms=20)
+    run_batch = RecordingBatchFunction()
+
+    futures = [batcher.submit("key", input, run_batch) for input in "abcde"]
+
+    assert [future.result(timeout=5) for future in futures] == list("ABCDE")
+    assert sorted(run_batch.batches) == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_batch_exception_is_set_on_every_future():
+    batcher = MicroBatcher(max_batch_size=2, max_wait_ms=20)
+
+    def run_batch(inputs):
+        raise RuntimeError("Out of memory")
+
+    futures = [batcher.submit("key", input, run_batch) for input in "ab"]
+
+    wait(futures, timeout=5)
+    for future in futures:
+        with pytest.raises(RuntimeError, match="Out of memory"):
+            future.result()
+
+
+def test_wrong_number_of_results_fails_the_batch():
+    batcher = MicroBatcher(max_batch_size=2, max_wait_ms=20)
+
+    futures = [
+        batcher.submit("key", input, lambda inputs: inputs[:1])
+        for input in "ab"
+    ]
+
+    for future in futures:
+        with pytest.raises(ValueError, match="returned 1 results"):
+            future.result(timeout=5)
+
+
+def test_cancelled_inputs_are_skipped():
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=50)
+    run_batch = RecordingBatchFunction()
+
+    futures = [batcher.submit("key", input, run_batch) for input in "abc"]
+    assert futures[1].cancel()
+
+    assert futures[0].result(timeout=5) == "A"
+    assert futures[2].result(timeout=5) == "C"
+    assert run_batch.batches == [["a", "c"]]
+
+
+def test_concurrent_coroutines_are_batched():
+    batcher = MicroBatcher(max_batch_size=4, max_wait_ms=1000)
+    run_batch = RecordingBatchFunction()
+
+    async def run_all():
+        return await asyncio.gather(
+            *(
+                asyncio.wrap_future(batcher.submit("key", input, run_batch))
+                for input in "abcd"
+            )
+        )
+
+    assert asyncio.run(run_all()) == ["A", "B", "C", "D"]
+    assert run_batch.batches == [["a", "b", "c", "d"]]
+
+
+def test_max_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        MicroBatcher(max_batch_size=0)
@@ -0,0 +1,197 @@
+import asyncio
+import threading
+import time
+
+from aiconfig_extension_hugging_face.local_inference.pipeline_pool import (
+    PipelinePool,
+    make_pipeline_key,
+)
+
+PIPELINE_SIZE_BYTES = 4
+
+
+class FakeLoader:
+    """
+    Loads fake pipelines (their names), each using PIPELINE_SIZE_BYTES, and counts the loads.
+    """
+
+    def __init__(self, load_time_s: float = 0.0):
+        self.load_time_s = load_time_s
+        self.loads = []
+
+    def __call__(self, name: str):
+        def load():
+            time.sleep(self.load_time_s)
+            self.loads.append(name)
+            return name
+
+        return load
+
+
+def _make_pool(max_memory_bytes: int = 10) -> PipelinePool:
+    return PipelinePool(
+        max_memory_bytes=max_memory_bytes,
+        estimate_memory_bytes=lambda _pipeline: PIPELINE_SIZE_BYTES,
+    )
+
+
+def _key(name: str):
+    return make_pipeline_key("text-generation", name)
+
+
+def _use(pool: PipelinePool, loader: FakeLoader, name: str) -> None:
+    with pool.acquire(_key(name), loader(name)) as pipeline:
+        assert pipeline == name
+
+
+def test_pipeline_is_loaded_once():
+    pool = _make_pool()
+    loader = FakeLoader()
+
+    _use(pool, loader, "a")
+    _use(pool, loader, "a")
+
+    assert loader.loads == ["a"]
+    metrics = pool.get_metrics()
+    assert (metrics.num_loads, metrics.num_hits) == (1, 1)
+
+
+def test_concurrent_requests_load_the_pipeline_once():
+    pool = _make_pool()
+    loader = FakeLoader(load_time_s=0.05)
+
+    threads = [
+        threading.Thread(target=_use, args=(pool, loader, "a"))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loader.loads == ["a"]
+    assert pool.get_metrics().num_hits == 7
+
+
+def test_request_during_the_end_of_a_load_uses_the_loaded_pipeline():
+    loader = FakeLoader()
+    threads = []
+
+    def _estimate_memory_bytes(_pipeline):
+        # Runs between the load and the insertion of the pipeline in the pool
+        if not threads:
+            threads.append(
+                threading.Thread(target=_use, args=(pool, loader, "a"))
+            )
+            threads[0].start()
+            # The request waits for the pipeline being loaded
+            threads[0].join(timeout=0.2)
+        return PIPELINE_SIZE_BYTES
+
+    pool = PipelinePool(
+        max_memory_bytes=10, estimate_memory_bytes=_estimate_memory_bytes
+    )
+    _use(pool, loader, "a")
+    threads[0].join()
+
+    assert loader.loads == ["a"]
+    assert pool.get_metrics().num_hits == 1
+
+
+def test_least_recently_used_pipeline_is_evicted_first():
+    pool = _make_pool(max_memory_bytes=10)
+    loader = FakeLoader()
+    _use(pool, loader, "a")
+    _use(pool, loader, "b")
+    _use(pool, loader, "a")
+
+    # Over the budget with 3 pipelines: "b" was used the longest time ago
+    _use(pool, loader, "c")
+
+    assert _key("b") not in pool
+    assert _key("a") in pool and _key("c") in pool
+    assert pool.get_metrics().num_evictions == 1
+
+
+def test_pipelines_in_use_are_not_evicted():
+    pool = _make_pool(max_memory_bytes=10)
+    loader = FakeLoader()
+
+    with pool.acquire(_key("a"), loader("a")):
+        _use(pool, loader, "b")
+        _use(pool, loader, "c")
+        _use(pool, loader, "d")
+        # "a" is the least recently used, but in use: the idle pipelines are evicted instead
+        assert _key("a") in pool
+        assert _key("b") not in pool and _key("c") not in pool
+
+    assert _key("a") in pool and _key("d") in pool
+    assert pool.get_metrics().num_evictions == 2
+
+
+def test_pool_can_exceed_the_budget_while_pipelines_are_in_use():
+    pool = _make_pool(max_memory_bytes=10)
+    loader = FakeLoader()
+
+    with (
+        pool.acquire(_key("a"), loader("a")),
+        pool.acquire(_key("b"), loader("b")),
+        pool.acquire(_key("c"), loader("c")),
+    ):
+        metrics = pool.get_metrics()
+        assert metrics.resident_bytes == 3 * PIPELINE_SIZE_BYTES
+        assert metrics.num_resident_pipelines == 3
+
+    metrics = pool.get_metrics()
+    assert metrics.resident_bytes == 2 * PIPELINE_SIZE_BYTES
+    assert metrics.num_resident_pipelines == 2
+    assert metrics.num_evictions == 1
+
+
+def test_clear_removes_idle_pipelines():
+    pool = _make_pool(max_memory_bytes=100)
+    loader = FakeLoader()
+    _use(pool, loader, "a")
+
+    with pool.acquire(_key("b"), loader("b")):
+        pool.clear()
+        assert _key("a") not in pool and _key("b") in pool
+
+    assert pool.get_metrics().resident_bytes == PIPELINE_SIZE_BYTES
+
+
+def test_acquire_async_releases_the_pipeline():
+    pool = _make_pool(max_memory_bytes=4)
+    loader = FakeLoader()
+
+    async def use_async(name: str):
+        async with pool.acquire_async(_key(name), loader(name)) as pipeline:
+            assert pipeline == name
+            assert _key(name) in pool
+
+    asyncio.run(use_async("a"))
+    asyncio.run(use_async("b"))
+
+    assert loader.loads == ["a", "b"]
+    assert _key("a") not in pool and _key("b") in pool
+
+
+def test_acquire_async_cancelled_during_load_releases_the_pipeline():
+    pool = _make_pool(max_memory_bytes=4)
+    loader = FakeLoader(load_time_s=0.1)
+
+    async def cancel_during_load():
+        task = asyncio.create_task(
+            pool.acquire_async(_key("a"), loader("a")).__aenter__()
+        )
+        await asyncio.sleep(0.02)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(cancel_during_load())
+    time.sleep(0.2)
+
+    # The load completed in the background and its pipeline can be evicted
+    assert loader.loads == ["a"]
+    _use(pool, loader, "b")
+    assert _key("a") not in pool and _key("b") in pool
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from aiconfig_extension_hugging_face.local_inference.text_generation import (
+    get_batch_generator,
+)
+
+
+class FakeTokenizer:
+    def __init__(self):
+        self.pad_token = None
+        self.eos_token = "</s>"
+        self.padding_side = "right"
+
+
+class FakePipeline:
+    def __init__(self, is_encoder_decoder: bool = False):
+        self.tokenizer = FakeTokenizer()
+        self.model = SimpleNamespace(
+            config=SimpleNamespace(is_encoder_decoder=is_encoder_decoder)
+        )
+
+
+def test_batch_generator_doesnt_change_the_shared_pipeline():
+    generator = FakePipeline()
+
+    batch_generator = get_batch_generator(generator)
+
+    assert batch_generator.model is generator.model
+    assert batch_generator.tokenizer.pad_token == "</s>"
+    assert batch_generator.tokenizer.padding_side == "left"
+    assert generator.tokenizer.pad_token is None
+    assert generator.tokenizer.padding_side == "right"
+    # The batch tokenizer is set up once per pipeline
+    assert (
+        get_batch_generator(generator).tokenizer is batch_generator.tokenizer
+    )
+
+
+def test_batch_generator_keeps_right_padding_for_encoder_decoder_models():
+    generator = FakePipeline(is_encoder_decoder=True)
+
+    assert get_batch_generator(generator).tokenizer.padding_side == "right"
@@ -0,0 +1,117 @@
+"""
+Benchmark: concurrent runs of a parser backed by a blocking SDK.
+
+Starts a local stub of the Hugging Face text generation API that answers after a fixed delay,
+then runs the same prompt N times through HuggingFaceTextGenerationParser, once sequentially and
+once concurrently with run_batch. Since blocking SDK calls run in the inference thread pool,
+the concurrent batch should take about 1x the stub latency instead of Nx.
+
+Usage:
+    python benchmarks/bench_blocking_parsers.py [--num-runs 16] [--latency-s 0.25]
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from aiconfig.default_parsers.hf import HuggingFaceTextGenerationParser
+from aiconfig.model_parser import InferenceOptions
+from aiconfig.registry import ModelParserRegistry
+from aiconfig.util.thread_pool import configure_inference_thread_pool
+
+from aiconfig import AIConfigRuntime
+from aiconfig.schema import Prompt, PromptMetadata
+
+
+def make_stub_handler(latency_s: float):
+    class StubTextGenerationHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            time.sleep(latency_s)
+            body = json.dumps(
+                [
+                    {
+                        "generated_text": f"echo: {request.get('inputs')}",
+                        "details": {
+                            "finish_reason": "length",
+                            "generated_tokens": 1,
+                            "seed": None,
+                            "prefill": [],
+                            "tokens": [],
+                        },
+                    }
+                ]
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StubTextGenerationHandler
+
+
+def make_aiconfig(server_url: str) -> AIConfigRuntime:
+    parser = HuggingFaceTextGenerationParser(server_url)
+    ModelParserRegistry.register_model_parser(parser)
+    aiconfig = AIConfigRuntime.create("blocking_parser_benchmark")
+    aiconfig.add_prompt(
+        "generate",
+        Prompt(
+            name="generate",
+            input="Tell me about {{topic}}",
+            metadata=PromptMetadata(
+                model={
+                    "name": parser.id(),
+                    "settings": {"details": True, "max_new_tokens": 1},
+                }
+            ),
+        ),
+    )
+    return aiconfig
+
+
+async def benchmark(num_runs: int, latency_s: float) -> None:
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), make_stub_handler(latency_s)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    configure_inference_thread_pool(max_workers=num_runs)
+    aiconfig = make_aiconfig(server_url)
+    options = InferenceOptions(stream=False)
+    parameters_list = [{"topic": f"topic {i}"} for i in range(num_runs)]
+
+    start = time.perf_counter()
+    for params in parameters_list:
+        await aiconfig.run("generate", params, options)
+    sequential_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await aiconfig.run_batch("generate", parameters_list, options)
+    concurrent_s = time.perf_counter() - start
+
+    server.shutdown()
+    print(f"{num_runs} runs against a stub with {latency_s:.3f}s latency")
+    print(
+        f"  sequential: {sequential_s:.3f}s ({sequential_s / latency_s:.1f}x latency)"
+    )
+    print(
+        f"  run_batch:  {concurrent_s:.3f}s ({concurrent_s / latency_s:.1f}x latency)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-runs", type=int, default=16)
+    parser.add_argument("--latency-s", type=float, default=0.25)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.num_runs, args.latency_s))
@@ -0,0 +1,138 @@
+"""
+Benchmark: loading large configs with AIConfigRuntime.load.
+
+Writes a synthetic config with N prompts, each with a multi-KB output, as JSON and as YAML, then compares
+the previous load pipeline (pure-Python YAML loader, re-encoding to a JSON string, model_validate_json)
+with AIConfigRuntime.load, including loading with lazy outputs and without outputs.
+Reports load time, and retained and peak traced memory.
+
+Usage:
+    python benchmarks/bench_load_config.py [--num-prompts 1000] [--output-kb 4] [--repeat 1]
+"""
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import yaml
+from aiconfig.registry import ModelParserRegistry
+
+from aiconfig import AIConfigRuntime
+
+
+def make_config_data(num_prompts: int, output_kb: int):
+    output_text = "x" * (output_kb * 1024)
+    prompts = []
+    for i in range(num_prompts):
+        prompts.append(
+            {
+                "name": f"prompt_{i}",
+                "input": f"Tell me about {{{{topic}}}} #{i}",
+                "metadata": {
+                    "model": "gpt-3.5-turbo",
+                    "parameters": {"topic": f"topic {i}"},
+                },
+                "outputs": [
+                    {
+                        "output_type": "execute_result",
+                        "execution_count": 0,
+                        "data": output_text,
+                        "metadata": {
+                            "role": "assistant",
+                            "raw_response": {
+                                "role": "assistant",
+                                "content": output_text,
+                            },
+                        },
+                    }
+                ],
+            }
+        )
+    return {
+        "name": "bench",
+        "schema_version": "latest",
+        "metadata": {"parameters": {}, "models": {}},
+        "prompts": prompts,
+    }
+
+
+def previous_load(config_filepath: str) -> AIConfigRuntime:
+    with open(config_filepath) as file:
+        if config_filepath.endswith(".yaml"):
+            data = json.dumps(yaml.safe_load(file))
+        else:
+            data = file.read()
+    return AIConfigRuntime.model_validate_json(data)
+
+
+def measure(load_fn, config_filepath: str, repeat: int):
+    # Best time of untraced runs, then peak memory of a traced run
+    elapsed_s = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        config = load_fn(config_filepath)
+        elapsed_s = min(elapsed_s, time.perf_counter() - start)
+        del config
+
+    gc.collect()
+    tracemalloc.start()
+    config = load_fn(config_filepath)
+    retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_s, retained_bytes, peak_bytes, len(config.prompts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-prompts", type=int, default=1000)
+    parser.add_argument("--output-kb", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    data = make_config_data(args.num_prompts, args.output_kb)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, "aiconfig.json")
+        yaml_path = os.path.join(tmp_dir, "aiconfig.yaml")
+        with open(json_path, "w") as file:
+            json.dump(data, file)
+        with open(yaml_path, "w") as file:
+            yaml.dump(data, file, Dumper=getattr(yaml, "CDumper", yaml.Dumper))
+        del data
+        # Registers the default model parsers before measuring
+        ModelParserRegistry.get_model_parser("gpt-3.5-turbo")
+
+        for path in [json_path, yaml_path]:
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{os.path.basename(path)} ({size_mb:.1f} MB)")
+            for name, load_fn in [
+                ("previous", previous_load),
+                ("load", AIConfigRuntime.load),
+                (
+                    "lazy",
+                    lambda path: AIConfigRuntime.load(path, lazy_outputs=True),
+                ),
+                (
+                    "no outputs",
+                    lambda path: AIConfigRuntime.load(
+                        path, include_outputs=False
+                    ),
+                ),
+            ]:
+                elapsed_s, retained_bytes, peak_bytes, num_prompts = measure(
+                    load_fn, path, args.repeat
+                )
+                assert num_prompts == args.num_prompts
+                print(
+                    f"  {name:<10} {elapsed_s:7.3f}s  "
+                    f"retained {retained_bytes / 1e6:7.1f} MB  "
+                    f"peak {peak_bytes / 1e6:7.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
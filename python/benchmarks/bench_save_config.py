@@ -0,0 +1,84 @@
+"""
+Benchmark: saving large configs with AIConfigRuntime.save.
+
+Builds a synthetic config with N prompts, each with a multi-KB output, then compares the previous save
+(building the whole indented JSON string, then rewriting the file in place) with AIConfigRuntime.save,
+which streams to a temporary file and renames it: a first save, a save of unchanged content (skipped),
+and a compact save. Reports save time and peak traced memory.
+
+Usage:
+    python benchmarks/bench_save_config.py [--num-prompts 1000] [--output-kb 4] [--repeat 3]
+"""
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bench_load_config import make_config_data
+
+from aiconfig import AIConfigRuntime
+
+
+def previous_save(config: AIConfigRuntime, config_filepath: str):
+    config_string = config.to_string()
+    with open(config_filepath, "w") as file:
+        file.write(config_string)
+
+
+def measure(save_fn, repeat: int):
+    # Best time of untraced runs, then peak memory of a traced run
+    elapsed_s = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        save_fn()
+        elapsed_s = min(elapsed_s, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    save_fn()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_s, peak_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-prompts", type=int, default=1000)
+    parser.add_argument("--output-kb", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    config = AIConfigRuntime.model_validate(
+        make_config_data(args.num_prompts, args.output_kb)
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "aiconfig.json")
+
+        def save_changed(**kwargs):
+            # Forget the last save, so the file is always rewritten
+            config._saved_files.clear()
+            config.save(path, **kwargs)
+
+        for name, save_fn in [
+            ("previous", lambda: previous_save(config, path)),
+            ("save", save_changed),
+            ("unchanged", lambda: config.save(path)),
+            ("compact", lambda: save_changed(compact=True)),
+        ]:
+            elapsed_s, peak_bytes = measure(save_fn, args.repeat)
+            size_mb = os.path.getsize(path) / 1e6
+            print(
+                f"{name:<10} {elapsed_s:7.3f}s  "
+                f"peak {peak_bytes / 1e6:7.1f} MB  file {size_mb:6.1f} MB"
+            )
+        with open(path) as file:
+            assert len(json.load(file)["prompts"]) == args.num_prompts
+
+
+if __name__ == "__main__":
+    main()
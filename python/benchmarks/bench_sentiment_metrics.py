@@ -0,0 +1,92 @@
+"""
+Benchmark: NLTK Vader sentiment metrics over many short texts.
+
+Scores N short texts with nltk_sentiment_scores_vader, once per text through the metric's
+evaluation_fn (what the eval runner did before batching), then in one call with evaluate_batch,
+in-process and with the process pool. Requires the Vader lexicon (downloaded on first use).
+
+Usage:
+    python benchmarks/bench_sentiment_metrics.py [--num-texts 100000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from aiconfig.eval import metrics
+
+WORDS = [
+    "good",
+    "bad",
+    "great",
+    "terrible",
+    "movie",
+    "food",
+    "service",
+    "was",
+    "really",
+    "not",
+    "the",
+    "amazing",
+    "awful",
+    "okay",
+]
+
+
+def make_texts(num_texts: int) -> list[str]:
+    rng = random.Random(0)
+    return [
+        " ".join(rng.choices(WORDS, k=rng.randint(3, 12)))
+        for _ in range(num_texts)
+    ]
+
+
+async def benchmark(num_texts: int) -> None:
+    texts = make_texts(num_texts)
+    metric = metrics.nltk_sentiment_scores_vader
+    # Load the lexicon before timing
+    await metric("warm up")
+
+    start = time.perf_counter()
+    per_text = await asyncio.gather(*map(metric.evaluation_fn, texts))
+    per_text_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    metrics.get_polarity_scores_batch(
+        texts,
+        metrics.nltk_get_polarity_scores_vader,
+        process_pool_min_batch_size=num_texts + 1,
+    )
+    in_process_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    metrics.get_polarity_scores_batch(
+        texts,
+        metrics.nltk_get_polarity_scores_vader,
+        process_pool_min_batch_size=1,
+    )
+    process_pool_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = await metric.evaluate_batch(texts)
+    evaluate_batch_s = time.perf_counter() - start
+    assert batched == per_text
+
+    print(f"{num_texts} texts, {len(set(texts))} unique")
+    for label, elapsed_s in [
+        ("evaluation_fn per text", per_text_s),
+        ("batch scores, in-process", in_process_s),
+        ("batch scores, process pool", process_pool_s),
+        ("evaluate_batch", evaluate_batch_s),
+    ]:
+        print(
+            f"  {label + ':':<29} {elapsed_s:.3f}s ({num_texts / elapsed_s:.0f} texts/s)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-texts", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(benchmark(args.num_texts))
@@ -0,0 +1,175 @@
+"""
+Benchmark: reducing a streamed OpenAI chat completion into outputs.
+
+Builds a synthetic stream of N chunks (one token each, as dicts like `chunk.model_dump()`) and reduces it
+with the previous per-chunk approach (deep-copying the accumulated message and building an ExecuteResult
+for every chunk) and with ChatCompletionStreamAccumulator. The previous approach is quadratic in the
+number of chunks; the accumulator is linear.
+
+Also times the stream callback path with a callback that only uses the delta (like the default
+print_stream_delta): passing it a plain dict snapshot of the accumulated message for every chunk is
+quadratic, passing it the lazy message view is linear.
+
+Usage:
+    python benchmarks/bench_stream_accumulator.py [--num-chunks 10000] [--num-choices 1]
+"""
+
+import argparse
+import copy
+import time
+
+from aiconfig.default_parsers.openai import build_output_data
+from aiconfig.util.stream_accumulator import ChatCompletionStreamAccumulator
+
+from aiconfig.schema import ExecuteResult
+
+
+def make_stream(num_chunks: int, num_choices: int):
+    chunks = []
+    for i in range(num_chunks):
+        choices = []
+        for index in range(num_choices):
+            delta = {"content": f"tok{i} "}
+            if i == 0:
+                delta["role"] = "assistant"
+            choices.append({"index": index, "delta": delta})
+        chunks.append(
+            {
+                "id": "chatcmpl-bench",
+                "created": 1700000000,
+                "model": "gpt-3.5-turbo",
+                "object": "chat.completion.chunk",
+                "choices": choices,
+            }
+        )
+    return chunks
+
+
+def reduce(acc, delta):
+    # The reducer the accumulator replaced
+    acc = copy.deepcopy(acc)
+    for key, value in delta.items():
+        if key not in acc:
+            acc[key] = value
+        elif isinstance(acc[key], str) and isinstance(value, str):
+            acc[key] += value
+        elif isinstance(acc[key], dict):
+            acc[key] = reduce(acc[key], value)
+    return acc
+
+
+def multi_choice_message_reducer(messages, chunk):
+    for choice in chunk["choices"]:
+        index = choice["index"]
+        messages[index] = reduce(messages.get(index, {}), choice["delta"])
+    return messages
+
+
+def reduce_with_deepcopy(chunks):
+    outputs = {}
+    messages = {}
+    for chunk in chunks:
+        chunk_without_choices = {
+            key: copy.deepcopy(value)
+            for key, value in chunk.items()
+            if key != "choices"
+        }
+        messages = multi_choice_message_reducer(messages, chunk)
+        for choice in chunk["choices"]:
+            index = choice.get("index")
+            outputs[index] = ExecuteResult(
+                output_type="execute_result",
+                data=messages.get(index, ""),
+                execution_count=index,
+                metadata=chunk_without_choices,
+            )
+    outputs = [outputs[i] for i in sorted(outputs)]
+    for output in outputs:
+        output_message = output.data
+        output.data = build_output_data(output_message)
+        output.metadata = {
+            **output.metadata,
+            "raw_response": output_message,
+            "role": output_message.get("role"),
+        }
+    return outputs
+
+
+def delta_callback(data, accumulated_data, index):
+    # print_stream_delta without the printing
+    return data.get("content")
+
+
+def reduce_with_accumulator(chunks, get_accumulated_message=None):
+    accumulator = ChatCompletionStreamAccumulator()
+    for chunk in chunks:
+        for choice in accumulator.add_chunk(chunk):
+            if get_accumulated_message is not None:
+                index = choice.get("index")
+                delta_callback(
+                    choice.get("delta"),
+                    get_accumulated_message(accumulator, index),
+                    index,
+                )
+    outputs = []
+    for index, output_message, metadata in accumulator.get_choices():
+        metadata["raw_response"] = output_message
+        metadata["role"] = output_message.get("role")
+        outputs.append(
+            ExecuteResult(
+                output_type="execute_result",
+                data=build_output_data(output_message),
+                execution_count=index,
+                metadata=metadata,
+            )
+        )
+    return outputs
+
+
+def time_reduction(reduce_fn, chunks):
+    start = time.perf_counter()
+    outputs = reduce_fn(chunks)
+    return time.perf_counter() - start, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-chunks", type=int, default=10_000)
+    parser.add_argument("--num-choices", type=int, default=1)
+    args = parser.parse_args()
+
+    chunks = make_stream(args.num_chunks, args.num_choices)
+    accumulator_s, accumulator_outputs = time_reduction(
+        reduce_with_accumulator, chunks
+    )
+    deepcopy_s, deepcopy_outputs = time_reduction(reduce_with_deepcopy, chunks)
+    assert [output.data for output in accumulator_outputs] == [
+        output.data for output in deepcopy_outputs
+    ]
+    snapshot_callback_s, _ = time_reduction(
+        lambda chunks: reduce_with_accumulator(
+            chunks, ChatCompletionStreamAccumulator.get_message
+        ),
+        chunks,
+    )
+    view_callback_s, _ = time_reduction(
+        lambda chunks: reduce_with_accumulator(
+            chunks, ChatCompletionStreamAccumulator.get_message_view
+        ),
+        chunks,
+    )
+
+    print(f"chunks: {args.num_chunks}, choices: {args.num_choices}")
+    print(f"deepcopy reducer:   {deepcopy_s:.3f}s")
+    print(f"stream accumulator: {accumulator_s:.3f}s")
+    print(f"speedup:            {deepcopy_s / accumulator_s:.1f}x")
+    print("with a delta-only stream callback:")
+    print(f"  snapshot per chunk: {snapshot_callback_s:.3f}s")
+    print(f"  lazy message view:  {view_callback_s:.3f}s")
+    print(
+        f"  speedup:            {snapshot_callback_s / view_callback_s:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
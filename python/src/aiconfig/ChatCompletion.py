@@ -13,7 +13,7 @@ import lastmile_utils.lib.core.api as core_utils
 import nest_asyncio
 import openai
 from aiconfig.Config import AIConfigRuntime
-from aiconfig.default_parsers.openai import multi_choice_message_reducer
+from aiconfig.util.stream_accumulator import ChatCompletionStreamAccumulator
 
 from aiconfig.schema import ExecuteResult, Output, Prompt
 
@@ -181,34 +181,25 @@ def create_and_save_to_config(
 
             # TODO: type
             def generate_streamed_response() -> Generator[Any, None, None]:
-                stream_outputs = {}
-                messages = {}
+                accumulator = ChatCompletionStreamAccumulator()
+                finish_reasons = {}
                 for chunk in response:
                     chunk_dict = chunk.model_dump(exclude_none=True)  # type: ignore [fixme]
 
                     # streaming only returns one chunk, one choice at a time. The order in which the choices are returned is not guaranteed.
-                    messages = multi_choice_message_reducer(
-                        messages, chunk_dict
-                    )
-
-                    for choice in chunk_dict["choices"]:
-                        index = choice.get("index")
-                        accumulated_message_for_choice = messages.get(
-                            index, {}
+                    for choice in accumulator.add_chunk(chunk_dict):
+                        finish_reasons[choice.get("index")] = choice.get(
+                            "finish_reason"
                         )
-                        output = ExecuteResult(
-                            output_type="execute_result",
-                            data=copy.deepcopy(accumulated_message_for_choice),
-                            execution_count=index,
-                            metadata={
-                                "finish_reason": choice.get("finish_reason")
-                            },
-                        )
-                        stream_outputs[index] = output
                     yield chunk
                 stream_outputs = [
-                    stream_outputs[i]
-                    for i in sorted(list(stream_outputs.keys()))
+                    ExecuteResult(
+                        output_type="execute_result",
+                        data=message,
+                        execution_count=index,
+                        metadata={"finish_reason": finish_reasons.get(index)},
+                    )
+                    for index, message, _ in accumulator.get_choices()
                 ]
 
                 # Add outputs to last prompt
@@ -1,9 +1,23 @@
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    IO,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+)
 
+import asyncio
 import json
 import os
+import time
 import requests
 import yaml
+from pydantic import PrivateAttr
 
 from .callback import CallbackEvent, CallbackManager
 from .default_parsers.anyscale_endpoint import (
@@ -22,8 +36,10 @@ from .registry import (
     ModelParserRegistry,
     update_model_parser_registry_with_config_runtime,
 )
-from .schema import AIConfig, JSONObject, Prompt
-from .util.config_utils import is_yaml_ext
+from .schema import AIConfig, JSONObject, Output, Prompt
+from .util.atomic_file import AtomicFileWriter, get_text_digest
+from .util.config_utils import is_yaml_ext, load_yaml_data
+from .util.scheduler import BatchResults, BatchStats
 
 gpt_models_main = [
     "gpt-3.5-turbo",
@@ -69,12 +85,36 @@ ModelParserRegistry.register_model_parser(PaLMChatParser())
 ModelParserRegistry.register_model_parser(PaLMTextParser())
 
 
+def _get_json_dump_options(compact: bool) -> Dict[str, Any]:
+    if compact:
+        return {"separators": (",", ":")}
+    return {"indent": 2}
+
+
+def _get_file_state(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Returns (mtime_ns, size) of a file, or None if it doesn't exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 class AIConfigRuntime(AIConfig):
     # A mapping of model names to their respective parsers
 
+    # Real path -> (sha256 of the content, mtime_ns, size) of the files this config was saved to,
+    # so saving unchanged content doesn't rewrite the file
+    _saved_files: Dict[str, Tuple[str, int, int]] = PrivateAttr(
+        default_factory=dict
+    )
+
     # TODO: Define a default constructor that will construct with default values. This seems a little complicated because of the way pydantic works. Pydantic creates its own constructors.
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    def model_post_init(self, __context):
+        # Post-init rather than a custom __init__, so that loading validates the config in a single pass
+        super().model_post_init(__context)
         self.file_path = None
         # AIConfigRuntime will always have a callback manager. Ae default one is be created when initialized.
         self.callback_manager = CallbackManager.create_default_manager()
@@ -111,52 +151,106 @@ class AIConfigRuntime(AIConfig):
         return config
 
     @classmethod
-    def load(cls, config_filepath: str) -> "AIConfigRuntime":
+    def load(
+        cls,
+        config_filepath: str,
+        include_outputs: bool = True,
+        lazy_outputs: bool = False,
+    ) -> "AIConfigRuntime":
         """
         Constructs AIConfigRuntime from a JSON or YAML file given its file path and returns it.
 
         Args:
             config_filepath (str): The file path to the configuration file.
+            include_outputs (bool, optional): Loads the prompts' outputs if True. Otherwise prompts are loaded without outputs. Defaults to True.
+            lazy_outputs (bool, optional): Defers validating each prompt's outputs until they're first accessed
+                (e.g. by get_latest_output or get_output_text). The unvalidated outputs are still kept in memory:
+                to load prompts only, set include_outputs to False. Defaults to False.
         """
 
-        with open(config_filepath) as file:
+        # Files are read as bytes and validated without re-encoding: YAML is parsed to Python objects
+        # and validated as is, JSON is parsed and validated in one pass by pydantic
+        with open(config_filepath, "rb") as file:
             if is_yaml_ext(config_filepath):
-                yaml_data = yaml.safe_load(file)
-                data = json.dumps(yaml_data)
+                config_runtime = cls._load_data(
+                    load_yaml_data(file), include_outputs, lazy_outputs
+                )
             else:
-                data = file.read()
+                config_runtime = cls.load_json(
+                    file.read(), include_outputs, lazy_outputs
+                )
 
-        config_runtime = cls.load_json(data)
         # set the file path. This is used when saving the config
         config_runtime.file_path = config_filepath
         return config_runtime
 
     @classmethod
-    def load_json(cls, config_json: str) -> "AIConfigRuntime":
+    def load_json(
+        cls,
+        config_json: str | bytes,
+        include_outputs: bool = True,
+        lazy_outputs: bool = False,
+    ) -> "AIConfigRuntime":
         """
         Constructs AIConfigRuntime from provided JSON and returns it.
 
         Args:
-            config_json (str): The JSON representing the AIConfig.
+            config_json (str | bytes): The JSON representing the AIConfig.
+            include_outputs (bool, optional): See `load`. Defaults to True.
+            lazy_outputs (bool, optional): See `load`. Defaults to False.
         """
 
-        config_runtime = cls.model_validate_json(config_json)
+        config_runtime = cls.model_validate_json(
+            config_json,
+            context={
+                "include_outputs": include_outputs,
+                "lazy_outputs": lazy_outputs,
+            },
+        )
         update_model_parser_registry_with_config_runtime(config_runtime)
 
         return config_runtime
 
     @classmethod
-    def load_yaml(cls, config_yaml: str) -> "AIConfigRuntime":
+    def load_yaml(
+        cls,
+        config_yaml: str | bytes,
+        include_outputs: bool = True,
+        lazy_outputs: bool = False,
+    ) -> "AIConfigRuntime":
         """
         Constructs AIConfigRuntime from provided YAML and returns it.
 
         Args:
-            config_yaml (str): The YAML representing the AIConfig.
+            config_yaml (str | bytes): The YAML representing the AIConfig.
+            include_outputs (bool, optional): See `load`. Defaults to True.
+            lazy_outputs (bool, optional): See `load`. Defaults to False.
+        """
+
+        return cls._load_data(
+            load_yaml_data(config_yaml), include_outputs, lazy_outputs
+        )
+
+    @classmethod
+    def _load_data(
+        cls,
+        config_data: Dict[str, Any],
+        include_outputs: bool = True,
+        lazy_outputs: bool = False,
+    ) -> "AIConfigRuntime":
         """
+        Constructs AIConfigRuntime from an already parsed config (e.g. from YAML) and returns it.
+        """
+        config_runtime = cls.model_validate(
+            config_data,
+            context={
+                "include_outputs": include_outputs,
+                "lazy_outputs": lazy_outputs,
+            },
+        )
+        update_model_parser_registry_with_config_runtime(config_runtime)
 
-        yaml_data = yaml.safe_load(config_yaml)
-        config_json = json.dumps(yaml_data)
-        return cls.load_json(config_json)
+        return config_runtime
 
     @classmethod
     def load_from_workbook(cls, workbook_id: str) -> "AIConfigRuntime":
@@ -195,6 +289,44 @@ class AIConfigRuntime(AIConfig):
             update_model_parser_registry_with_config_runtime(aiconfigruntime)
             return aiconfigruntime
 
+    def copy_for_run(self) -> "AIConfigRuntime":
+        """
+        Returns a lightweight, copy-on-write view of this AIConfigRuntime to run prompts against.
+
+        Prompts are shallow-copied so that any outputs written by a run (or deleted before it)
+        only affect the copy. Prompt inputs, prompt metadata and existing outputs are shared with
+        this AIConfigRuntime and must be treated as read-only. Config-level parameters are copied
+        so the copy can override them without touching the original.
+
+        This is much cheaper than `copy.deepcopy()`, since memory per copy is proportional to what
+        the run writes rather than to the size of the config (e.g. large base64 outputs).
+        """
+        run_copy = self.model_copy()
+        run_copy.metadata = self.metadata.model_copy(
+            update={"parameters": dict(self.metadata.parameters or {})}
+        )
+        run_copy.prompts = [
+            (
+                # Deferred outputs stay deferred (and unvalidated) in the copy
+                prompt.model_copy()
+                if prompt.has_deferred_outputs()
+                else prompt.model_copy(
+                    update={
+                        "outputs": (
+                            list(prompt.outputs)
+                            if prompt.outputs is not None
+                            else None
+                        )
+                    }
+                )
+            )
+            for prompt in self.prompts
+        ]
+        run_copy.prompt_index = {
+            prompt.name: prompt for prompt in run_copy.prompts
+        }
+        return run_copy
+
     async def serialize(
         self,
         model_name: str,
@@ -213,17 +345,18 @@ class AIConfigRuntime(AIConfig):
         returns:
             Prompt | List[Prompt]: A prompt or list of prompts representing the input data
         """
-        event = CallbackEvent(
-            "on_serialize_start",
-            __name__,
-            {
-                model_name: model_name,
-                "data": data,
-                "prompt_name": prompt_name,
-                "params": params,
-            },
-        )
-        await self.callback_manager.run_callbacks(event)
+        if self.callback_manager.has_listeners("on_serialize_start"):
+            event = CallbackEvent(
+                "on_serialize_start",
+                __name__,
+                {
+                    model_name: model_name,
+                    "data": data,
+                    "prompt_name": prompt_name,
+                    "params": params,
+                },
+            )
+            await self.callback_manager.run_callbacks(event)
 
         if not params:
             params = {}
@@ -236,10 +369,11 @@ class AIConfigRuntime(AIConfig):
 
         prompts = await model_parser.serialize(prompt_name, data, self, params)
 
-        event = CallbackEvent(
-            "on_serialize_complete", __name__, {"result": prompts}
-        )
-        await self.callback_manager.run_callbacks(event)
+        if self.callback_manager.has_listeners("on_serialize_complete"):
+            event = CallbackEvent(
+                "on_serialize_complete", __name__, {"result": prompts}
+            )
+            await self.callback_manager.run_callbacks(event)
         return prompts
 
     async def resolve(
@@ -258,12 +392,13 @@ class AIConfigRuntime(AIConfig):
         Returns:
             str: The resolved prompt.
         """
-        event = CallbackEvent(
-            "on_resolve_start",
-            __file__,
-            {"prompt_name": prompt_name, "params": params},
-        )
-        await self.callback_manager.run_callbacks(event)
+        if self.callback_manager.has_listeners("on_resolve_start"):
+            event = CallbackEvent(
+                "on_resolve_start",
+                __file__,
+                {"prompt_name": prompt_name, "params": params},
+            )
+            await self.callback_manager.run_callbacks(event)
 
         if not params:
             params = {}
@@ -279,10 +414,11 @@ class AIConfigRuntime(AIConfig):
 
         response = await model_provider.deserialize(prompt_data, self, params)
 
-        event = CallbackEvent(
-            "on_resolve_complete", __name__, {"result": response}
-        )
-        await self.callback_manager.run_callbacks(event)
+        if self.callback_manager.has_listeners("on_resolve_complete"):
+            event = CallbackEvent(
+                "on_resolve_complete", __name__, {"result": response}
+            )
+            await self.callback_manager.run_callbacks(event)
         return response
 
     async def run(
@@ -302,17 +438,18 @@ class AIConfigRuntime(AIConfig):
         Returns:
             object: The response object returned by the AI-model's API.
         """
-        event = CallbackEvent(
-            "on_run_start",
-            __name__,
-            {
-                "prompt_name": prompt_name,
-                "params": params,
-                "options": options,
-                "run_with_dependencies": run_with_dependencies,
-            },
-        )
-        await self.callback_manager.run_callbacks(event)
+        if self.callback_manager.has_listeners("on_run_start"):
+            event = CallbackEvent(
+                "on_run_start",
+                __name__,
+                {
+                    "prompt_name": prompt_name,
+                    "params": params,
+                    "options": options,
+                    "run_with_dependencies": run_with_dependencies,
+                },
+            )
+            await self.callback_manager.run_callbacks(event)
 
         if not params:
             params = {}
@@ -333,10 +470,11 @@ class AIConfigRuntime(AIConfig):
             prompt_data, self, options, params, run_with_dependencies
         )
 
-        event = CallbackEvent(
-            "on_run_complete", __name__, {"result": response}
-        )
-        await self.callback_manager.run_callbacks(event)
+        if self.callback_manager.has_listeners("on_run_complete"):
+            event = CallbackEvent(
+                "on_run_complete", __name__, {"result": response}
+            )
+            await self.callback_manager.run_callbacks(event)
         return response
 
     async def run_batch(
@@ -345,11 +483,17 @@ class AIConfigRuntime(AIConfig):
         parameters_list: list[dict[str, Any]],
         options: Optional[InferenceOptions] = None,
         **kwargs,
-    ) -> list[Tuple["ExecuteResult", JSONObject | Any, Dict[str, Any]]]:
+    ) -> BatchResults[
+        Tuple["ExecuteResult", JSONObject | Any, Dict[str, Any]]
+    ]:
         """
         Executes a specified Prompt in batch mode using provided parameters. This method returns a list of tuples.
         Each tuple consists of the inference result, the corresponding resolved completion parameters, and the parameters dict used.
-        The resolved completion parameters are derived by calling the resolve() method on the resultant AIConfigRuntimes.
+        The resolved completion parameters are the ones each run was resolved to (the output of the model parser's deserialize()).
+        Throughput stats for the batch (see `BatchStats`) are available on the returned list as `.stats`.
+
+        Concurrency, rate limits and retries can be configured through `options`
+        (max_concurrency, requests_per_second, tokens_per_minute, max_retries).
 
 
         Args:
@@ -363,21 +507,23 @@ class AIConfigRuntime(AIConfig):
             IndexError: If the identifier for the prompt doesn't exist in the list of available prompts.
             IndexError: If the model name doesn't exist in the list of available model parsers.
         Returns:
-            list[Tuple["ExecuteResult", JSONObject | Any, Dict[str, Any]]]: A list of tuples, each tuple consisting of the inference result, the corresponding resolved completion parameters, and the parameters dict used.
+            BatchResults[Tuple["ExecuteResult", JSONObject | Any, Dict[str, Any]]]: A list of tuples, each tuple consisting of the inference result, the corresponding resolved completion parameters, and the parameters dict used.
 
         Example:
-            >>> aiconfig.run_batch("some_prompt", [{"param1": 1, "param2": 2}, {"param1": 3, "param2": 4}])
-        """
-        event = CallbackEvent(
-            "on_run_batch_start",
-            __name__,
-            {
-                "prompt_name": prompt_name,
-                "params_list": parameters_list,
-                "kwargs": kwargs,
-            },
-        )
-        await self.callback_manager.run_callbacks(event)
+            >>> results = await aiconfig.run_batch("some_prompt", [{"param1": 1, "param2": 2}, {"param1": 3, "param2": 4}], InferenceOptions(stream=False, max_concurrency=8, max_retries=3))
+            >>> results.stats.throughput_rps
+        """
+        if self.callback_manager.has_listeners("on_run_batch_start"):
+            event = CallbackEvent(
+                "on_run_batch_start",
+                __name__,
+                {
+                    "prompt_name": prompt_name,
+                    "params_list": parameters_list,
+                    "kwargs": kwargs,
+                },
+            )
+            await self.callback_manager.run_callbacks(event)
 
         # Check if the provided prompt name is available in the list of prompts
         if prompt_name not in self.prompt_index:
@@ -393,6 +539,7 @@ class AIConfigRuntime(AIConfig):
         # Clear previous run outputs if they exist
         self.delete_output(prompt_name)
 
+        batch_start_time = time.perf_counter()
         # Run the batch and store results
         batch_results_aiconfigruntimes = await model_provider.run_batch(
             prompt_data,
@@ -406,13 +553,25 @@ class AIConfigRuntime(AIConfig):
         batch_results_formatted = []
         # TODO: Refactor this implementation or model parser's run_batch() for improved maintainability and clarity.
         # Currently, it returns a list of AIConfigRuntimes, with outputs corresponding to the params in parameters_list. If it gets overriden, order is not guaranteed.
+        # Reuse the completion params the runs were resolved to. Model parsers that override run_batch
+        # may not report them, resolve those concurrently instead.
+        completion_params_list = getattr(
+            batch_results_aiconfigruntimes, "completion_params", None
+        )
+        if completion_params_list is None:
+            completion_params_list = await asyncio.gather(
+                *[
+                    aiconfig.resolve(prompt_name, parameters_dict_used)
+                    for aiconfig, parameters_dict_used in zip(
+                        batch_results_aiconfigruntimes, parameters_list
+                    )
+                ]
+            )
         for i, aiconfig in enumerate(batch_results_aiconfigruntimes):
             parameters_dict_used = parameters_list[i]
 
             aiconfig_execute_results = aiconfig.get_prompt(prompt_name).outputs
-            prompt_data_resolved = await aiconfig.resolve(
-                prompt_name, parameters_dict_used
-            )
+            prompt_data_resolved = completion_params_list[i]
 
             batch_results_formatted.append(
                 tuple(
@@ -424,15 +583,110 @@ class AIConfigRuntime(AIConfig):
                 )
             )
 
-        event = CallbackEvent(
-            "on_run_batch_complete",
-            __name__,
-            {"result": batch_results_formatted},
+        # Model parsers that override run_batch may not report stats, fall back to the overall wall-clock time
+        batch_stats = getattr(batch_results_aiconfigruntimes, "stats", None)
+        if batch_stats is None:
+            wall_time_s = time.perf_counter() - batch_start_time
+            batch_stats = BatchStats(
+                total_requests=len(parameters_list),
+                succeeded=len(batch_results_formatted),
+                failed=0,
+                retries=0,
+                wall_time_s=wall_time_s,
+                throughput_rps=(
+                    len(batch_results_formatted) / wall_time_s
+                    if wall_time_s > 0
+                    else 0.0
+                ),
+                mean_latency_s=0.0,
+                max_latency_s=0.0,
+                peak_in_flight=0,
+                estimated_tokens=0,
+            )
+        batch_results_formatted = BatchResults(
+            batch_results_formatted, stats=batch_stats
         )
 
-        await self.callback_manager.run_callbacks(event)
+        if self.callback_manager.has_listeners("on_run_batch_complete"):
+            event = CallbackEvent(
+                "on_run_batch_complete",
+                __name__,
+                {"result": batch_results_formatted, "stats": batch_stats},
+            )
+            await self.callback_manager.run_callbacks(event)
         return batch_results_formatted
 
+    async def run_batch_iter(
+        self,
+        prompt_name: str,
+        parameters: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+        options: Optional[InferenceOptions] = None,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[List[Output], JSONObject | Any, Dict[str, Any]]]:
+        """
+        Streaming variant of run_batch. Yields a tuple of (outputs, resolved completion params, parameters dict used)
+        as soon as each item completes, so downstream work can start before the whole batch finishes.
+
+        Results are yielded in completion order, not input order; use the parameters dict to match them up.
+        `parameters` can be an async iterable, in which case parameter sets are pulled lazily and the full list is never
+        materialized. The resolved completion params are the ones that were sent to the model, resolve() is not called again.
+
+        Args:
+            prompt_name (str): Identifier of the Prompt to be used. The identifier must be valid & present in available prompts.
+            parameters (Iterable[dict] | AsyncIterable[dict]): The parameter sets to run the prompt with.
+            options (Optional[InferenceOptions]): Optional parameters for tuning the inference execution, see run_batch.
+            kwargs (Any): Other optional parameters.
+
+        Raises:
+            IndexError: If the identifier for the prompt doesn't exist in the list of available prompts.
+
+        Example:
+            >>> async for outputs, resolved_params, params in aiconfig.run_batch_iter("some_prompt", read_params_from_db()):
+            ...     write_result(params, aiconfig.get_output_text("some_prompt", outputs[0]))
+        """
+        if self.callback_manager.has_listeners("on_run_batch_iter_start"):
+            event = CallbackEvent(
+                "on_run_batch_iter_start",
+                __name__,
+                {"prompt_name": prompt_name, "kwargs": kwargs},
+            )
+            await self.callback_manager.run_callbacks(event)
+
+        if prompt_name not in self.prompt_index:
+            raise IndexError(
+                f"Prompt '{prompt_name}' not found in config, available prompts are:\n {list(self.prompt_index.keys())}"
+            )
+
+        prompt_data = self.prompt_index[prompt_name]
+        model_name = self.get_model_name(prompt_data)
+        model_provider = AIConfigRuntime.get_model_parser(model_name)
+
+        # Clear previous run outputs if they exist
+        self.delete_output(prompt_name)
+
+        num_results = 0
+        async for (
+            aiconfig,
+            prompt_data_resolved,
+            parameters_dict_used,
+        ) in model_provider.run_batch_iter(
+            prompt_data, self, parameters, options, **kwargs
+        ):
+            num_results += 1
+            yield (
+                aiconfig.get_prompt(prompt_name).outputs,
+                prompt_data_resolved,
+                parameters_dict_used,
+            )
+
+        if self.callback_manager.has_listeners("on_run_batch_iter_complete"):
+            event = CallbackEvent(
+                "on_run_batch_iter_complete",
+                __name__,
+                {"num_results": num_results},
+            )
+            await self.callback_manager.run_callbacks(event)
+
     async def run_and_get_output_text(
         self,
         prompt_name: str,
@@ -450,13 +704,25 @@ class AIConfigRuntime(AIConfig):
         config_filepath: str | None = None,
         include_outputs: bool = True,
         mode: Literal["json", "yaml"] | None = None,
-    ):
+        compact: bool = False,
+    ) -> bool:
         """
         Save the AI Configuration to a file.
 
+        The config is serialized straight to a temporary file, which atomically replaces the
+        config file, so an interrupted save never leaves a truncated config behind.
+        If the content is the same as the last time this config was saved to the file,
+        and the file hasn't changed since, the file is left untouched.
+
         Args:
             config_filepath (str, optional): The file path to the JSON or YAML configuration file.
                 Defaults to "aiconfig.json" or "aiconfig.yaml", depending on the mode.
+            include_outputs (bool, optional): Whether to save the prompt outputs. Defaults to True.
+            mode (str, optional): "json" or "yaml". Defaults to the mode matching the file extension.
+            compact (bool, optional): Save JSON without indentation or whitespace. Defaults to False.
+
+        Returns:
+            bool: Whether the file was written.
         """
 
         default_filepath = (
@@ -473,21 +739,61 @@ class AIConfigRuntime(AIConfig):
                 # Default to JSON
                 mode = "json"
 
-        config_string = self.to_string(include_outputs, mode)
+        json_data = self._to_json_data(include_outputs)
 
-        with open(config_filepath, "w") as file:
-            file.write(config_string)
+        def _dump(file: IO[str]) -> None:
+            if mode == "yaml":
+                yaml.dump(json_data, file, indent=2)
+            else:
+                json.dump(json_data, file, **_get_json_dump_options(compact))
+
+        # If the file is as this config last saved it, hash the content first, and skip
+        # the write entirely if it's unchanged
+        path = os.path.realpath(config_filepath)
+        saved_file = self._saved_files.get(path)
+        if (
+            saved_file is not None
+            and saved_file[1:] == _get_file_state(path)
+            and saved_file[0] == get_text_digest(_dump)
+        ):
+            return False
+
+        with AtomicFileWriter(path) as file:
+            _dump(file)
+            digest = file.hexdigest
+
+        file_state = _get_file_state(path)
+        if file_state is not None:
+            self._saved_files[path] = (digest, *file_state)
+        return True
 
     def to_string(
         self,
         include_outputs: bool = True,
         mode: Literal["json", "yaml"] = "json",
+        compact: bool = False,
     ) -> str:
         """
         Returns the well-formatted string representing the AIConfig object.
         Note that this method will return the string that would be saved as a .aiconfig file using the save() method.
         To get the raw string representation of the AIConfig object, use the __str__() method.
         """
+        json_data = self._to_json_data(include_outputs)
+
+        if mode == "yaml":
+            # Save AIConfig JSON as YAML string
+            return yaml.dump(
+                json_data,
+                indent=2,
+            )
+        else:
+            # Save AIConfig as JSON string, with the schema specified
+            return json.dumps(json_data, **_get_json_dump_options(compact))
+
+    def _to_json_data(self, include_outputs: bool = True) -> Dict[str, Any]:
+        """
+        Returns the JSON-compatible data that is saved as a .aiconfig file.
+        """
         # AIConfig json should only contain the core data fields. These are auxiliary fields that should not be persisted
         exclude_options = {
             "prompt_index": True,
@@ -509,18 +815,7 @@ class AIConfigRuntime(AIConfig):
             # Set the schema if it is not set
             json_data["$schema"] = "https://json.schemastore.org/aiconfig-1.0"
 
-        if mode == "yaml":
-            # Save AIConfig JSON as YAML string
-            return yaml.dump(
-                json_data,
-                indent=2,
-            )
-        else:
-            # Save AIConfig as JSON string, with the schema specified
-            return json.dumps(
-                json_data,
-                indent=2,
-            )
+        return json_data
 
     def get_output_text(
         self, prompt: str | Prompt, output: Optional[dict] = None
@@ -42,3 +42,10 @@ from .schema import (
 )
 from .util.config_utils import get_api_key_from_environment
 from .util.params import resolve_prompt
+from .util.scheduler import BatchResults, BatchStats, InferenceScheduler
+from .util.inference_cache import (
+    InferenceCache,
+    InMemoryInferenceCache,
+    SQLiteInferenceCache,
+)
+from .util.openai_client_pool import configure_openai_connection_pool
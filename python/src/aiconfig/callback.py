@@ -1,14 +1,18 @@
 # Standard Libraries
 import asyncio
+import inspect
 import logging
+import os
 import time
 from typing import (
     Any,
     Awaitable,
     Callable,
     Coroutine,
+    Dict,
     Final,
     List,
+    Optional,
     Sequence,
     TypeAlias,
     Union,
@@ -21,6 +25,9 @@ from result import Err, Ok
 
 # Constants
 DEFAULT_TIMEOUT = 5  # Default timeout for callback execution in seconds
+DEFAULT_MAX_QUEUE_SIZE = (
+    1024  # Default number of events buffered in background dispatch mode
+)
 
 
 class CallbackEvent:
@@ -29,7 +36,7 @@ class CallbackEvent:
     """
 
     def __init__(
-        self, name: str, file: str, data: Any, ts_ns: int = time.time_ns()
+        self, name: str, file: str, data: Any, ts_ns: Optional[int] = None
     ):
         self.name = name
         # The name of the file that triggered the event.
@@ -37,10 +44,11 @@ class CallbackEvent:
         # Anything available at the time the event happens.
         # It is passed to the callback.
         self.data = data
-        self.ts_ns = ts_ns
+        self.ts_ns = ts_ns if ts_ns is not None else time.time_ns()
 
 
 # Type Aliases
+# Callbacks can be coroutine functions or plain functions.
 Callback = Callable[[CallbackEvent], Awaitable[Any]]
 Result: TypeAlias = Union[Ok[Any], Err[Any]]
 
@@ -85,27 +93,140 @@ class CallbackEventModel(Record):
 class CallbackManager:
     """
     Manages a sequence of callbacks to be executed in response to Events
+
+    Callbacks passed to the constructor receive every event. Callbacks can also subscribe to
+    specific event names with `subscribe`. Every callback counts as a listener, including the default
+    file logger (see `create_default_manager`), so events nobody listens to are the ones a manager
+    without callbacks or subscriptions would drop. Callers check `has_listeners` before building
+    event data, so `CallbackManager([])` skips building events entirely.
+
+    By default, run_callbacks waits for the callbacks to complete. With `background=True`, events are
+    put on a bounded queue and dispatched by a background task instead, so callbacks never slow down
+    inference. When the queue is full, new events are dropped and counted in `num_dropped_events`.
     """
 
     def __init__(
-        self, callbacks: Sequence[Callback], timeout: int = None
+        self,
+        callbacks: Sequence[Callback],
+        timeout: int = None,
+        background: bool = False,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
     ) -> None:
         if timeout is None:
             timeout = DEFAULT_TIMEOUT
         self.callbacks: Final[Sequence[Callback]] = callbacks
         self.results: List[Result] = []
         self.timeout = timeout
+        # event name -> callbacks subscribed to that event only
+        self.subscriptions: Dict[str, List[Callback]] = {}
+
+        self.background = background
+        self.max_queue_size = max_queue_size
+        self.num_dropped_events = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def subscribe(self, event_name: str, callback: Callback) -> None:
+        """
+        Registers a callback that only runs for events with the given name.
+        """
+        self.subscriptions.setdefault(event_name, []).append(callback)
+
+    def unsubscribe(self, event_name: str, callback: Callback) -> None:
+        """
+        Removes a callback registered with `subscribe`.
+        """
+        callbacks = self.subscriptions.get(event_name, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self.subscriptions.pop(event_name, None)
+
+    def has_listeners(self, event_name: str) -> bool:
+        """
+        Returns True if any callback would run for an event with the given name.
+        """
+        return bool(self.callbacks) or event_name in self.subscriptions
+
+    def _get_listeners(self, event_name: str) -> List[Callback]:
+        subscribed_callbacks = self.subscriptions.get(event_name)
+        if not subscribed_callbacks:
+            return list(self.callbacks)
+        return [*self.callbacks, *subscribed_callbacks]
 
     async def run_callbacks(self, event: CallbackEvent) -> None:
-        event = CallbackEventModel(**event.__dict__)
-        tasks = []
-        for callback in self.callbacks:
-            task = execute_coroutine_with_timeout(
-                callback(event), self.timeout
+        if not self.callbacks and event.name not in self.subscriptions:
+            return
+
+        if self.background:
+            self._enqueue(event)
+        else:
+            await self._dispatch(event)
+
+    async def _dispatch(self, event: CallbackEvent) -> None:
+        callbacks = self._get_listeners(event.name)
+        # The event fields were already typed by CallbackEvent, so skip pydantic validation
+        event = CallbackEventModel.model_construct(**event.__dict__)
+        if len(callbacks) == 1:
+            self.results = [await self._execute_callback(callbacks[0], event)]
+        else:
+            self.results = await asyncio.gather(
+                *(
+                    self._execute_callback(callback, event)
+                    for callback in callbacks
+                )
             )
-            tasks.append(task)
 
-        self.results = await asyncio.gather(*tasks)
+    async def _execute_callback(
+        self, callback: Callback, event: "CallbackEventModel"
+    ) -> Result:
+        try:
+            result = callback(event)
+        except Exception as e:
+            return Err(str(e))
+        # Plain functions complete synchronously, only coroutines need the timeout
+        if inspect.isawaitable(result):
+            return await execute_coroutine_with_timeout(result, self.timeout)
+        return Ok(result)
+
+    def _enqueue(self, event: CallbackEvent) -> None:
+        loop = asyncio.get_running_loop()
+        # Queues and tasks are bound to an event loop, recreate them if the loop changed (e.g. across asyncio.run calls)
+        if self._worker is None or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = loop.create_task(self._process_queue())
+
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.num_dropped_events += 1
+
+    async def _process_queue(self) -> None:
+        queue = self._queue
+        while True:
+            event = await queue.get()
+            try:
+                await self._dispatch(event)
+            finally:
+                queue.task_done()
+
+    async def flush(self) -> None:
+        """
+        Waits until every event queued in background dispatch mode has been processed.
+        """
+        if self._queue is not None and self._worker is not None:
+            if self._worker.get_loop() is asyncio.get_running_loop():
+                await self._queue.join()
+
+    async def close(self) -> None:
+        """
+        Processes the remaining queued events, then stops the background dispatch task.
+        """
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+            self._queue = None
 
     @classmethod
     def create_default_manager(cls) -> "CallbackManager":
@@ -129,14 +250,22 @@ def create_logging_callback(log_file: str = None) -> Callback:
         name = "my-logger"
         log_file = "aiconfig.log"
 
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+
+        # Every AIConfigRuntime creates a default callback manager, don't attach the same file handler again
+        if any(
+            isinstance(handler, logging.FileHandler)
+            and handler.baseFilename == os.path.abspath(log_file)
+            for handler in logger.handlers
+        ):
+            return logger
+
         formatter = logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
         handler = logging.FileHandler(log_file)
         handler.setFormatter(formatter)
-
-        logger = logging.getLogger(name)
-        logger.setLevel(level)
         logger.addHandler(handler)
         return logger
 
@@ -4,7 +4,8 @@ from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 from aiconfig.callback import CallbackEvent
 from aiconfig.model_parser import InferenceOptions
-from openai import OpenAI
+from aiconfig.util.openai_client_pool import get_shared_async_openai_client
+from aiconfig.util.stream_accumulator import ChatCompletionStreamAccumulator
 from openai.types.chat import ChatCompletionMessage
 
 from aiconfig.schema import (
@@ -42,18 +43,32 @@ class AnyscaleEndpoint(OpenAIInference):
         Returns:
             ExecuteResult: The response from the model.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_start",
-                __name__,
-                {
-                    "prompt": prompt,
-                    "options": options,
-                    "parameters": parameters,
-                },
-            )
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        return await self.run_inference_with_completion_params(
+            prompt, aiconfig, completion_data, options, parameters
         )
 
+    async def run_inference_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        completion_params: Dict,
+        options: InferenceOptions,
+        parameters: Optional[Dict],
+    ) -> List[Output]:
+        if aiconfig.callback_manager.has_listeners("on_run_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_start",
+                    __name__,
+                    {
+                        "prompt": prompt,
+                        "options": options,
+                        "parameters": parameters,
+                    },
+                )
+            )
+
         anyscale_api_key_name = "ANYSCALE_ENDPOINT_API_KEY"
         openai_api_key_name = "OPENAI_API_KEY"
 
@@ -67,11 +82,11 @@ class AnyscaleEndpoint(OpenAIInference):
         else:
             api_key = os.environ[anyscale_api_key_name]
 
-        client = OpenAI(
+        client = get_shared_async_openai_client(
             api_key=api_key, base_url="https://api.endpoints.anyscale.com/v1"
         )
 
-        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        completion_data = completion_params
         # if stream enabled in runtime options and config, then stream. Otherwise don't stream.
         # const stream = options?.stream ?? completionParams.stream ?? true;
         stream = True  # Default value
@@ -83,7 +98,7 @@ class AnyscaleEndpoint(OpenAIInference):
 
         completion_data["stream"] = stream
 
-        response = client.chat.completions.create(**completion_data)
+        response = await client.chat.completions.create(**completion_data)
         outputs = []
         if not stream:
             # # OpenAI>1.0.0 uses pydantic models for response
@@ -119,60 +134,46 @@ class AnyscaleEndpoint(OpenAIInference):
 
                 outputs.append(output)
         else:
-            outputs = {}
-            messages = {}
-            for chunk in response:
+            accumulator = ChatCompletionStreamAccumulator()
+            async for chunk in response:
                 # OpenAI>1.0.0 uses pydantic models. Chunk is of type ChatCompletionChunk; type is not directly importable from openai Library, will require some diffing
                 chunk = chunk.model_dump(exclude_none=True)
-                chunk_without_choices = {
-                    key: copy.deepcopy(value)
-                    for key, value in chunk.items()
-                    if key != "choices"
-                }
-                # streaming only returns one chunk, one choice at a time (before 1.0.0). The order in which the choices are returned is not guaranteed.
-                messages = multi_choice_message_reducer(messages, chunk)
-
-                for i, choice in enumerate(chunk["choices"]):
-                    index = choice.get("index")
-                    accumulated_message_for_choice = messages.get(index, "")
-                    delta = choice.get("delta")
-
+                # Only the deltas are accumulated per chunk; outputs are built once the stream is complete
+                for choice in accumulator.add_chunk(chunk):
                     if options and options.stream_callback:
+                        index = choice.get("index")
                         options.stream_callback(
-                            delta, accumulated_message_for_choice, index
+                            choice.get("delta"),
+                            accumulator.get_message_view(index),
+                            index,
                         )
 
-                    output = ExecuteResult(
+            # Now that we have the complete outputs, we can parse it into our object model properly
+            for index, output_message, metadata in accumulator.get_choices():
+                metadata["raw_response"] = output_message
+                if output_message.get("role", None) is not None:
+                    metadata["role"] = output_message.get("role")
+
+                outputs.append(
+                    ExecuteResult(
                         **{
                             "output_type": "execute_result",
-                            "data": accumulated_message_for_choice,
+                            "data": build_output_data(output_message),
                             "execution_count": index,
-                            "metadata": chunk_without_choices,
+                            "metadata": metadata,
                         }
                     )
-                    outputs[index] = output
-            outputs = [outputs[i] for i in sorted(list(outputs.keys()))]
-
-            # Now that we have the complete outputs, we can parse it into our object model properly
-            for output in outputs:
-                output_message = output.data
-                output_data = build_output_data(output.data)
-
-                metadata = {"raw_response": output_message}
-                if output_message.get("role", None) is not None:
-                    metadata["role"] = output_message.get("role")
-
-                output.data = output_data
-                output.metadata = {**output.metadata, **metadata}
+                )
 
         # rewrite or extend list of outputs?
         prompt.outputs = outputs
 
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_complete", __name__, {"result": prompt.outputs}
+        if aiconfig.callback_manager.has_listeners("on_run_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_complete", __name__, {"result": prompt.outputs}
+                )
             )
-        )
         return prompt.outputs
 
 
@@ -239,41 +240,6 @@ class Mixtral_8x7B(DefaultAnyscaleEndpointParser):
         super().__init__(model_id)
 
 
-def reduce(acc, delta):
-    acc = copy.deepcopy(acc)
-
-    for key, value in delta.items():
-        if key not in acc:
-            # If the key doesn't exist in 'acc', add it with the 'value'
-            acc[key] = value
-        elif isinstance(acc[key], str) and isinstance(value, str):
-            # If both 'acc[key]' and 'value' are strings, concatenate them
-            acc[key] += value
-        elif isinstance(acc[key], dict) and not isinstance(acc[key], list):
-            # If 'acc[key]' is a dictionary (not a list), recursively merge it with 'value'
-            acc[key] = reduce(acc[key], value)
-
-    return acc
-
-
-def multi_choice_message_reducer(
-    messages: Union[Dict[int, dict], None], chunk: dict
-) -> Dict[int, dict]:
-    if messages is None:
-        messages = {}
-
-    # elif len(messages) != len(chunk["choices"]):
-    #     raise ValueError("Invalid number of previous choices -- it should match the incoming number of choices")
-
-    for choice in chunk["choices"]:
-        index = choice["index"]
-        previous_message = messages.get(index, {})
-        updated_message = reduce(previous_message, choice["delta"])
-        messages[index] = updated_message
-
-    return messages
-
-
 def build_output_data(
     message: Union[ChatCompletionMessage, None],
 ) -> Union[OutputDataWithValue, str, None]:
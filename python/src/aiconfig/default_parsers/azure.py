@@ -1,7 +1,7 @@
 from aiconfig.default_parsers.openai import DefaultOpenAIParser
-from aiconfig.util.config_utils import get_api_key_from_environment
+from aiconfig.util.openai_client_pool import get_shared_async_openai_client
 
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI
 
 
 class AzureOpenAIParser(DefaultOpenAIParser):
@@ -21,8 +21,11 @@ class AzureOpenAIParser(DefaultOpenAIParser):
         openai_deserialized_params["model"] = self.deployment
         return openai_deserialized_params
 
-    def initialize_openai_client(self) -> None:
-        ## The Azure Client itself will check and retrieve environment variables as necessary
+    def get_openai_client(self):
+        if self.client is None:
+            self.initialize_openai_client()
+        if self.client is not None:
+            return self.client
 
-        # Initialize Azure Client
-        self.client = AzureOpenAI()
+        ## The Azure Client itself will check and retrieve environment variables as necessary
+        return get_shared_async_openai_client(AsyncAzureOpenAI)
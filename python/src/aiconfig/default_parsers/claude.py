@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import json
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
@@ -9,7 +10,12 @@ from aiconfig.default_parsers.parameterized_model_parser import (
 from aiconfig.model_parser import InferenceOptions
 from aiconfig.schema import ExecuteResult, Output, Prompt, PromptMetadata
 from aiconfig.util.params import resolve_prompt
-from anthropic_bedrock import AI_PROMPT, HUMAN_PROMPT, AnthropicBedrock, Stream
+from anthropic_bedrock import (
+    AI_PROMPT,
+    HUMAN_PROMPT,
+    AsyncAnthropicBedrock,
+    AsyncStream,
+)
 from anthropic_bedrock.types import Completion
 
 if TYPE_CHECKING:
@@ -28,6 +34,8 @@ class ClaudeBedrockModelParser(ParameterizedModelParser):
         super().__init__()
         # Client will be set in the run method. This is to avoid having to set the api key in the constructor
         self.client = None
+        # The async client's connections are bound to the event loop it was created on
+        self._client_loop = None
 
     def id(self) -> str:
         return "ClaudeBedrockModelParser"
@@ -50,18 +58,19 @@ class ClaudeBedrockModelParser(ParameterizedModelParser):
         Returns:
             str: Serialized representation of the prompt and inference settings.
         """
-        await ai_config.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_serialize_start",
-                __name__,
-                {
-                    "prompt_name": prompt_name,
-                    "data": data,
-                    "parameters": parameters,
-                    "kwargs": kwargs,
-                },
+        if ai_config.callback_manager.has_listeners("on_serialize_start"):
+            await ai_config.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_serialize_start",
+                    __name__,
+                    {
+                        "prompt_name": prompt_name,
+                        "data": data,
+                        "parameters": parameters,
+                        "kwargs": kwargs,
+                    },
+                )
             )
-        )
 
         # assume data is completion params for Claude Text Completion
         prompt_input = data["prompt"]
@@ -84,11 +93,12 @@ class ClaudeBedrockModelParser(ParameterizedModelParser):
 
         prompts.append(prompt)
 
-        await ai_config.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_serialize_complete", __name__, {"result": prompts}
+        if ai_config.callback_manager.has_listeners("on_serialize_complete"):
+            await ai_config.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_serialize_complete", __name__, {"result": prompts}
+                )
             )
-        )
 
         return prompts
 
@@ -108,13 +118,14 @@ class ClaudeBedrockModelParser(ParameterizedModelParser):
         Returns:
             dict: Model-specific completion parameters.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_start",
-                __name__,
-                {"prompt": prompt, "params": params},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_start",
+                    __name__,
+                    {"prompt": prompt, "params": params},
+                )
             )
-        )
         # Build Completion params
         model_settings = self.get_model_settings(prompt, aiconfig)
 
@@ -130,13 +141,14 @@ class ClaudeBedrockModelParser(ParameterizedModelParser):
             f"{HUMAN_PROMPT} {resolved_prompt}{AI_PROMPT}"
         )
 
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_complete",
-                __name__,
-                {"output": completion_data},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_complete",
+                    __name__,
+                    {"output": completion_data},
+                )
             )
-        )
 
         return completion_data
 
@@ -147,24 +159,40 @@ class ClaudeBedrockModelParser(ParameterizedModelParser):
         options: Optional[InferenceOptions] = None,
         parameters: Dict[Any, Any] = {},
     ) -> List[Output]:
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_start",
-                __name__,
-                {
-                    "prompt": prompt,
-                    "options": options,
-                    "parameters": parameters,
-                },
-            )
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        return await self.run_inference_with_completion_params(
+            prompt, aiconfig, completion_data, options, parameters
         )
 
-        if self.client is None:
+    async def run_inference_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        completion_params: Dict,
+        options: Optional[InferenceOptions] = None,
+        parameters: Dict[Any, Any] = {},
+    ) -> List[Output]:
+        if aiconfig.callback_manager.has_listeners("on_run_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_start",
+                    __name__,
+                    {
+                        "prompt": prompt,
+                        "options": options,
+                        "parameters": parameters,
+                    },
+                )
+            )
+
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._client_loop is not loop:
             # AWS credentials could either be in the environment or in ~/.aws/credentials
             # Let Anthropic's API handle AWS credentials validation which happens on Api call, not on client construct
-            self.client = AnthropicBedrock()
+            self.client = AsyncAnthropicBedrock()
+            self._client_loop = loop
 
-        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        completion_data = completion_params
 
         # if stream enabled in runtime options and config, then stream. Otherwise don't stream.
         stream = True  # Default value
@@ -175,22 +203,23 @@ class ClaudeBedrockModelParser(ParameterizedModelParser):
 
         completion_data["stream"] = stream
 
-        response = self.client.completions.create(**completion_data)  # type: ignore (pyright doesn't understand response object)
+        response = await self.client.completions.create(**completion_data)  # type: ignore (pyright doesn't understand response object)
 
         output = None
         if stream:
-            output = construct_stream_output(response, options)  # type: ignore
+            output = await construct_stream_output(response, options)  # type: ignore
         else:
             output = construct_output(response)  # type: ignore
 
         # rewrite or extend list of outputs?
         prompt.outputs = [output]
 
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_complete", __name__, {"result": prompt.outputs}
+        if aiconfig.callback_manager.has_listeners("on_run_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_complete", __name__, {"result": prompt.outputs}
+                )
             )
-        )
         return prompt.outputs
 
     def get_output_text(
@@ -261,8 +290,8 @@ def construct_output(response: Completion) -> Output:
     )
 
 
-def construct_stream_output(
-    response: Stream[Completion], options: Union[InferenceOptions, None]
+async def construct_stream_output(
+    response: AsyncStream[Completion], options: Union[InferenceOptions, None]
 ) -> Output:
     """
     Constructs the output for a stream response.
@@ -280,7 +309,7 @@ def construct_stream_output(
         {}
     )  # TODO: extract the completion stop reason from the response and add it to the metadata
 
-    for iteration in response:
+    async for iteration in response:
         new_text = iteration.completion
 
         accumulated_message += new_text
@@ -5,8 +5,13 @@ import openai
 from aiconfig.default_parsers.parameterized_model_parser import (
     ParameterizedModelParser,
 )
+from aiconfig.util.blob_store import (
+    make_binary_output_data,
+    resolve_blob_data,
+)
 from aiconfig.util.config_utils import get_api_key_from_environment
 from aiconfig.util.params import resolve_prompt
+from aiconfig.util.thread_pool import run_in_thread_pool
 from openai import OpenAI
 
 # Dall-E API imports
@@ -60,12 +65,15 @@ def refine_image_completion_params(model_settings, aiconfig, prompt):
     return completion_data
 
 
-def construct_output(image_data: Image, execution_count: int) -> Output:
+def construct_output(
+    image_data: Image,
+    execution_count: int,
+    aiconfig: Optional["AIConfigRuntime"] = None,
+) -> Output:
     data = None
     if image_data.b64_json is not None:
-        data = OutputDataWithStringValue(
-            kind="base64", value=str(image_data.b64_json)
-        )
+        # Stored in the config's blob store (if any) rather than inlined as base64
+        data = make_binary_output_data(str(image_data.b64_json), aiconfig)
     elif image_data.url is not None:
         data = OutputDataWithStringValue(
             kind="file_uri", value=str(image_data.url)
@@ -203,6 +211,19 @@ class DalleImageGenerationParser(ParameterizedModelParser):
         Returns:
             InferenceResponse: The response from the model.
         """
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        return await self.run_inference_with_completion_params(
+            prompt, aiconfig, completion_data, _options, parameters
+        )
+
+    async def run_inference_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig,
+        completion_params: Dict,
+        _options,
+        parameters,
+    ) -> List[Output]:
         # If needed, certify the API key and initialize the OpenAI client
         if not openai.api_key:
             openai.api_key = get_api_key_from_environment(
@@ -211,20 +232,21 @@ class DalleImageGenerationParser(ParameterizedModelParser):
         if not self.client:
             self.client = OpenAI(api_key=openai.api_key)
 
-        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        completion_data = completion_params
 
         print(
             "Calling image generation. This can take several seconds, please hold on..."
         )
-        response: ImagesResponse = self.client.images.generate(
-            **completion_data
+        # The image generation call is blocking, run it in the inference thread pool to keep the event loop free
+        response: ImagesResponse = await run_in_thread_pool(
+            self.client.images.generate, **completion_data
         )
 
         outputs = []
         # ImageResponse object also contains a "created" field for timestamp, should I store that somewhere?
         # Ex: response=ImagesResponse(created=1700347843, data=[...])
         for execution_count, image_data in enumerate(response.data):
-            output = construct_output(image_data, execution_count)
+            output = construct_output(image_data, execution_count, aiconfig)
             outputs.append(output)
 
         prompt.outputs = outputs
@@ -246,7 +268,7 @@ class DalleImageGenerationParser(ParameterizedModelParser):
         # https://github.com/lastmile-ai/aiconfig/issues/467
         if output.output_type == "execute_result":
             if isinstance(output.data, OutputDataWithStringValue):
-                return output.data.value
+                return resolve_blob_data(output.data, aiconfig).value
             elif isinstance(output.data, str):
                 return output.data
         return ""
@@ -181,17 +181,18 @@ class GeminiModelParser(ParameterizedModelParser):
                 serialized_prompts = await ai_config.serialize("prompt", completion_params, "gemini-pro")
         """
 
-        event = CallbackEvent(
-            "on_serialize_start",
-            __name__,
-            {
-                "prompt_name": prompt_name,
-                "data": data,
-                "parameters": parameters,
-                "kwargs": kwargs,
-            },
-        )
-        await ai_config.callback_manager.run_callbacks(event)
+        if ai_config.callback_manager.has_listeners("on_serialize_start"):
+            event = CallbackEvent(
+                "on_serialize_start",
+                __name__,
+                {
+                    "prompt_name": prompt_name,
+                    "data": data,
+                    "parameters": parameters,
+                    "kwargs": kwargs,
+                },
+            )
+            await ai_config.callback_manager.run_callbacks(event)
 
         # Don't operate on the original data object
         data = copy.deepcopy(data)
@@ -278,10 +279,11 @@ class GeminiModelParser(ParameterizedModelParser):
                 "Unable to parse Data into prompts. Contents data is either invalid or contains unsupported objects like protobufs."
             )
 
-        event = CallbackEvent(
-            "on_serialize_complete", __name__, {"result": prompts}
-        )
-        await ai_config.callback_manager.run_callbacks(event)
+        if ai_config.callback_manager.has_listeners("on_serialize_complete"):
+            event = CallbackEvent(
+                "on_serialize_complete", __name__, {"result": prompts}
+            )
+            await ai_config.callback_manager.run_callbacks(event)
 
         return prompts
 
@@ -301,13 +303,14 @@ class GeminiModelParser(ParameterizedModelParser):
         Returns:
             dict: Model-specific completion parameters.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_start",
-                __name__,
-                {"prompt": prompt, "params": params},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_start",
+                    __name__,
+                    {"prompt": prompt, "params": params},
+                )
             )
-        )
 
         # Build Completion data
         model_settings = self.get_model_settings(prompt, aiconfig)
@@ -347,13 +350,14 @@ class GeminiModelParser(ParameterizedModelParser):
                 )
             )
 
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_complete",
-                __name__,
-                {"output": completion_data},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_complete",
+                    __name__,
+                    {"output": completion_data},
+                )
             )
-        )
         return completion_data
 
     async def run_inference(
@@ -374,18 +378,32 @@ class GeminiModelParser(ParameterizedModelParser):
         Returns:
             ExecuteResult: The response from the model.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_start",
-                __name__,
-                {
-                    "prompt": prompt,
-                    "options": options,
-                    "parameters": parameters,
-                },
-            )
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        return await self.run_inference_with_completion_params(
+            prompt, aiconfig, completion_data, options, parameters
         )
 
+    async def run_inference_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        completion_params: Dict,
+        options: InferenceOptions,
+        parameters,
+    ) -> list[Output]:
+        if aiconfig.callback_manager.has_listeners("on_run_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_start",
+                    __name__,
+                    {
+                        "prompt": prompt,
+                        "options": options,
+                        "parameters": parameters,
+                    },
+                )
+            )
+
         if not self.api_key:
             self.api_key = get_api_key_from_environment(
                 "GOOGLE_API_KEY", required=True
@@ -398,7 +416,7 @@ class GeminiModelParser(ParameterizedModelParser):
         genai.configure(api_key=self.api_key)
 
         # TODO: check and handle api key here
-        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        completion_data = completion_params
 
         stream = True  # Default value
         if options is not None and options.stream is not None:
@@ -416,11 +434,12 @@ class GeminiModelParser(ParameterizedModelParser):
             outputs = construct_regular_outputs(response)
 
         prompt.outputs = outputs
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_complete", __name__, {"result": prompt.outputs}
+        if aiconfig.callback_manager.has_listeners("on_run_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_complete", __name__, {"result": prompt.outputs}
+                )
             )
-        )
         return prompt.outputs
 
     def get_output_text(
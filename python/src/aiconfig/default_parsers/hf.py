@@ -1,6 +1,6 @@
 import copy
 import json
-from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Union
+from typing import TYPE_CHECKING, Any, AsyncIterable, List, Optional, Union
 
 from aiconfig.default_parsers.parameterized_model_parser import (
     ParameterizedModelParser,
@@ -8,6 +8,10 @@ from aiconfig.default_parsers.parameterized_model_parser import (
 from aiconfig.model_parser import InferenceOptions
 from aiconfig.util.config_utils import get_api_key_from_environment
 from aiconfig.util.params import resolve_prompt
+from aiconfig.util.thread_pool import (
+    iterate_in_thread_pool,
+    run_in_thread_pool,
+)
 
 # HuggingFace API imports
 from huggingface_hub import InferenceClient
@@ -59,8 +63,10 @@ def refine_completion_params(model_settings: dict[Any, Any]) -> dict[str, Any]:
     return completion_data
 
 
-def construct_stream_output(
-    response: Union[Iterable[TextGenerationStreamResponse], Iterable[str]],
+async def construct_stream_output(
+    response: Union[
+        AsyncIterable[TextGenerationStreamResponse], AsyncIterable[str]
+    ],
     response_includes_details: bool,
     options: InferenceOptions,
 ) -> Output:
@@ -74,7 +80,7 @@ def construct_stream_output(
 
     """
     accumulated_message = ""
-    for iteration in response:
+    async for iteration in response:
         metadata = {}
         # If response_includes_details is false, `iteration` will be a string,
         # otherwise, `iteration` is a TextGenerationStreamResponse
@@ -182,18 +188,19 @@ class HuggingFaceTextGenerationParser(ParameterizedModelParser):
         Returns:
             str: Serialized representation of the prompt and inference settings.
         """
-        await ai_config.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_serialize_start",
-                __name__,
-                {
-                    "prompt_name": prompt_name,
-                    "data": data,
-                    "parameters": parameters,
-                    "kwargs": kwargs,
-                },
+        if ai_config.callback_manager.has_listeners("on_serialize_start"):
+            await ai_config.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_serialize_start",
+                    __name__,
+                    {
+                        "prompt_name": prompt_name,
+                        "data": data,
+                        "parameters": parameters,
+                        "kwargs": kwargs,
+                    },
+                )
             )
-        )
 
         data = copy.deepcopy(data)
 
@@ -216,11 +223,12 @@ class HuggingFaceTextGenerationParser(ParameterizedModelParser):
 
         prompts.append(prompt)
 
-        await ai_config.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_serialize_complete", __name__, {"result": prompts}
+        if ai_config.callback_manager.has_listeners("on_serialize_complete"):
+            await ai_config.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_serialize_complete", __name__, {"result": prompts}
+                )
             )
-        )
 
         return prompts
 
@@ -240,13 +248,14 @@ class HuggingFaceTextGenerationParser(ParameterizedModelParser):
         Returns:
             dict: Model-specific completion parameters.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_start",
-                __name__,
-                {"prompt": prompt, "params": params},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_start",
+                    __name__,
+                    {"prompt": prompt, "params": params},
+                )
             )
-        )
 
         resolved_prompt = resolve_prompt(prompt, params, aiconfig)
 
@@ -257,13 +266,14 @@ class HuggingFaceTextGenerationParser(ParameterizedModelParser):
 
         completion_data["prompt"] = resolved_prompt
 
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_complete",
-                __name__,
-                {"output": completion_data},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_complete",
+                    __name__,
+                    {"output": completion_data},
+                )
             )
-        )
 
         return completion_data
 
@@ -285,19 +295,33 @@ class HuggingFaceTextGenerationParser(ParameterizedModelParser):
         Returns:
             InferenceResponse: The response from the model.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_start",
-                __name__,
-                {
-                    "prompt": prompt,
-                    "options": options,
-                    "parameters": parameters,
-                },
-            )
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        return await self.run_inference_with_completion_params(
+            prompt, aiconfig, completion_data, options, parameters
         )
 
-        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+    async def run_inference_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        completion_params: dict[Any, Any],
+        options: InferenceOptions,
+        parameters: dict[Any, Any],
+    ) -> List[Output]:
+        if aiconfig.callback_manager.has_listeners("on_run_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_start",
+                    __name__,
+                    {
+                        "prompt": prompt,
+                        "options": options,
+                        "parameters": parameters,
+                    },
+                )
+            )
+
+        completion_data = completion_params
 
         # if stream enabled in runtime options and config, then stream. Otherwise don't stream.
         stream = True  # Default value
@@ -308,7 +332,10 @@ class HuggingFaceTextGenerationParser(ParameterizedModelParser):
 
         completion_data["stream"] = stream
 
-        response = self.client.text_generation(**completion_data)
+        # The Hugging Face client is blocking, run it in the inference thread pool to keep the event loop free
+        response = await run_in_thread_pool(
+            self.client.text_generation, **completion_data
+        )
         response_is_detailed = completion_data.get("details", False)
         outputs = []
 
@@ -319,16 +346,17 @@ class HuggingFaceTextGenerationParser(ParameterizedModelParser):
             outputs.append(output)
         else:
             # Handles stream callback
-            output = construct_stream_output(
-                response, response_is_detailed, options
+            output = await construct_stream_output(
+                iterate_in_thread_pool(response), response_is_detailed, options
             )
             outputs.append(output)
 
         prompt.outputs = outputs
 
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent("on_run_complete", __name__, {"result": outputs})
-        )
+        if aiconfig.callback_manager.has_listeners("on_run_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent("on_run_complete", __name__, {"result": outputs})
+            )
 
         return outputs
 
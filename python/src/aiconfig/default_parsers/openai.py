@@ -1,19 +1,27 @@
 import copy
+import inspect
 from abc import abstractmethod
 from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
-import openai
 from aiconfig.callback import CallbackEvent
 from aiconfig.default_parsers.parameterized_model_parser import (
     ParameterizedModelParser,
 )
 from aiconfig.model_parser import InferenceOptions
 from aiconfig.util.config_utils import get_api_key_from_environment
+from aiconfig.util.openai_client_pool import (
+    get_shared_async_openai_client,
+    iterate_stream,
+)
 from aiconfig.util.params import (
     resolve_prompt,
     resolve_prompt_string,
     resolve_system_prompt,
 )
+from aiconfig.util.stream_accumulator import (
+    ChatCompletionStreamAccumulator,
+    StreamedMessage,
+)
 from openai.types.chat import ChatCompletionMessage
 
 from aiconfig.schema import (
@@ -35,7 +43,8 @@ if TYPE_CHECKING:
 class OpenAIInference(ParameterizedModelParser):
     def __init__(self):
         super().__init__()
-        # Will be set in the run method. This is to avoid having to set the api key in the constructor
+        # Optional custom client, set by initialize_openai_client overrides.
+        # When None, parsers share a pooled AsyncOpenAI client (see get_openai_client).
         self.client = None
 
     @abstractmethod
@@ -63,17 +72,18 @@ class OpenAIInference(ParameterizedModelParser):
         Returns:
             str: Serialized representation of the prompt and inference settings.
         """
-        event = CallbackEvent(
-            "on_serialize_start",
-            __name__,
-            {
-                "prompt_name": prompt_name,
-                "data": data,
-                "parameters": parameters,
-                "kwargs": kwargs,
-            },
-        )
-        await ai_config.callback_manager.run_callbacks(event)
+        if ai_config.callback_manager.has_listeners("on_serialize_start"):
+            event = CallbackEvent(
+                "on_serialize_start",
+                __name__,
+                {
+                    "prompt_name": prompt_name,
+                    "data": data,
+                    "parameters": parameters,
+                    "kwargs": kwargs,
+                },
+            )
+            await ai_config.callback_manager.run_callbacks(event)
         prompts: list[Prompt] = []
 
         # Combine conversation data with any extra keyword args
@@ -188,10 +198,11 @@ class OpenAIInference(ParameterizedModelParser):
         if prompts:
             prompts[len(prompts) - 1].name = prompt_name
 
-        event = CallbackEvent(
-            "on_serialize_complete", __name__, {"result": prompts}
-        )
-        await ai_config.callback_manager.run_callbacks(event)
+        if ai_config.callback_manager.has_listeners("on_serialize_complete"):
+            event = CallbackEvent(
+                "on_serialize_complete", __name__, {"result": prompts}
+            )
+            await ai_config.callback_manager.run_callbacks(event)
         return prompts
 
     async def deserialize(
@@ -210,13 +221,14 @@ class OpenAIInference(ParameterizedModelParser):
         Returns:
             dict: Model-specific completion parameters.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_start",
-                __name__,
-                {"prompt": prompt, "params": params},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_start",
+                    __name__,
+                    {"prompt": prompt, "params": params},
+                )
             )
-        )
         # Build Completion params
         model_settings = self.get_model_settings(prompt, aiconfig)
 
@@ -278,13 +290,14 @@ class OpenAIInference(ParameterizedModelParser):
         add_prompt_as_message(
             prompt, aiconfig, completion_params["messages"], params
         )
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_complete",
-                __name__,
-                {"output": completion_params},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_complete",
+                    __name__,
+                    {"output": completion_params},
+                )
             )
-        )
         return completion_params
 
     async def run_inference(
@@ -305,22 +318,35 @@ class OpenAIInference(ParameterizedModelParser):
         Returns:
             ExecuteResult: The response from the model.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_start",
-                __name__,
-                {
-                    "prompt": prompt,
-                    "options": options,
-                    "parameters": parameters,
-                },
-            )
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        return await self.run_inference_with_completion_params(
+            prompt, aiconfig, completion_data, options, parameters
         )
 
-        if self.client is None:
-            self.initialize_openai_client()
+    async def run_inference_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        completion_params: Dict,
+        options: InferenceOptions,
+        parameters,
+    ) -> List[Output]:
+        if aiconfig.callback_manager.has_listeners("on_run_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_start",
+                    __name__,
+                    {
+                        "prompt": prompt,
+                        "options": options,
+                        "parameters": parameters,
+                    },
+                )
+            )
 
-        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        client = self.get_openai_client()
+
+        completion_data = completion_params
         # if stream enabled in runtime options and config, then stream. Otherwise don't stream.
         # const stream = options?.stream ?? completionParams.stream ?? true;
         stream = True  # Default value
@@ -332,7 +358,10 @@ class OpenAIInference(ParameterizedModelParser):
 
         completion_data["stream"] = stream
 
-        response = self.client.chat.completions.create(**completion_data)
+        response = client.chat.completions.create(**completion_data)
+        # Custom clients set by initialize_openai_client overrides may be sync
+        if inspect.isawaitable(response):
+            response = await response
         outputs = []
         if not stream:
             # # OpenAI>1.0.0 uses pydantic models for response
@@ -368,73 +397,73 @@ class OpenAIInference(ParameterizedModelParser):
 
                 outputs.append(output)
         else:
-            outputs = {}
-            messages = {}
-            for chunk in response:
+            accumulator = ChatCompletionStreamAccumulator()
+            async for chunk in iterate_stream(response):
                 # OpenAI>1.0.0 uses pydantic models. Chunk is of type ChatCompletionChunk; type is not directly importable from openai Library, will require some diffing
                 chunk = chunk.model_dump(exclude_none=True)
-                chunk_without_choices = {
-                    key: copy.deepcopy(value)
-                    for key, value in chunk.items()
-                    if key != "choices"
-                }
-                # streaming only returns one chunk, one choice at a time (before 1.0.0). The order in which the choices are returned is not guaranteed.
-                messages = multi_choice_message_reducer(messages, chunk)
-
-                for i, choice in enumerate(chunk["choices"]):
-                    index = choice.get("index")
-                    accumulated_message_for_choice = messages.get(index, "")
-                    delta = choice.get("delta")
-
+                # Only the deltas are accumulated per chunk; outputs are built once the stream is complete
+                for choice in accumulator.add_chunk(chunk):
                     if options and options.stream_callback:
+                        index = choice.get("index")
                         options.stream_callback(
-                            delta, accumulated_message_for_choice, index
+                            choice.get("delta"),
+                            accumulator.get_message_view(index),
+                            index,
                         )
 
-                    output = ExecuteResult(
+            # Now that we have the complete outputs, we can parse it into our object model properly
+            for index, output_message, metadata in accumulator.get_choices():
+                metadata["raw_response"] = output_message
+                if output_message.get("role", None) is not None:
+                    metadata["role"] = output_message.get("role")
+
+                outputs.append(
+                    ExecuteResult(
                         **{
                             "output_type": "execute_result",
-                            # TODO (rossdan): accumulated_message_for_choice.get("content")
-                            "data": accumulated_message_for_choice,
+                            "data": build_output_data(output_message),
                             "execution_count": index,
-                            "metadata": chunk_without_choices,
+                            "metadata": metadata,
                         }
                     )
-                    outputs[index] = output
-            outputs = [outputs[i] for i in sorted(list(outputs.keys()))]
-
-            # Now that we have the complete outputs, we can parse it into our object model properly
-            for output in outputs:
-                output_message = output.data
-                output_data = build_output_data(output.data)
-
-                metadata = {"raw_response": output_message}
-                if output_message.get("role", None) is not None:
-                    metadata["role"] = output_message.get("role")
-
-                output.data = output_data
-                output.metadata = {**output.metadata, **metadata}
+                )
 
         # rewrite or extend list of outputs?
         prompt.outputs = outputs
 
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_complete", __name__, {"result": prompt.outputs}
+        if aiconfig.callback_manager.has_listeners("on_run_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_complete", __name__, {"result": prompt.outputs}
+                )
             )
-        )
         return prompt.outputs
 
     def initialize_openai_client(self) -> None:
         """
         Initializes the client to be used with the OpenAI Module.
-        This method can be overriden to customize the client initialization.
+        This method can be overriden to customize the client initialization, by setting `self.client`.
+        Custom clients can be sync or async.
+
+        By default, no client is set and the parser uses the shared, pooled AsyncOpenAI client.
         """
 
+    def get_openai_client(self):
+        """
+        Returns the client to run inference with: the custom client set by initialize_openai_client if any,
+        otherwise the AsyncOpenAI client shared by every parser on the current event loop.
+        Shared clients reuse pooled connections, so concurrent requests (e.g. in run_batch) don't block each other.
+        See aiconfig.util.openai_client_pool to configure the connection pool.
+        """
+        if self.client is None:
+            self.initialize_openai_client()
+        if self.client is not None:
+            return self.client
+
         openai_api_key = get_api_key_from_environment(
             "OPENAI_API_KEY"
         ).unwrap()
-        self.client = openai.Client(api_key=openai_api_key)
+        return get_shared_async_openai_client(api_key=openai_api_key)
 
     def get_prompt_template(
         self, prompt: Prompt, aiconfig: "AIConfigRuntime"
@@ -496,20 +525,15 @@ class DefaultOpenAIParser(OpenAIInference):
 
 
 def reduce(acc, delta):
-    acc = copy.deepcopy(acc)
-
-    for key, value in delta.items():
-        if key not in acc:
-            # If the key doesn't exist in 'acc', add it with the 'value'
-            acc[key] = value
-        elif isinstance(acc[key], str) and isinstance(value, str):
-            # If both 'acc[key]' and 'value' are strings, concatenate them
-            acc[key] += value
-        elif isinstance(acc[key], dict) and not isinstance(acc[key], list):
-            # If 'acc[key]' is a dictionary (not a list), recursively merge it with 'value'
-            acc[key] = reduce(acc[key], value)
-
-    return acc
+    """
+    Merges a streamed delta into an accumulated message: strings are concatenated and dicts are merged recursively.
+    Returns a new message. To accumulate a whole stream, use ChatCompletionStreamAccumulator, which doesn't copy
+    the accumulated message for every delta.
+    """
+    message = StreamedMessage()
+    message.add(acc)
+    message.add(delta)
+    return message.to_dict()
 
 
 def multi_choice_message_reducer(
@@ -518,14 +542,9 @@ def multi_choice_message_reducer(
     if messages is None:
         messages = {}
 
-    # elif len(messages) != len(chunk["choices"]):
-    #     raise ValueError("Invalid number of previous choices -- it should match the incoming number of choices")
-
     for choice in chunk["choices"]:
         index = choice["index"]
-        previous_message = messages.get(index, {})
-        updated_message = reduce(previous_message, choice["delta"])
-        messages[index] = updated_message
+        messages[index] = reduce(messages.get(index, {}), choice["delta"])
 
     return messages
 
@@ -51,17 +51,18 @@ class OpenAIVisionParser(DefaultOpenAIParser):
         Returns:
             str: Serialized representation of the prompt and inference settings.
         """
-        event = CallbackEvent(
-            "on_serialize_start",
-            __name__,
-            {
-                "prompt_name": prompt_name,
-                "data": data,
-                "parameters": parameters,
-                "kwargs": kwargs,
-            },
-        )
-        await ai_config.callback_manager.run_callbacks(event)
+        if ai_config.callback_manager.has_listeners("on_serialize_start"):
+            event = CallbackEvent(
+                "on_serialize_start",
+                __name__,
+                {
+                    "prompt_name": prompt_name,
+                    "data": data,
+                    "parameters": parameters,
+                    "kwargs": kwargs,
+                },
+            )
+            await ai_config.callback_manager.run_callbacks(event)
         prompts: list[Prompt] = []
 
         # Combine conversation data with any extra keyword args
@@ -210,10 +211,11 @@ class OpenAIVisionParser(DefaultOpenAIParser):
         if prompts:
             prompts[len(prompts) - 1].name = prompt_name
 
-        event = CallbackEvent(
-            "on_serialize_complete", __name__, {"result": prompts}
-        )
-        await ai_config.callback_manager.run_callbacks(event)
+        if ai_config.callback_manager.has_listeners("on_serialize_complete"):
+            event = CallbackEvent(
+                "on_serialize_complete", __name__, {"result": prompts}
+            )
+            await ai_config.callback_manager.run_callbacks(event)
         return prompts
 
     async def deserialize(
@@ -232,13 +234,14 @@ class OpenAIVisionParser(DefaultOpenAIParser):
         Returns:
             dict: Model-specific completion parameters.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_start",
-                __name__,
-                {"prompt": prompt, "params": params},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_start",
+                    __name__,
+                    {"prompt": prompt, "params": params},
+                )
             )
-        )
         # Build Completion params
         model_settings = self.get_model_settings(prompt, aiconfig)
 
@@ -314,13 +317,14 @@ class OpenAIVisionParser(DefaultOpenAIParser):
         add_prompt_as_message(
             prompt, aiconfig, completion_params["messages"], params
         )
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_complete",
-                __name__,
-                {"output": completion_params},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_complete",
+                    __name__,
+                    {"output": completion_params},
+                )
             )
-        )
         return completion_params
 
 
@@ -8,6 +8,7 @@ from aiconfig.default_parsers.parameterized_model_parser import (
 )
 from aiconfig.model_parser import InferenceOptions
 from aiconfig.util.params import resolve_parameters, resolve_prompt
+from aiconfig.util.thread_pool import run_in_thread_pool
 from google.generativeai.text import Completion
 from google.generativeai.types.discuss_types import MessageDict
 
@@ -78,10 +79,11 @@ class PaLMTextParser(ParameterizedModelParser):
             )
         ]
 
-        event = CallbackEvent(
-            "on_serialize_complete", __name__, {"result": prompts}
-        )
-        await ai_config.callback_manager.run_callbacks(event)
+        if ai_config.callback_manager.has_listeners("on_serialize_complete"):
+            event = CallbackEvent(
+                "on_serialize_complete", __name__, {"result": prompts}
+            )
+            await ai_config.callback_manager.run_callbacks(event)
 
         return prompts
 
@@ -101,13 +103,14 @@ class PaLMTextParser(ParameterizedModelParser):
         Returns:
             dict: Model-specific completion parameters.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_start",
-                __name__,
-                {"prompt": prompt, "params": params},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_start",
+                    __name__,
+                    {"prompt": prompt, "params": params},
+                )
             )
-        )
         # Build Completion data
         model_settings = self.get_model_settings(prompt, aiconfig)
 
@@ -120,13 +123,14 @@ class PaLMTextParser(ParameterizedModelParser):
         # pass in the user prompt
         completion_data["prompt"] = prompt_str
 
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_complete",
-                __name__,
-                {"output": completion_data},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_complete",
+                    __name__,
+                    {"output": completion_data},
+                )
             )
-        )
         return completion_data
 
     async def run_inference(
@@ -151,22 +155,39 @@ class PaLMTextParser(ParameterizedModelParser):
         Returns:
             ExecuteResult: The response from the model.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_start",
-                __name__,
-                {
-                    "prompt": prompt,
-                    "options": options,
-                    "parameters": parameters,
-                },
-            )
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        return await self.run_inference_with_completion_params(
+            prompt, aiconfig, completion_data, options, parameters
         )
 
+    async def run_inference_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        completion_params: Dict,
+        options: InferenceOptions,
+        parameters,
+    ) -> List[Output]:
+        if aiconfig.callback_manager.has_listeners("on_run_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_start",
+                    __name__,
+                    {
+                        "prompt": prompt,
+                        "options": options,
+                        "parameters": parameters,
+                    },
+                )
+            )
+
         # TODO: check api key here
-        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        completion_data = completion_params
         # Return Type is of type Completion from Google Library
-        completion: Completion = palm.generate_text(**completion_data)
+        # PaLM has no async text generation API, run it in the inference thread pool to keep the event loop free
+        completion: Completion = await run_in_thread_pool(
+            palm.generate_text, **completion_data
+        )
 
         outputs = []
         # completion.candidates has all outputs. Candidates is an attribute of completion. Candidates is a dict. Taken from Google API impl
@@ -184,11 +205,12 @@ class PaLMTextParser(ParameterizedModelParser):
             outputs.append(output)
 
         prompt.outputs = outputs
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_complete", __name__, {"result": prompt.outputs}
+        if aiconfig.callback_manager.has_listeners("on_run_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_complete", __name__, {"result": prompt.outputs}
+                )
             )
-        )
         return outputs
 
     def get_output_text(
@@ -234,17 +256,18 @@ class PaLMChatParser(ParameterizedModelParser):
             str: Serialized representation of the prompt and inference settings.
         """
 
-        event = CallbackEvent(
-            "on_serialize_start",
-            __name__,
-            {
-                "prompt_name": prompt_name,
-                "data": data,
-                "parameters": parameters,
-                "kwargs": kwargs,
-            },
-        )
-        await ai_config.callback_manager.run_callbacks(event)
+        if ai_config.callback_manager.has_listeners("on_serialize_start"):
+            event = CallbackEvent(
+                "on_serialize_start",
+                __name__,
+                {
+                    "prompt_name": prompt_name,
+                    "data": data,
+                    "parameters": parameters,
+                    "kwargs": kwargs,
+                },
+            )
+            await ai_config.callback_manager.run_callbacks(event)
 
         prompt_template = data.get("prompt", "")
         data.pop("prompt", None)
@@ -262,10 +285,11 @@ class PaLMChatParser(ParameterizedModelParser):
             )
         ]
 
-        event = CallbackEvent(
-            "on_serialize_complete", __name__, {"result": prompts}
-        )
-        await ai_config.callback_manager.run_callbacks(event)
+        if ai_config.callback_manager.has_listeners("on_serialize_complete"):
+            event = CallbackEvent(
+                "on_serialize_complete", __name__, {"result": prompts}
+            )
+            await ai_config.callback_manager.run_callbacks(event)
         return prompts
 
     async def deserialize(
@@ -284,13 +308,14 @@ class PaLMChatParser(ParameterizedModelParser):
         Returns:
             dict: Model-specific completion parameters.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_start",
-                __name__,
-                {"prompt": prompt, "params": params},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_start",
+                    __name__,
+                    {"prompt": prompt, "params": params},
+                )
             )
-        )
         resolved_prompt = resolve_prompt(prompt, params, aiconfig)
 
         # Build Completion data
@@ -347,13 +372,14 @@ class PaLMChatParser(ParameterizedModelParser):
         completion_data["messages"].append(
             {"content": resolved_prompt, "author": "0"}
         )
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_deserialize_complete",
-                __name__,
-                {"output": completion_data},
+        if aiconfig.callback_manager.has_listeners("on_deserialize_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_deserialize_complete",
+                    __name__,
+                    {"output": completion_data},
+                )
             )
-        )
         return completion_data
 
     async def run_inference(
@@ -374,21 +400,35 @@ class PaLMChatParser(ParameterizedModelParser):
         Returns:
             ExecuteResult: The response from the model.
         """
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_start",
-                __name__,
-                {
-                    "prompt": prompt,
-                    "options": options,
-                    "parameters": parameters,
-                },
-            )
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        return await self.run_inference_with_completion_params(
+            prompt, aiconfig, completion_data, options, parameters
         )
 
+    async def run_inference_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        completion_params: Dict,
+        options: InferenceOptions,
+        parameters,
+    ) -> List[Output]:
+        if aiconfig.callback_manager.has_listeners("on_run_start"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_start",
+                    __name__,
+                    {
+                        "prompt": prompt,
+                        "options": options,
+                        "parameters": parameters,
+                    },
+                )
+            )
+
         # TODO: check and handle api key here
-        completion_data = await self.deserialize(prompt, aiconfig, parameters)
-        response = palm.chat(**completion_data)
+        completion_data = completion_params
+        response = await palm.chat_async(**completion_data)
         outputs = []
         for i, candidate in enumerate(response.candidates):
             # candidate is a MessageDict obj (https://shorturl.at/jKY35),
@@ -406,11 +446,12 @@ class PaLMChatParser(ParameterizedModelParser):
             outputs.append(output)
 
         prompt.outputs = outputs
-        await aiconfig.callback_manager.run_callbacks(
-            CallbackEvent(
-                "on_run_complete", __name__, {"result": prompt.outputs}
+        if aiconfig.callback_manager.has_listeners("on_run_complete"):
+            await aiconfig.callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_complete", __name__, {"result": prompt.outputs}
+                )
             )
-        )
         return prompt.outputs
 
     def get_output_text(
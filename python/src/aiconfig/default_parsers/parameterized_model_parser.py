@@ -1,12 +1,27 @@
 # TODO: plaese improve the file name on this file. This is an abstract class that handles parameterization for a model parser.
 
 
+import asyncio
+import time
 import typing
 from abc import abstractmethod
+from contextlib import nullcontext
 from typing import Dict, List, Optional
 
+from aiconfig.callback import CallbackEvent
 from aiconfig.model_parser import InferenceOptions, ModelParser
-from aiconfig.util.params import get_dependency_graph, resolve_prompt_string
+from aiconfig.util.inference_cache import (
+    InferenceCache,
+    get_inference_cache,
+    make_inference_cache_key,
+)
+from aiconfig.util.params import (
+    get_critical_path,
+    get_dependency_graph,
+    get_dependency_levels,
+    resolve_prompt_string,
+)
+from aiconfig.util.thread_pool import run_in_thread_pool
 
 from aiconfig.schema import AIConfig, JSONObject, Output, Prompt, PromptInput
 
@@ -52,9 +67,119 @@ class ParameterizedModelParser(ModelParser):
                 prompt, aiconfig, options, parameters
             )
         else:
-            return await self.run_inference(
+            cache = get_inference_cache(aiconfig, options)
+            if cache is None:
+                return await self.run_inference(
+                    prompt, aiconfig, options, parameters
+                )
+            return await self.run_inference_with_cache(
+                cache, prompt, aiconfig, options, parameters
+            )
+
+    async def run_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: AIConfig,
+        completion_params: Dict,
+        options: Optional[InferenceOptions] = None,
+        parameters: Dict = {},
+        run_with_dependencies: Optional[bool] = False,
+    ) -> List[Output]:
+        if run_with_dependencies:
+            return await self.run_with_dependencies(
                 prompt, aiconfig, options, parameters
             )
+        cache = get_inference_cache(aiconfig, options)
+        if cache is None:
+            return await self.run_inference_with_completion_params(
+                prompt, aiconfig, completion_params, options, parameters
+            )
+        return await self.run_inference_with_cache(
+            cache,
+            prompt,
+            aiconfig,
+            options,
+            parameters,
+            completion_params=completion_params,
+        )
+
+    async def run_inference_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: AIConfig,
+        completion_params: Dict,
+        options: Optional[InferenceOptions] = None,
+        parameters: Dict = {},
+    ) -> List[Output]:
+        """
+        Runs inference with completion params that deserialize() already resolved for the prompt and parameters.
+
+        The default implementation ignores `completion_params` and calls run_inference(), which resolves them again.
+        Model Parsers override it to send `completion_params` as they are, and implement run_inference() as
+        deserialize() followed by this method.
+        """
+        return await self.run_inference(prompt, aiconfig, options, parameters)
+
+    async def run_inference_with_cache(
+        self,
+        cache: InferenceCache,
+        prompt: Prompt,
+        aiconfig: AIConfig,
+        options: Optional[InferenceOptions] = None,
+        parameters: Dict = {},
+        completion_params: Optional[Dict] = None,
+    ) -> List[Output]:
+        """
+        Runs inference through the inference cache: if the resolved completion params (the output of deserialize())
+        were seen before, the cached outputs are returned without calling the model. Otherwise, inference is run
+        with those completion params (see run_inference_with_completion_params) and its outputs are cached.
+
+        Cache hits are not streamed; the outputs are set on the prompt at once.
+        """
+        if completion_params is None:
+            completion_params = await self.deserialize(
+                prompt, aiconfig, params=parameters
+            )
+        key = make_inference_cache_key(self.id(), completion_params)
+
+        # Cache backends can do blocking I/O (e.g. SQLite), keep it off the event loop
+        cached_outputs = await run_in_thread_pool(cache.get, key)
+        event_name = (
+            "on_inference_cache_hit"
+            if cached_outputs is not None
+            else "on_inference_cache_miss"
+        )
+        callback_manager = getattr(aiconfig, "callback_manager", None)
+        # Computing the cache stats can query the cache backend, only do it for listeners
+        if callback_manager is not None and callback_manager.has_listeners(
+            event_name
+        ):
+            stats = cache.stats()
+            await callback_manager.run_callbacks(
+                CallbackEvent(
+                    event_name,
+                    __name__,
+                    {
+                        "prompt_name": prompt.name,
+                        "model_parser": self.id(),
+                        "key": key,
+                        "hits": stats.hits,
+                        "misses": stats.misses,
+                        "hit_rate": stats.hit_rate,
+                    },
+                )
+            )
+
+        if cached_outputs is not None:
+            prompt.outputs = cached_outputs
+            return prompt.outputs
+
+        outputs = await self.run_inference_with_completion_params(
+            prompt, aiconfig, completion_params, options, parameters
+        )
+        if outputs:
+            await run_in_thread_pool(cache.set, key, outputs)
+        return outputs
 
     async def run_with_dependencies(
         self,
@@ -66,6 +191,10 @@ class ParameterizedModelParser(ModelParser):
         """
         Executes the AI model with the resolved dependencies and prompt references and returns the API response.
 
+        Dependencies run as soon as their own dependencies complete, so independent prompts run concurrently
+        (up to options.max_concurrency at once), and each prompt runs once no matter how many prompts depend on it.
+        Per-prompt latencies and the critical path are reported through the on_run_with_dependencies_complete callback event.
+
         Args:
             prompt: The prompt to be used.
             aiconfig: The AIConfig object containing all prompts and parameters.
@@ -77,36 +206,82 @@ class ParameterizedModelParser(ModelParser):
         dependency_graph = get_dependency_graph(
             prompt, aiconfig.prompts, aiconfig.prompt_index
         )
+        levels = get_dependency_levels(dependency_graph, prompt.name)
 
-        # Create a set to keep track of visited prompts
-        visited_prompts = set()
+        max_concurrency = getattr(options, "max_concurrency", None)
+        semaphore = (
+            asyncio.Semaphore(max_concurrency)
+            if max_concurrency is not None
+            else None
+        )
 
-        async def execute_recursive(prompt_name):
+        # Each prompt runs at most once per call; dependents await the memoized task of each dependency
+        prompt_tasks: Dict[str, asyncio.Task] = {}
+        prompt_latencies_s: Dict[str, float] = {}
+
+        async def execute_prompt(prompt_name: str) -> List[Output]:
             """
-            Execute the AI model for a given prompt and its dependencies recursively.
+            Runs a prompt once all of its dependencies have completed.
 
             Args:
                 prompt_name (str): The name of the prompt to execute.
 
             Returns:
-                Any: The output of the original prompt being executed.
+                List[Output]: The outputs of the prompt.
             """
+            await asyncio.gather(
+                *(
+                    prompt_tasks[dependency_prompt_name]
+                    for dependency_prompt_name in dependency_graph[prompt_name]
+                )
+            )
+            async with semaphore or nullcontext():
+                start = time.perf_counter()
+                outputs = await aiconfig.run(prompt_name, parameters, options)
+                prompt_latencies_s[prompt_name] = time.perf_counter() - start
+            return outputs
 
-            if prompt_name in visited_prompts:
-                return  # Skip already visited prompts
-            visited_prompts.add(prompt_name)
-
-            # Iterate through dependencies of the current prompt
-            for dependency_prompt_name in dependency_graph[prompt_name]:
-                await execute_recursive(dependency_prompt_name)
-
-            outputs = await aiconfig.run(prompt_name, parameters, options)
-
-            # Return the output of the original prompt being executed
-            if prompt_name == prompt.name:
-                return outputs
+        start = time.perf_counter()
+        try:
+            # Tasks are created level by level, so dependencies always exist before their dependents
+            for level in levels:
+                for prompt_name in level:
+                    prompt_tasks[prompt_name] = asyncio.create_task(
+                        execute_prompt(prompt_name)
+                    )
+            outputs = await prompt_tasks[prompt.name]
+        finally:
+            # On failure, don't leave dependencies running in the background
+            for task in prompt_tasks.values():
+                task.cancel()
+            await asyncio.gather(
+                *prompt_tasks.values(), return_exceptions=True
+            )
+        wall_time_s = time.perf_counter() - start
 
-        return await execute_recursive(prompt.name)
+        callback_manager = getattr(aiconfig, "callback_manager", None)
+        # Computing the critical path is only worth it for listeners
+        if callback_manager is not None and callback_manager.has_listeners(
+            "on_run_with_dependencies_complete"
+        ):
+            critical_path, critical_path_latency_s = get_critical_path(
+                dependency_graph, levels, prompt_latencies_s
+            )
+            await callback_manager.run_callbacks(
+                CallbackEvent(
+                    "on_run_with_dependencies_complete",
+                    __name__,
+                    {
+                        "prompt_name": prompt.name,
+                        "levels": levels,
+                        "prompt_latencies_s": prompt_latencies_s,
+                        "critical_path": critical_path,
+                        "critical_path_latency_s": critical_path_latency_s,
+                        "wall_time_s": wall_time_s,
+                    },
+                )
+            )
+        return outputs
 
     def resolve_prompt_template(
         prompt_template: str,
@@ -16,6 +16,8 @@ import { useCallback, useEffect, useMemo, useState } from "react";
 import { ufetch } from "ufetch";
 import { ROUTE_TABLE } from "./utils/api";
 import { streamingApiChain } from "./utils/oboeHelpers";
+import { postWithRevision } from "./utils/revisions";
+import { getSessionHeaders } from "./utils/session";
 import { datadogLogs } from "@datadog/browser-logs";
 import { LogEvent, LogEventData } from "./shared/types";
 
@@ -44,7 +46,7 @@ export default function LocalEditor() {
   const { classes } = useStyles();
 
   const loadConfig = useCallback(async () => {
-    const res = await ufetch.post(ROUTE_TABLE.LOAD, {});
+    const res = await postWithRevision(ROUTE_TABLE.LOAD, {});
     setAiConfig(res.aiconfig);
   }, []);
 
@@ -83,7 +85,7 @@ export default function LocalEditor() {
   }, [setupTelemetryIfAllowed]);
 
   const save = useCallback(async (aiconfig: AIConfig) => {
-    const res = await ufetch.post(ROUTE_TABLE.SAVE, {
+    const res = await postWithRevision(ROUTE_TABLE.SAVE, {
       // path: file path,
       aiconfig,
     });
@@ -107,7 +109,7 @@ export default function LocalEditor() {
 
   const addPrompt = useCallback(
     async (promptName: string, promptData: Prompt, index: number) => {
-      return await ufetch.post(ROUTE_TABLE.ADD_PROMPT, {
+      return await postWithRevision(ROUTE_TABLE.ADD_PROMPT, {
         prompt_name: promptName,
         prompt_data: promptData,
         index,
@@ -117,23 +119,23 @@ export default function LocalEditor() {
   );
 
   const deleteModelSettings = useCallback(async (modelName: string) => {
-    return await ufetch.post(ROUTE_TABLE.DELETE_MODEL, {
+    return await postWithRevision(ROUTE_TABLE.DELETE_MODEL, {
       model_name: modelName,
     });
   }, []);
 
   const deletePrompt = useCallback(async (promptName: string) => {
-    return await ufetch.post(ROUTE_TABLE.DELETE_PROMPT, {
+    return await postWithRevision(ROUTE_TABLE.DELETE_PROMPT, {
       prompt_name: promptName,
     });
   }, []);
 
   const clearOutputs = useCallback(async () => {
-    return await ufetch.post(ROUTE_TABLE.CLEAR_OUTPUTS, {});
+    return await postWithRevision(ROUTE_TABLE.CLEAR_OUTPUTS, {});
   }, []);
 
   const deleteOutput = useCallback(async (promptName: string) => {
-    return await ufetch.post(ROUTE_TABLE.DELETE_OUTPUT, {
+    return await postWithRevision(ROUTE_TABLE.DELETE_OUTPUT, {
       prompt_name: promptName,
     });
   }, []);
@@ -153,6 +155,7 @@ export default function LocalEditor() {
         {
           url: ROUTE_TABLE.RUN_PROMPT,
           method: "POST",
+          headers: getSessionHeaders(),
           body: {
             prompt_name: promptName,
             stream: enableStreaming,
@@ -183,14 +186,14 @@ export default function LocalEditor() {
 
   const cancel = useCallback(async (cancellationToken: string) => {
     // TODO: saqadri - check the status of the response (can be 400 or 422 if cancellation fails)
-    return await ufetch.post(ROUTE_TABLE.CANCEL, {
+    return await postWithRevision(ROUTE_TABLE.CANCEL, {
       cancellation_token_id: cancellationToken,
     });
   }, []);
 
   const updatePrompt = useCallback(
     async (promptName: string, promptData: Prompt) => {
-      return await ufetch.post(ROUTE_TABLE.UPDATE_PROMPT, {
+      return await postWithRevision(ROUTE_TABLE.UPDATE_PROMPT, {
         prompt_name: promptName,
         prompt_data: promptData,
       });
@@ -204,7 +207,7 @@ export default function LocalEditor() {
       settings?: InferenceSettings;
       promptName?: string;
     }) => {
-      return await ufetch.post(ROUTE_TABLE.UPDATE_MODEL, {
+      return await postWithRevision(ROUTE_TABLE.UPDATE_MODEL, {
         model_name: value.modelName,
         settings: value.settings,
         prompt_name: value.promptName,
@@ -214,20 +217,20 @@ export default function LocalEditor() {
   );
 
   const setConfigName = useCallback(async (name: string) => {
-    return await ufetch.post(ROUTE_TABLE.SET_NAME, {
+    return await postWithRevision(ROUTE_TABLE.SET_NAME, {
       name,
     });
   }, []);
 
   const setConfigDescription = useCallback(async (description: string) => {
-    return await ufetch.post(ROUTE_TABLE.SET_DESCRIPTION, {
+    return await postWithRevision(ROUTE_TABLE.SET_DESCRIPTION, {
       description,
     });
   }, []);
 
   const setParameters = useCallback(
     async (parameters: JSONObject, promptName?: string) => {
-      return await ufetch.post(ROUTE_TABLE.SET_PARAMETERS, {
+      return await postWithRevision(ROUTE_TABLE.SET_PARAMETERS, {
         parameters,
         prompt_name: promptName,
       });
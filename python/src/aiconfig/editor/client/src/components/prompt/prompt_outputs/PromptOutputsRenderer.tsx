@@ -11,11 +11,30 @@ import PromptOutputWrapper from "./PromptOutputWrapper";
 import MimeTypeRenderer from "../../MimeTypeRenderer";
 import JSONRenderer from "../../JSONRenderer";
 import { Alert, Flex } from "@mantine/core";
+import { ROUTE_TABLE } from "../../../utils/api";
+import { getSessionId } from "../../../utils/session";
 
 type Props = {
   outputs: Output[];
 };
 
+// Binary outputs stored in the config's blob store are referenced by content hash,
+// and served by the editor server
+const BLOB_URI_PREFIX = "aiconfig-blob://sha256/";
+
+function getFileUriContent(uri: string, mimeType?: string): string {
+  if (!uri.startsWith(BLOB_URI_PREFIX)) {
+    return uri;
+  }
+  const digest = uri.slice(BLOB_URI_PREFIX.length);
+  // The browser requests the blob itself, so the session is sent in the query rather than a header
+  const query = new URLSearchParams({ session_id: getSessionId() });
+  if (mimeType) {
+    query.set("mime_type", mimeType);
+  }
+  return `${ROUTE_TABLE.BLOB}/${digest}?${query.toString()}`;
+}
+
 function ErrorOutput({ output }: { output: Error }) {
   return (
     <Flex direction="column">
@@ -61,7 +80,10 @@ const ExecuteResultOutput = memo(function ExecuteResultOutput({
           >
             <MimeTypeRenderer
               mimeType={output.mime_type}
-              content={(output.data as OutputDataWithValue).value as string}
+              content={getFileUriContent(
+                (output.data as OutputDataWithValue).value as string,
+                output.mime_type
+              )}
             />
           </PromptOutputWrapper>
         );
@@ -0,0 +1,174 @@
+import { AIConfig } from "aiconfig";
+import { cloneDeep } from "lodash";
+import { ufetch } from "ufetch";
+import { ROUTE_TABLE } from "./api";
+import { getSessionHeaders, isSessionExpiredError } from "./session";
+
+// Request header with the revision of the AIConfig the client has. The server then
+// responds with a patch from that revision ("aiconfig_patch") instead of the whole AIConfig
+export const AICONFIG_REVISION_HEADER = "X-AIConfig-Revision";
+
+// Number of AIConfig snapshots kept, so that responses arriving out of order can still be patched
+const MAX_SNAPSHOTS = 8;
+
+type JSONPatchOperation = {
+  op: "add" | "remove" | "replace";
+  path: string;
+  value?: unknown;
+};
+
+type AIConfigResponse = {
+  aiconfig?: AIConfig;
+  revision?: number;
+  base_revision?: number;
+  aiconfig_patch?: JSONPatchOperation[];
+  // eslint-disable-next-line @typescript-eslint/no-explicit-any
+  [key: string]: any;
+};
+
+// AIConfig snapshots received from the server, by revision (oldest first)
+const snapshots = new Map<number, AIConfig>();
+let latestRevision: number | undefined;
+
+function unescapePointerToken(token: string): string {
+  return token.replace(/~1/g, "/").replace(/~0/g, "~");
+}
+
+/**
+ * Applies a JSON patch (RFC 6902 "add", "remove" and "replace" operations, as sent by the server)
+ * to a copy of the document, and returns it.
+ */
+export function applyJsonPatch<T>(
+  document: T,
+  patch: JSONPatchOperation[]
+): T {
+  // eslint-disable-next-line @typescript-eslint/no-explicit-any
+  let result: any = cloneDeep(document);
+  for (const operation of patch) {
+    const tokens = operation.path
+      .split("/")
+      .slice(1)
+      .map(unescapePointerToken);
+    const value = cloneDeep(operation.value);
+    if (tokens.length === 0) {
+      result = value;
+      continue;
+    }
+
+    let parent = result;
+    for (const token of tokens.slice(0, -1)) {
+      parent = Array.isArray(parent) ? parent[Number(token)] : parent[token];
+      if (parent == null || typeof parent !== "object") {
+        throw new Error(`Cannot apply patch at '${operation.path}'`);
+      }
+    }
+    const lastToken = tokens[tokens.length - 1];
+    if (Array.isArray(parent)) {
+      const index = lastToken === "-" ? parent.length : Number(lastToken);
+      if (operation.op === "add") {
+        parent.splice(index, 0, value);
+      } else if (operation.op === "remove") {
+        parent.splice(index, 1);
+      } else {
+        parent[index] = value;
+      }
+    } else if (operation.op === "remove") {
+      delete parent[lastToken];
+    } else {
+      parent[lastToken] = value;
+    }
+  }
+  return result;
+}
+
+function recordSnapshot(revision: number, aiconfig: AIConfig) {
+  snapshots.delete(revision);
+  snapshots.set(revision, aiconfig);
+  if (snapshots.size > MAX_SNAPSHOTS) {
+    snapshots.delete(snapshots.keys().next().value as number);
+  }
+  if (latestRevision == null || revision > latestRevision) {
+    latestRevision = revision;
+  }
+}
+
+/**
+ * Returns the headers to send with a request so the server can respond with a patch.
+ */
+export function getRevisionHeaders(): Record<string, string> {
+  return latestRevision != null
+    ? { [AICONFIG_REVISION_HEADER]: String(latestRevision) }
+    : {};
+}
+
+function forgetSnapshots() {
+  snapshots.clear();
+  latestRevision = undefined;
+}
+
+/**
+ * Sets `aiconfig` on a server response from the AIConfig patch it contains, if any, and records the snapshot.
+ * Falls back to reloading the whole AIConfig if the patch can't be applied.
+ */
+async function resolveAIConfig(
+  res: AIConfigResponse
+): Promise<AIConfigResponse> {
+  if (res.revision == null) {
+    return res;
+  }
+  if (res.aiconfig_patch == null) {
+    if (res.aiconfig != null) {
+      recordSnapshot(res.revision, res.aiconfig);
+    }
+    return res;
+  }
+
+  const { aiconfig_patch, base_revision, ...rest } = res;
+  const baseSnapshot =
+    base_revision != null ? snapshots.get(base_revision) : undefined;
+  if (baseSnapshot != null) {
+    try {
+      const aiconfig = applyJsonPatch(baseSnapshot, aiconfig_patch);
+      recordSnapshot(res.revision, aiconfig);
+      return { ...rest, aiconfig };
+    } catch (e) {
+      // Fall through to reload the whole AIConfig
+    }
+  }
+
+  // Without the base snapshot, get the current AIConfig from the server in full
+  forgetSnapshots();
+  const loadRes: AIConfigResponse = await ufetch.post(
+    ROUTE_TABLE.LOAD,
+    {},
+    { headers: getSessionHeaders() }
+  );
+  if (loadRes.revision != null && loadRes.aiconfig != null) {
+    recordSnapshot(loadRes.revision, loadRes.aiconfig);
+  }
+  return { ...rest, aiconfig: loadRes.aiconfig };
+}
+
+/**
+ * POSTs to an endpoint that responds with the AIConfig, sending this tab's session and the revision the client has.
+ * The response has the whole AIConfig in `aiconfig`, whether the server sent it in full or as a patch.
+ */
+export async function postWithRevision(
+  path: string,
+  // eslint-disable-next-line @typescript-eslint/no-explicit-any
+  data: any
+): Promise<AIConfigResponse> {
+  let res: AIConfigResponse;
+  try {
+    res = await ufetch.post(path, data, {
+      headers: { ...getSessionHeaders(), ...getRevisionHeaders() },
+    });
+  } catch (err: unknown) {
+    if (isSessionExpiredError(err)) {
+      // Reloading starts a new session from the AIConfig file on the server
+      window.location.reload();
+    }
+    throw err;
+  }
+  return await resolveAIConfig(res);
+}
@@ -0,0 +1,45 @@
+import { v4 as uuidv4 } from "uuid";
+
+// Request header identifying the editor session on the server. Each browser tab
+// has its own session, so tabs don't edit (or save over) each other's AIConfig
+export const AICONFIG_SESSION_HEADER = "X-AIConfig-Session-Id";
+
+const SESSION_ID_STORAGE_KEY = "aiconfig-session-id";
+
+let sessionId: string | undefined;
+
+/**
+ * Returns the id of this tab's session. It's kept in sessionStorage, so reloading
+ * the page keeps the session while a new tab starts a new one.
+ */
+export function getSessionId(): string {
+  if (sessionId == null) {
+    try {
+      sessionId = window.sessionStorage.getItem(SESSION_ID_STORAGE_KEY) ?? "";
+      if (!sessionId) {
+        sessionId = uuidv4();
+        window.sessionStorage.setItem(SESSION_ID_STORAGE_KEY, sessionId);
+      }
+    } catch (e) {
+      // sessionStorage can be unavailable (e.g. disabled cookies): the session lasts until the page is reloaded
+      sessionId = uuidv4();
+    }
+  }
+  return sessionId;
+}
+
+export function getSessionHeaders(): Record<string, string> {
+  return { [AICONFIG_SESSION_HEADER]: getSessionId() };
+}
+
+/**
+ * Returns whether a request failed because the server doesn't have this tab's session
+ * anymore (e.g. it was removed after being idle, or the server restarted).
+ */
+export function isSessionExpiredError(err: unknown): boolean {
+  return (
+    err != null &&
+    typeof err === "object" &&
+    (err as { session_expired?: boolean }).session_expired === true
+  );
+}
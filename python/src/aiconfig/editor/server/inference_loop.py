@@ -0,0 +1,116 @@
+"""
+Runs the editor server's inference on a single long-lived event loop, instead of a thread
+(and a fresh event loop) per run, and streams the output text back to the request threads.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class InferenceLoop:
+    """
+    An asyncio event loop running in a daemon thread, started on first use. Runs are scheduled on it
+    as tasks, so concurrent runs share one thread (blocking SDK calls go to the inference thread pool,
+    see aiconfig.util.thread_pool), and cancelling a run cancels its task.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="aiconfig-editor-inference",
+                    daemon=True,
+                ).start()
+                self._loop = loop
+            return self._loop
+
+    def submit(
+        self, coroutine: Coroutine[Any, Any, T]
+    ) -> "concurrent.futures.Future[T]":
+        """
+        Schedules the coroutine as a task on the loop. Cancelling the returned future cancels the task.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """
+        Runs the coroutine on the loop and waits for its result in the calling thread.
+        """
+        return self.submit(coroutine).result()
+
+
+class OutputTextStream:
+    """
+    The output text streamed by a run, from the inference loop to the thread sending the response.
+
+    Text chunks are accumulated as they arrive, and the reader gets the accumulated text whenever it
+    changed. A slow reader gets fewer, larger updates rather than a growing backlog of chunks, and
+    the run never waits for the reader.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._parts: List[str] = []
+        self._changed = asyncio.Event()
+        self._has_new_text = False
+        self._closed = False
+
+    def put(self, text: str) -> None:
+        """
+        Adds a text chunk. Can be called from any thread.
+        """
+        self._call_on_loop(self._put, text)
+
+    def close(self) -> None:
+        """
+        Ends the stream. Can be called from any thread.
+        """
+        self._call_on_loop(self._close)
+
+    async def get_update(self) -> Optional[str]:
+        """
+        Waits for new text, and returns the text accumulated so far, or None when the stream has ended.
+        Must run on the loop.
+        """
+        await self._changed.wait()
+        self._changed.clear()
+        if self._closed:
+            # Once the stream has ended, every call returns without waiting
+            self._changed.set()
+        if not self._has_new_text:
+            return None
+        self._has_new_text = False
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0]
+
+    def _put(self, text: str) -> None:
+        if not self._closed and text:
+            self._parts.append(text)
+            self._has_new_text = True
+            self._changed.set()
+
+    def _close(self) -> None:
+        self._closed = True
+        self._changed.set()
+
+    def _call_on_loop(self, fn, *args) -> None:
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            fn(*args)
+        else:
+            self._loop.call_soon_threadsafe(fn, *args)
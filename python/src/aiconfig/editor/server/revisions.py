@@ -0,0 +1,198 @@
+import copy
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+import lastmile_utils.lib.core.api as core_utils
+
+JSONPatch = List[core_utils.JSONObject]
+
+# Number of revisions whose patches are kept, i.e. how far behind a client can be and still get a patch
+DEFAULT_MAX_PATCH_HISTORY = 32
+# Bounds the memory used by the patches kept, e.g. when outputs with large images change
+DEFAULT_MAX_PATCH_HISTORY_BYTES = 16 * 1024**2
+
+
+def _escape_pointer_token(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape_pointer_token(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_json_patch(old: Any, new: Any, path: str = "") -> JSONPatch:
+    """
+    Returns a JSON patch (RFC 6902, using "add", "remove" and "replace") that turns `old` into `new`.
+    Dicts are diffed by key. Lists are diffed after skipping their common prefix and suffix,
+    so inserting or deleting a prompt only patches that prompt.
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch: JSONPatch = []
+        for key in old:
+            if key not in new:
+                patch.append(
+                    {
+                        "op": "remove",
+                        "path": f"{path}/{_escape_pointer_token(key)}",
+                    }
+                )
+        for key, value in new.items():
+            key_path = f"{path}/{_escape_pointer_token(key)}"
+            if key not in old:
+                patch.append({"op": "add", "path": key_path, "value": value})
+            else:
+                patch.extend(make_json_patch(old[key], value, key_path))
+        return patch
+    if isinstance(old, list) and isinstance(new, list):
+        return _make_list_patch(old, new, path)
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def _make_list_patch(old: List[Any], new: List[Any], path: str) -> JSONPatch:
+    start = 0
+    while start < min(len(old), len(new)) and old[start] == new[start]:
+        start += 1
+    old_end, new_end = len(old), len(new)
+    while (
+        old_end > start
+        and new_end > start
+        and old[old_end - 1] == new[new_end - 1]
+    ):
+        old_end -= 1
+        new_end -= 1
+
+    # Patch the changed items in place, then remove or add the remaining ones.
+    # Indices are only shifted after the in-place patches, so the operations apply in order.
+    num_common = min(old_end, new_end) - start
+    patch: JSONPatch = []
+    for index in range(start, start + num_common):
+        patch.extend(
+            make_json_patch(old[index], new[index], f"{path}/{index}")
+        )
+    for index in reversed(range(start + num_common, old_end)):
+        patch.append({"op": "remove", "path": f"{path}/{index}"})
+    for index in range(start + num_common, new_end):
+        patch.append(
+            {"op": "add", "path": f"{path}/{index}", "value": new[index]}
+        )
+    return patch
+
+
+def apply_json_patch(document: Any, patch: JSONPatch) -> Any:
+    """
+    Applies a JSON patch made by `make_json_patch` to a copy of the document, and returns it.
+    """
+    document = copy.deepcopy(document)
+    for operation in patch:
+        tokens = [
+            _unescape_pointer_token(token)
+            for token in operation["path"].split("/")[1:]
+        ]
+        value = copy.deepcopy(operation.get("value"))
+        if not tokens:
+            document = value
+            continue
+
+        parent = document
+        for token in tokens[:-1]:
+            parent = (
+                parent[int(token)]
+                if isinstance(parent, list)
+                else parent[token]
+            )
+        last_token = tokens[-1]
+        if isinstance(parent, list):
+            index = len(parent) if last_token == "-" else int(last_token)
+            if operation["op"] == "add":
+                parent.insert(index, value)
+            elif operation["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = value
+        elif operation["op"] == "remove":
+            del parent[last_token]
+        else:
+            parent[last_token] = value
+    return document
+
+
+class AIConfigRevisions:
+    """
+    Tracks revisions of the AIConfig the editor server sends to clients. The revision increases every time
+    the config differs from the last one sent, and a patch from the previous revision is kept for the last
+    revisions, so a client that sends its revision back gets the changes since then instead of the whole config.
+    Besides the last snapshot, at most `max_patch_history` patches and `max_patch_history_bytes` of patches
+    (as JSON) are kept.
+    """
+
+    def __init__(
+        self,
+        max_patch_history: int = DEFAULT_MAX_PATCH_HISTORY,
+        max_patch_history_bytes: int = DEFAULT_MAX_PATCH_HISTORY_BYTES,
+    ):
+        # Start from the current time rather than 0, so that a client holding a revision
+        # from before a server restart can't mistake the new config for its own
+        self.revision = time.time_ns() // 1_000_000
+        self._snapshot: Optional[core_utils.JSONObject] = None
+        self.max_patch_history = max_patch_history
+        self.max_patch_history_bytes = max_patch_history_bytes
+        # (revision, patch from revision - 1, size of the patch as JSON), oldest first
+        self._patches: Deque[Tuple[int, JSONPatch, int]] = deque()
+        self._patches_bytes = 0
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        snapshot: core_utils.JSONObject,
+        base_revision: Optional[int] = None,
+    ) -> Tuple[int, Optional[JSONPatch]]:
+        """
+        Records the current config snapshot.
+
+        Args:
+            snapshot (dict): The serialized AIConfig.
+            base_revision (int, optional): The revision the client has.
+
+        Returns:
+            (int, JSONPatch | None): The new revision, and the patch from `base_revision` to it,
+                or None if the client needs the full snapshot (no or unknown base revision).
+        """
+        with self._lock:
+            if self._snapshot is None:
+                self.revision += 1
+            elif snapshot != self._snapshot:
+                self.revision += 1
+                self._add_patch(make_json_patch(self._snapshot, snapshot))
+            self._snapshot = snapshot
+
+            if base_revision is None or base_revision > self.revision:
+                return self.revision, None
+            if base_revision == self.revision:
+                return self.revision, []
+            patches = [
+                patch
+                for revision, patch, _ in self._patches
+                if revision > base_revision
+            ]
+            if len(patches) != self.revision - base_revision:
+                # The base revision is older than the history
+                return self.revision, None
+            return self.revision, [
+                operation for patch in patches for operation in patch
+            ]
+
+    def _add_patch(self, patch: JSONPatch) -> None:
+        num_bytes = len(json.dumps(patch, default=str))
+        self._patches.append((self.revision, patch, num_bytes))
+        self._patches_bytes += num_bytes
+        while self._patches and (
+            len(self._patches) > self.max_patch_history
+            or self._patches_bytes > self.max_patch_history_bytes
+        ):
+            _, _, removed_bytes = self._patches.popleft()
+            self._patches_bytes -= removed_bytes
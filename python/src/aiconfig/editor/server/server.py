@@ -1,10 +1,6 @@
-import asyncio
 import copy
-import ctypes
 import json
 import logging
-import threading
-import time
 import uuid
 import webbrowser
 from typing import Any, Dict, Literal, Type, Union
@@ -17,9 +13,9 @@ from flask_cors import CORS
 from result import Err, Ok, Result
 
 from aiconfig.Config import AIConfigRuntime
-from aiconfig.editor.server.queue_iterator import (
-    STOP_STREAMING_SIGNAL,
-    QueueIterator,
+from aiconfig.editor.server.inference_loop import (
+    InferenceLoop,
+    OutputTextStream,
 )
 from aiconfig.editor.server.server_utils import (
     AIConfigRC,
@@ -34,6 +30,7 @@ from aiconfig.editor.server.server_utils import (
     ValidatedPath,
     get_http_response_load_user_parser_module,
     get_server_state,
+    get_session_state,
     get_validated_path,
     init_server_state,
     make_op_run_method,
@@ -43,9 +40,11 @@ from aiconfig.editor.server.server_utils import (
     safe_run_aiconfig_static_method,
     validate_env_file_path,
 )
+from aiconfig.editor.server.sessions import SessionExpiredError
 from aiconfig.model_parser import InferenceOptions
 from aiconfig.registry import ModelParserRegistry
 from aiconfig.schema import ExecuteResult, Output, Prompt, PromptMetadata
+from aiconfig.util.blob_store import get_blob_store, make_blob_uri
 
 logging.getLogger("werkzeug").disabled = True
 
@@ -63,6 +62,30 @@ LOGGER.addHandler(log_handler)
 app = Flask(__name__, static_url_path="")
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
+# Runs the inference of all the prompts run from the editor
+INFERENCE_LOOP = InferenceLoop()
+
+# Content types /api/blob can serve blobs as. Blobs hold arbitrary bytes, so types the browser could
+# execute or render as a document (text/html, image/svg+xml...) are served as application/octet-stream.
+BLOB_MIME_TYPES = frozenset(
+    [
+        "application/octet-stream",
+        "audio/flac",
+        "audio/mpeg",
+        "audio/ogg",
+        "audio/wav",
+        "audio/webm",
+        "audio/x-wav",
+        "image/bmp",
+        "image/gif",
+        "image/jpeg",
+        "image/png",
+        "image/webp",
+        "video/mp4",
+        "video/webm",
+    ]
+)
+
 
 def run_backend_server(
     initialization_settings: StartServerConfig | EditServerConfig,
@@ -128,6 +151,17 @@ def _validated_request_path(
         )
 
 
+@app.errorhandler(SessionExpiredError)
+def session_expired(e: SessionExpiredError) -> FlaskResponse:
+    # 410 Gone: the client reloads, which starts a new session from the AIConfig file
+    return HttpResponseWithAIConfig(
+        message=str(e),
+        code=410,
+        aiconfig=None,
+        payload={"session_expired": True},
+    ).to_flask_format()
+
+
 @app.route("/")
 def home():
     return app.send_static_file("index.html")
@@ -138,6 +172,37 @@ def server_status() -> FlaskResponse:
     return FlaskResponse(({"status": "OK"}, 200))
 
 
+@app.route("/api/blob/<digest>", methods=["GET"])
+def get_blob(digest: str) -> FlaskResponse | Response:
+    """
+    Serves a binary output referenced by a blob URI (see aiconfig.util.blob_store), so outputs
+    stored in the config's blob store can be displayed without inlining them in the config.
+    """
+    session = get_session_state(app)
+    blob_store = get_blob_store(session.aiconfig)
+    if blob_store is None:
+        return FlaskResponse(
+            ({"message": "No blob store is configured."}, 404)
+        )
+    try:
+        data = blob_store.get(make_blob_uri(digest))
+    except (KeyError, ValueError) as e:
+        return FlaskResponse(({"message": str(e)}, 404))
+
+    mime_type = request.args.get("mime_type", "application/octet-stream")
+    if mime_type not in BLOB_MIME_TYPES:
+        mime_type = "application/octet-stream"
+    return Response(
+        data,
+        mimetype=mime_type,
+        headers={
+            # Blobs are content-addressed, so they never change
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "X-Content-Type-Options": "nosniff",
+        },
+    )
+
+
 @app.route("/api/list_models", methods=["GET"])
 def list_models() -> FlaskResponse:
     out: list[str] = ModelParserRegistry.parser_ids()  # type: ignore
@@ -164,7 +229,8 @@ def load_model_parser_module() -> FlaskResponse:
 
 @app.route("/api/load", methods=["POST"])
 def load() -> FlaskResponse:
-    state = get_server_state(app)
+    # The client loads the AIConfig first, which starts its session
+    session = get_session_state(app, create=True)
     request_json = request.get_json()
     if not request_json.keys() <= {"path"}:
         return HttpResponseWithAIConfig(
@@ -174,7 +240,7 @@ def load() -> FlaskResponse:
         ).to_flask_format()
     path: str | None = request_json.get("path", None)
     if path is None:
-        aiconfig = state.aiconfig
+        aiconfig = session.aiconfig
         if aiconfig is None:
             return HttpResponseWithAIConfig(
                 message="No AIConfig loaded", code=400, aiconfig=None
@@ -192,7 +258,8 @@ def load() -> FlaskResponse:
                 LOGGER.warning(
                     f"Loaded AIConfig from {res_path_val}. This may have overwritten in-memory changes."
                 )
-                state.aiconfig = aiconfig
+                session.aiconfig = aiconfig
+                session.record_file_state()
                 return HttpResponseWithAIConfig(
                     message="Loaded", aiconfig=aiconfig
                 ).to_flask_format()
@@ -206,7 +273,7 @@ def load() -> FlaskResponse:
 
 @app.route("/api/load_content", methods=["POST"])
 def load_content() -> FlaskResponse:
-    state = get_server_state(app)
+    session = get_session_state(app, create=True)
     request_json = request.get_json()
 
     content = request_json.get("content", None)
@@ -225,7 +292,7 @@ def load_content() -> FlaskResponse:
                 ),
             )
 
-            state.aiconfig = aiconfig
+            session.aiconfig = aiconfig
             return HttpResponseWithAIConfig(
                 message="Created", aiconfig=aiconfig
             ).to_flask_format()
@@ -237,7 +304,7 @@ def load_content() -> FlaskResponse:
     else:
         aiconfig = AIConfigRuntime.load_yaml(content)
 
-    state.aiconfig = aiconfig
+    session.aiconfig = aiconfig
     return HttpResponseWithAIConfig(
         message="Loaded", aiconfig=aiconfig
     ).to_flask_format()
@@ -245,8 +312,8 @@ def load_content() -> FlaskResponse:
 
 @app.route("/api/save", methods=["POST"])
 def save() -> FlaskResponse:
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
     path: str | None = request_json.get("path", None)
 
@@ -264,13 +331,22 @@ def save() -> FlaskResponse:
     res_path_val = get_validated_path(path, allow_create=True)
     match res_path_val:
         case Ok(path_ok):
+            # Sessions editing the same file don't silently overwrite each other's changes
+            if session.is_file_changed(path_ok):
+                return HttpResponseWithAIConfig(
+                    message=f"Failed to save AIConfig: {path_ok} was changed since this session loaded it, e.g. by another session. Reload it, or save to another path.",
+                    code=409,
+                    aiconfig=None,
+                ).to_flask_format()
             _op = make_op_run_method(MethodName("save"))
             op_args: Result[OpArgs, str] = result.Ok(
                 OpArgs({"config_filepath": path_ok})
             )
-            return run_aiconfig_operation_with_op_args(
+            response = run_aiconfig_operation_with_op_args(
                 aiconfig, "save", _op, op_args
             )
+            session.record_file_state(path_ok)
+            return response
 
         case Err(e):
             return HttpResponseWithAIConfig(
@@ -282,8 +358,8 @@ def save() -> FlaskResponse:
 
 @app.route("/api/to_string", methods=["POST"])
 def to_string() -> FlaskResponse:
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
     mode: Literal["json", "yaml"] = request_json.get("mode", "json")
     include_outputs: bool = request_json.get("include_outputs", True)
@@ -306,13 +382,13 @@ def to_string() -> FlaskResponse:
 
 @app.route("/api/create", methods=["POST"])
 def create() -> FlaskResponse:
-    state = get_server_state(app)
+    session = get_session_state(app)
     aiconfig = safe_run_aiconfig_static_method(
         MethodName("create"), OpArgs({}), AIConfigRuntime
     )
     match aiconfig:
         case Ok(aiconfig_ok):
-            state.aiconfig = aiconfig_ok
+            session.aiconfig = aiconfig_ok
             return HttpResponseWithAIConfig(
                 message="Created new AIConfig", aiconfig=aiconfig_ok
             ).to_flask_format()
@@ -332,6 +408,7 @@ def run() -> FlaskResponse:
         "callback_manager": True,
     }
     state = get_server_state(app)
+    session = get_session_state(app)
 
     # Allow user to modify their environment keys without reloading the server.
     # Execution time of `0.001s` is arbitrary, but should be small enough to not be noticeable.
@@ -339,7 +416,7 @@ def run() -> FlaskResponse:
     override_behaviour = state.env_file_path is not None
     dotenv.load_dotenv(state.env_file_path, override=override_behaviour)
 
-    aiconfig = state.aiconfig
+    aiconfig = session.aiconfig
     request_json = request.get_json()
     cancellation_token_id: str | None = None
     aiconfig_deep_copy: AIConfigRuntime | None = None
@@ -363,36 +440,38 @@ def run() -> FlaskResponse:
     params = request_json.get("params", aiconfig.get_parameters(prompt_name))  # type: ignore
     stream = request_json.get("stream", True)
 
-    # Define stream callback and queue object for streaming results
-    output_text_queue = QueueIterator()
+    output_text_stream = OutputTextStream(INFERENCE_LOOP.loop)
 
-    def update_output_queue(
-        data: str, _accumulated_data: str, _index: int
+    def update_output_stream(
+        data: Any, _accumulated_data: Any, _index: int
     ) -> None:
-        should_end_stream: bool = data == STOP_STREAMING_SIGNAL
-        output_text_queue.put(data, should_end_stream)
+        if isinstance(data, str):
+            output_text_stream.put(data)
+        elif isinstance(data, dict) and "content" in data:
+            # TODO: Fix streaming output format so that it returns text
+            output_text_stream.put(data["content"] or "")
+        elif isinstance(data, dict) and "generated_text" in data:
+            # TODO: Fix streaming output format so that it returns text
+            output_text_stream.put(data["generated_text"] or "")
 
     inference_options = InferenceOptions(
         stream=stream,
-        stream_callback=update_output_queue,
+        stream_callback=update_output_stream,
     )
 
     # Deepcopy the aiconfig prior to run so we can restore it in the case the run operation is cancelled or encounters some error
     aiconfig_deep_copy = copy.deepcopy(aiconfig)
 
-    state.events[cancellation_token_id] = threading.Event()
+    async def run_prompt() -> None:
+        await aiconfig.run(prompt_name=prompt_name, params=params, run_with_dependencies=False, options=inference_options)  # type: ignore
 
-    def generate(cancellation_token_id: str):  # type: ignore
-        # Use multi-threading so that we don't block run command from
-        # displaying the streamed output (if streaming is supported)
-        def run_async_config_in_thread():
-            try:
-                asyncio.run(aiconfig.run(prompt_name=prompt_name, params=params, run_with_dependencies=False, options=inference_options))  # type: ignore
-            except Exception as e:
-                output_text_queue.put(e)
-
-            output_text_queue.put(STOP_STREAMING_SIGNAL)  # type: ignore
+    # The run is a task on the shared inference loop; /api/cancel cancels it
+    run_future = INFERENCE_LOOP.submit(run_prompt())
+    # Also ends the stream if the task is cancelled before it starts
+    run_future.add_done_callback(lambda _: output_text_stream.close())
+    session.runs[cancellation_token_id] = run_future
 
+    def generate(cancellation_token_id: str):  # type: ignore
         def create_error_payload(message: str, code: int):
             aiconfig_json = (
                 aiconfig_deep_copy.model_dump(exclude=EXCLUDE_OPTIONS)
@@ -409,124 +488,62 @@ def run() -> FlaskResponse:
                 }
             )
 
-        def create_cancellation_payload():
-            return create_error_payload(
-                message="The task was cancelled.", code=499
-            )
-
         def handle_cancellation():
             yield "["
-            yield create_cancellation_payload()
-            yield "]"
-
-            # Reset the aiconfig state to the state prior to the run, and kill the running thread
-            kill_thread(t.ident)
-            state.aiconfig = aiconfig_deep_copy
-
-        def kill_thread(thread_id: int | None):
-            """
-            Kill the thread with the given thread_id.
-
-            PyThreadState_SetAsyncExc: This is a C API function in Python which is used to raise an exception in the context
-            of the specified thread.
-
-            SystemExit: This is the exception we'd like to raise in the target thread.
-            """
-            if thread_id is None:
-                # Nothing to do
-                return
-
-            response = ctypes.pythonapi.PyThreadState_SetAsyncExc(
-                ctypes.c_long(thread_id), ctypes.py_object(SystemExit)
+            yield create_error_payload(
+                message="The task was cancelled.", code=499
             )
+            yield "]"
 
-            if response == 0:
-                print(f"Invalid thread id {thread_id}")
-            elif response != 1:
-                # If the response is not 1, the function didn't work correctly, and you should call it again with exc=NULL to reset it.
-                ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, None)
-
-        cancellation_event = state.events[cancellation_token_id]
-
-        t = threading.Thread(target=run_async_config_in_thread)
-        t.start()
-
-        # If model supports streaming, need to wait until streamer has at
-        # least 1 item to display. If model does not support streaming,
-        # need to wait until the aiconfig.run() thread is complete
-        SLEEP_DELAY_SECONDS = 0.1
-        wait_time_in_seconds = 0.0
-        while output_text_queue.isEmpty() and t.is_alive():
-            if cancellation_event.is_set():
-                yield from handle_cancellation()
-                return
-
-            # Yea I know time.sleep() isn't super accurate, but it's fine,
-            # we can fix later
-            time.sleep(0.1)
-            wait_time_in_seconds += SLEEP_DELAY_SECONDS
-            print(
-                f"Output queue is currently empty. Waiting for {wait_time_in_seconds:.1f}s..."
-            )
+            # Reset the aiconfig state to the state prior to the run
+            session.aiconfig = aiconfig_deep_copy
 
+        # Wait for output text without polling. If the model doesn't support streaming,
+        # the stream ends when the run is complete.
         # Yield in flask is weird and you either need to send responses as a
         # string, or artificially wrap them around "[" and "]"
-        # yield "["
-        if not output_text_queue.isEmpty():
-            accumulated_output_text = ""
-            for text in output_text_queue:
-                if cancellation_event.is_set():
-                    yield from handle_cancellation()
-                    return
-
-                if isinstance(text, Exception):
-                    yield from create_error_payload(
-                        message=f"Exception: {text}", code=500
-                    )
-                    return
-                elif isinstance(text, str):
-                    accumulated_output_text += text
-                elif isinstance(text, dict) and "content" in text:
-                    # TODO: Fix streaming output format so that it returns text
-                    accumulated_output_text += text["content"]
-                elif isinstance(text, dict) and "generated_text" in text:
-                    # TODO: Fix streaming output format so that it returns text
-                    accumulated_output_text += text["generated_text"]
-
-                accumulated_output: Output = ExecuteResult(
-                    **{
-                        "output_type": "execute_result",
-                        "data": accumulated_output_text,
-                        # Assume streaming only supports single output
-                        # I think this actually may be wrong for PaLM or OpenAI
-                        # TODO: Need to sync with Ankush but can fix forward
-                        "execution_count": 0,
-                        "metadata": {},
-                    }  # type: ignore
-                )
-                yield "["
-                yield json.dumps(
-                    {"output_chunk": accumulated_output.to_json()}
-                )
-                yield "]"
-
-        # Ensure that the run process is complete to yield final output
-        t.join()
+        while True:
+            accumulated_output_text = INFERENCE_LOOP.run(
+                output_text_stream.get_update()
+            )
+            if accumulated_output_text is None or run_future.cancelled():
+                break
+
+            accumulated_output: Output = ExecuteResult(
+                **{
+                    "output_type": "execute_result",
+                    "data": accumulated_output_text,
+                    # Assume streaming only supports single output
+                    # I think this actually may be wrong for PaLM or OpenAI
+                    # TODO: Need to sync with Ankush but can fix forward
+                    "execution_count": 0,
+                    "metadata": {},
+                }  # type: ignore
+            )
+            yield "["
+            yield json.dumps({"output_chunk": accumulated_output.to_json()})
+            yield "]"
 
-        if cancellation_event.is_set():
+        if run_future.cancelled():
             yield from handle_cancellation()
             return
-        else:
-            state.events.pop(cancellation_token_id, None)
 
-            aiconfig_json = (
-                aiconfig.model_dump(exclude=EXCLUDE_OPTIONS)
-                if aiconfig is not None
-                else None
+        session.runs.pop(cancellation_token_id, None)
+        exception = run_future.exception()
+        if exception is not None:
+            yield create_error_payload(
+                message=f"Exception: {exception}", code=500
             )
-            yield "["
-            yield json.dumps({"aiconfig_chunk": aiconfig_json})
-            yield "]"
+            return
+
+        aiconfig_json = (
+            aiconfig.model_dump(exclude=EXCLUDE_OPTIONS)
+            if aiconfig is not None
+            else None
+        )
+        yield "["
+        yield json.dumps({"aiconfig_chunk": aiconfig_json})
+        yield "]"
 
         yield "["
         yield json.dumps({"stop_streaming": None})
@@ -556,18 +573,17 @@ def run() -> FlaskResponse:
 
 @app.route("/api/cancel", methods=["POST"])
 def cancel() -> FlaskResponse:
-    state = get_server_state(app)
+    session = get_session_state(app)
     request_json = request.get_json()
 
     cancellation_token_id: str | None = request_json.get(
         "cancellation_token_id"
     )
     if cancellation_token_id is not None:
-        event = state.events.get(cancellation_token_id)
-        if event is not None:
-            event.set()
-            # Remove the event from the events dict
-            state.events.pop(cancellation_token_id)
+        run_future = session.runs.pop(cancellation_token_id, None)
+        if run_future is not None:
+            # Cancels the run's task on the inference loop
+            run_future.cancel()
 
             return FlaskResponse(
                 ({"cancellation_token_id": cancellation_token_id}, 200)
@@ -604,8 +620,8 @@ def add_prompt() -> FlaskResponse:
         "index": int,
     }
 
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     operation = make_op_run_method(method_name)
@@ -622,8 +638,8 @@ def update_prompt() -> FlaskResponse:
         "prompt_data": Prompt,
     }
 
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     operation = make_op_run_method(method_name)
@@ -637,8 +653,8 @@ def delete_model() -> FlaskResponse:
     method_name = MethodName("delete_model")
     signature: dict[str, Type[Any]] = {"model_name": str}
 
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     operation = make_op_run_method(method_name)
@@ -652,8 +668,8 @@ def delete_prompt() -> FlaskResponse:
     method_name = MethodName("delete_prompt")
     signature: dict[str, Type[Any]] = {"prompt_name": str}
 
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     operation = make_op_run_method(method_name)
@@ -664,8 +680,8 @@ def delete_prompt() -> FlaskResponse:
 
 @app.route("/api/update_model", methods=["POST"])
 def update_model() -> FlaskResponse:
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     model_name: str | None = request_json.get("model_name")
@@ -689,8 +705,8 @@ def update_model() -> FlaskResponse:
 
 @app.route("/api/set_parameter", methods=["POST"])
 def set_parameter() -> FlaskResponse:
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     parameter_name: str | None = request_json.get("parameter_name")
@@ -716,8 +732,8 @@ def set_parameter() -> FlaskResponse:
 
 @app.route("/api/set_parameters", methods=["POST"])
 def set_parameters() -> FlaskResponse:
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     parameters: Dict[str, Any] = request_json.get("parameters")
@@ -734,8 +750,8 @@ def set_parameters() -> FlaskResponse:
 
 @app.route("/api/delete_parameter", methods=["POST"])
 def delete_parameter() -> FlaskResponse:
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     parameter_name: str | None = request_json.get("parameter_name")
@@ -752,8 +768,8 @@ def delete_parameter() -> FlaskResponse:
 
 @app.route("/api/set_name", methods=["POST"])
 def set_name() -> FlaskResponse:
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     name: str | None = request_json.get("name")
@@ -767,8 +783,8 @@ def set_name() -> FlaskResponse:
 
 @app.route("/api/set_description", methods=["POST"])
 def set_description() -> FlaskResponse:
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     description: str | None = request_json.get("description")
@@ -788,8 +804,8 @@ def clear_outputs() -> FlaskResponse:
     Clears all outputs in the server state's AIConfig.
     """
     method_name = MethodName("clear_outputs")
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     if aiconfig is None:
@@ -821,8 +837,8 @@ def delete_output() -> FlaskResponse:
     Clears a single outputs in the server state's AIConfig based on prompt name.
     """
     method_name = MethodName("delete_output")
-    state = get_server_state(app)
-    aiconfig = state.aiconfig
+    session = get_session_state(app)
+    aiconfig = session.aiconfig
     request_json = request.get_json()
 
     if aiconfig is None:
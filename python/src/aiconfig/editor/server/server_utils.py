@@ -8,7 +8,6 @@ import typing
 from dataclasses import dataclass, field
 from enum import Enum
 from textwrap import dedent
-from threading import Event
 from types import ModuleType
 from typing import Any, Callable, NewType, Type, TypeVar, cast, Optional, Tuple
 
@@ -16,7 +15,12 @@ import lastmile_utils.lib.core.api as core_utils
 import result
 from aiconfig.Config import AIConfigRuntime
 from aiconfig.registry import ModelParserRegistry
-from flask import Flask
+from aiconfig.editor.server.sessions import (
+    AICONFIG_SESSION_HEADER,
+    SessionState,
+    SessionStore,
+)
+from flask import Flask, current_app, has_request_context, request
 from pydantic import field_validator
 from result import Err, Ok, Result
 from ruamel.yaml import YAML
@@ -102,8 +106,8 @@ class StartServerConfig(core_utils.Record):
 @dataclass
 class ServerState:
     aiconfigrc_path: str = os.path.join(os.path.expanduser("~"), ".aiconfigrc")
-    aiconfig: AIConfigRuntime | None = None
-    events: dict[str, Event] = field(default_factory=dict)
+    # The AIConfig, runs and revisions of each session
+    sessions: SessionStore = field(default_factory=SessionStore)
     env_file_path: str | None = None
 
 
@@ -140,6 +144,18 @@ DEFAULT_AICONFIGRC = YAML().load(
 
 FlaskResponse = NewType("FlaskResponse", tuple[core_utils.JSONObject, int])
 
+# Request header with the AIConfig revision the client has. When it's set, responses
+# send a patch from that revision ("aiconfig_patch") instead of the whole AIConfig, if possible.
+AICONFIG_REVISION_HEADER = "X-AIConfig-Revision"
+
+
+def _get_request_base_revision() -> int | None:
+    value = request.headers.get(AICONFIG_REVISION_HEADER)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
 
 @dataclass(frozen=True)
 class HttpResponseWithAIConfig:
@@ -160,9 +176,22 @@ class HttpResponseWithAIConfig:
             **(self.payload if self.payload is not None else {}),
         }
         if self.aiconfig is not None:
-            out["aiconfig"] = self.aiconfig.model_dump(
+            snapshot = self.aiconfig.model_dump(
                 exclude=HttpResponseWithAIConfig.EXCLUDE_OPTIONS
             )
+            if has_request_context():
+                base_revision = _get_request_base_revision()
+                revision, patch = get_session_state(
+                    current_app
+                ).revisions.update(snapshot, base_revision)
+                out["revision"] = revision
+                if patch is not None:
+                    out["base_revision"] = base_revision
+                    out["aiconfig_patch"] = patch
+                else:
+                    out["aiconfig"] = snapshot
+            else:
+                out["aiconfig"] = snapshot
 
         return FlaskResponse((out, self.code))
 
@@ -171,6 +200,24 @@ def get_server_state(app: Flask) -> ServerState:
     return app.server_state  # type: ignore
 
 
+def get_session_state(app: Flask, create: bool = False) -> SessionState:
+    """
+    Returns the state of the session of the current request, set by the X-AIConfig-Session-Id header,
+    or the `session_id` query parameter for requests the browser makes itself (e.g. images of blob outputs).
+
+    Args:
+        create (bool): Create the session if it doesn't exist. Only requests that load the AIConfig create
+            sessions, other requests for unknown sessions raise SessionExpiredError.
+    """
+    sessions = get_server_state(app).sessions
+    session_id = request.headers.get(
+        AICONFIG_SESSION_HEADER
+    ) or request.args.get("session_id")
+    if create:
+        return sessions.get_or_create(session_id)
+    return sessions.get(session_id)
+
+
 def resolve_path(path: str) -> str:
     return os.path.abspath(os.path.expanduser(path))
 
@@ -315,14 +362,15 @@ def init_server_state(
     # else:
     edit_config = initialization_settings
 
-    assert state.aiconfig is None
+    assert state.sessions.default.aiconfig is None
     if os.path.exists(edit_config.aiconfig_path):
         LOGGER.info(f"Loading AIConfig from {edit_config.aiconfig_path}")
         val_path = get_validated_path(edit_config.aiconfig_path)
         aiconfig_runtime = val_path.and_then(safe_load_from_disk)
         match aiconfig_runtime:
             case Ok(aiconfig_runtime_):
-                state.aiconfig = aiconfig_runtime_
+                state.sessions.default.aiconfig = aiconfig_runtime_
+                state.sessions.default.record_file_state()
                 LOGGER.info(
                     f"Loaded AIConfig from {edit_config.aiconfig_path}"
                 )
@@ -348,7 +396,7 @@ def init_server_state(
                 ),
             )
 
-        state.aiconfig = aiconfig_runtime
+        state.sessions.default.aiconfig = aiconfig_runtime
         LOGGER.info("Created new AIConfig")
         try:
             aiconfig_runtime.save(edit_config.aiconfig_path)
@@ -356,7 +404,8 @@ def init_server_state(
             LOGGER.info(
                 f"Saved new AIConfig to {edit_config.aiconfig_path} (aiconfig path field: {aiconfig_runtime.file_path})"
             )
-            state.aiconfig = aiconfig_runtime
+            state.sessions.default.aiconfig = aiconfig_runtime
+            state.sessions.default.record_file_state()
             return Ok(None)
         except Exception as e:
             LOGGER.error(
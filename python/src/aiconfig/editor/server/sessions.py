@@ -0,0 +1,199 @@
+"""
+Session-scoped editor state, so that one editor server can serve several users or files at a time.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Tuple
+
+from aiconfig.Config import AIConfigRuntime
+from aiconfig.editor.server.revisions import AIConfigRevisions
+
+# Request header identifying the session. Requests without it use the default session,
+# which holds the AIConfig the server was started with.
+AICONFIG_SESSION_HEADER = "X-AIConfig-Session-Id"
+DEFAULT_SESSION_ID = "default"
+
+DEFAULT_MAX_SESSIONS = 64
+# Sessions that aren't used for this long are removed
+DEFAULT_SESSION_IDLE_TIMEOUT_S = 2 * 60 * 60
+
+
+@dataclass
+class SessionState:
+    aiconfig: AIConfigRuntime | None = None
+    # Cancellation token id -> the run's task on the inference loop
+    runs: dict[str, Future[None]] = field(default_factory=dict)
+    revisions: AIConfigRevisions = field(default_factory=AIConfigRevisions)
+    last_used_time: float = field(default_factory=time.monotonic)
+    # The AIConfig file as this session last loaded or saved it: (path, (mtime_ns, size) or None if it didn't exist).
+    # Sessions editing the same file don't overwrite each other's changes, see `is_file_changed`.
+    file_state: Tuple[str, Tuple[int, int] | None] | None = None
+
+    def has_running_runs(self) -> bool:
+        return any(not run.done() for run in self.runs.values())
+
+    def record_file_state(self, path: str | None = None) -> None:
+        """
+        Records the state of the AIConfig file after this session loaded or saved it.
+        Defaults to the file of the session's AIConfig.
+        """
+        if path is None and self.aiconfig is not None:
+            path = self.aiconfig.file_path
+        self.file_state = (
+            (os.path.realpath(path), _get_file_state(path))
+            if path is not None
+            else None
+        )
+
+    def is_file_changed(self, path: str) -> bool:
+        """
+        Returns whether the AIConfig file changed since this session last loaded or saved it,
+        e.g. because another session saved it.
+        """
+        if self.file_state is None:
+            return False
+        recorded_path, recorded_state = self.file_state
+        return (
+            os.path.realpath(path) == recorded_path
+            and _get_file_state(path) != recorded_state
+        )
+
+
+def _get_file_state(path: str) -> Tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SessionExpiredError(Exception):
+    """
+    Raised when a request refers to a session the server doesn't have (anymore), e.g. because it was
+    removed after being idle or the server restarted. The client has to reload to start a new session.
+    """
+
+    def __init__(self, session_id: str):
+        super().__init__(
+            f"Session '{session_id}' expired. Reload the editor to start a new session."
+        )
+        self.session_id = session_id
+
+
+class SessionStore:
+    """
+    Maps session ids to their state. Sessions are created with `get_or_create` when the client loads the
+    editor; other requests for unknown sessions raise SessionExpiredError. A new session starts from the
+    default session's AIConfig file as it is on disk, and saves to the same file by default, unless the
+    file was saved by another session since it was loaded.
+
+    At most `max_sessions` sessions (besides the default one) are kept: the least recently used sessions
+    are removed first, as well as sessions idle for more than `idle_timeout_s`. Sessions with runs in
+    progress are kept until their runs are done. The store's lock is only held to look sessions up,
+    so runs and edits in different sessions don't wait on each other.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_timeout_s: float = DEFAULT_SESSION_IDLE_TIMEOUT_S,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_timeout_s = idle_timeout_s
+        self.default = SessionState()
+        # Least recently used first
+        self._sessions: OrderedDict[str, SessionState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def get(self, session_id: str | None) -> SessionState:
+        """
+        Returns the state of the session.
+
+        Raises:
+            SessionExpiredError: If the session doesn't exist.
+        """
+        session = self._get_existing(session_id, time.monotonic())
+        if session is None:
+            raise SessionExpiredError(session_id)
+        return session
+
+    def get_or_create(self, session_id: str | None) -> SessionState:
+        """
+        Returns the state of the session, creating it if needed.
+        """
+        now = time.monotonic()
+        session = self._get_existing(session_id, now)
+        if session is not None:
+            return session
+
+        # Load the config without holding the lock, it can be large
+        new_session = self._create_session()
+        with self._lock:
+            session = self._sessions.setdefault(session_id, new_session)
+            self._sessions.move_to_end(session_id)
+            session.last_used_time = now
+            self._remove_expired_sessions(now)
+            return session
+
+    def _get_existing(
+        self, session_id: str | None, now: float
+    ) -> SessionState | None:
+        if session_id is None or session_id == DEFAULT_SESSION_ID:
+            self.default.last_used_time = now
+            return self.default
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._sessions.move_to_end(session_id)
+                session.last_used_time = now
+                self._remove_expired_sessions(now)
+            return session
+
+    def _create_session(self) -> SessionState:
+        # The default session's AIConfig in memory can be stale (e.g. another session saved the file),
+        # so start from the file on disk
+        default_aiconfig = self.default.aiconfig
+        path = getattr(default_aiconfig, "file_path", None)
+        if path is not None and os.path.isfile(path):
+            session = SessionState(aiconfig=AIConfigRuntime.load(path))
+            session.record_file_state(path)
+            return session
+        # Configs that were never saved only exist in memory
+        return SessionState(
+            aiconfig=copy.deepcopy(default_aiconfig),
+            file_state=self.default.file_state,
+        )
+
+    def remove(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _remove_expired_sessions(self, now: float) -> None:
+        # Only the least recently used sessions are looked at: each call removes expired sessions
+        # and skips sessions with runs in progress, until the first session to keep. The session
+        # of the current request, the most recently used one, is never looked at.
+        for _ in range(len(self._sessions) - 1):
+            session_id, session = next(iter(self._sessions.items()))
+            is_over_capacity = len(self._sessions) > self.max_sessions
+            is_idle = now - session.last_used_time > self.idle_timeout_s
+            if not is_over_capacity and not is_idle:
+                # The following sessions were used more recently
+                return
+            if session.has_running_runs():
+                # Look at it again once the other sessions have been
+                self._sessions.move_to_end(session_id)
+            else:
+                del self._sessions[session_id]
@@ -14,6 +14,8 @@ from .. import common, metrics
 
 # pyright: reportWildcardImportFromLibrary=false
 from ..lib import (
+    TestSuiteGeneralSettings,
+    TestSuiteOutputsOnlySettings,
     TestSuiteWithInputsSettings,
     run_test_suite_outputs_only,
     run_test_suite_with_inputs,
@@ -24,5 +26,7 @@ __all__ = [
     "metrics",
     "run_test_suite_outputs_only",
     "run_test_suite_with_inputs",
+    "TestSuiteGeneralSettings",
+    "TestSuiteOutputsOnlySettings",
     "TestSuiteWithInputsSettings",
 ]
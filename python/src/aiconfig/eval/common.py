@@ -1,7 +1,15 @@
 import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Generic, NewType, Protocol, Type, TypeVar
+from typing import (
+    Any,
+    Generic,
+    NewType,
+    Protocol,
+    Sequence,
+    Type,
+    TypeVar,
+)
 
 import lastmile_utils.lib.core.api as core_utils
 import result
@@ -44,6 +52,12 @@ class CompletionTextToSerializedJSON(Protocol):
         pass
 
 
+class AsyncCompletionTextToSerializedJSON(Protocol):
+    @abstractmethod
+    async def __call__(self, output_datum: str) -> Result[SerializedJSON, str]:
+        pass
+
+
 @dataclass(frozen=True)
 class CustomMetricPydanticObject(CustomMetricValue, Generic[T_BaseModel]):
     data: T_BaseModel
@@ -55,6 +69,14 @@ class EvaluationFunction(Protocol, Generic[T_Evaluable, T_MetricValue]):
         pass
 
 
+class BatchEvaluationFunction(Protocol, Generic[T_Evaluable, T_MetricValue]):
+    @abstractmethod
+    async def __call__(
+        self, data: Sequence[T_Evaluable]
+    ) -> Sequence[T_MetricValue]:
+        """Returns one value per datum, in order."""
+
+
 class EvaluationMetricMetadata(
     core_utils.Record, Generic[T_Evaluable, T_MetricValue]
 ):
@@ -170,6 +192,11 @@ def get_llm_structured_response(
     chat_completion_create: CompletionTextToSerializedJSON,
     basemodel_type: Type[T_BaseModel],
 ) -> Result[T_BaseModel, str]:
+    """
+    Gets a structured response from a sync judge and validates it as `basemodel_type`.
+    Structured LLM metrics (see metrics.make_structured_llm_metric) call the judge asynchronously
+    and cache its judgments instead.
+    """
     return result.do(
         core_utils.safe_model_validate_json(response_ok, basemodel_type)
         # get the serialized JSON response
@@ -1,15 +1,36 @@
 import asyncio
+import dataclasses
 import json
 import logging
+import time
 from dataclasses import dataclass
 from functools import partial
-from typing import Any, Generic, NewType, Sequence, Tuple, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterator,
+    NewType,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 import aiconfig.eval.common as common
 import lastmile_utils.lib.core.api as core_utils
 import pandas as pd
 from aiconfig.Config import AIConfigRuntime
 from aiconfig.eval.metrics import Metric
+from aiconfig.eval.results_writer import (
+    DEFAULT_FLUSH_INTERVAL_S,
+    DEFAULT_FLUSH_ROWS,
+    RESULTS_COLUMNS,
+    EvalResultsWriter,
+    ResultsFormat,
+    get_result_key,
+    read_eval_results,
+)
+from aiconfig.util.scheduler import InferenceScheduler
 from frozendict import frozendict
 from result import Err, Ok, Result
 
@@ -31,6 +52,16 @@ UserTestSuiteOutputsOnly = Sequence[Tuple[str, Metric[str, Any]]]
 # ... create a ... new type. For example, you can't pattern match against it.
 TextOutput = NewType("TextOutput", str)
 
+# Default number of test suite inputs run through the AIConfig at the same time
+DEFAULT_MAX_CONCURRENT_RUNS = 16
+
+# Number of samples scored per call to a metric's batch_evaluation_fn
+DEFAULT_EVALUATION_BATCH_SIZE = 10_000
+
+# Maximum number of tests run at a time when results are streamed to disk. Smaller than a flush,
+# so the results are handed to the writer (and its flush interval checked) several times per flush
+DEFAULT_RESULTS_CHUNK_SIZE = 1_000
+
 
 @dataclass(frozen=True)
 class TextBasedInputDatum:
@@ -40,12 +71,26 @@ class TextBasedInputDatum:
 @dataclass(frozen=True)
 class TestSuiteGeneralSettings:
     eval_fn_timeout_s: int = 5
+    # Timeout of one call to a metric's batch_evaluation_fn. Defaults to `eval_fn_timeout_s` per sample in the batch.
+    batch_eval_fn_timeout_s: float | None = None
+    # If set, results are streamed to this directory as they are computed (see results_writer.py),
+    # instead of being accumulated in memory. A run resumes from the results already in the directory.
+    results_path: str | None = None
+    results_format: ResultsFormat = "parquet"
+    # Results are written every `results_flush_rows` rows or `results_flush_interval_s` seconds
+    results_flush_rows: int = DEFAULT_FLUSH_ROWS
+    results_flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S
+    # If set, the returned DataFrame holds every result in `results_path`. Otherwise, it is empty, and the
+    # results can be read with results_writer.iter_eval_results (or read_eval_results) from `df.attrs["results_path"]`
+    load_results: bool = False
 
 
 class TestSuiteWithInputsSettings(core_utils.Record):
     prompt_name: str
     aiconfig_path: str
     general_settings: TestSuiteGeneralSettings = TestSuiteGeneralSettings()
+    # Maximum number of inputs run through the AIConfig at the same time
+    max_concurrent_runs: int = DEFAULT_MAX_CONCURRENT_RUNS
 
 
 class TestSuiteOutputsOnlySettings(core_utils.Record):
@@ -56,30 +101,146 @@ async def run_test_suite_with_inputs(
     test_suite: UserTestSuiteWithInputs,
     settings: TestSuiteWithInputsSettings,
 ) -> pd.DataFrame:
+    """
+    Runs every unique input of the test suite through the AIConfig (concurrently, up to
+    `settings.max_concurrent_runs` at a time) and evaluates the outputs.
+
+    The "run_latency_s" column holds the time the AIConfig took to run each row's input (rows of the
+    same input share a run). The aggregate stats of the runs (wall-clock time, latency percentiles,
+    throughput) are available as `df.attrs["run_stats"]`, see `aiconfig.util.scheduler.BatchStats`.
+
+    If `settings.general_settings.results_path` is set, results are streamed to disk and inputs already
+    scored for a metric there are skipped. The returned DataFrame is then empty, unless
+    `settings.general_settings.load_results` is set (see TestSuiteGeneralSettings).
+    """
     aiconfig = AIConfigRuntime.load(settings.aiconfig_path)  # type: ignore[fixme, no-untyped-call]
-    res = await run_test_suite_helper(
-        TestSuiteWithInputsSpec(
-            test_suite=test_suite,
+    scheduler = InferenceScheduler(
+        max_concurrency=settings.max_concurrent_runs
+    )
+
+    def _make_spec(
+        test_suite_: UserTestSuiteWithInputs,
+    ) -> TestSuiteWithInputsSpec:
+        return TestSuiteWithInputsSpec(
+            test_suite=test_suite_,
             prompt_name=settings.prompt_name,
             aiconfig=aiconfig,
             general_settings=settings.general_settings,
+            scheduler=scheduler,
         )
-    )
-    return res.map(text_eval_res_to_df).unwrap_or_raise(ValueError)
+
+    if settings.general_settings.results_path is not None:
+        df = await _run_test_suite_streaming(
+            test_suite, _make_spec, settings.general_settings
+        )
+    else:
+        res = await run_test_suite_helper(_make_spec(test_suite))
+        df = res.map(text_eval_res_to_df).unwrap_or_raise(ValueError)
+    df.attrs["run_stats"] = dataclasses.asdict(scheduler.stats())
+    return df
 
 
 async def run_test_suite_outputs_only(
     test_suite: UserTestSuiteOutputsOnly,
     settings: TestSuiteOutputsOnlySettings = TestSuiteOutputsOnlySettings(),
 ) -> pd.DataFrame:
-    res = await run_test_suite_helper(
-        TestSuiteOutputsOnlySpec(
-            test_suite=test_suite, general_settings=settings.general_settings
+    def _make_spec(
+        test_suite_: UserTestSuiteOutputsOnly,
+    ) -> TestSuiteOutputsOnlySpec:
+        return TestSuiteOutputsOnlySpec(
+            test_suite=test_suite_, general_settings=settings.general_settings
         )
-    )
+
+    if settings.general_settings.results_path is not None:
+        return await _run_test_suite_streaming(
+            test_suite, _make_spec, settings.general_settings
+        )
+    res = await run_test_suite_helper(_make_spec(test_suite))
     return res.map(text_eval_res_to_df).unwrap_or_raise(ValueError)
 
 
+def _get_test_key(test: Tuple[Any, Metric[str, Any]]) -> tuple[str, str]:
+    """
+    The result key (see results_writer.get_result_key) of a (input, metric) or (output, metric) test.
+    Inputs are identified as they are displayed in results.
+    """
+    datum, metric = test
+    datum_for_display = (
+        datum if isinstance(datum, str) else json.dumps(datum, sort_keys=True)
+    )
+    return get_result_key(
+        datum_for_display, datum_for_display, metric.metric_metadata.id
+    )
+
+
+def _chunk_tests_by_datum(
+    tests: Sequence[Tuple[Any, Metric[str, Any]]], chunk_size: int
+) -> Iterator[list[Tuple[Any, Metric[str, Any]]]]:
+    """
+    Splits tests into chunks of about `chunk_size` tests, keeping the tests of a datum in the same chunk,
+    so each input is still only run through the AIConfig once.
+    """
+    tests_by_datum: dict[str, list[Tuple[Any, Metric[str, Any]]]] = {}
+    for test in tests:
+        tests_by_datum.setdefault(_get_test_key(test)[0], []).append(test)
+
+    chunk: list[Tuple[Any, Metric[str, Any]]] = []
+    for datum_tests in tests_by_datum.values():
+        chunk.extend(datum_tests)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _run_test_suite_streaming(
+    test_suite: Sequence[Tuple[Any, Metric[str, Any]]],
+    make_spec: Callable[[Any], "TestSuiteSpec"],
+    general_settings: TestSuiteGeneralSettings,
+) -> pd.DataFrame:
+    """
+    Runs the test suite a chunk at a time, appending each chunk's results to `general_settings.results_path`,
+    so only one chunk of results is held in memory. Tests already scored in the results directory are skipped.
+    Only loads the results back if `general_settings.load_results` is set.
+    """
+    assert general_settings.results_path is not None
+    with EvalResultsWriter(
+        general_settings.results_path,
+        format=general_settings.results_format,
+        flush_rows=general_settings.results_flush_rows,
+        flush_interval_s=general_settings.results_flush_interval_s,
+    ) as writer:
+        scored_keys = writer.get_scored_keys()
+        remaining_tests = [
+            test
+            for test in test_suite
+            if _get_test_key(test) not in scored_keys
+        ]
+        if len(remaining_tests) < len(test_suite):
+            LOGGER.info(
+                f"Resuming: skipping {len(test_suite) - len(remaining_tests)} tests already scored in {general_settings.results_path}"
+            )
+        for tests in _chunk_tests_by_datum(
+            remaining_tests,
+            min(
+                general_settings.results_flush_rows, DEFAULT_RESULTS_CHUNK_SIZE
+            ),
+        ):
+            res = await run_test_suite_helper(make_spec(tests))
+            writer.append(
+                text_eval_res_to_records(res.unwrap_or_raise(ValueError))
+            )
+    if general_settings.load_results:
+        df = _format_results_df(
+            read_eval_results(general_settings.results_path)
+        )
+    else:
+        df = pd.DataFrame(columns=RESULTS_COLUMNS)
+    df.attrs["results_path"] = general_settings.results_path
+    return df
+
+
 T = TypeVar("T")
 
 
@@ -100,6 +261,8 @@ class SampleEvaluationResult(
     metric_value: common.SampleMetricValue[
         common.T_OutputDatum, common.T_MetricValue
     ]
+    # Time the AIConfig took to produce output_datum from input_datum, None for outputs-only test suites
+    run_latency_s: float | None = None
 
 
 @dataclass(frozen=True)
@@ -112,6 +275,7 @@ class SampleEvaluationParams(
     input_sample: common.T_InputDatum | None
     output_sample: common.T_OutputDatum
     metric: Metric[common.T_OutputDatum, common.T_MetricValue]
+    run_latency_s: float | None = None
 
     def __str__(self) -> str:
         return f"\nSampleEvaluationParams:\n\t{self.output_sample=}\n\t{self.metric=}"
@@ -162,31 +326,150 @@ async def _evaluate_for_sample(
             value=_ok_with_log(res_),
             metric_metadata=metric.metric_metadata,
         ),
+        run_latency_s=eval_params.run_latency_s,
     )
     return result
 
 
+async def _evaluate_batch_for_metric(
+    eval_params_batch: DatasetEvaluationParams[
+        common.T_InputDatum, common.T_OutputDatum
+    ],
+    timeout_s: int,
+    batch_timeout_s: float | None = None,
+) -> DatasetEvaluationResult[common.T_InputDatum, common.T_OutputDatum]:
+    """
+    Evaluates samples that share a metric with a single call to its batch_evaluation_fn, with a timeout of
+    `batch_timeout_s` (default: `timeout_s` per sample). If the batch fails, the samples are evaluated one at
+    a time, so only the failing samples get no value. If it times out, no sample gets a value: evaluating
+    them again one at a time would mostly repeat the work that timed out.
+    """
+    metric = eval_params_batch[0].metric
+    if batch_timeout_s is None:
+        batch_timeout_s = timeout_s * len(eval_params_batch)
+
+    def _make_results(
+        values: Sequence[Any],
+    ) -> DatasetEvaluationResult[common.T_InputDatum, common.T_OutputDatum]:
+        return [
+            SampleEvaluationResult(
+                input_datum=eval_params.input_sample,
+                output_datum=eval_params.output_sample,
+                metric_value=common.SampleMetricValue(
+                    value=value,
+                    metric_metadata=metric.metric_metadata,
+                ),
+                run_latency_s=eval_params.run_latency_s,
+            )
+            for eval_params, value in zip(eval_params_batch, values)
+        ]
+
+    try:
+        values = await asyncio.wait_for(
+            metric.evaluate_batch(
+                [
+                    eval_params.output_sample
+                    for eval_params in eval_params_batch
+                ]
+            ),
+            timeout=batch_timeout_s,
+        )
+    except asyncio.TimeoutError:
+        LOGGER.error(
+            f"Batch evaluation of {metric.metric_metadata.name} timed out after {batch_timeout_s}s ({len(eval_params_batch)} samples)"
+        )
+        return _make_results([None] * len(eval_params_batch))
+    except Exception as e:
+        LOGGER.debug(
+            f"Batch evaluation of {metric.metric_metadata.name} failed, evaluating samples one at a time: {e}"
+        )
+    else:
+        if len(values) == len(eval_params_batch):
+            return _make_results(values)
+        LOGGER.debug(
+            f"Batch evaluation of {metric.metric_metadata.name} returned {len(values)} values for {len(eval_params_batch)} samples, evaluating samples one at a time"
+        )
+    return await asyncio.gather(
+        *map(
+            partial(_evaluate_for_sample, timeout_s=timeout_s),
+            eval_params_batch,
+        )
+    )
+
+
 async def evaluate(
     evaluation_params_list: DatasetEvaluationParams[
         common.T_InputDatum, common.T_OutputDatum
     ],
     eval_fn_timeout_s: int,
+    batch_size: int = DEFAULT_EVALUATION_BATCH_SIZE,
+    batch_eval_fn_timeout_s: float | None = None,
 ) -> Result[
     DatasetEvaluationResult[common.T_InputDatum, common.T_OutputDatum], str
 ]:
-    return Ok(
-        await asyncio.gather(
-            *map(
-                partial(_evaluate_for_sample, timeout_s=eval_fn_timeout_s),
-                evaluation_params_list,
+    """
+    Evaluates every (sample, metric) pair. Samples of a metric that has a batch_evaluation_fn are scored
+    `batch_size` at a time with one call per batch, each call with a timeout of `batch_eval_fn_timeout_s`
+    (default: `eval_fn_timeout_s` per sample in the batch).
+    Other metrics are evaluated one sample at a time. Results are in the order of `evaluation_params_list`.
+    """
+    results: list[Any] = [None] * len(evaluation_params_list)
+    per_sample_indices: list[int] = []
+    # Metric object id -> indices of its samples
+    batched_indices: dict[int, list[int]] = {}
+    for index, eval_params in enumerate(evaluation_params_list):
+        if eval_params.metric.batch_evaluation_fn is None:
+            per_sample_indices.append(index)
+        else:
+            batched_indices.setdefault(id(eval_params.metric), []).append(
+                index
             )
+
+    async def _evaluate_sample(index: int) -> None:
+        results[index] = await _evaluate_for_sample(
+            evaluation_params_list[index], timeout_s=eval_fn_timeout_s
+        )
+
+    async def _evaluate_batch(indices: list[int]) -> None:
+        batch_results = await _evaluate_batch_for_metric(
+            [evaluation_params_list[index] for index in indices],
+            timeout_s=eval_fn_timeout_s,
+            batch_timeout_s=batch_eval_fn_timeout_s,
         )
+        for index, result in zip(indices, batch_results):
+            results[index] = result
+
+    await asyncio.gather(
+        *map(_evaluate_sample, per_sample_indices),
+        *(
+            _evaluate_batch(indices[start : start + batch_size])
+            for indices in batched_indices.values()
+            for start in range(0, len(indices), batch_size)
+        ),
     )
+    return Ok(results)
 
 
 def text_eval_res_to_df(
     eval_res: DatasetEvaluationResult[TextBasedInputDatum, TextOutput],
 ) -> pd.DataFrame:
+    records = text_eval_res_to_records(eval_res)
+    df = pd.DataFrame.from_records(records)  # type: ignore[no-untyped-call]
+    return _format_results_df(df)
+
+
+def _format_results_df(df: pd.DataFrame) -> pd.DataFrame:
+    if len(df) == 0:
+        return df
+    for c in ["input", "aiconfig_output", "metric_name", "metric_description"]:
+        df[c] = df[c].astype("string").fillna("Missing")  # type: ignore[no-untyped-call]
+
+    return df
+
+
+def text_eval_res_to_records(
+    eval_res: DatasetEvaluationResult[TextBasedInputDatum, TextOutput],
+) -> list[dict[str, Any]]:
     def _extract_text_based_input_for_display(
         eval_res: DatasetEvaluationResult[TextBasedInputDatum, TextOutput],
     ) -> DatasetEvaluationResult[str, TextOutput]:
@@ -209,6 +492,7 @@ def text_eval_res_to_df(
                 input_datum=_extract_value(sample_res.input_datum),
                 output_datum=sample_res.output_datum,
                 metric_value=sample_res.metric_value,
+                run_latency_s=sample_res.run_latency_s,
             )
             for sample_res in eval_res
         ]
@@ -217,36 +501,42 @@ def text_eval_res_to_df(
     # TODO: dont use Any
     records: list[dict[str, Any]] = []
     for sample_res in with_text_extracted:
-        records.append(
-            dict(
-                input=sample_res.input_datum,
-                aiconfig_output=sample_res.output_datum,
-                value=sample_res.metric_value.value,
-                metric_id=sample_res.metric_value.metric_metadata.id,
-                metric_name=sample_res.metric_value.metric_metadata.name,
-                metric_description=sample_res.metric_value.metric_metadata.description,
-                best_possible_value=sample_res.metric_value.metric_metadata.best_value,
-                worst_possible_value=sample_res.metric_value.metric_metadata.worst_value,
-            )
+        record = dict(
+            input=sample_res.input_datum,
+            aiconfig_output=sample_res.output_datum,
+            value=sample_res.metric_value.value,
+            metric_id=sample_res.metric_value.metric_metadata.id,
+            metric_name=sample_res.metric_value.metric_metadata.name,
+            metric_description=sample_res.metric_value.metric_metadata.description,
+            best_possible_value=sample_res.metric_value.metric_metadata.best_value,
+            worst_possible_value=sample_res.metric_value.metric_metadata.worst_value,
         )
-    df = pd.DataFrame.from_records(records)  # type: ignore[no-untyped-call]
-    if len(df) == 0:
-        return df
-    for c in ["input", "aiconfig_output", "metric_name", "metric_description"]:
-        df[c] = df[c].astype("string").fillna("Missing")  # type: ignore[no-untyped-call]
-
-    return df
+        # Only results of test suites with inputs come from AIConfig runs
+        if sample_res.run_latency_s is not None:
+            record["run_latency_s"] = sample_res.run_latency_s
+        records.append(record)
+    return records
 
 
 async def user_test_suite_with_inputs_to_eval_params_list(
     test_suite: UserTestSuiteWithInputs,
     prompt_name: str,
     aiconfig: AIConfigRuntime,
+    scheduler: InferenceScheduler | None = None,
 ) -> Result[DatasetEvaluationParams[TextBasedInputDatum, TextOutput], str]:
     """
+    Runs each unique input through the AIConfig, concurrently. Each run gets its own
+    copy-on-write view of the AIConfig (see `AIConfigRuntime.copy_for_run()`), so runs don't
+    see each other's outputs. `scheduler` bounds the number of concurrent runs and records
+    their stats (default: DEFAULT_MAX_CONCURRENT_RUNS at a time).
+
     Example in/out:
         [("hello", brevity)] -> [SampleEvaluationParams("hello", "output_is_world", brevity)]
     """
+    if scheduler is None:
+        scheduler = InferenceScheduler(
+            max_concurrency=DEFAULT_MAX_CONCURRENT_RUNS
+        )
 
     def _user_test_input_to_internal_type(
         input_datum_user_given: str | dict[str, str]
@@ -279,22 +569,30 @@ async def user_test_suite_with_inputs_to_eval_params_list(
 
     async def _run(
         input_datum: TextBasedInputDatum,
-    ) -> Result[TextOutput, str]:
-        return (
-            await run_aiconfig_on_text_based_input(
-                aiconfig, prompt_name, input_datum
+    ) -> Result[tuple[TextOutput, float], str]:
+        async def _run_isolated() -> tuple[TextOutput, float]:
+            start_time = time.perf_counter()
+            # Run against a copy-on-write view so that concurrent runs don't race on the
+            # shared runtime's prompt outputs (https://github.com/lastmile-ai/aiconfig/issues/434)
+            res = await run_aiconfig_on_text_based_input(
+                aiconfig.copy_for_run(), prompt_name, input_datum
+            )
+            return (
+                TextOutput(res.unwrap_or_raise(ValueError)),
+                time.perf_counter() - start_time,
             )
-        ).map(TextOutput)
 
-    # TODO: fix the race condition and then use gather
-    # https://github.com/lastmile-ai/aiconfig/issues/434
-    res_outputs_: list[Result[TextOutput, str]] = []
-    for input_datum in all_inputs:
-        res_outputs_.append(await _run(input_datum))
-    res_outputs = core_utils.result_reduce_list_all_ok(res_outputs_)
-    # res_outputs = await core_utils.result_reduce_list_all_ok_async(list(map(_run, all_inputs)))
+        try:
+            return Ok(await scheduler.run(_run_isolated))
+        except Exception as e:
+            return Err(str(e))
+
+    # asyncio.gather preserves the order of all_inputs in the outputs
+    res_outputs = core_utils.result_reduce_list_all_ok(
+        await asyncio.gather(*map(_run, all_inputs))
+    )
 
-    def _zip_inputs_outputs(outputs: list[TextOutput]):
+    def _zip_inputs_outputs(outputs: list[tuple[TextOutput, float]]):
         # This zip is safe because we have defined an order for the keys in `all_inputs`
         # them apped run_aiconfig over that list.
         # Docs: https://docs.python.org/3/library/asyncio-task.html#running-tasks-concurrently
@@ -305,11 +603,13 @@ async def user_test_suite_with_inputs_to_eval_params_list(
 
         for input_datum, metrics in input_to_metrics_mapping.items():
             for metric in metrics:
+                output, run_latency_s = outputs_by_input[input_datum]
                 out.append(
                     SampleEvaluationParams(
                         input_sample=input_datum,
-                        output_sample=outputs_by_input[input_datum],
+                        output_sample=output,
                         metric=metric,
+                        run_latency_s=run_latency_s,
                     )
                 )
         return out
@@ -357,6 +657,8 @@ class TestSuiteWithInputsSpec:
     prompt_name: str
     aiconfig: AIConfigRuntime
     general_settings: TestSuiteGeneralSettings
+    # Bounds the concurrent AIConfig runs and records their stats
+    scheduler: InferenceScheduler | None = None
 
 
 @dataclass(frozen=True)
@@ -379,9 +681,10 @@ async def run_test_suite_helper(
                 test_suite=test_suite,
                 prompt_name=prompt_name,
                 aiconfig=aiconfig,
+                scheduler=scheduler,
             ):
                 return await user_test_suite_with_inputs_to_eval_params_list(
-                    test_suite, prompt_name, aiconfig
+                    test_suite, prompt_name, aiconfig, scheduler
                 )
             case TestSuiteOutputsOnlySpec(test_suite=test_suite):
                 return Ok(
@@ -400,6 +703,7 @@ async def run_test_suite_helper(
         return await evaluate(
             eval_params_list,
             eval_fn_timeout_s=test_suite_spec.general_settings.eval_fn_timeout_s,
+            batch_eval_fn_timeout_s=test_suite_spec.general_settings.batch_eval_fn_timeout_s,
         )
 
     res_evaluated = await eval_params_list.and_then_async(
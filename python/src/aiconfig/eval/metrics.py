@@ -1,28 +1,47 @@
+import asyncio
+import atexit
+import inspect
 import json
+import math
+import multiprocessing
+import os
+import pickle
 import sys
+import threading
+import weakref
 from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from functools import partial, total_ordering
+from functools import lru_cache, partial, total_ordering
 from typing import (
     Any,
     Awaitable,
     Callable,
     Concatenate,
     Generic,
+    Optional,
     ParamSpec,
     Protocol,
+    Sequence,
     Type,
 )
 
 import lastmile_utils.lib.core.api as core_utils
 import nltk
-import pandas as pd
 from aiconfig.eval import common
 from aiconfig.eval.openai import (
+    AsyncOpenAIChatCompletionCreate,
     OpenAIChatCompletionCreate,
-    default_openai_chat_completion_create,
+    default_async_openai_chat_completion_create,
+    make_async_fn_completion_text_to_serialized_json,
     make_fn_completion_text_to_serialized_json,
 )
+from aiconfig.schema import ExecuteResult
+from aiconfig.util.inference_cache import (
+    InferenceCache,
+    make_inference_cache_key,
+)
+from aiconfig.util.thread_pool import run_in_thread_pool
 from nltk.sentiment.vader import (
     SentimentIntensityAnalyzer as NLTKSentimentIntensityAnalyzer,
 )
@@ -39,6 +58,14 @@ class Metric(Generic[common.T_Evaluable, common.T_MetricValue]):
     metric_metadata: common.EvaluationMetricMetadata[
         common.T_Evaluable, common.T_MetricValue
     ]
+    # Optional. Scores a whole list of data in one call, which is much faster than
+    # calling evaluation_fn per datum for metrics with a fixed cost per call.
+    batch_evaluation_fn: (
+        common.BatchEvaluationFunction[
+            common.T_Evaluable, common.T_MetricValue
+        ]
+        | None
+    ) = None
 
     async def __call__(
         self, datum: common.T_Evaluable
@@ -49,6 +76,16 @@ class Metric(Generic[common.T_Evaluable, common.T_MetricValue]):
         """
         return await self.evaluation_fn(datum)
 
+    async def evaluate_batch(
+        self, data: Sequence[common.T_Evaluable]
+    ) -> list[common.T_MetricValue]:
+        """
+        Scores every datum, with batch_evaluation_fn if the metric has one. Returns one value per datum, in order.
+        """
+        if self.batch_evaluation_fn is not None:
+            return list(await self.batch_evaluation_fn(data))
+        return list(await asyncio.gather(*map(self.evaluation_fn, data)))
+
 
 T_ParamSpec = ParamSpec("T_ParamSpec")
 
@@ -62,7 +99,19 @@ def metric(
     description: str | None = None,
     best_value: common.T_MetricValue | None = None,
     worst_value: common.T_MetricValue | None = None,
+    parametrized_batch_evaluation_fn: (
+        Callable[
+            Concatenate[Sequence[common.T_Evaluable], T_ParamSpec],
+            Sequence[common.T_MetricValue],
+        ]
+        | None
+    ) = None,
 ) -> Callable[T_ParamSpec, Metric[common.T_Evaluable, common.T_MetricValue]]:
+    """
+    Makes a metric factory from a function of a datum and the metric's parameters.
+    `parametrized_batch_evaluation_fn` optionally computes the same values for a whole sequence of data
+    in one call, and is used by `lib.evaluate()` when available.
+    """
     name_ = name or parametrized_evaluation_fn.__name__
     description_ = description or name_
 
@@ -74,6 +123,17 @@ def metric(
         ) -> common.T_MetricValue:
             return parametrized_evaluation_fn(datum, *args, **kwargs)
 
+        async def _batch_evaluation_fn(
+            data: Sequence[common.T_Evaluable],
+        ) -> Sequence[common.T_MetricValue]:
+            return parametrized_batch_evaluation_fn(data, *args, **kwargs)  # type: ignore[misc]
+
+        batch_evaluation_fn = (
+            _batch_evaluation_fn
+            if parametrized_batch_evaluation_fn is not None
+            else None
+        )
+
         return Metric(
             evaluation_fn=evaluation_fn,
             metric_metadata=common.EvaluationMetricMetadata(
@@ -83,6 +143,7 @@ def metric(
                 worst_value=worst_value,
                 extra_metadata=dict(args=args, **kwargs),
             ),
+            batch_evaluation_fn=batch_evaluation_fn,
         )
 
     return _construct
@@ -163,16 +224,88 @@ class GetPolarityScores(Protocol):
         pass
 
 
-def _get_nltk_polarity_scores(text: str, model: str) -> dict[str, float]:
+# Batches of at least this many texts are scored in a process pool
+DEFAULT_SENTIMENT_PROCESS_POOL_MIN_BATCH_SIZE = 10_000
+
+_sentiment_process_pool: Optional[ProcessPoolExecutor] = None
+_sentiment_process_pool_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _get_nltk_sentiment_analyzer(
+    model: str,
+) -> NLTKSentimentIntensityAnalyzer:
+    # Downloading the lexicon and loading it into an analyzer are the slow part,
+    # so do them once per process rather than per text.
     nltk.download(model, quiet=True)  # type: ignore
-    return NLTKSentimentIntensityAnalyzer().polarity_scores(text)  # type: ignore
+    return NLTKSentimentIntensityAnalyzer()
+
+
+def _get_nltk_polarity_scores(text: str, model: str) -> dict[str, float]:
+    return _get_nltk_sentiment_analyzer(model).polarity_scores(text)  # type: ignore
+
+
+def _get_sentiment_process_pool() -> ProcessPoolExecutor:
+    global _sentiment_process_pool
+    with _sentiment_process_pool_lock:
+        if _sentiment_process_pool is None:
+            # Workers are spawned rather than forked: forking a process with threads running
+            # (the event loop, the inference thread pool) can deadlock the children
+            _sentiment_process_pool = ProcessPoolExecutor(
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            atexit.register(_shutdown_sentiment_process_pool)
+        return _sentiment_process_pool
+
+
+def _shutdown_sentiment_process_pool() -> None:
+    global _sentiment_process_pool
+    with _sentiment_process_pool_lock:
+        process_pool, _sentiment_process_pool = _sentiment_process_pool, None
+    if process_pool is not None:
+        process_pool.shutdown(cancel_futures=True)
+
+
+def _is_picklable(obj: Any) -> bool:
+    try:
+        pickle.dumps(obj)
+        return True
+    except Exception:
+        return False
+
+
+def get_polarity_scores_batch(
+    texts: Sequence[str],
+    get_polarity_scores: GetPolarityScores,
+    process_pool_min_batch_size: int = DEFAULT_SENTIMENT_PROCESS_POOL_MIN_BATCH_SIZE,
+) -> list[dict[str, float]]:
+    """
+    Returns the polarity scores of each text, in order. Large batches are split across a process pool
+    (one worker per CPU) if `get_polarity_scores` can be pickled, e.g. a module-level function or a partial of one.
+    """
+    num_workers = os.cpu_count() or 1
+    if (
+        len(texts) < process_pool_min_batch_size
+        or num_workers == 1
+        or not _is_picklable(get_polarity_scores)
+    ):
+        return [get_polarity_scores(text) for text in texts]
+
+    # A few chunks per worker amortizes the pickling overhead while keeping the workers busy
+    chunk_size = math.ceil(len(texts) / (num_workers * 4))
+    return list(
+        _get_sentiment_process_pool().map(
+            get_polarity_scores, texts, chunksize=chunk_size
+        )
+    )
 
 
 def _get_sentiment_scores(
     output_datum: str, get_polarity_scores: GetPolarityScores
 ) -> TextSentimentScores:
     mapping: dict[str, float] = get_polarity_scores(output_datum)
-    highest: str = pd.Series(mapping).idxmax()  # type: ignore
+    # First class with the highest score
+    highest = max(mapping, key=mapping.__getitem__)
     return TextSentimentScores(mapping=mapping, **mapping, highest=highest)
 
 
@@ -219,6 +352,22 @@ def make_sentiment_scores_metric(
     evaluation_fn: common.EvaluationFunction[str, common.T_MetricValue] = (
         make_evaluation_fn(get_polarity_scores)
     )
+
+    async def batch_evaluation_fn(
+        data: Sequence[str],
+    ) -> list[common.T_MetricValue]:
+        # Score each unique text once (in a process pool for large batches), off the event loop,
+        # then build the metric values from the precomputed scores.
+        unique_texts = list(dict.fromkeys(data))
+        scores = await run_in_thread_pool(
+            get_polarity_scores_batch, unique_texts, get_polarity_scores
+        )
+        scores_by_text = dict(zip(unique_texts, scores))
+        evaluation_fn_from_scores = make_evaluation_fn(
+            scores_by_text.__getitem__
+        )
+        return [await evaluation_fn_from_scores(datum) for datum in data]
+
     out: Metric[str, common.T_MetricValue] = Metric(
         evaluation_fn=evaluation_fn,
         metric_metadata=common.EvaluationMetricMetadata(
@@ -229,31 +378,154 @@ def make_sentiment_scores_metric(
             best_value=best_value,
             worst_value=worst_value,
         ),
+        batch_evaluation_fn=batch_evaluation_fn,
     )
     return out
 
 
+# Model parser id under which the judgments of structured LLM metrics are cached
+STRUCTURED_LLM_METRIC_CACHE_ID = "aiconfig.eval.structured_llm_metric"
+DEFAULT_MAX_CONCURRENT_JUDGMENTS = 8
+
+
+def _is_async_callable(fn: Callable[..., Any]) -> bool:
+    # Also covers callable objects with an async __call__
+    return inspect.iscoroutinefunction(fn) or inspect.iscoroutinefunction(
+        getattr(fn, "__call__", None)
+    )
+
+
+def _to_async_completion_text_to_serialized_json(
+    chat_completion_create: (
+        common.CompletionTextToSerializedJSON
+        | common.AsyncCompletionTextToSerializedJSON
+    ),
+) -> common.AsyncCompletionTextToSerializedJSON:
+    if _is_async_callable(chat_completion_create):
+        return chat_completion_create  # type: ignore[return-value]
+
+    async def _run_in_thread_pool(
+        output_datum: str,
+    ) -> Result[common.SerializedJSON, str]:
+        # Blocking chat completion functions must not block the event loop
+        return await run_in_thread_pool(chat_completion_create, output_datum)  # type: ignore[arg-type]
+
+    return _run_in_thread_pool
+
+
 def make_structured_llm_metric(
-    chat_completion_create: common.CompletionTextToSerializedJSON,
+    chat_completion_create: (
+        common.CompletionTextToSerializedJSON
+        | common.AsyncCompletionTextToSerializedJSON
+    ),
     eval_llm_name: str,
     pydantic_basemodel_type: Type[common.T_BaseModel],
     metric_name: str,
     metric_description: str,
     field_descriptions: dict[str, str] = {},
+    judgment_cache: InferenceCache | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_JUDGMENTS,
 ) -> Metric[str, common.CustomMetricPydanticObject[common.T_BaseModel]]:
+    """
+    Makes a metric graded by an LLM (the judge), which answers with an instance of `pydantic_basemodel_type`.
+
+    Args:
+        chat_completion_create: Gets the judge's structured (JSON) response for a text. Can be async;
+            blocking functions are run in the inference thread pool.
+        judgment_cache (InferenceCache, optional): Caches the judge's responses, keyed on the judge model,
+            the schema, the field descriptions and the text. With a persistent cache (e.g. SQLiteInferenceCache),
+            re-running an eval only queries the judge for new or changed outputs.
+        max_concurrency (int): Maximum number of judge requests in flight at a time, per event loop.
+    """
+    chat_completion_create_async = (
+        _to_async_completion_text_to_serialized_json(chat_completion_create)
+    )
+    judgment_cache_key_params = dict(
+        eval_llm_name=eval_llm_name,
+        schema=pydantic_basemodel_type.model_json_schema(),
+        field_descriptions=field_descriptions,
+    )
+    # Semaphores and in-flight judgments are bound to the event loop they're used on
+    semaphores: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, asyncio.Semaphore
+    ] = weakref.WeakKeyDictionary()
+    in_flight_judgments: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop,
+        dict[str, asyncio.Future[Result[Any, str]]],
+    ] = weakref.WeakKeyDictionary()
+
     def _make_evaluation_fn(
         basemodel_type: Type[common.T_BaseModel],
     ) -> common.EvaluationFunction[
         str, common.CustomMetricPydanticObject[common.T_BaseModel]
     ]:
+        async def _judge(
+            cache_key: str, datum: str
+        ) -> Result[common.T_BaseModel, str]:
+            # The cache may be backed by a file (e.g. SQLite): keep its I/O off the event loop
+            cached_outputs = (
+                await run_in_thread_pool(judgment_cache.get, cache_key)
+                if judgment_cache is not None
+                else None
+            )
+            if cached_outputs:
+                response: Result[common.SerializedJSON, str] = Ok(
+                    cached_outputs[0].data
+                )
+            else:
+                semaphore = semaphores.setdefault(
+                    asyncio.get_running_loop(),
+                    asyncio.Semaphore(max_concurrency),
+                )
+                async with semaphore:
+                    response = await chat_completion_create_async(datum)
+
+            resp = response.and_then(
+                partial(
+                    core_utils.safe_model_validate_json,
+                    basemodel_type=basemodel_type,
+                )
+            )
+            # Only responses that match the schema are cached
+            if (
+                judgment_cache is not None
+                and not cached_outputs
+                and isinstance(resp, Ok)
+            ):
+                await run_in_thread_pool(
+                    judgment_cache.set,
+                    cache_key,
+                    [
+                        ExecuteResult(
+                            output_type="execute_result",
+                            execution_count=0,
+                            data=response.unwrap(),
+                            metadata={},
+                        )
+                    ],
+                )
+            return resp
+
         async def _evaluation_fn(
             datum: str,
         ) -> common.CustomMetricPydanticObject[common.T_BaseModel]:
-            resp = common.get_llm_structured_response(
-                input_text=datum,
-                chat_completion_create=chat_completion_create,
-                basemodel_type=basemodel_type,
+            cache_key = make_inference_cache_key(
+                STRUCTURED_LLM_METRIC_CACHE_ID,
+                dict(judgment_cache_key_params, text=datum),
+            )
+            # Concurrent evaluations of the same text share one judgment
+            judgments = in_flight_judgments.setdefault(
+                asyncio.get_running_loop(), {}
             )
+            judgment = judgments.get(cache_key)
+            if judgment is None:
+                judgment = asyncio.ensure_future(_judge(cache_key, datum))
+                judgments[cache_key] = judgment
+                judgment.add_done_callback(
+                    lambda _: judgments.pop(cache_key, None)
+                )
+            # Shielded, so that a cancelled evaluation doesn't cancel the judgment for the others
+            resp = await asyncio.shield(judgment)
 
             # Intentional: unwrap and raise here to conform to the Metric interface.
             match resp:
@@ -286,7 +558,11 @@ def _make_openai_structured_llm_metric_helper(
     metric_name: str,
     metric_description: str,
     field_descriptions: dict[str, str],
-    openai_chat_completion_create: OpenAIChatCompletionCreate | None = None,
+    openai_chat_completion_create: (
+        OpenAIChatCompletionCreate | AsyncOpenAIChatCompletionCreate | None
+    ) = None,
+    judgment_cache: InferenceCache | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_JUDGMENTS,
 ) -> Result[
     Metric[str, common.CustomMetricPydanticObject[common.T_BaseModel]], str
 ]:
@@ -315,15 +591,29 @@ def _make_openai_structured_llm_metric_helper(
 
     openai_eval_llm_chat_completion_create: (
         common.CompletionTextToSerializedJSON
-    ) = make_fn_completion_text_to_serialized_json(
-        eval_llm_name=eval_llm_name,
-        properties=properties,
-        required=required,
-        openai_chat_completion_create=(
-            openai_chat_completion_create
-            or default_openai_chat_completion_create
-        ),
+        | common.AsyncCompletionTextToSerializedJSON
     )
+    if openai_chat_completion_create is None or _is_async_callable(
+        openai_chat_completion_create
+    ):
+        openai_eval_llm_chat_completion_create = (
+            make_async_fn_completion_text_to_serialized_json(
+                eval_llm_name=eval_llm_name,
+                properties=properties,
+                required=required,
+                openai_chat_completion_create=(
+                    openai_chat_completion_create  # type: ignore[arg-type]
+                    or default_async_openai_chat_completion_create
+                ),
+            )
+        )
+    else:
+        openai_eval_llm_chat_completion_create = make_fn_completion_text_to_serialized_json(
+            eval_llm_name=eval_llm_name,
+            properties=properties,
+            required=required,
+            openai_chat_completion_create=openai_chat_completion_create,  # type: ignore[arg-type]
+        )
 
     return Ok(
         make_structured_llm_metric(
@@ -333,6 +623,8 @@ def _make_openai_structured_llm_metric_helper(
             metric_name=metric_name,
             metric_description=metric_description,
             field_descriptions=field_descriptions,
+            judgment_cache=judgment_cache,
+            max_concurrency=max_concurrency,
         )
     )
 
@@ -349,8 +641,17 @@ def make_openai_structured_llm_metric(
     metric_name: str,
     metric_description: str,
     field_descriptions: dict[str, str] = {},
-    openai_chat_completion_create: OpenAIChatCompletionCreate | None = None,
+    openai_chat_completion_create: (
+        OpenAIChatCompletionCreate | AsyncOpenAIChatCompletionCreate | None
+    ) = None,
+    judgment_cache: InferenceCache | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_JUDGMENTS,
 ) -> Metric[str, common.CustomMetricPydanticObject[common.T_BaseModel]]:
+    """
+    Makes a structured LLM metric graded by an OpenAI model. See make_structured_llm_metric.
+    By default, the judge is queried with the shared async OpenAI client; `openai_chat_completion_create`
+    can replace it with a sync or async function.
+    """
     res_metric = _make_openai_structured_llm_metric_helper(
         eval_llm_name=eval_llm_name,
         pydantic_basemodel_type=pydantic_basemodel_type,
@@ -358,6 +659,8 @@ def make_openai_structured_llm_metric(
         metric_description=metric_description,
         field_descriptions=field_descriptions,
         openai_chat_completion_create=openai_chat_completion_create,
+        judgment_cache=judgment_cache,
+        max_concurrency=max_concurrency,
     )
 
     # User interface: unwrap and raise
@@ -371,11 +674,21 @@ def make_openai_structured_llm_metric(
 # 2. literal metrics
 
 
+def _substring_match_batch(
+    data: Sequence[str], substring: str, case_sensitive: bool = True
+) -> list[bool]:
+    if case_sensitive:
+        return [substring in datum for datum in data]
+    substring = substring.lower()
+    return [substring in datum.lower() for datum in data]
+
+
 @metric(
     #
     description="True (pass) if contains given substring",
     best_value=True,
     worst_value=False,
+    parametrized_batch_evaluation_fn=_substring_match_batch,
 )
 def substring_match(
     datum: str, substring: str, case_sensitive: bool = True
@@ -386,12 +699,21 @@ def substring_match(
         return substring.lower() in datum.lower()
 
 
+def _brevity_batch(data: Sequence[str]) -> list[int]:
+    lengths = [len(datum) for datum in data]
+    if not all(lengths):
+        # Evaluated one at a time instead, so only the empty strings fail
+        raise ValueError("Brevity is meaningless for empty string.")
+    return lengths
+
+
 @metric(
     #
     description="Absolute text length",
     name="brevity",
     best_value=1,
     worst_value=sys.maxsize,
+    parametrized_batch_evaluation_fn=_brevity_batch,
 )
 def make_brevity(datum: str):
     if len(datum) == 0:
@@ -415,28 +737,27 @@ gpt3_5_text_ratings = make_openai_structured_llm_metric(
     ),
 )
 
+# Picklable, so large batches can be scored in the process pool
+nltk_get_polarity_scores_vader = partial(
+    _get_nltk_polarity_scores, model="vader_lexicon"
+)
+
 nltk_sentiment_scores_vader = make_sentiment_scores_metric(
-    get_polarity_scores=partial(
-        _get_nltk_polarity_scores, model="vader_lexicon"
-    ),
+    get_polarity_scores=nltk_get_polarity_scores_vader,
     make_evaluation_fn=make_get_sentiment_scores,
     name="nltk_sentiment_scores_vader",
     description="NLTK sentiment scores using Vader",
 )
 
 nltk_sentiment_class_vader = make_sentiment_scores_metric(
-    get_polarity_scores=partial(
-        _get_nltk_polarity_scores, model="vader_lexicon"
-    ),
+    get_polarity_scores=nltk_get_polarity_scores_vader,
     make_evaluation_fn=make_get_sentiment_class,
     name="nltk_sentiment_class_vader",
     description="Highest-probability NLTK sentiment class using Vader",
 )
 
 nltk_sentiment_score_overall_positive = make_sentiment_scores_metric(
-    get_polarity_scores=partial(
-        _get_nltk_polarity_scores, model="vader_lexicon"
-    ),
+    get_polarity_scores=nltk_get_polarity_scores_vader,
     make_evaluation_fn=make_get_overall_positive_sentiment,
     name="nltk_sentiment_score_overall_positive",
     description="Positive minus negative",
@@ -6,6 +6,7 @@ import lastmile_utils.lib.core.api as core_utils
 import openai
 import openai.types.chat as openai_types
 from aiconfig.eval import common
+from aiconfig.util.openai_client_pool import get_shared_async_openai_client
 from result import Err, Ok, Result
 
 
@@ -26,6 +27,14 @@ class OpenAIChatCompletionCreate(Protocol):
         pass
 
 
+class AsyncOpenAIChatCompletionCreate(Protocol):
+    @abstractmethod
+    async def __call__(
+        self, completion_params: OpenAIChatCompletionParams
+    ) -> Result[openai_types.ChatCompletion, str]:
+        pass
+
+
 def default_openai_chat_completion_create(
     completion_params: OpenAIChatCompletionParams,
 ) -> Result[openai_types.ChatCompletion, str]:
@@ -42,6 +51,27 @@ def default_openai_chat_completion_create(
         return core_utils.ErrWithTraceback(e)
 
 
+async def default_async_openai_chat_completion_create(
+    completion_params: OpenAIChatCompletionParams,
+) -> Result[openai_types.ChatCompletion, str]:
+    """
+    Like default_openai_chat_completion_create, but awaits the request on an async client
+    shared by everything running on the event loop (see aiconfig.util.openai_client_pool).
+    """
+    try:
+        client = get_shared_async_openai_client()
+        result = await client.chat.completions.create(
+            messages=completion_params.messages,
+            model=completion_params.model,
+            temperature=completion_params.temperature,
+            tools=completion_params.tools,
+            stream=False,
+        )
+        return Ok(result)
+    except Exception as e:
+        return core_utils.ErrWithTraceback(e)
+
+
 def extract_json_from_chat_completion(
     chat_completion: openai_types.ChatCompletion,
 ) -> Result[common.SerializedJSON, str]:
@@ -73,6 +103,26 @@ def make_fn_completion_text_to_serialized_json(
     return out
 
 
+def make_async_fn_completion_text_to_serialized_json(
+    eval_llm_name: str,
+    properties: dict[str, dict[str, str]],
+    required: list[str],
+    openai_chat_completion_create: AsyncOpenAIChatCompletionCreate,
+) -> common.AsyncCompletionTextToSerializedJSON:
+    async def _chat_completion_create(
+        output_datum: str,
+    ) -> Result[common.SerializedJSON, str]:
+        openai_chat_completion_params = _make_openai_completion_params(
+            output_datum, eval_llm_name, properties, required
+        )
+        return (
+            await openai_chat_completion_create(openai_chat_completion_params)
+        ).and_then(extract_json_from_chat_completion)
+
+    out: common.AsyncCompletionTextToSerializedJSON = _chat_completion_create
+    return out
+
+
 def _make_openai_completion_params(
     input_text: str,
     eval_llm_name: str,
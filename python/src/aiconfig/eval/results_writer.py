@@ -0,0 +1,288 @@
+"""
+Streams eval results to disk as they are computed, instead of holding them all in memory.
+
+Results are appended to a directory of columnar part files (Parquet or Arrow IPC), one part per flush.
+Parts are written atomically, so a crash loses at most the results since the last flush, and a run
+pointed at the same directory can resume by skipping the (input, metric) pairs already scored.
+
+Requires pyarrow (`pip install python-aiconfig[eval]` or `pip install pyarrow`).
+"""
+
+import dataclasses
+import glob
+import json
+import os
+import re
+import time
+from types import TracebackType
+from typing import Any, Iterator, Literal, Optional, Type
+
+import pandas as pd
+from pydantic import BaseModel
+
+ResultsFormat = Literal["parquet", "arrow"]
+
+RESULTS_COLUMNS = [
+    "input",
+    "aiconfig_output",
+    "value",
+    "metric_id",
+    "metric_name",
+    "metric_description",
+    "best_possible_value",
+    "worst_possible_value",
+    # Only set for test suites with inputs
+    "run_latency_s",
+]
+# Metric values can be of any type (numbers, strings, CustomMetricValue...), so they are stored as JSON
+JSON_COLUMNS = ["value", "best_possible_value", "worst_possible_value"]
+FLOAT_COLUMNS = ["run_latency_s"]
+
+DEFAULT_FLUSH_ROWS = 10_000
+DEFAULT_FLUSH_INTERVAL_S = 30.0
+
+_FILE_EXTENSIONS: dict[ResultsFormat, str] = {
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+}
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow  # type: ignore
+        import pyarrow.ipc  # type: ignore
+        import pyarrow.parquet  # type: ignore
+
+        return pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Streaming eval results to disk requires pyarrow. Install it with `pip install python-aiconfig[eval]` or `pip install pyarrow`."
+        ) from e
+
+
+def _to_jsonable(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return str(obj)
+
+
+def serialize_value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return json.dumps(value, default=_to_jsonable, sort_keys=True)
+
+
+def get_result_key(
+    input: Optional[str], aiconfig_output: str, metric_id: str
+) -> tuple[str, str]:
+    """
+    Identifies a scored (input, metric) pair. Results without an input (outputs-only test suites)
+    are identified by their output instead.
+    """
+    return (input if input is not None else aiconfig_output, metric_id)
+
+
+def _get_part_paths(path: str) -> list[str]:
+    return sorted(
+        part_path
+        for extension in _FILE_EXTENSIONS.values()
+        for part_path in glob.glob(os.path.join(path, f"part-*{extension}"))
+    )
+
+
+def _get_next_part_index(path: str) -> int:
+    # After the highest existing part, so a missing part never gets an existing part overwritten
+    part_indices = [
+        int(match.group(1))
+        for part_path in _get_part_paths(path)
+        if (match := re.match(r"part-(\d+)\.", os.path.basename(part_path)))
+    ]
+    return max(part_indices, default=-1) + 1
+
+
+def _read_part(part_path: str, columns: Optional[list[str]] = None) -> Any:
+    pyarrow = _import_pyarrow()
+    if part_path.endswith(_FILE_EXTENSIONS["parquet"]):
+        return pyarrow.parquet.read_table(part_path, columns=columns)
+    with pyarrow.ipc.open_file(part_path) as reader:
+        table = reader.read_all()
+    return table.select(columns) if columns is not None else table
+
+
+class EvalResultsWriter:
+    """
+    Appends eval result records (dicts with the RESULTS_COLUMNS keys, "run_latency_s" is optional) to the
+    results directory at `path`.
+    Buffered records are written as a new part file once there are `flush_rows` of them,
+    or `flush_interval_s` after the previous flush, and when the writer is closed.
+
+    Usage:
+        with EvalResultsWriter("eval_results") as writer:
+            scored = writer.get_scored_keys()
+            writer.append(records)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        format: ResultsFormat = "parquet",
+        flush_rows: int = DEFAULT_FLUSH_ROWS,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+    ):
+        if format not in _FILE_EXTENSIONS:
+            raise ValueError(
+                f"Unknown results format '{format}'. Supported formats: {list(_FILE_EXTENSIONS)}."
+            )
+        self._pyarrow = _import_pyarrow()
+        self.path = path
+        self.format = format
+        self.flush_rows = flush_rows
+        self.flush_interval_s = flush_interval_s
+        self._schema = self._pyarrow.schema(
+            [
+                (
+                    column,
+                    (
+                        self._pyarrow.float64()
+                        if column in FLOAT_COLUMNS
+                        else self._pyarrow.string()
+                    ),
+                )
+                for column in RESULTS_COLUMNS
+            ]
+        )
+        self._buffer: list[dict[str, Any]] = []
+        self._last_flush_time = time.monotonic()
+
+        os.makedirs(path, exist_ok=True)
+        self._next_part_index = _get_next_part_index(path)
+
+    def get_scored_keys(self) -> set[tuple[str, str]]:
+        """
+        Returns the keys (see get_result_key) of the results already written to the directory.
+        Failed evaluations (null value) are not scored, so a resumed run evaluates them again.
+        """
+        keys: set[tuple[str, str]] = set()
+        for part_path in _get_part_paths(self.path):
+            table = _read_part(
+                part_path,
+                columns=["input", "aiconfig_output", "metric_id", "value"],
+            )
+            for input, aiconfig_output, metric_id, value in zip(
+                *(
+                    table.column(name).to_pylist()
+                    for name in table.column_names
+                )
+            ):
+                if value is not None:
+                    keys.add(get_result_key(input, aiconfig_output, metric_id))
+        return keys
+
+    def append(self, records: list[dict[str, Any]]) -> None:
+        for record in records:
+            self._buffer.append(
+                {
+                    column: (
+                        serialize_value(record.get(column))
+                        if column in JSON_COLUMNS
+                        else record.get(column)
+                    )
+                    for column in RESULTS_COLUMNS
+                }
+            )
+        if (
+            len(self._buffer) >= self.flush_rows
+            or time.monotonic() - self._last_flush_time
+            >= self.flush_interval_s
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered records as a new part file.
+        """
+        self._last_flush_time = time.monotonic()
+        if not self._buffer:
+            return
+        table = self._pyarrow.Table.from_pylist(
+            self._buffer, schema=self._schema
+        )
+        part_path = os.path.join(
+            self.path,
+            f"part-{self._next_part_index:06d}{_FILE_EXTENSIONS[self.format]}",
+        )
+        # Written next to the part and renamed, so readers never see a partial part
+        tmp_path = f"{part_path}.tmp"
+        try:
+            if self.format == "parquet":
+                self._pyarrow.parquet.write_table(table, tmp_path)
+            else:
+                with self._pyarrow.ipc.new_file(
+                    tmp_path, self._schema
+                ) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, part_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        self._next_part_index += 1
+        self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "EvalResultsWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        # Keep the results computed before an error, so the run can resume from them
+        self.close()
+
+
+def iter_eval_results(path: str) -> Iterator[pd.DataFrame]:
+    """
+    Lazily reads the results written by EvalResultsWriter to `path`, one part file at a time, as DataFrames
+    with the same columns as `lib.text_eval_res_to_df`. Metric values are decoded from JSON, so custom metric
+    values become dicts.
+    """
+    for part_path in _get_part_paths(path):
+        df = _read_part(part_path).to_pandas()
+        for column in JSON_COLUMNS:
+            df[column] = df[column].map(
+                lambda value: json.loads(value) if value is not None else None
+            )
+        yield df
+
+
+def read_eval_results(path: str) -> pd.DataFrame:
+    """
+    Reads all the results written by EvalResultsWriter to `path` into one DataFrame (see iter_eval_results).
+    Failed evaluations that a resumed run scored again are dropped.
+    """
+    dfs = list(iter_eval_results(path))
+    if not dfs:
+        return pd.DataFrame()
+    df = pd.concat(dfs, ignore_index=True)
+    keys = [
+        get_result_key(input, aiconfig_output, metric_id)
+        for input, aiconfig_output, metric_id in zip(
+            df["input"], df["aiconfig_output"], df["metric_id"]
+        )
+    ]
+    scored_keys = {
+        key for key, value in zip(keys, df["value"]) if value is not None
+    }
+    is_retried_failure = [
+        value is None and key in scored_keys
+        for key, value in zip(keys, df["value"])
+    ]
+    return df[~pd.Series(is_retried_failure, index=df.index)].reset_index(
+        drop=True
+    )
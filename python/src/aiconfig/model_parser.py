@@ -1,12 +1,32 @@
 import asyncio
 import copy
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 from aiconfig.schema import AIConfig, ExecuteResult, Output, Prompt
+from aiconfig.util.scheduler import (
+    BatchResults,
+    InferenceScheduler,
+    estimate_tokens,
+)
 
 if TYPE_CHECKING:
     from aiconfig.Config import AIConfigRuntime
+    from aiconfig.util.inference_cache import InferenceCache
+
+# Maximum number of batch items run_batch_iter keeps in flight when max_concurrency isn't set
+DEFAULT_MAX_PENDING_BATCH_ITEMS = 64
 
 
 class ModelParser(ABC):
@@ -82,6 +102,24 @@ class ModelParser(ABC):
             ExecuteResult: The response generated by the model.
         """
 
+    async def run_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        completion_params: Any,
+        options: Optional["InferenceOptions"] = None,
+        parameters: Dict = {},
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Runs inference like run(), with the completion params that deserialize() already resolved for this prompt
+        and parameters, so that they aren't resolved again. The run may modify `completion_params`.
+
+        The default implementation resolves them again through run(). Model Parsers that can send the given
+        completion params as they are override this method (see ParameterizedModelParser).
+        """
+        return await self.run(prompt, aiconfig, options, parameters, **kwargs)
+
     async def run_batch(
         self,
         prompt: Prompt,
@@ -89,11 +127,15 @@ class ModelParser(ABC):
         parameters_list: list[dict[str, Any]],
         options: Optional["InferenceOptions"] = None,
         **kwargs: Any,
-    ) -> list["AIConfigRuntime"]:
+    ) -> BatchResults["AIConfigRuntime"]:
         """
         Concurrently runs inference on multiple parameter sets, one set at a time.
         Default implementation for the run_batch method. Model Parsers may choose to override this method if they need to implement custom batch execution logic.
-        For each dictionary of parameters in `params_list``, the `run` method is invoked. All iterations are separate as we use a deep copy of `aiconfig` in each iteration.
+        For each dictionary of parameters in `params_list``, the `run` method is invoked. All iterations are separate as each one runs against
+        its own copy-on-write view of `aiconfig` (see `AIConfigRuntime.copy_for_run()`), so memory per iteration is proportional to what it writes.
+
+        Requests are scheduled according to the batch settings in `options` (max_concurrency, requests_per_second,
+        tokens_per_minute, max_retries). See `InferenceScheduler` for details.
 
         Args:
             prompt (Prompt): The prompt for running the inference
@@ -103,30 +145,151 @@ class ModelParser(ABC):
             **kwargs: Additional arguments like metadata or custom configuration that could be used to modify the inference behaviour.
 
         Returns:
-            list[AIConfigRuntime]: A list of AIConfigRuntime objects. Each object contains the state of the AIConfigRuntime after each run using the corresponding parameter set from params_list.
+            BatchResults[AIConfigRuntime]: A list of AIConfigRuntime objects. Each object contains the state of the AIConfigRuntime after each run using the corresponding parameter set from params_list.
+                The throughput stats of the batch are available as `.stats`, and the completion params each run
+                was resolved to (in the same order) as `.completion_params`.
         """
-        # Intiailize an empty list to hold the results
-        inference_results = []
-        tasks = []
-
-        for params in parameters_list:
-            # Create a deep copy of the aiconfig object to prevent mutations that could affect other iterations
-            aiconfig_deep_copy = copy.deepcopy(aiconfig)
-            prompt = aiconfig_deep_copy.get_prompt(prompt.name)
-            # Asynchronously schedule 'run()' for execution with a set of parameters.
-            # This approach enables concurrent processing of multiple aiconfigs.
-            task = asyncio.create_task(
-                self.run(prompt, aiconfig_deep_copy, options, params, **kwargs)
+        scheduler = InferenceScheduler.from_options(options)
+
+        # Asynchronously schedule 'run()' for each set of parameters. The scheduler bounds how many run at once.
+        # asyncio.gather preserves the order of parameters_list in the results.
+        batch_items = await asyncio.gather(
+            *[
+                self._run_batch_item(
+                    prompt,
+                    aiconfig,
+                    params,
+                    options,
+                    scheduler,
+                    resolve=True,
+                    **kwargs,
+                )
+                for params in parameters_list
+            ]
+        )
+        return BatchResults(
+            [aiconfig_run_copy for aiconfig_run_copy, _ in batch_items],
+            stats=scheduler.stats(),
+            completion_params=[
+                completion_params for _, completion_params in batch_items
+            ],
+        )
+
+    async def run_batch_iter(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        parameters: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+        options: Optional["InferenceOptions"] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[Tuple["AIConfigRuntime", Any, dict[str, Any]]]:
+        """
+        Streaming variant of run_batch. Yields each result as soon as its run completes (in completion order, not input order).
+
+        Parameter sets are pulled lazily from `parameters`, which can be an async iterable, so the full list never has to be
+        materialized. At most `options.max_concurrency` (or DEFAULT_MAX_PENDING_BATCH_ITEMS) items are pending at any time.
+
+        Args:
+            prompt (Prompt): The prompt for running the inference
+            aiconfig (AIConfigRuntime): The AIConfig object containing all necessary configurations (prompts and parameters) for running the inference.
+            parameters (Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]]): The parameter sets to run the prompt with.
+            options (InferenceOptions, optional): Options to tune the execution of inference. See run_batch.
+            **kwargs: Additional arguments passed to `run`.
+
+        Yields:
+            Tuple[AIConfigRuntime, Any, dict[str, Any]]: The AIConfigRuntime the item was run against, the resolved completion
+                params that were sent to the model, and the parameters dict used.
+        """
+        scheduler = InferenceScheduler.from_options(options)
+        max_pending = (
+            scheduler.max_concurrency or DEFAULT_MAX_PENDING_BATCH_ITEMS
+        )
+
+        async def _run(
+            params: dict[str, Any]
+        ) -> Tuple["AIConfigRuntime", Any, dict[str, Any]]:
+            aiconfig_run_copy, completion_params = await self._run_batch_item(
+                prompt,
+                aiconfig,
+                params,
+                options,
+                scheduler,
+                resolve=True,
+                **kwargs,
+            )
+            return aiconfig_run_copy, completion_params, params
+
+        pending: set[asyncio.Task] = set()
+        try:
+            async for params in _iterate_async(parameters):
+                if len(pending) >= max_pending:
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        yield task.result()
+                pending.add(asyncio.create_task(_run(params)))
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            # The consumer stopped early or a run failed, don't leave orphaned runs behind
+            for task in pending:
+                task.cancel()
+
+    async def _run_batch_item(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        params: dict[str, Any],
+        options: Optional["InferenceOptions"],
+        scheduler: InferenceScheduler,
+        resolve: bool = False,
+        **kwargs: Any,
+    ) -> Tuple["AIConfigRuntime", Any]:
+        """
+        Runs a single batch item against its own copy-on-write view of `aiconfig`, through the batch scheduler.
+
+        Returns:
+            Tuple[AIConfigRuntime, Any]: The AIConfigRuntime the item was run against, and the resolved
+                completion params if `resolve` is True (None otherwise).
+        """
+        # Run against a copy-on-write view of the aiconfig to prevent mutations that could affect other iterations
+        aiconfig_run_copy = aiconfig.copy_for_run()
+        run_prompt = aiconfig_run_copy.get_prompt(prompt.name)
+
+        completion_params = None
+        tokens = 0
+        if resolve:
+            # Resolve before running so that the params reflect exactly what gets sent to the model
+            completion_params = await self.deserialize(
+                run_prompt, aiconfig_run_copy, params=params
+            )
+            if scheduler.tokens_per_minute is not None:
+                tokens = estimate_tokens(completion_params)
+
+        async def _run() -> Any:
+            if not resolve:
+                return await self.run(
+                    run_prompt, aiconfig_run_copy, options, params, **kwargs
+                )
+            # The run gets its own copy, so the completion params returned for the item are
+            # exactly the ones that were resolved, whatever the run changes in them
+            return await self.run_with_completion_params(
+                run_prompt,
+                aiconfig_run_copy,
+                copy.deepcopy(completion_params),
+                options,
+                params,
+                **kwargs,
             )
-            tasks.append(task)
-            # store reference to the deep copy in inference_results
-            inference_results.append(aiconfig_deep_copy)
 
-        # Wait for all tasks to complete
-        await asyncio.gather(*tasks)
-        # Return the results. We don't need to store the results of gather, we've already stored refrences to the AIConfigRuntime objects in inference_results.
-        # Each object in this list corresponds to the aiconfigruntime used in each asynchronous task.
-        return inference_results
+        await scheduler.run(_run, tokens=tokens)
+        return aiconfig_run_copy, completion_params
 
     @abstractmethod
     def get_output_text(
@@ -197,6 +360,20 @@ class ModelParser(ABC):
             return model_settings
 
 
+async def _iterate_async(
+    items: Iterable[Any] | AsyncIterable[Any],
+) -> AsyncIterator[Any]:
+    """
+    Iterates over a sync or async iterable with `async for`.
+    """
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
 def print_stream_callback(data, accumulated_data, index: int):
     """
     Default streamCallback function that prints the output to the console.
@@ -227,6 +404,13 @@ class InferenceOptions:
         self,
         stream_callback: Callable[[Any, Any, int], Any] = print_stream_delta,
         stream=True,
+        max_concurrency: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 0,
+        retry_base_delay_s: float = 1.0,
+        retry_max_delay_s: float = 60.0,
+        cache: Optional["InferenceCache"] = None,
         **kwargs,
     ):
         super().__init__()
@@ -248,6 +432,32 @@ class InferenceOptions:
 
         self.stream = stream
 
+        """
+        Batch scheduling settings, used by run_batch (see aiconfig.util.scheduler.InferenceScheduler).
+
+        Args:
+            max_concurrency (int, optional): Maximum number of requests in flight at once. Unbounded if None.
+                Also bounds the number of prompts run_with_dependencies runs concurrently.
+            requests_per_second (float, optional): Request rate budget. Unlimited if None.
+            tokens_per_minute (int, optional): Estimated token budget per minute. Unlimited if None.
+            max_retries (int): Number of times a rate limited (429) or transient (5xx) failure is retried.
+            retry_base_delay_s (float): Base delay for the jittered exponential backoff between retries.
+            retry_max_delay_s (float): Maximum delay between retries.
+        """
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.retry_base_delay_s = retry_base_delay_s
+        self.retry_max_delay_s = retry_max_delay_s
+
+        """
+        Inference result cache (see aiconfig.util.inference_cache). When set, runs whose resolved completion params
+        were seen before return the cached outputs instead of calling the model.
+        Takes precedence over the cache configured in the AIConfig metadata.
+        """
+        self.cache = cache
+
         for key, value in kwargs.items():
             setattr(self, key, value)
 
@@ -2,7 +2,19 @@ import warnings
 from typing import Any, Dict, List, Literal, Optional, Union
 
 from aiconfig.util.config_utils import extract_override_settings
-from pydantic import BaseModel
+from aiconfig.util.dependency_index import (
+    PromptDependencyIndex,
+    record_prompt_rename,
+)
+from pydantic import (
+    BaseModel,
+    PrivateAttr,
+    TypeAdapter,
+    ValidationInfo,
+    field_validator,
+    model_serializer,
+    model_validator,
+)
 
 # Pydantic doesn't handle circular type references very well, TODO: handle this better than defining as type Any
 # JSONObject represents a JSON object as a dictionary with string keys and JSONValue values
@@ -133,6 +145,7 @@ class Error(BaseModel):
 
 # Output can be one of ExecuteResult, ExecuteResult, DisplayData, Stream, or Error
 Output = Union[ExecuteResult, Error]
+_outputs_adapter = TypeAdapter(Optional[List[Output]])
 
 
 class ModelMetadata(BaseModel):
@@ -182,6 +195,17 @@ class PromptInput(BaseModel):
         extra = "allow"
 
 
+class _DeferredOutputs:
+    """
+    Holds a prompt's unvalidated outputs between field validation and model validation.
+    """
+
+    __slots__ = ("outputs",)
+
+    def __init__(self, outputs: Any):
+        self.outputs = outputs
+
+
 class Prompt(BaseModel):
     # A unique identifier for the prompt. This is used to reference the prompt in other parts of the AIConfig (such as other prompts)
     name: str
@@ -191,10 +215,89 @@ class Prompt(BaseModel):
     metadata: Optional[PromptMetadata] = None
     # Execution, display, or stream outputs (currently a work-in-progress)
     outputs: Optional[List[Output]] = []
+    # Unvalidated outputs of a prompt loaded with lazy outputs. They're validated on first access to `outputs`
+    _deferred_outputs: Optional[List[Any]] = PrivateAttr(default=None)
 
     class Config:
         extra = "allow"
 
+    @field_validator("outputs", mode="wrap")
+    @classmethod
+    def _validate_outputs(cls, outputs: Any, handler, info: ValidationInfo):
+        # AIConfigRuntime.load sets the validation context to skip or defer outputs
+        context = info.context or {}
+        if not context.get("include_outputs", True):
+            return []
+        if context.get("lazy_outputs") and outputs is not None:
+            return _DeferredOutputs(outputs)
+        return handler(outputs)
+
+    @model_validator(mode="after")
+    def _set_deferred_outputs(self) -> "Prompt":
+        outputs = self.__dict__.get("outputs")
+        if isinstance(outputs, _DeferredOutputs):
+            self.defer_outputs(outputs.outputs)
+        return self
+
+    def defer_outputs(self, outputs: Optional[List[Any]]) -> None:
+        """
+        Sets the prompt's outputs from unvalidated data (e.g. parsed JSON), to be validated on first access to `outputs`.
+        """
+        self.__dict__.pop("outputs", None)
+        self._deferred_outputs = outputs
+
+    def has_deferred_outputs(self) -> bool:
+        """
+        Returns True if the prompt's outputs were deferred and haven't been accessed yet.
+        """
+        return "outputs" not in self.__dict__
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "name":
+            # Dependency indexes look prompts up by name
+            record_prompt_rename()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing from __dict__, i.e. deferred outputs
+        if name == "outputs":
+            outputs = _outputs_adapter.validate_python(self._deferred_outputs)
+            self.__dict__["outputs"] = outputs
+            self._deferred_outputs = None
+            return outputs
+        return super().__getattr__(name)
+
+    @model_serializer(mode="wrap")
+    def _serialize_deferred_outputs(self, handler, info):
+        if not self.has_deferred_outputs():
+            return handler(self)
+
+        excluded = (
+            info.exclude is not None and "outputs" in info.exclude
+        ) or (info.include is not None and "outputs" not in info.include)
+        if excluded:
+            return handler(self)
+        if info.mode != "json":
+            # Python objects are expected: validate the outputs
+            self.outputs
+            return handler(self)
+
+        # Deferred outputs are already JSON: write them as is, in field order (before extra fields)
+        serialized = handler(self)
+        return {
+            **{
+                key: value
+                for key, value in serialized.items()
+                if key in Prompt.model_fields
+            },
+            "outputs": self._deferred_outputs,
+            **{
+                key: value
+                for key, value in serialized.items()
+                if key not in Prompt.model_fields
+            },
+        }
+
     def add_output(self, output: Output):
         """
         Add the output to the prompt's output list
@@ -251,6 +354,10 @@ class AIConfig(BaseModel):
     prompts: List[Prompt] = []
     # An index of prompts by name, constructed during post-initialization.
     prompt_index: Dict[str, Prompt] = {}
+    # An index of prompt positions and template references, used to resolve prompt references.
+    _dependency_index: PromptDependencyIndex = PrivateAttr(
+        default_factory=PromptDependencyIndex
+    )
 
     class Config:
         extra = "allow"
@@ -259,6 +366,12 @@ class AIConfig(BaseModel):
         """Post init hook for model"""
         self.prompt_index = {prompt.name: prompt for prompt in self.prompts}
 
+    def get_dependency_index(self) -> PromptDependencyIndex:
+        """
+        Returns the index of prompt positions and template references used to resolve prompt references.
+        """
+        return self._dependency_index
+
     def set_name(self, name: str):
         """
         Sets the name of the AIConfig
@@ -643,6 +756,7 @@ class AIConfig(BaseModel):
             self.prompts.append(prompt_data)
         else:
             self.prompts.insert(index, prompt_data)
+        self._dependency_index.invalidate()
 
     def update_prompt(self, prompt_name: str, prompt_data: Prompt):
         """
@@ -667,6 +781,7 @@ class AIConfig(BaseModel):
                 del self.prompt_index[prompt_name]
                 self.prompt_index[prompt_data.name] = prompt_data
                 break
+        self._dependency_index.invalidate()
 
     def delete_prompt(self, prompt_name: str):
         """
@@ -687,6 +802,7 @@ class AIConfig(BaseModel):
         self.prompts = [
             prompt for prompt in self.prompts if prompt.name != prompt_name
         ]
+        self._dependency_index.invalidate()
 
     def get_model_metadata(
         self, inference_settings: InferenceSettings, model_id: str
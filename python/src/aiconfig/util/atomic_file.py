@@ -0,0 +1,127 @@
+import hashlib
+import io
+import os
+import secrets
+import shutil
+from types import TracebackType
+from typing import IO, Any, Callable, Optional, Type
+
+
+class _HashingFileIO(io.FileIO):
+    """
+    A raw file that hashes everything written to it. It sits under the text and buffered layers,
+    so it hashes (and writes) buffered blocks rather than every small string.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path, "xb")
+        self.hasher = hashlib.sha256()
+
+    def write(self, data) -> int:
+        num_bytes = super().write(data)
+        if num_bytes:
+            self.hasher.update(memoryview(data)[:num_bytes])
+        return num_bytes
+
+
+class _HashingSink(io.RawIOBase):
+    """
+    A raw stream that hashes everything written to it, and discards it.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.hasher = hashlib.sha256()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.hasher.update(data)
+        return len(data)
+
+
+def get_text_digest(
+    write: Callable[[IO[str]], Any], encoding: str = "utf-8"
+) -> str:
+    """
+    Returns the sha256 of the text `write` writes to the file it's given, without writing it anywhere.
+    The digest matches AtomicFileWriter.hexdigest for the same text.
+
+    Usage:
+        digest = get_text_digest(lambda file: json.dump(data, file))
+    """
+    sink = _HashingSink()
+    with io.TextIOWrapper(
+        io.BufferedWriter(sink), encoding=encoding, newline=""
+    ) as file:
+        write(file)
+        file.flush()
+        return sink.hasher.hexdigest()
+
+
+class AtomicFileWriter:
+    """
+    Writes a text file atomically: the content is written to a temporary file next to the target,
+    which replaces the target when the `with` block exits without an error. Readers (and a crash
+    midway through a write) never see a partially written file.
+
+    The sha256 of the written content is available as `hexdigest` before the block exits.
+
+    Usage:
+        with AtomicFileWriter("aiconfig.json") as file:
+            json.dump(data, file)
+    """
+
+    def __init__(self, path: str, encoding: str = "utf-8"):
+        # Replace the file a symlink points to, not the symlink
+        self.path = os.path.realpath(path)
+        self.encoding = encoding
+        # In the same directory as the target, so the rename is atomic
+        self._tmp_path = f"{self.path}.{secrets.token_hex(4)}.tmp"
+        self._raw: Optional[_HashingFileIO] = None
+        self._file: Optional[io.TextIOWrapper] = None
+
+    def __enter__(self) -> "AtomicFileWriter":
+        self._raw = _HashingFileIO(self._tmp_path)
+        self._file = io.TextIOWrapper(
+            io.BufferedWriter(self._raw), encoding=self.encoding, newline=""
+        )
+        return self
+
+    def write(self, text: str) -> int:
+        assert self._file is not None, "AtomicFileWriter must be entered"
+        return self._file.write(text)
+
+    @property
+    def hexdigest(self) -> str:
+        """
+        The sha256 of the content written so far.
+        """
+        assert self._file is not None and self._raw is not None
+        self._file.flush()
+        return self._raw.hasher.hexdigest()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        assert self._file is not None and self._raw is not None
+        try:
+            if exc_type is None:
+                self._file.flush()
+                os.fsync(self._raw.fileno())
+            self._file.close()
+            if exc_type is not None:
+                os.unlink(self._tmp_path)
+                return
+            if os.path.exists(self.path):
+                # Keep the permissions of the file being replaced
+                shutil.copymode(self.path, self._tmp_path)
+            os.replace(self._tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(self._tmp_path):
+                os.unlink(self._tmp_path)
+            raise
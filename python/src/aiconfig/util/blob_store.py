@@ -0,0 +1,264 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, Optional, TypeVar, Union
+
+from aiconfig.schema import (
+    AttachmentDataWithStringValue,
+    OutputDataWithStringValue,
+)
+
+if TYPE_CHECKING:
+    from aiconfig.schema import AIConfig
+
+# Blobs are referenced from outputs and attachments by the sha256 of their content
+BLOB_URI_PREFIX = "aiconfig-blob://sha256/"
+# Binary payloads smaller than this stay inline as base64
+DEFAULT_MIN_BLOB_SIZE_BYTES = 16 * 1024
+# Key of the blob store settings in the AIConfig metadata
+BLOB_STORE_METADATA_KEY = "blob_store"
+
+StringValueDataT = TypeVar(
+    "StringValueDataT",
+    OutputDataWithStringValue,
+    AttachmentDataWithStringValue,
+)
+
+
+def make_blob_uri(digest: str) -> str:
+    return f"{BLOB_URI_PREFIX}{digest}"
+
+
+def get_blob_digest(uri: Any) -> Optional[str]:
+    """
+    Returns the content digest referenced by a blob URI, or None if the value isn't a blob URI.
+    """
+    if not isinstance(uri, str) or not uri.startswith(BLOB_URI_PREFIX):
+        return None
+    digest = uri[len(BLOB_URI_PREFIX) :]
+    if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+        return None
+    return digest
+
+
+def is_blob_uri(value: Any) -> bool:
+    return get_blob_digest(value) is not None
+
+
+class BlobStore(ABC):
+    """
+    A content-addressed store for large binary outputs (images, audio...), so configs reference them
+    by URI instead of inlining them as base64. Blobs are immutable: writing the same content twice stores it once.
+
+    Subclasses implement _exists, _read and _write for a storage backend.
+    """
+
+    def __init__(self, min_size_bytes: int = DEFAULT_MIN_BLOB_SIZE_BYTES):
+        self.min_size_bytes = min_size_bytes
+
+    def put(self, data: bytes) -> str:
+        """
+        Stores the data, if it isn't stored already, and returns its blob URI.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        if not self._exists(digest):
+            self._write(digest, data)
+        return make_blob_uri(digest)
+
+    def get(self, uri: str) -> bytes:
+        """
+        Returns the data referenced by a blob URI.
+
+        Raises:
+            ValueError: If the URI isn't a blob URI.
+            KeyError: If the blob isn't in the store.
+        """
+        digest = get_blob_digest(uri)
+        if digest is None:
+            raise ValueError(f"'{uri}' is not a blob URI.")
+        data = self._read(digest)
+        if data is None:
+            raise KeyError(f"Blob '{uri}' not found in {self}.")
+        return data
+
+    def exists(self, uri: str) -> bool:
+        digest = get_blob_digest(uri)
+        return digest is not None and self._exists(digest)
+
+    @abstractmethod
+    def _exists(self, digest: str) -> bool:
+        pass
+
+    @abstractmethod
+    def _read(self, digest: str) -> Optional[bytes]:
+        """
+        Returns the blob's data, or None if it isn't stored.
+        """
+
+    @abstractmethod
+    def _write(self, digest: str, data: bytes) -> None:
+        pass
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Stores blobs as files in a local directory, sharded by the first two characters of their digest.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        min_size_bytes: int = DEFAULT_MIN_BLOB_SIZE_BYTES,
+    ):
+        super().__init__(min_size_bytes)
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+
+    def __repr__(self) -> str:
+        return f"LocalBlobStore({self.directory!r})"
+
+    def get_path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _exists(self, digest: str) -> bool:
+        return os.path.exists(self.get_path(digest))
+
+    def _read(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self.get_path(digest), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, digest: str, data: bytes) -> None:
+        path = self.get_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file and rename it, so readers never see a partially written blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def create_blob_store(
+    settings: Dict[str, Any], base_dir: Optional[str] = None
+) -> BlobStore:
+    """
+    Creates a blob store from settings, as stored in the AIConfig metadata.
+
+    Args:
+        settings (dict): {"backend": "local", "path": str, "min_size_bytes": int}. `path` is required.
+        base_dir (str, optional): Directory a relative `path` is resolved against (the directory of the
+            config file). Defaults to the current working directory.
+    """
+    backend = settings.get("backend", "local")
+    if backend == "local":
+        if not settings.get("path"):
+            raise ValueError(
+                "The local blob store backend requires a 'path' setting."
+            )
+        path = settings["path"]
+        if base_dir is not None:
+            path = os.path.join(base_dir, os.path.expanduser(path))
+        return LocalBlobStore(
+            path,
+            min_size_bytes=settings.get(
+                "min_size_bytes", DEFAULT_MIN_BLOB_SIZE_BYTES
+            ),
+        )
+    raise ValueError(
+        f"Unknown blob store backend '{backend}'. Supported backends: 'local'."
+    )
+
+
+_default_blob_store: Optional[BlobStore] = None
+# Blob stores created from AIConfig metadata, by settings
+_blob_stores_from_metadata: Dict[str, BlobStore] = {}
+_blob_stores_from_metadata_lock = threading.Lock()
+
+
+def set_default_blob_store(blob_store: Optional[BlobStore]) -> None:
+    """
+    Sets the blob store used for configs that don't configure one in their metadata. None disables it.
+    """
+    global _default_blob_store
+    _default_blob_store = blob_store
+
+
+def get_blob_store(
+    aiconfig: Optional["AIConfig"] = None,
+) -> Optional[BlobStore]:
+    """
+    Returns the blob store configured in the AIConfig metadata if any, otherwise the default blob store.
+    Binary outputs are inlined as base64 unless one of them is set, or if the metadata sets "enabled": False.
+    """
+    metadata = getattr(aiconfig, "metadata", None)
+    settings = getattr(metadata, BLOB_STORE_METADATA_KEY, None)
+    if not settings:
+        return _default_blob_store
+    if not settings.get("enabled", True):
+        return None
+
+    # A relative path in the metadata is relative to the config file, like the config's other paths
+    file_path = getattr(aiconfig, "file_path", None)
+    base_dir = (
+        os.path.dirname(os.path.abspath(file_path)) if file_path else None
+    )
+    settings_key = json.dumps([settings, base_dir], sort_keys=True)
+    with _blob_stores_from_metadata_lock:
+        if settings_key not in _blob_stores_from_metadata:
+            _blob_stores_from_metadata[settings_key] = create_blob_store(
+                settings, base_dir
+            )
+        return _blob_stores_from_metadata[settings_key]
+
+
+def make_binary_output_data(
+    data: Union[bytes, str], aiconfig: Optional["AIConfig"] = None
+) -> OutputDataWithStringValue:
+    """
+    Returns output data for binary content (raw bytes or a base64 string): a blob URI if the config has a
+    blob store and the content is large enough, otherwise the content inlined as base64.
+    """
+    blob_store = get_blob_store(aiconfig)
+    if blob_store is not None:
+        raw_data = data if isinstance(data, bytes) else base64.b64decode(data)
+        if len(raw_data) >= blob_store.min_size_bytes:
+            return OutputDataWithStringValue(
+                kind="file_uri", value=blob_store.put(raw_data)
+            )
+
+    if isinstance(data, bytes):
+        data = base64.b64encode(data).decode("utf-8")
+    return OutputDataWithStringValue(kind="base64", value=data)
+
+
+def resolve_blob_data(
+    data: StringValueDataT, aiconfig: Optional["AIConfig"] = None
+) -> StringValueDataT:
+    """
+    Returns output or attachment data with a blob URI replaced by the blob's content as base64.
+    Any other data is returned as is.
+    """
+    if data.kind != "file_uri" or not is_blob_uri(data.value):
+        return data
+    blob_store = get_blob_store(aiconfig)
+    if blob_store is None:
+        raise ValueError(
+            f"Cannot read '{data.value}': no blob store is configured."
+        )
+    return data.model_copy(
+        update={
+            "kind": "base64",
+            "value": base64.b64encode(blob_store.get(data.value)).decode(
+                "utf-8"
+            ),
+        }
+    )
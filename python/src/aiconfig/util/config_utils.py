@@ -1,8 +1,9 @@
 import copy
 import os
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING, Any, Union
 
 import dotenv
+import yaml
 from result import Err, Ok, Result
 
 if TYPE_CHECKING:
@@ -12,6 +13,9 @@ if TYPE_CHECKING:
 
     from ..schema import AIConfig
 
+# Use the libyaml C loader when PyYAML was built with it; it's several times faster than the pure-Python loader
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def get_api_key_from_environment(
     api_key_name: str, required: bool = True
@@ -82,3 +86,10 @@ def is_yaml_ext(file_path: str):
     """
     _, ext = os.path.splitext(file_path)
     return ext in [".yaml", ".yml"]
+
+
+def load_yaml_data(stream: Union[str, bytes, IO]) -> Any:
+    """
+    Parses YAML (a string, bytes or a file) with the fastest available safe loader.
+    """
+    return yaml.load(stream, Loader=YAML_LOADER)
@@ -0,0 +1,148 @@
+import itertools
+import re
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional
+
+if TYPE_CHECKING:
+    from aiconfig.schema import Prompt
+
+# Number of parsed templates kept in memory by each index
+DEFAULT_MAX_INDEXED_TEMPLATES = 1024
+
+# Handlebars tags whose references can't be read off the root context: block helpers, partials,
+# and parent/root/this/lookup paths. Templates using them fall back to materializing every earlier prompt.
+_SCOPED_TAG_PATTERN = re.compile(
+    r"{{[{~]?\s*(?:[#>]|[^}]*(?:\.\./|@root|\bthis\b|\blookup\b))"
+)
+
+# Counts prompt renames (see Prompt.__setattr__), so indexes notice prompts renamed directly without rescanning them
+_prompt_rename_counter = itertools.count(1)
+_num_prompt_renames = 0
+
+
+def record_prompt_rename() -> None:
+    """
+    Called when a prompt's name is assigned. Makes every index rebuild its positions on the next lookup.
+    """
+    global _num_prompt_renames
+    _num_prompt_renames = next(_prompt_rename_counter)
+
+
+class PromptDependencyIndex:
+    """
+    An incrementally maintained index of the prompts in an AIConfig, used to resolve prompt references
+    without rescanning every prompt on every resolve:
+    - the position of each prompt, so "is this an earlier prompt?" is a dict lookup
+    - the parameters referenced by each template, so templates are only parsed once
+
+    AIConfig keeps the index up to date from add_prompt, update_prompt and delete_prompt.
+    Since prompts and the prompt list can also be mutated directly, positions are rebuilt on lookup
+    when the length of the prompt list changed or a prompt was renamed since they were built.
+    """
+
+    def __init__(self, max_templates: int = DEFAULT_MAX_INDEXED_TEMPLATES):
+        self.max_templates = max_templates
+        self._positions: Dict[str, int] = {}
+        # Length of the prompt list the positions were built from, -1 when stale
+        self._num_indexed_prompts = -1
+        # Number of prompt renames when the positions were built
+        self._num_indexed_renames = 0
+        # template -> names of the root-level parameters it references, or None if it can reference any prompt
+        self._template_parameters: OrderedDict[
+            str, Optional[FrozenSet[str]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        self.num_rebuilds = 0
+
+    def __deepcopy__(self, memo) -> "PromptDependencyIndex":
+        # The index is a cache of the prompt list: a copy of the config starts with an empty one
+        return PromptDependencyIndex(self.max_templates)
+
+    def invalidate(self) -> None:
+        """
+        Marks prompt positions as stale. Called when prompts are added, renamed, reordered or deleted.
+        """
+        self._num_indexed_prompts = -1
+
+    def _rebuild(self, prompts: List["Prompt"]) -> Dict[str, int]:
+        # Read first, so renames made while rebuilding make the next lookup rebuild again
+        num_renames = _num_prompt_renames
+        positions: Dict[str, int] = {}
+        for position, prompt in enumerate(prompts):
+            if prompt.name:
+                positions.setdefault(prompt.name, position)
+        self._positions = positions
+        self._num_indexed_prompts = len(prompts)
+        self._num_indexed_renames = num_renames
+        self.num_rebuilds += 1
+        return positions
+
+    def get_position(
+        self, prompts: List["Prompt"], prompt_name: str
+    ) -> Optional[int]:
+        """
+        Returns the position of the named prompt in the prompt list, or None if there is no such prompt.
+        """
+        position = self._positions.get(prompt_name)
+        if (
+            self._num_indexed_prompts != len(prompts)
+            or self._num_indexed_renames != _num_prompt_renames
+            or (position is not None and prompts[position].name != prompt_name)
+        ):
+            return self._rebuild(prompts).get(prompt_name)
+        return position
+
+    def get_referenced_parameters(
+        self, template: str
+    ) -> Optional[FrozenSet[str]]:
+        """
+        Returns the names of the root-level parameters referenced by a template (e.g. "prompt1" for "{{prompt1.output}}"),
+        or None if the template uses block helpers that may reference any parameter.
+        """
+        with self._lock:
+            if template in self._template_parameters:
+                self._template_parameters.move_to_end(template)
+                return self._template_parameters[template]
+
+        if _SCOPED_TAG_PATTERN.search(template):
+            parameters = None
+        else:
+            # Circular import
+            from aiconfig.util.params import get_parameters_in_template
+
+            parameters = frozenset(get_parameters_in_template(template).keys())
+
+        with self._lock:
+            self._template_parameters[template] = parameters
+            while len(self._template_parameters) > self.max_templates:
+                self._template_parameters.popitem(last=False)
+        return parameters
+
+    def get_referenced_prompts(
+        self,
+        prompts: List["Prompt"],
+        current_prompt_name: str,
+        template: str,
+    ) -> List["Prompt"]:
+        """
+        Returns the prompts before the current prompt that the template references, in prompt order.
+        Prompts can only reference earlier prompts, to avoid cyclic dependencies.
+        """
+        current_position = self.get_position(prompts, current_prompt_name)
+        if current_position is None:
+            current_position = len(prompts)
+
+        parameters = self.get_referenced_parameters(template)
+        if parameters is None:
+            return prompts[:current_position]
+
+        positions = sorted(
+            position
+            for position in (
+                self.get_position(prompts, parameter)
+                for parameter in parameters
+            )
+            if position is not None and position < current_position
+        )
+        return [prompts[position] for position in positions]
@@ -0,0 +1,398 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from aiconfig.schema import Output
+
+if TYPE_CHECKING:
+    from aiconfig.Config import AIConfigRuntime
+    from aiconfig.model_parser import InferenceOptions
+
+# Key of the AIConfig metadata entry used to enable the inference cache, e.g.
+# "metadata": {"inference_cache": {"backend": "sqlite", "path": ".aiconfig_cache.sqlite", "ttl_s": 86400}}
+INFERENCE_CACHE_METADATA_KEY = "inference_cache"
+
+DEFAULT_MEMORY_MAX_ENTRIES = 1024
+DEFAULT_SQLITE_MAX_SIZE_BYTES = 512 * 1024 * 1024
+
+_outputs_adapter = TypeAdapter(List[Output])
+
+
+def make_inference_cache_key(
+    model_parser_id: str, completion_params: Any
+) -> str:
+    """
+    Content-addressed cache key: a hash of the model parser id and the resolved completion params (the output of deserialize()).
+    """
+    serialized = json.dumps(
+        {
+            "model_parser": model_parser_id,
+            "completion_params": completion_params,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def serialize_outputs(outputs: List[Output]) -> str:
+    return _outputs_adapter.dump_json(outputs).decode("utf-8")
+
+
+def deserialize_outputs(serialized_outputs: str) -> List[Output]:
+    return _outputs_adapter.validate_json(serialized_outputs)
+
+
+@dataclass(frozen=True)
+class InferenceCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class InferenceCache(ABC):
+    """
+    Caches model outputs keyed on the resolved completion params, so re-running a prompt with identical
+    completion params doesn't pay model latency and cost again.
+    Entries are stored as serialized outputs, so cached outputs are never shared between runs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Optional[List[Output]]:
+        """
+        Returns the cached outputs for the key, or None if missing or expired.
+        """
+        serialized_outputs = self._get(key)
+        with self._lock:
+            if serialized_outputs is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return deserialize_outputs(serialized_outputs)
+
+    def set(self, key: str, outputs: List[Output]) -> None:
+        self._set(key, serialize_outputs(outputs))
+
+    def stats(self) -> InferenceCacheStats:
+        with self._lock:
+            return InferenceCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=self._size(),
+            )
+
+    def _record_evictions(self, count: int) -> None:
+        with self._lock:
+            self._evictions += count
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, serialized_outputs: str) -> None:
+        pass
+
+    @abstractmethod
+    def _size(self) -> int:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+class InMemoryInferenceCache(InferenceCache):
+    """
+    A process-local LRU inference cache with an optional TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MEMORY_MAX_ENTRIES,
+        ttl_s: Optional[float] = None,
+    ):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        # key -> (expires_at, serialized outputs)
+        self._entries: OrderedDict[str, Tuple[Optional[float], str]] = (
+            OrderedDict()
+        )
+        self._entries_lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._entries_lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, serialized_outputs = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return serialized_outputs
+
+    def _set(self, key: str, serialized_outputs: str) -> None:
+        expires_at = time.time() + self.ttl_s if self.ttl_s else None
+        evictions = 0
+        with self._entries_lock:
+            self._entries[key] = (expires_at, serialized_outputs)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evictions += 1
+        if evictions:
+            self._record_evictions(evictions)
+
+    def _size(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._entries_lock:
+            self._entries.clear()
+
+
+class SQLiteInferenceCache(InferenceCache):
+    """
+    A persistent inference cache backed by a SQLite file, fronted by an in-memory LRU.
+    Entries expire after `ttl_s` seconds, and the least recently used entries are evicted
+    once the total size of the cached outputs exceeds `max_size_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_s: Optional[float] = None,
+        max_size_bytes: int = DEFAULT_SQLITE_MAX_SIZE_BYTES,
+        memory_max_entries: int = DEFAULT_MEMORY_MAX_ENTRIES,
+    ):
+        super().__init__()
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_size_bytes = max_size_bytes
+        self._memory_cache = InMemoryInferenceCache(
+            max_entries=memory_max_entries, ttl_s=ttl_s
+        )
+        # Access times of entries served from the memory cache, written to the database lazily before evicting
+        self._pending_accesses: Dict[str, float] = {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        with self._db_lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS inference_cache (
+                    key TEXT PRIMARY KEY,
+                    outputs TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed_at REAL NOT NULL
+                )
+                """
+            )
+            # Kept up to date as this cache adds and removes entries, so stats() doesn't query the database
+            (self._num_entries,) = self._connection.execute(
+                "SELECT COUNT(*) FROM inference_cache"
+            ).fetchone()
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        serialized_outputs = self._memory_cache._get(key)
+        if serialized_outputs is not None:
+            self._pending_accesses[key] = now
+            return serialized_outputs
+
+        with self._db_lock, self._connection:
+            row = self._connection.execute(
+                "SELECT outputs, created_at FROM inference_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            serialized_outputs, created_at = row
+            if self.ttl_s and created_at + self.ttl_s <= now:
+                self._num_entries -= self._connection.execute(
+                    "DELETE FROM inference_cache WHERE key = ?", (key,)
+                ).rowcount
+                return None
+            self._connection.execute(
+                "UPDATE inference_cache SET last_accessed_at = ? WHERE key = ?",
+                (now, key),
+            )
+
+        self._memory_cache._set(key, serialized_outputs)
+        return serialized_outputs
+
+    def _set(self, key: str, serialized_outputs: str) -> None:
+        now = time.time()
+        size_bytes = len(serialized_outputs.encode("utf-8"))
+        with self._db_lock, self._connection:
+            is_new_entry = (
+                self._connection.execute(
+                    "SELECT 1 FROM inference_cache WHERE key = ?", (key,)
+                ).fetchone()
+                is None
+            )
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO inference_cache
+                (key, outputs, size_bytes, created_at, last_accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, serialized_outputs, size_bytes, now, now),
+            )
+            if is_new_entry:
+                self._num_entries += 1
+            evictions = self._evict(now)
+        self._memory_cache._set(key, serialized_outputs)
+        if evictions:
+            self._record_evictions(evictions)
+
+    def _evict(self, now: float) -> int:
+        """
+        Removes expired entries, then least recently used entries until the cache fits in max_size_bytes.
+        Must be called while holding the database lock.
+        """
+        evictions = 0
+        pending_accesses = self._pending_accesses
+        self._pending_accesses = {}
+        self._connection.executemany(
+            "UPDATE inference_cache SET last_accessed_at = MAX(last_accessed_at, ?) WHERE key = ?",
+            [
+                (accessed_at, key)
+                for key, accessed_at in pending_accesses.items()
+            ],
+        )
+
+        if self.ttl_s:
+            evictions += self._connection.execute(
+                "DELETE FROM inference_cache WHERE created_at <= ?",
+                (now - self.ttl_s,),
+            ).rowcount
+
+        (total_size_bytes,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM inference_cache"
+        ).fetchone()
+        if total_size_bytes <= self.max_size_bytes:
+            self._num_entries -= evictions
+            return evictions
+
+        rows = self._connection.execute(
+            "SELECT key, size_bytes FROM inference_cache ORDER BY last_accessed_at ASC"
+        ).fetchall()
+        keys_to_evict = []
+        for key, size_bytes in rows:
+            if total_size_bytes <= self.max_size_bytes:
+                break
+            keys_to_evict.append((key,))
+            total_size_bytes -= size_bytes
+        self._connection.executemany(
+            "DELETE FROM inference_cache WHERE key = ?", keys_to_evict
+        )
+        # Evicted entries must not be served from the memory cache either
+        with self._memory_cache._entries_lock:
+            for (key,) in keys_to_evict:
+                self._memory_cache._entries.pop(key, None)
+        evictions += len(keys_to_evict)
+        self._num_entries -= evictions
+        return evictions
+
+    def _size(self) -> int:
+        return self._num_entries
+
+    def clear(self) -> None:
+        self._memory_cache.clear()
+        with self._db_lock, self._connection:
+            self._pending_accesses = {}
+            self._connection.execute("DELETE FROM inference_cache")
+            self._num_entries = 0
+
+
+# Caches configured through AIConfig metadata, keyed by their settings, so they're shared across runs
+_caches_from_metadata: Dict[str, InferenceCache] = {}
+_caches_from_metadata_lock = threading.Lock()
+
+
+def create_inference_cache(settings: Dict[str, Any]) -> InferenceCache:
+    """
+    Creates an inference cache from settings, as stored in the AIConfig metadata.
+
+    Args:
+        settings (dict): {"backend": "memory" | "sqlite", "path": str, "ttl_s": float,
+            "max_entries": int, "max_size_bytes": int}. `path` is required for the sqlite backend.
+    """
+    backend = settings.get("backend", "memory")
+    if backend == "memory":
+        return InMemoryInferenceCache(
+            max_entries=settings.get(
+                "max_entries", DEFAULT_MEMORY_MAX_ENTRIES
+            ),
+            ttl_s=settings.get("ttl_s"),
+        )
+    elif backend == "sqlite":
+        if not settings.get("path"):
+            raise ValueError(
+                "The sqlite inference cache backend requires a 'path' setting."
+            )
+        return SQLiteInferenceCache(
+            path=settings["path"],
+            ttl_s=settings.get("ttl_s"),
+            max_size_bytes=settings.get(
+                "max_size_bytes", DEFAULT_SQLITE_MAX_SIZE_BYTES
+            ),
+            memory_max_entries=settings.get(
+                "max_entries", DEFAULT_MEMORY_MAX_ENTRIES
+            ),
+        )
+    raise ValueError(
+        f"Unknown inference cache backend '{backend}'. Supported backends: 'memory', 'sqlite'."
+    )
+
+
+def get_inference_cache(
+    aiconfig: "AIConfigRuntime", options: Optional["InferenceOptions"]
+) -> Optional[InferenceCache]:
+    """
+    Returns the inference cache to use for a run, if any. The cache set on InferenceOptions takes precedence
+    over the one configured in the AIConfig metadata. Caching is disabled unless one of them is set.
+    """
+    cache = getattr(options, "cache", None)
+    if cache is not None:
+        return cache
+
+    metadata = getattr(aiconfig, "metadata", None)
+    settings = getattr(metadata, INFERENCE_CACHE_METADATA_KEY, None)
+    if not settings or not settings.get("enabled", True):
+        return None
+
+    settings_key = json.dumps(settings, sort_keys=True)
+    with _caches_from_metadata_lock:
+        if settings_key not in _caches_from_metadata:
+            _caches_from_metadata[settings_key] = create_inference_cache(
+                settings
+            )
+        return _caches_from_metadata[settings_key]
@@ -0,0 +1,154 @@
+import asyncio
+import importlib.util
+import threading
+import weakref
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Type, TypeVar
+
+import httpx
+from openai import AsyncOpenAI
+
+ClientT = TypeVar("ClientT")
+
+
+@dataclass(frozen=True)
+class ConnectionPoolSettings:
+    """
+    Settings of the HTTP connection pool shared by the OpenAI-family model parsers.
+    """
+
+    # Maximum number of concurrent connections per client
+    max_connections: int = 100
+    # Maximum number of idle connections kept alive for reuse
+    max_keepalive_connections: int = 20
+    # Seconds an idle connection is kept alive
+    keepalive_expiry_s: float = 30.0
+    # Use HTTP/2 (multiplexes concurrent requests over one connection). Only applied if the `h2` package is installed.
+    http2: bool = True
+
+
+_pool_settings = ConnectionPoolSettings()
+# event loop -> (client class, client kwargs) -> client.
+# httpx connections are bound to the event loop that opened them, so clients are shared per event loop.
+_LoopClients = Dict[Tuple[Any, ...], Any]
+_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]"
+) = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+# Close tasks scheduled by configure_openai_connection_pool, referenced until they finish
+_closing_tasks: "set[asyncio.Task]" = set()
+
+
+def is_http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def configure_openai_connection_pool(**settings) -> ConnectionPoolSettings:
+    """
+    Updates the connection pool settings of the shared OpenAI clients, e.g.
+    `configure_openai_connection_pool(max_connections=50, http2=False)`.
+    Clients created afterwards use the new settings. Existing clients are dropped from the pool and
+    closed on their event loop.
+
+    Returns:
+        ConnectionPoolSettings: The updated settings.
+    """
+    global _pool_settings
+    with _clients_lock:
+        _pool_settings = replace(_pool_settings, **settings)
+        dropped_clients = list(_clients.items())
+        _clients.clear()
+    for loop, loop_clients in dropped_clients:
+        _schedule_close(loop, list(loop_clients.values()))
+    return _pool_settings
+
+
+def _schedule_close(loop: asyncio.AbstractEventLoop, clients: list) -> None:
+    # httpx clients must be closed on the loop that opened their connections.
+    # The connections of a closed loop are gone with it.
+    if loop.is_closed() or not clients:
+        return
+    try:
+        loop.call_soon_threadsafe(_start_close, clients)
+    except RuntimeError:
+        # The loop was closed in the meantime
+        pass
+
+
+def _start_close(clients: list) -> None:
+    task = asyncio.get_running_loop().create_task(_close_clients(clients))
+    _closing_tasks.add(task)
+    task.add_done_callback(_closing_tasks.discard)
+
+
+async def _close_clients(clients: list) -> None:
+    for client in clients:
+        await client.close()
+
+
+def get_connection_pool_settings() -> ConnectionPoolSettings:
+    return _pool_settings
+
+
+def create_async_http_client(
+    settings: Optional[ConnectionPoolSettings] = None,
+) -> httpx.AsyncClient:
+    """
+    Creates an httpx.AsyncClient with a keep-alive connection pool, to be passed to an AsyncOpenAI client.
+    """
+    settings = settings or _pool_settings
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry_s,
+        ),
+        http2=settings.http2 and is_http2_available(),
+        follow_redirects=True,
+    )
+
+
+def get_shared_async_openai_client(
+    client_class: Type[ClientT] = AsyncOpenAI, **client_kwargs
+) -> ClientT:
+    """
+    Returns an async OpenAI client (AsyncOpenAI, AsyncAzureOpenAI, ...) shared by every parser running on the current
+    event loop with the same client class and arguments, so concurrent requests reuse pooled connections.
+
+    Args:
+        client_class (type): The async client class to instantiate.
+        **client_kwargs: Arguments passed to the client, e.g. api_key or base_url. Must be hashable.
+    """
+    loop = asyncio.get_running_loop()
+    key = (client_class, tuple(sorted(client_kwargs.items())))
+    with _clients_lock:
+        loop_clients = _clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            client = client_class(
+                **client_kwargs, http_client=create_async_http_client()
+            )
+            loop_clients[key] = client
+    return client
+
+
+async def close_shared_openai_clients() -> None:
+    """
+    Closes the shared clients of the current event loop and their connections.
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        loop_clients = _clients.pop(loop, {})
+    await _close_clients(list(loop_clients.values()))
+
+
+async def iterate_stream(response: Any) -> AsyncIterator[Any]:
+    """
+    Iterates over a streamed response from either an async client or a sync client (e.g. a custom client set by a subclass).
+    """
+    if hasattr(response, "__aiter__"):
+        async for chunk in response:
+            yield chunk
+    else:
+        for chunk in response:
+            yield chunk
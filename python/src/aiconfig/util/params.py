@@ -1,6 +1,17 @@
 import re
-from collections import defaultdict
-from typing import TYPE_CHECKING, Any, Dict, List, Set
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from aiconfig.registry import ModelParserRegistry
 from pybars import Compiler
@@ -117,10 +128,117 @@ def validate_params(params: dict):
                 raise Exception("Invalid parameter: {}".format(param))
 
 
+# Default number of compiled handlebars templates kept in memory
+DEFAULT_TEMPLATE_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class TemplateCacheStats:
+    """
+    Snapshot of the compiled template cache counters.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+
+class CompiledTemplateCache:
+    """
+    A bounded, thread-safe LRU cache of compiled handlebars templates, keyed by the raw template string.
+
+    Compiling a template with pybars is far more expensive than rendering it, so prompts
+    that get resolved repeatedly (run_batch, chat history, eval loops) should only pay
+    the compilation cost once.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_TEMPLATE_CACHE_SIZE):
+        if max_size < 0:
+            raise ValueError(
+                f"Template cache size must be non-negative, got {max_size}"
+            )
+        self.max_size = max_size
+        self._templates: OrderedDict[str, Callable[..., str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, raw_template: str) -> Callable[..., str]:
+        """
+        Returns the compiled template for the given template string, compiling (and caching) it on a miss.
+        """
+        with self._lock:
+            template = self._templates.get(raw_template)
+            if template is not None:
+                self._templates.move_to_end(raw_template)
+                self._hits += 1
+                return template
+            self._misses += 1
+
+        # Compile outside of the lock so that slow compilations don't block readers
+        template = Compiler().compile(raw_template)
+        if self.max_size == 0:
+            return template
+
+        with self._lock:
+            self._templates[raw_template] = template
+            self._templates.move_to_end(raw_template)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+                self._evictions += 1
+        return template
+
+    def resize(self, max_size: int) -> None:
+        """
+        Updates the maximum number of cached templates, evicting the least recently used ones if needed.
+        """
+        if max_size < 0:
+            raise ValueError(
+                f"Template cache size must be non-negative, got {max_size}"
+            )
+        with self._lock:
+            self.max_size = max_size
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """
+        Removes all compiled templates and resets the counters.
+        """
+        with self._lock:
+            self._templates.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> TemplateCacheStats:
+        with self._lock:
+            return TemplateCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._templates),
+                max_size=self.max_size,
+            )
+
+
+_compiled_template_cache = CompiledTemplateCache()
+
+
+def get_compiled_template_cache() -> CompiledTemplateCache:
+    """
+    Returns the process-wide compiled template cache used when resolving prompts.
+    """
+    return _compiled_template_cache
+
+
 def resolve_parametrized_prompt(raw_prompt, params):
     """Paramterizes input Prompt"""
-    compiler = Compiler()
-    template = compiler.compile(raw_prompt)
+    template = _compiled_template_cache.get(raw_prompt)
     resolved_prompt = template(params)
     return resolved_prompt
 
@@ -202,6 +320,87 @@ def get_dependency_graph(
     return dependency_graph
 
 
+def get_dependency_levels(
+    dependency_graph: Dict[str, List[str]], root_prompt_name: str
+) -> List[List[str]]:
+    """
+    Groups the prompts of a dependency graph into topological levels. Level 0 holds the prompts without dependencies,
+    and every prompt is one level above its deepest dependency, so the prompts of a level only depend on earlier
+    levels and can run concurrently. The root prompt is always on the last level.
+
+    :param dependency_graph: A dependency graph, as returned by get_dependency_graph.
+    :param root_prompt_name: The name of the prompt the dependency graph was built from.
+    :return: The prompt names of each level, in topological order.
+    """
+    prompt_levels: Dict[str, int] = {}
+
+    def get_level(prompt_name: str) -> int:
+        if prompt_name not in prompt_levels:
+            prompt_levels[prompt_name] = 1 + max(
+                (
+                    get_level(dependency)
+                    for dependency in dependency_graph.get(prompt_name, [])
+                ),
+                default=-1,
+            )
+        return prompt_levels[prompt_name]
+
+    get_level(root_prompt_name)
+
+    levels: List[List[str]] = [
+        [] for _ in range(prompt_levels[root_prompt_name] + 1)
+    ]
+    for prompt_name, level in prompt_levels.items():
+        levels[level].append(prompt_name)
+    return levels
+
+
+def get_critical_path(
+    dependency_graph: Dict[str, List[str]],
+    levels: List[List[str]],
+    prompt_latencies_s: Dict[str, float],
+) -> Tuple[List[str], float]:
+    """
+    Finds the chain of dependent prompts with the highest total latency. With unbounded parallelism,
+    a run with dependencies can't complete faster than this chain.
+
+    :param dependency_graph: A dependency graph, as returned by get_dependency_graph.
+    :param levels: The topological levels of the graph, as returned by get_dependency_levels.
+    :param prompt_latencies_s: The latency of each prompt, in seconds.
+    :return: The prompt names on the critical path, from the first dependency to the root, and its total latency.
+    """
+    # prompt name -> (latency of the slowest chain ending at the prompt, previous prompt on that chain)
+    slowest_chains: Dict[str, Tuple[float, Optional[str]]] = {}
+    for level in levels:
+        for prompt_name in level:
+            previous_prompt_name = max(
+                dependency_graph.get(prompt_name, []),
+                key=lambda dependency: slowest_chains[dependency][0],
+                default=None,
+            )
+            previous_latency_s = (
+                slowest_chains[previous_prompt_name][0]
+                if previous_prompt_name is not None
+                else 0.0
+            )
+            slowest_chains[prompt_name] = (
+                previous_latency_s + prompt_latencies_s.get(prompt_name, 0.0),
+                previous_prompt_name,
+            )
+
+    if not slowest_chains:
+        return [], 0.0
+
+    # The root prompt depends on every other prompt, so its chain is the slowest
+    root_prompt_name = levels[-1][0]
+    critical_path = []
+    prompt_name: Optional[str] = root_prompt_name
+    while prompt_name is not None:
+        critical_path.append(prompt_name)
+        prompt_name = slowest_chains[prompt_name][1]
+    return critical_path[::-1], slowest_chains[root_prompt_name][0]
+
+
 def resolve_parameters(params, prompt: Prompt, ai_config: "AIConfig"):
     """
     Resolves input parameters for a specific prompt in the AI Configuration.
@@ -252,16 +451,33 @@ def get_prompt_template(
 
 
 def collect_prompt_references(
-    current_prompt: Prompt, ai_config: "AIConfigRuntime"
+    current_prompt: Prompt,
+    ai_config: "AIConfigRuntime",
+    prompt_template: Optional[str] = None,
 ) -> Dict[Any, Any]:
     """
     Collects references to all other prompts in the AIConfig. Only prompts that appear before the current prompt are collected.
+
+    If a prompt template is given, only the prompts it references are collected, so resolving a template
+    doesn't materialize the input and output of every earlier prompt.
     """
-    prompt_references = {}
-    for previous_prompt in ai_config.prompts:
-        if current_prompt.name == previous_prompt.name:
-            break
+    if prompt_template is not None and hasattr(
+        ai_config, "get_dependency_index"
+    ):
+        previous_prompts = (
+            ai_config.get_dependency_index().get_referenced_prompts(
+                ai_config.prompts, current_prompt.name, prompt_template
+            )
+        )
+    else:
+        previous_prompts = []
+        for previous_prompt in ai_config.prompts:
+            if current_prompt.name == previous_prompt.name:
+                break
+            previous_prompts.append(previous_prompt)
 
+    prompt_references = {}
+    for previous_prompt in previous_prompts:
         # Note: not all model inputs are parameterizable. This can be None.
         prompt_input = get_prompt_template(previous_prompt, ai_config)
 
@@ -327,7 +543,9 @@ def resolve_prompt_string(
     """
 
     # augment params with prompt-reference params
-    augmented_params = collect_prompt_references(current_prompt, ai_config)
+    augmented_params = collect_prompt_references(
+        current_prompt, ai_config, prompt_string
+    )
 
     # augment params with config-level params
     augmented_params.update(ai_config.get_global_parameters())
@@ -0,0 +1,361 @@
+import asyncio
+import json
+import math
+import random
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    from aiconfig.model_parser import InferenceOptions
+
+T = TypeVar("T")
+
+# HTTP status codes that are worth retrying: rate limiting, timeouts and transient server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# Completion param keys that bound the number of generated tokens, across the default parsers
+MAX_OUTPUT_TOKENS_KEYS = (
+    "max_tokens",
+    "max_new_tokens",
+    "max_output_tokens",
+    "max_tokens_to_sample",
+)
+
+
+def get_error_status_code(error: BaseException) -> Optional[int]:
+    """
+    Best-effort extraction of the HTTP status code from an exception raised by a provider SDK
+    (openai, anthropic, google, huggingface_hub, requests...).
+    """
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code
+
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code
+
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code
+    return None
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Returns True if the error is a rate limit (429) or transient server (5xx) error.
+    """
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    return get_error_status_code(error) in RETRYABLE_STATUS_CODES
+
+
+def get_retry_after_s(error: BaseException) -> Optional[float]:
+    """
+    Returns the delay requested by the server through the `Retry-After` header, if any.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(completion_params: Any) -> int:
+    """
+    Roughly estimates the number of tokens a request will consume, used to enforce token budgets.
+    Uses ~4 characters per token for the request, plus the maximum number of tokens the model is allowed to generate.
+    """
+    try:
+        serialized = json.dumps(completion_params, default=str)
+    except (TypeError, ValueError):
+        serialized = str(completion_params)
+    tokens = len(serialized) // 4
+
+    if isinstance(completion_params, dict):
+        for key in MAX_OUTPUT_TOKENS_KEYS:
+            max_output_tokens = completion_params.get(key)
+            if isinstance(max_output_tokens, int):
+                tokens += max_output_tokens
+                break
+    return tokens
+
+
+def get_percentile(values: List[float], percentile: float) -> float:
+    """
+    Returns the nearest-rank percentile of the values, or 0.0 if there are none.
+    """
+    if not values:
+        return 0.0
+    sorted_values = sorted(values)
+    rank = math.ceil(percentile / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+class RateLimiter:
+    """
+    An asyncio token bucket. Allows bursts up to `capacity` and refills at `rate` per `per_seconds`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        per_seconds: float = 1.0,
+        capacity: Optional[float] = None,
+    ):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.refill_per_second = rate / per_seconds
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._last_refill) * self.refill_per_second,
+        )
+        self._last_refill = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """
+        Waits until `amount` tokens are available and consumes them.
+        Requests larger than the bucket capacity are capped so they can't block forever.
+        """
+        amount = min(amount, self.capacity)
+        # Holding the lock while waiting keeps acquisition first-come, first-served
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep(
+                    (amount - self._tokens) / self.refill_per_second
+                )
+
+
+@dataclass(frozen=True)
+class BatchStats:
+    """
+    Throughput statistics for a single batch run.
+    """
+
+    total_requests: int
+    succeeded: int
+    failed: int
+    retries: int
+    wall_time_s: float
+    # Completed requests per second of wall-clock time
+    throughput_rps: float
+    mean_latency_s: float
+    max_latency_s: float
+    # Highest number of requests that were in flight at the same time
+    peak_in_flight: int
+    estimated_tokens: int
+    p50_latency_s: float = 0.0
+    p90_latency_s: float = 0.0
+    p99_latency_s: float = 0.0
+
+
+class BatchResults(List[T]):
+    """
+    A list of batch results, annotated with the throughput stats of the batch that produced them,
+    and optionally with the completion params each result was resolved to (in the same order).
+    """
+
+    def __init__(
+        self,
+        results: Iterable[T] = (),
+        stats: Optional[BatchStats] = None,
+        completion_params: Optional[List[Any]] = None,
+    ):
+        super().__init__(results)
+        self.stats = stats
+        self.completion_params = completion_params
+
+
+class InferenceScheduler:
+    """
+    Schedules model inference requests for a batch: bounds the number of requests in flight,
+    enforces requests-per-second and tokens-per-minute budgets, and retries rate limited (429)
+    or transient (5xx) failures with jittered exponential backoff.
+
+    A scheduler is meant to be shared by every request of a single batch.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 0,
+        retry_base_delay_s: float = 1.0,
+        retry_max_delay_s: float = 60.0,
+    ):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency}"
+            )
+        if max_retries < 0:
+            raise ValueError(
+                f"max_retries must be non-negative, got {max_retries}"
+            )
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.retry_base_delay_s = retry_base_delay_s
+        self.retry_max_delay_s = retry_max_delay_s
+
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency)
+            if max_concurrency is not None
+            else None
+        )
+        self._request_limiter = (
+            RateLimiter(requests_per_second)
+            if requests_per_second is not None
+            else None
+        )
+        self._token_limiter = (
+            RateLimiter(tokens_per_minute, per_seconds=60)
+            if tokens_per_minute is not None
+            else None
+        )
+
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._total_requests = 0
+        self._succeeded = 0
+        self._failed = 0
+        self._retries = 0
+        self._latencies_s: List[float] = []
+        self._estimated_tokens = 0
+
+    @classmethod
+    def from_options(
+        cls, options: Optional["InferenceOptions"]
+    ) -> "InferenceScheduler":
+        """
+        Creates a scheduler from the batch settings in InferenceOptions. Without options, requests are not limited.
+        """
+        if options is None:
+            return cls()
+        return cls(
+            max_concurrency=getattr(options, "max_concurrency", None),
+            requests_per_second=getattr(options, "requests_per_second", None),
+            tokens_per_minute=getattr(options, "tokens_per_minute", None),
+            max_retries=getattr(options, "max_retries", 0),
+            retry_base_delay_s=getattr(options, "retry_base_delay_s", 1.0),
+            retry_max_delay_s=getattr(options, "retry_max_delay_s", 60.0),
+        )
+
+    def get_backoff_delay_s(self, attempt: int) -> float:
+        """
+        Exponential backoff with jitter: a random delay in [cap / 2, cap], where cap doubles every attempt.
+        """
+        cap = min(
+            self.retry_max_delay_s, self.retry_base_delay_s * (2**attempt)
+        )
+        return random.uniform(cap / 2, cap)
+
+    async def run(
+        self, request_fn: Callable[[], Awaitable[T]], tokens: int = 0
+    ) -> T:
+        """
+        Runs `request_fn` once a slot and the rate budgets are available, retrying retryable errors.
+
+        Args:
+            request_fn (Callable): Creates the awaitable to run. Called again on every retry.
+            tokens (int): Estimated number of tokens the request consumes, checked against the tokens-per-minute budget.
+        """
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        self._total_requests += 1
+        self._estimated_tokens += tokens
+
+        attempt = 0
+        while True:
+            async with self._semaphore or nullcontext():
+                if self._request_limiter is not None:
+                    await self._request_limiter.acquire()
+                if self._token_limiter is not None and tokens > 0:
+                    await self._token_limiter.acquire(tokens)
+
+                self._in_flight += 1
+                self._peak_in_flight = max(
+                    self._peak_in_flight, self._in_flight
+                )
+                start = time.perf_counter()
+                error: Optional[Exception] = None
+                try:
+                    result = await request_fn()
+                except Exception as e:
+                    error = e
+                finally:
+                    self._in_flight -= 1
+                    self._finished_at = time.perf_counter()
+
+            if error is None:
+                self._latencies_s.append(self._finished_at - start)
+                self._succeeded += 1
+                return result
+
+            if attempt >= self.max_retries or not is_retryable_error(error):
+                self._failed += 1
+                raise error
+
+            # Back off outside of the concurrency slot so other requests can make progress
+            delay_s = get_retry_after_s(error)
+            if delay_s is None:
+                delay_s = self.get_backoff_delay_s(attempt)
+            attempt += 1
+            self._retries += 1
+            await asyncio.sleep(delay_s)
+
+    def stats(self) -> BatchStats:
+        wall_time_s = (
+            self._finished_at - self._started_at
+            if self._started_at is not None and self._finished_at is not None
+            else 0.0
+        )
+        return BatchStats(
+            total_requests=self._total_requests,
+            succeeded=self._succeeded,
+            failed=self._failed,
+            retries=self._retries,
+            wall_time_s=wall_time_s,
+            throughput_rps=(
+                self._succeeded / wall_time_s if wall_time_s > 0 else 0.0
+            ),
+            mean_latency_s=(
+                sum(self._latencies_s) / len(self._latencies_s)
+                if self._latencies_s
+                else 0.0
+            ),
+            max_latency_s=max(self._latencies_s, default=0.0),
+            peak_in_flight=self._peak_in_flight,
+            estimated_tokens=self._estimated_tokens,
+            p50_latency_s=get_percentile(self._latencies_s, 50),
+            p90_latency_s=get_percentile(self._latencies_s, 90),
+            p99_latency_s=get_percentile(self._latencies_s, 99),
+        )
@@ -0,0 +1,215 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class _StringBuilder:
+    """
+    Accumulates string fragments; they're only joined when the message is materialized.
+    """
+
+    __slots__ = ("parts",)
+
+    def __init__(self, value: str):
+        self.parts: List[str] = [value]
+
+    def build(self) -> str:
+        if len(self.parts) > 1:
+            self.parts = ["".join(self.parts)]
+        return self.parts[0]
+
+
+class _ToolCallsBuilder:
+    """
+    Accumulates streamed tool call deltas, which are matched by their "index".
+    """
+
+    __slots__ = ("tool_calls",)
+
+    def __init__(self):
+        self.tool_calls: Dict[int, StreamedMessage] = {}
+
+    def add(self, deltas: List[Any]) -> None:
+        for position, delta in enumerate(deltas):
+            if not isinstance(delta, dict):
+                continue
+            index = delta.get("index", position)
+            tool_call = self.tool_calls.get(index)
+            if tool_call is None:
+                tool_call = self.tool_calls[index] = StreamedMessage()
+            tool_call.add(delta)
+
+    def build(self) -> List[Dict[str, Any]]:
+        return [
+            self.tool_calls[index].to_dict()
+            for index in sorted(self.tool_calls)
+        ]
+
+
+class StreamedMessage:
+    """
+    A chat message accumulated from streamed deltas. Adding a delta only costs the size of the delta:
+    string fields (e.g. "content", "function_call.arguments") are kept as fragments, and tool calls
+    are merged by index.
+
+    `to_dict` materializes the message as a plain dict (cached until the next delta).
+    """
+
+    def __init__(self):
+        # key -> _StringBuilder, _ToolCallsBuilder, StreamedMessage, or the first value seen for the key
+        self._fields: Dict[str, Any] = {}
+        self._snapshot: Optional[Dict[str, Any]] = None
+
+    def add(self, delta: Dict[str, Any]) -> None:
+        self._snapshot = None
+        for key, value in delta.items():
+            field = self._fields.get(key)
+            if field is None:
+                self._fields[key] = _new_field(value)
+            elif isinstance(field, _StringBuilder):
+                if isinstance(value, str):
+                    field.parts.append(value)
+            elif isinstance(field, StreamedMessage):
+                if isinstance(value, dict):
+                    field.add(value)
+            elif isinstance(field, _ToolCallsBuilder):
+                if isinstance(value, list):
+                    field.add(value)
+            # Other values (numbers, lists without indices...) keep the first value seen
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._snapshot is None:
+            self._snapshot = {
+                key: (
+                    field.build()
+                    if isinstance(field, (_StringBuilder, _ToolCallsBuilder))
+                    else (
+                        field.to_dict()
+                        if isinstance(field, StreamedMessage)
+                        else field
+                    )
+                )
+                for key, field in self._fields.items()
+            }
+        return self._snapshot
+
+
+class StreamedMessageView(Mapping):
+    """
+    A read-only view of the message accumulated so far, passed to stream callbacks. The message is only
+    materialized when the view is read (at most once per delta), so callbacks that only use the delta
+    don't pay for the accumulated text.
+
+    Reads reflect the message at the time of the read. `to_dict` returns a plain dict snapshot,
+    e.g. to keep it or serialize it as JSON.
+    """
+
+    __slots__ = ("_message",)
+
+    def __init__(self, message: StreamedMessage):
+        self._message = message
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._message.to_dict()
+
+    def __getitem__(self, key: str) -> Any:
+        return self._message.to_dict()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._message.to_dict())
+
+    def __len__(self) -> int:
+        return len(self._message.to_dict())
+
+    def __repr__(self) -> str:
+        return repr(self._message.to_dict())
+
+
+def _new_field(value: Any) -> Any:
+    if isinstance(value, str):
+        return _StringBuilder(value)
+    if isinstance(value, dict):
+        message = StreamedMessage()
+        message.add(value)
+        return message
+    if isinstance(value, list) and all(
+        isinstance(item, dict) and "index" in item for item in value
+    ):
+        tool_calls = _ToolCallsBuilder()
+        tool_calls.add(value)
+        return tool_calls
+    return value
+
+
+class ChatCompletionStreamAccumulator:
+    """
+    Accumulates the chunks of a streamed chat completion (as dicts, e.g. from `chunk.model_dump()`)
+    into one message per choice, in time linear in the size of the stream.
+    """
+
+    def __init__(self):
+        self._messages: Dict[int, StreamedMessage] = {}
+        # choice index -> the fields other than "choices" of the last chunk with that choice
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+
+    def add_chunk(self, chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Adds a chunk to the accumulated messages.
+
+        Returns:
+            List[dict]: The choices in the chunk.
+        """
+        # The order in which the choices are streamed is not guaranteed
+        choices = chunk.get("choices") or []
+        chunk_without_choices = None
+        for choice in choices:
+            index = choice.get("index", 0)
+            message = self._messages.get(index)
+            if message is None:
+                message = self._messages[index] = StreamedMessage()
+            message.add(choice.get("delta") or {})
+
+            if chunk_without_choices is None:
+                chunk_without_choices = {
+                    key: value
+                    for key, value in chunk.items()
+                    if key != "choices"
+                }
+            self._metadata[index] = chunk_without_choices
+        return choices
+
+    def get_message(self, index: int) -> Dict[str, Any]:
+        """
+        Returns the message accumulated so far for a choice, as a plain dict (e.g. for stream callbacks).
+        This materializes the accumulated strings, so it costs the size of the message rather than of the last delta;
+        only call it when the accumulated message is needed.
+        """
+        return self._get_streamed_message(index).to_dict()
+
+    def get_message_view(self, index: int) -> StreamedMessageView:
+        """
+        Returns a lazy view of the message accumulated so far for a choice, for stream callbacks.
+        Unlike `get_message`, this costs nothing unless the view is read.
+        """
+        return StreamedMessageView(self._get_streamed_message(index))
+
+    def _get_streamed_message(self, index: int) -> StreamedMessage:
+        message = self._messages.get(index)
+        if message is None:
+            message = self._messages[index] = StreamedMessage()
+        return message
+
+    def get_choices(
+        self,
+    ) -> List[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+        """
+        Returns (index, message, metadata) for every choice, sorted by index. Metadata holds the fields
+        other than "choices" of the last chunk for that choice (id, model, created...).
+        """
+        return [
+            (
+                index,
+                self._messages[index].to_dict(),
+                dict(self._metadata.get(index, {})),
+            )
+            for index in sorted(self._messages)
+        ]
@@ -0,0 +1,73 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+# Default number of threads used to run blocking SDK calls (PaLM, Hugging Face...) off the event loop
+DEFAULT_MAX_INFERENCE_THREADS = 32
+
+_max_workers = DEFAULT_MAX_INFERENCE_THREADS
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Marks the end of an iterator consumed from the thread pool
+_END_OF_ITERATION = object()
+
+
+def configure_inference_thread_pool(max_workers: int) -> None:
+    """
+    Sets the number of threads used to run blocking model SDK calls. This bounds how many
+    blocking requests run concurrently across all parsers. Requests already running are not interrupted.
+    """
+    global _max_workers, _executor
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+    with _executor_lock:
+        _max_workers = max_workers
+        previous_executor, _executor = _executor, None
+    if previous_executor is not None:
+        previous_executor.shutdown(wait=False)
+
+
+def get_inference_thread_pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_max_workers,
+                thread_name_prefix="aiconfig-inference",
+            )
+        return _executor
+
+
+async def run_in_thread_pool(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Runs a blocking function in the inference thread pool without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_inference_thread_pool(), functools.partial(fn, *args, **kwargs)
+    )
+
+
+async def iterate_in_thread_pool(iterable: Iterable[T]) -> AsyncIterator[T]:
+    """
+    Consumes a blocking iterable (e.g. a streamed SDK response) from the inference thread pool,
+    yielding its items on the event loop.
+    """
+    iterator = await run_in_thread_pool(iter, iterable)
+    while True:
+        item: Any = await run_in_thread_pool(next, iterator, _END_OF_ITERATION)
+        if item is _END_OF_ITERATION:
+            return
+        yield item
@@ -1,8 +1,14 @@
 import os
 
 import pytest
+from aiconfig.Config import AIConfigRuntime
+from aiconfig.registry import ModelParserRegistry
 from openai.types.chat import ChatCompletion
 
+from aiconfig.schema import ExecuteResult, Prompt, PromptMetadata
+
+from .util.mock_parser import EchoModelParser
+
 
 # pytest patch side effect for mocking openai calls. Use as a decorator on a test function. `@patch.object(openai.ChatCompletion, "create", side_effect=mock_openai_chat_completion)`
 def mock_openai_chat_completion(**kwargs):
@@ -233,3 +239,36 @@ def set_temporary_env_vars():
                 os.environ[env_var] = original_value
             else:
                 del os.environ[env_var]
+
+
+@pytest.fixture
+def echo_aiconfig():
+    """
+    An AIConfig with a single prompt, "prompt1", run by EchoModelParser.
+    The prompt has one (stale) output and a global "greeting" parameter.
+    """
+    parser = EchoModelParser()
+    ModelParserRegistry.register_model_parser(parser)
+
+    config = AIConfigRuntime.create(
+        "batch_test", metadata={"parameters": {"greeting": "Hello"}}
+    )
+    config.add_prompt(
+        "prompt1",
+        Prompt(
+            name="prompt1",
+            input="{{greeting}} {{name}}",
+            metadata=PromptMetadata(model=parser.id()),
+            outputs=[
+                ExecuteResult(
+                    output_type="execute_result",
+                    execution_count=0,
+                    data="a large previous output",
+                    metadata={},
+                )
+            ],
+        ),
+    )
+    yield config
+
+    ModelParserRegistry.remove_model_parser(parser.id())
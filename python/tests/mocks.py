@@ -46,6 +46,10 @@ def make_mock_aiconfig_runtime(
             params_ = params or {}
             return await mock_run_text_to_text_impl(prompt_name, params_)
 
+        def copy_for_run(self) -> "_MockAIConfigRuntime":
+            # The mock has no state for runs to share
+            return self
+
     return _MockAIConfigRuntime()
 
 
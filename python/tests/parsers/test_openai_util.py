@@ -50,7 +50,7 @@ def test_refine_chat_completion_params():
 @pytest.mark.asyncio
 async def test_get_output_text(set_temporary_env_vars):
     with patch.object(
-        openai.resources.chat.Completions,
+        openai.resources.chat.AsyncCompletions,
         "create",
         side_effect=mock_openai_chat_completion,
     ):
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+
+import pytest
+from aiconfig.callback import (
+    CallbackEvent,
+    CallbackManager,
+    create_logging_callback,
+)
+from aiconfig.Config import AIConfigRuntime
+from aiconfig.default_parsers.openai import DefaultOpenAIParser
+from aiconfig.schema import Prompt, PromptMetadata
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_only_receive_their_events():
+    all_events = []
+    run_events = []
+
+    async def _record_all(event):
+        all_events.append(event.name)
+
+    def _record_run(event):
+        run_events.append(event.name)
+
+    callback_manager = CallbackManager([_record_all])
+    callback_manager.subscribe("on_run_start", _record_run)
+
+    await callback_manager.run_callbacks(CallbackEvent("on_run_start", "", {}))
+    await callback_manager.run_callbacks(
+        CallbackEvent("on_resolve_start", "", {})
+    )
+
+    assert all_events == ["on_run_start", "on_resolve_start"]
+    assert run_events == ["on_run_start"]
+    # Plain function callbacks run synchronously instead of failing as non-coroutines
+    assert [result.is_ok() for result in callback_manager.results] == [True]
+
+    callback_manager.unsubscribe("on_run_start", _record_run)
+    assert "on_run_start" not in callback_manager.subscriptions
+
+
+@pytest.mark.asyncio
+async def test_events_without_listeners_are_skipped():
+    received = []
+
+    async def _record(event):
+        received.append(event)
+
+    callback_manager = CallbackManager([])
+    callback_manager.subscribe("on_run_complete", _record)
+
+    assert not callback_manager.has_listeners("on_run_start")
+    assert callback_manager.has_listeners("on_run_complete")
+    await callback_manager.run_callbacks(CallbackEvent("on_run_start", "", {}))
+    assert received == []
+    assert callback_manager.results == []
+
+
+@pytest.mark.asyncio
+async def test_callback_errors_and_timeouts_are_captured():
+    def _raise(event):
+        raise ValueError("bad callback")
+
+    async def _hang(event):
+        await asyncio.sleep(1)
+
+    callback_manager = CallbackManager([_raise, _hang], timeout=0.01)
+    await callback_manager.run_callbacks(CallbackEvent("on_run_start", "", {}))
+
+    assert [result.is_err() for result in callback_manager.results] == [
+        True,
+        True,
+    ]
+    assert callback_manager.results[0].err() == "bad callback"
+
+
+@pytest.mark.asyncio
+async def test_background_dispatch_with_bounded_queue():
+    received = []
+    release = asyncio.Event()
+
+    async def _slow_record(event):
+        await release.wait()
+        received.append(event.data)
+
+    callback_manager = CallbackManager(
+        [_slow_record], background=True, max_queue_size=2
+    )
+    for i in range(5):
+        await callback_manager.run_callbacks(
+            CallbackEvent("on_run_start", "", i)
+        )
+    # The worker holds one event, the queue holds two more, and the rest are dropped
+    await asyncio.sleep(0)
+    await callback_manager.run_callbacks(CallbackEvent("on_run_start", "", 5))
+
+    release.set()
+    await callback_manager.close()
+
+    assert received[0] == 0
+    assert len(received) + callback_manager.num_dropped_events == 6
+    assert callback_manager.num_dropped_events >= 1
+
+
+def test_event_timestamps_are_set_per_event():
+    first = CallbackEvent("on_run_start", "", {})
+    second = CallbackEvent("on_run_start", "", {}, ts_ns=first.ts_ns + 1)
+
+    assert CallbackEvent("on_run_start", "", {}).ts_ns >= first.ts_ns
+    assert second.ts_ns == first.ts_ns + 1
+
+
+def test_default_logging_callback_does_not_duplicate_handlers():
+    create_logging_callback("aiconfig.log")
+    num_handlers = len(logging.getLogger("my-logger").handlers)
+    create_logging_callback("aiconfig.log")
+    CallbackManager.create_default_manager()
+
+    assert len(logging.getLogger("my-logger").handlers) == num_handlers
+
+
+@pytest.mark.asyncio
+async def test_default_logging_callback_is_a_listener():
+    callback_manager = CallbackManager.create_default_manager()
+    assert callback_manager.has_listeners("on_run_start")
+
+    await callback_manager.run_callbacks(CallbackEvent("on_run_start", "", {}))
+    assert len(callback_manager.results) == 1
+
+
+@pytest.mark.asyncio
+async def test_parsers_skip_events_without_listeners():
+    built_events = []
+    callback_manager = CallbackManager([])
+    callback_manager.subscribe("on_deserialize_complete", lambda event: None)
+    run_callbacks = callback_manager.run_callbacks
+
+    async def _record_and_run(event):
+        built_events.append(event.name)
+        await run_callbacks(event)
+
+    callback_manager.run_callbacks = _record_and_run
+    config = AIConfigRuntime.create("test")
+    config.callback_manager = callback_manager
+    prompt = Prompt(
+        name="prompt",
+        input="Hello",
+        metadata=PromptMetadata(model="gpt-3.5-turbo"),
+    )
+    config.add_prompt(prompt.name, prompt)
+
+    await DefaultOpenAIParser("gpt-3.5-turbo").deserialize(prompt, config, {})
+
+    assert built_events == ["on_deserialize_complete"]
@@ -0,0 +1,93 @@
+import pytest
+from aiconfig.editor.server.revisions import (
+    AIConfigRevisions,
+    apply_json_patch,
+    make_json_patch,
+)
+
+
+def _make_config(*prompt_names: str, **metadata):
+    return {
+        "name": "config",
+        "metadata": {"parameters": {}, **metadata},
+        "prompts": [
+            {"name": name, "input": f"Input of {name}"}
+            for name in prompt_names
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    "old,new",
+    [
+        (_make_config("a", "b", "c"), _make_config("a", "x", "b", "c")),
+        (_make_config("a", "b", "c"), _make_config("a", "c")),
+        (_make_config("a", "b"), _make_config("b", "a", "c", "d")),
+        (_make_config("a"), _make_config("a", **{"a/b~c": 1})),
+        (_make_config("a", "b"), {"name": "other"}),
+    ],
+)
+def test_json_patch_round_trip(old, new):
+    patch = make_json_patch(old, new)
+
+    assert apply_json_patch(old, patch) == new
+
+
+def test_json_patch_only_contains_changes():
+    old = _make_config(*[f"prompt{i}" for i in range(100)])
+    updated = _make_config(*[f"prompt{i}" for i in range(100)])
+    updated["prompts"][50]["input"] = "Changed"
+    inserted = _make_config(*[f"prompt{i}" for i in range(100)])
+    inserted["prompts"].insert(10, {"name": "new", "input": ""})
+
+    assert make_json_patch(old, updated) == [
+        {
+            "op": "replace",
+            "path": "/prompts/50/input",
+            "value": "Changed",
+        },
+    ]
+    assert make_json_patch(old, inserted) == [
+        {
+            "op": "add",
+            "path": "/prompts/10",
+            "value": {"name": "new", "input": ""},
+        },
+    ]
+
+
+def test_revisions_patch_from_client_revision():
+    revisions = AIConfigRevisions(max_patch_history=2)
+    configs = [_make_config(*"abcd"[:i]) for i in range(1, 5)]
+
+    first_revision, patch = revisions.update(configs[0])
+    assert patch is None
+    assert revisions.update(configs[0], first_revision) == (first_revision, [])
+
+    for config in configs[1:]:
+        revision, _ = revisions.update(config)
+    assert revision == first_revision + 3
+
+    # Two revisions behind: patch from the history
+    revision, patch = revisions.update(configs[3], first_revision + 1)
+    assert apply_json_patch(configs[1], patch) == configs[3]
+    # Older than the history, or unknown: full snapshot
+    assert revisions.update(configs[3], first_revision) == (revision, None)
+    assert revisions.update(configs[3], revision + 1) == (revision, None)
+
+
+def test_revisions_patch_history_is_bounded_in_bytes():
+    revisions = AIConfigRevisions(max_patch_history_bytes=1000)
+    first_revision, _ = revisions.update(_make_config("a"))
+    revisions.update(_make_config("a", output="x" * 10_000))
+    revision, _ = revisions.update(_make_config("a", output="y"))
+
+    # The large patch isn't kept, so only the last patch is available
+    assert revisions.update(_make_config("a", output="y"), first_revision) == (
+        revision,
+        None,
+    )
+    _, patch = revisions.update(_make_config("a", output="y"), revision - 1)
+    assert patch == [
+        {"op": "replace", "path": "/metadata/output", "value": "y"}
+    ]
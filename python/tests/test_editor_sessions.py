@@ -0,0 +1,130 @@
+from concurrent.futures import Future
+
+import pytest
+from aiconfig.editor.server.sessions import (
+    SessionExpiredError,
+    SessionState,
+    SessionStore,
+)
+
+from aiconfig import AIConfigRuntime
+
+
+def _make_store(**kwargs) -> SessionStore:
+    store = SessionStore(**kwargs)
+    store.default.aiconfig = AIConfigRuntime.create("default")
+    return store
+
+
+def test_new_session_starts_from_a_copy_of_the_default_config():
+    store = _make_store()
+
+    session = store.get_or_create("user1")
+    session.aiconfig.set_name("user1")
+
+    assert store.get("user1") is session
+    assert store.get_or_create("user1") is session
+    assert store.get(None) is store.default
+    assert store.get("default") is store.default
+    assert store.default.aiconfig.name == "default"
+    assert store.get_or_create("user2").aiconfig.name == "default"
+
+
+def test_unknown_sessions_are_expired():
+    store = _make_store()
+
+    with pytest.raises(SessionExpiredError):
+        store.get("user1")
+    assert "user1" not in store
+
+
+def test_new_session_loads_the_config_file(tmp_path):
+    path = str(tmp_path / "aiconfig.json")
+    store = _make_store()
+    store.default.aiconfig.save(path)
+    store.default.aiconfig.file_path = path
+    store.default.record_file_state()
+    session1 = store.get_or_create("user1")
+    session1.aiconfig.set_name("user1")
+    session1.aiconfig.save(path)
+    session1.record_file_state(path)
+
+    session2 = store.get_or_create("user2")
+
+    # The default session's config in memory is stale, the file has user1's changes
+    assert store.default.aiconfig.name == "default"
+    assert session2.aiconfig.name == "user1"
+    assert not session2.is_file_changed(path)
+
+
+def test_least_recently_used_sessions_are_removed():
+    store = _make_store(max_sessions=2)
+    store.get_or_create("user1")
+    store.get_or_create("user2")
+    store.get_or_create("user1")
+
+    store.get_or_create("user3")
+
+    assert len(store) == 2
+    assert "user2" not in store
+    assert "user1" in store and "user3" in store
+
+
+def test_idle_sessions_are_removed_unless_running(monkeypatch):
+    store = _make_store(idle_timeout_s=60)
+    running_session = store.get_or_create("running")
+    running_session.runs["token"] = Future()
+    store.get_or_create("idle")
+
+    now = running_session.last_used_time + 120
+    monkeypatch.setattr(
+        "aiconfig.editor.server.sessions.time.monotonic", lambda: now
+    )
+    store.get_or_create("user")
+
+    assert "idle" not in store
+    assert "running" in store and "user" in store
+
+
+def test_sessions_dont_overwrite_each_others_file(tmp_path):
+    path = str(tmp_path / "aiconfig.json")
+    store = _make_store()
+    store.default.aiconfig.save(path)
+    store.default.aiconfig.file_path = path
+    store.default.record_file_state()
+    session1 = store.get_or_create("user1")
+    session2 = store.get_or_create("user2")
+
+    assert not session1.is_file_changed(path)
+    session1.aiconfig.set_name("user1")
+    session1.aiconfig.save(path)
+    session1.record_file_state(path)
+
+    # Saving to the same file from another session would lose user1's changes
+    assert session2.is_file_changed(path)
+    assert store.default.is_file_changed(path)
+    assert not session1.is_file_changed(path)
+    assert not session2.is_file_changed(str(tmp_path / "other.json"))
+
+
+def test_expired_sessions_are_found_without_scanning_all_sessions(
+    monkeypatch, mocker
+):
+    store = _make_store(idle_timeout_s=60)
+    running_session = store.get_or_create("running")
+    running_session.runs["token"] = Future()
+    store.get_or_create("idle")
+
+    now = running_session.last_used_time + 120
+    monkeypatch.setattr(
+        "aiconfig.editor.server.sessions.time.monotonic", lambda: now
+    )
+    has_running_runs_spy = mocker.spy(SessionState, "has_running_runs")
+    for i in range(10):
+        store.get_or_create(f"user{i}")
+
+    assert "idle" not in store and "running" in store
+    assert len(store) == 11
+    # Each expired session was looked at once: the running session was moved after the session then
+    # in use, and the following requests stopped at the first session used since
+    assert has_running_runs_spy.call_count == 2
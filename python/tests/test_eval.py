@@ -1,15 +1,20 @@
+import asyncio
 import itertools
 import json
 import logging
 import os
-from typing import Any
+from typing import Any, Sequence
 
 import hypothesis
 import hypothesis.strategies as st
 import lastmile_utils.lib.core.api as core_utils
 import pandas as pd
 import pytest
+from aiconfig.eval import common
+from aiconfig.eval import lib as eval_lib
 from aiconfig.eval.api import (
+    TestSuiteGeneralSettings,
+    TestSuiteOutputsOnlySettings,
     TestSuiteWithInputsSettings,
     metrics,
     run_test_suite_outputs_only,
@@ -17,11 +22,18 @@ from aiconfig.eval.api import (
 )
 from aiconfig.eval.lib import (
     MetricList,
-    TestSuiteGeneralSettings,
+    SampleEvaluationParams,
     TestSuiteWithInputsSpec,
+    _chunk_tests_by_datum,
+    evaluate,
     run_test_suite_helper,
     text_eval_res_to_df,
 )
+from aiconfig.eval.results_writer import (
+    EvalResultsWriter,
+    iter_eval_results,
+)
+from aiconfig.util.scheduler import InferenceScheduler
 from frozendict import frozendict
 from result import Err, Ok
 
@@ -201,6 +213,7 @@ async def test_run_test_suite_with_inputs(data: st.DataObject):
                 "metric_description",
                 "best_possible_value",
                 "worst_possible_value",
+                "run_latency_s",
             ]
 
             input_pairs = {
@@ -279,6 +292,7 @@ async def test_run_test_suite_with_inputs_general_params(data: st.DataObject):
                 "metric_description",
                 "best_possible_value",
                 "worst_possible_value",
+                "run_latency_s",
             ]
 
             input_pairs = {
@@ -307,6 +321,80 @@ async def test_run_test_suite_with_inputs_general_params(data: st.DataObject):
             assert False, f"expected Ok, got Err({e})"
 
 
+@pytest.mark.asyncio
+async def test_run_test_suite_with_inputs_concurrently():
+    num_in_flight, peak_in_flight = 0, 0
+
+    async def mock_run_text_to_text(
+        prompt_name: str, params: dict[str, str]
+    ) -> str:
+        nonlocal num_in_flight, peak_in_flight
+        num_in_flight += 1
+        peak_in_flight = max(peak_in_flight, num_in_flight)
+        # Later inputs finish first
+        await asyncio.sleep(0.01 * (10 - int(params["the_query"])))
+        num_in_flight -= 1
+        return "x" * int(params["the_query"])
+
+    test_suite = [(str(i), brevity) for i in range(1, 10)]
+    scheduler = InferenceScheduler(max_concurrency=4)
+    out = await run_test_suite_helper(
+        TestSuiteWithInputsSpec(
+            test_suite=test_suite,
+            prompt_name="prompt0",
+            aiconfig=mocks.make_mock_aiconfig_runtime(mock_run_text_to_text),
+            general_settings=TestSuiteGeneralSettings(),
+            scheduler=scheduler,
+        )
+    )
+
+    df = out.map(text_eval_res_to_df).unwrap()
+    # Each output is matched with its own input, in the test suite's order
+    assert df["input"].tolist() == [str(i) for i in range(1, 10)]
+    assert df["value"].tolist() == [float(i) for i in range(1, 10)]
+    assert peak_in_flight == 4
+    # Each row has the latency of its own run
+    latencies = df.set_index("input")["run_latency_s"]
+    assert latencies["1"] > latencies["9"] > 0
+
+    stats = scheduler.stats()
+    assert (stats.succeeded, stats.peak_in_flight) == (9, 4)
+    assert 0 < stats.p50_latency_s <= stats.p99_latency_s
+    assert stats.throughput_rps > 0
+
+
+@pytest.mark.asyncio
+async def test_run_test_suite_with_inputs_isolates_concurrent_runs(
+    echo_aiconfig,
+):
+    """
+    Runs concurrent inputs through a real AIConfigRuntime (the mock runtime has no state to isolate):
+    each output must come from its own input, even though later inputs finish first.
+    """
+    test_suite = [
+        ({"name": f"user{i}", "delay_s": str(0.01 * (10 - i))}, brevity)
+        for i in range(10)
+    ]
+    out = await run_test_suite_helper(
+        TestSuiteWithInputsSpec(
+            test_suite=test_suite,
+            prompt_name="prompt1",
+            aiconfig=echo_aiconfig,
+            general_settings=TestSuiteGeneralSettings(),
+            scheduler=InferenceScheduler(max_concurrency=10),
+        )
+    )
+
+    df = out.map(text_eval_res_to_df).unwrap()
+    assert df["aiconfig_output"].tolist() == [
+        f"Hello user{i}" for i in range(10)
+    ]
+    # The runs didn't write to the shared runtime
+    assert echo_aiconfig.get_latest_output("prompt1").data == (
+        "a large previous output"
+    )
+
+
 def _make_mock_nltk_metrics() -> MetricList[str]:
     def _mock_get_nltk_polarity_scores(text: str) -> dict[str, float]:
         return MOCK_NLTK_SENTIMENT_SCORE_MAPPING[text]
@@ -374,6 +462,323 @@ async def test_custom_metric_type():
     )
 
 
+@pytest.mark.asyncio
+async def test_sentiment_metrics_evaluate_batch():
+    num_calls = 0
+
+    def _mock_get_nltk_polarity_scores(text: str) -> dict[str, float]:
+        nonlocal num_calls
+        num_calls += 1
+        return MOCK_NLTK_SENTIMENT_SCORE_MAPPING[text]
+
+    sentiment_class = metrics.make_sentiment_scores_metric(
+        get_polarity_scores=_mock_get_nltk_polarity_scores,
+        make_evaluation_fn=metrics.make_get_sentiment_class,
+        name="nltk_sentiment_class_vader",
+        description="Highest-probability NLTK sentiment class using Vader",
+    )
+    texts = list(MOCK_NLTK_SENTIMENT_SCORE_MAPPING) * 3
+
+    values = await sentiment_class.evaluate_batch(texts)
+
+    assert values == [MOCK_NLTK_SENTIMENT_CLASS_MAPPING[t] for t in texts]
+    # Each unique text is only scored once
+    assert num_calls == len(MOCK_NLTK_SENTIMENT_SCORE_MAPPING)
+
+
+def test_polarity_scores_batch_in_process_pool(mocker):
+    mocker.patch("aiconfig.eval.metrics.os.cpu_count", return_value=2)
+    texts = [json.dumps({"pos": i / 100}) for i in range(100)]
+
+    try:
+        scores = metrics.get_polarity_scores_batch(
+            texts, json.loads, process_pool_min_batch_size=10
+        )
+        assert scores == [{"pos": i / 100} for i in range(100)]
+        # Forking a process with running threads isn't safe
+        process_pool = metrics._get_sentiment_process_pool()
+        assert process_pool._mp_context.get_start_method() == "spawn"
+    finally:
+        metrics._shutdown_sentiment_process_pool()
+    assert metrics._sentiment_process_pool is None
+
+
+@pytest.mark.asyncio
+async def test_evaluate_batch_without_batch_evaluation_fn():
+    assert await brevity.evaluate_batch(["a", "abc"]) == [1, 3]
+
+
+@hypothesis.given(st.lists(st.text()), st.text(max_size=3), st.booleans())
+@pytest.mark.asyncio
+async def test_builtin_metrics_evaluate_batch(
+    data: list[str], substring: str, case_sensitive: bool
+):
+    metric = substring_match(substring, case_sensitive=case_sensitive)
+    assert await metric.evaluate_batch(data) == [
+        await metric(datum) for datum in data
+    ]
+
+    non_empty_data = [datum for datum in data if datum]
+    assert await brevity.evaluate_batch(non_empty_data) == [
+        await brevity(datum) for datum in non_empty_data
+    ]
+
+
+@pytest.mark.asyncio
+async def test_evaluate_uses_batch_evaluation_fn():
+    batch_sizes: list[int] = []
+
+    async def _batch_evaluation_fn(data: Sequence[str]) -> list[int]:
+        batch_sizes.append(len(data))
+        return [len(datum) for datum in data]
+
+    async def _evaluation_fn(datum: str) -> int:
+        raise AssertionError("Should be evaluated in batches")
+
+    length = metrics.Metric(
+        evaluation_fn=_evaluation_fn,
+        metric_metadata=brevity.metric_metadata,
+        batch_evaluation_fn=_batch_evaluation_fn,
+    )
+    outputs = [f"output {i}" for i in range(25)]
+
+    res = await evaluate(
+        [
+            SampleEvaluationParams(None, output, metric_)
+            for output in outputs
+            for metric_ in [length, substring_match("1")]
+        ],
+        eval_fn_timeout_s=5,
+        batch_size=10,
+    )
+
+    values = [result.metric_value.value for result in res.unwrap()]
+    assert values[::2] == [len(output) for output in outputs]
+    assert values[1::2] == ["1" in output for output in outputs]
+    assert batch_sizes == [10, 10, 5]
+
+
+@pytest.mark.asyncio
+async def test_batch_evaluation_timeout():
+    num_sample_evaluations = 0
+
+    async def _slow_batch_evaluation_fn(data: Sequence[str]) -> list[int]:
+        await asyncio.sleep(1.1)
+        return [len(datum) for datum in data]
+
+    async def _evaluation_fn(datum: str) -> int:
+        nonlocal num_sample_evaluations
+        num_sample_evaluations += 1
+        return len(datum)
+
+    length = metrics.Metric(
+        evaluation_fn=_evaluation_fn,
+        metric_metadata=brevity.metric_metadata,
+        batch_evaluation_fn=_slow_batch_evaluation_fn,
+    )
+    eval_params_list = [
+        SampleEvaluationParams(None, output, length)
+        for output in ["a", "bb", "ccc"]
+    ]
+
+    # The timeout of a batch scales with its size
+    res = await evaluate(eval_params_list, eval_fn_timeout_s=1)
+    assert [result.metric_value.value for result in res.unwrap()] == [1, 2, 3]
+
+    # A batch that times out isn't evaluated again one sample at a time
+    res = await evaluate(
+        eval_params_list, eval_fn_timeout_s=1, batch_eval_fn_timeout_s=0.05
+    )
+    assert [result.metric_value.value for result in res.unwrap()] == [
+        None,
+        None,
+        None,
+    ]
+    assert num_sample_evaluations == 0
+
+
+def test_get_llm_structured_response():
+    def _chat_completion_create(input_text: str):
+        return Ok(
+            json.dumps(
+                {
+                    "conciseness_rating": len(input_text),
+                    "conciseness_confidence": 0.5,
+                    "conciseness_reasoning": "",
+                }
+            )
+        )
+
+    res = common.get_llm_structured_response(
+        "hello", _chat_completion_create, common.TextRatingsData
+    )
+
+    assert res.unwrap().conciseness_rating == 5
+    assert common.get_llm_structured_response(
+        "hello", lambda _: Err("down"), common.TextRatingsData
+    ) == Err("down")
+
+
+def test_chunk_tests_by_datum():
+    test_suite = [
+        (datum, metric_)
+        for datum in ["a", "b", "c", "a"]
+        for metric_ in [brevity, substring_match("a")]
+    ]
+    chunks = list(_chunk_tests_by_datum(test_suite, chunk_size=3))
+    # Each datum's tests stay in one chunk
+    assert [[datum for datum, _ in chunk] for chunk in chunks] == [
+        ["a"] * 4,
+        ["b"] * 2 + ["c"] * 2,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_test_suite_outputs_only_resumes_from_results_path(
+    tmp_path: Any,
+):
+    pytest.importorskip("pyarrow")
+    evaluated: list[str] = []
+
+    async def _evaluation_fn(datum: str) -> int:
+        evaluated.append(datum)
+        return len(datum)
+
+    length = metrics.Metric(
+        evaluation_fn=_evaluation_fn,
+        metric_metadata=brevity.metric_metadata,
+    )
+    settings = TestSuiteOutputsOnlySettings(
+        general_settings=TestSuiteGeneralSettings(
+            results_path=str(tmp_path / "results"),
+            results_flush_rows=1,
+            load_results=True,
+        )
+    )
+
+    df = await run_test_suite_outputs_only(
+        [("hello", length), ("world!", length)], settings
+    )
+    assert sorted(df["value"]) == [5, 6]
+
+    df = await run_test_suite_outputs_only(
+        [("hello", length), ("world!", length), ("goodbye", length)],
+        settings,
+    )
+    # Only the new output is evaluated, and previous results are kept
+    assert evaluated == ["hello", "world!", "goodbye"]
+    assert df.set_index("aiconfig_output")["value"].to_dict() == {
+        "hello": 5,
+        "world!": 6,
+        "goodbye": 7,
+    }
+    assert set(df["input"]) == {"Missing"}
+
+
+@pytest.mark.asyncio
+async def test_run_test_suite_outputs_only_resumes_failed_evaluations(
+    tmp_path: Any,
+):
+    pytest.importorskip("pyarrow")
+    evaluated: list[str] = []
+
+    async def _evaluation_fn(datum: str) -> int:
+        evaluated.append(datum)
+        if datum == "world!" and evaluated.count(datum) == 1:
+            raise ValueError("judge is down")
+        return len(datum)
+
+    length = metrics.Metric(
+        evaluation_fn=_evaluation_fn,
+        metric_metadata=brevity.metric_metadata,
+    )
+    settings = TestSuiteOutputsOnlySettings(
+        general_settings=TestSuiteGeneralSettings(
+            results_path=str(tmp_path / "results"),
+            results_flush_rows=1,
+            load_results=True,
+        )
+    )
+    test_suite = [("hello", length), ("world!", length)]
+
+    df = await run_test_suite_outputs_only(test_suite, settings)
+    assert df.set_index("aiconfig_output")["value"].to_dict() == {
+        "hello": 5,
+        "world!": None,
+    }
+
+    df = await run_test_suite_outputs_only(test_suite, settings)
+    # Only the failed evaluation is run again, and its failed result is dropped
+    assert evaluated == ["hello", "world!", "world!"]
+    assert df.set_index("aiconfig_output")["value"].to_dict() == {
+        "hello": 5,
+        "world!": 6,
+    }
+
+
+@pytest.mark.asyncio
+async def test_streamed_results_are_flushed_on_time_and_not_loaded(
+    tmp_path: Any, monkeypatch: pytest.MonkeyPatch
+):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(eval_lib, "DEFAULT_RESULTS_CHUNK_SIZE", 1)
+    results_path = str(tmp_path / "results")
+    settings = TestSuiteOutputsOnlySettings(
+        general_settings=TestSuiteGeneralSettings(
+            results_path=results_path,
+            results_flush_rows=10_000,
+            results_flush_interval_s=0,
+        )
+    )
+
+    df = await run_test_suite_outputs_only(
+        [("a", brevity), ("bb", brevity), ("ccc", brevity)], settings
+    )
+
+    # The results are left on disk, and each chunk was flushed on time rather than on size
+    assert len(df) == 0 and df.attrs["results_path"] == results_path
+    assert [
+        list(part_df["value"]) for part_df in iter_eval_results(results_path)
+    ] == [[1], [2], [3]]
+
+
+def test_results_writer_doesnt_overwrite_parts(tmp_path: Any):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "results")
+
+    def _write(output: str) -> None:
+        with EvalResultsWriter(path) as writer:
+            writer.append(
+                [
+                    dict(
+                        input=None,
+                        aiconfig_output=output,
+                        value=len(output),
+                        metric_id="length",
+                        metric_name="length",
+                        metric_description="",
+                        best_possible_value=None,
+                        worst_possible_value=None,
+                    )
+                ]
+            )
+
+    _write("a")
+    _write("bb")
+    os.remove(os.path.join(path, "part-000000.parquet"))
+    _write("ccc")
+
+    assert sorted(os.listdir(path)) == [
+        "part-000001.parquet",
+        "part-000002.parquet",
+    ]
+    assert [
+        output
+        for part_df in iter_eval_results(path)
+        for output in part_df["aiconfig_output"]
+    ] == ["bb", "ccc"]
+
+
 @pytest.mark.asyncio
 async def test_exception_metric(caplog: pytest.LogCaptureFixture):
     user_test_suite_outputs_only = list(
@@ -1,3 +1,6 @@
+import asyncio
+import json
+import os
 from typing import cast
 
 import aiconfig.eval.openai as lib_openai
@@ -7,6 +10,7 @@ import openai.types.chat.chat_completion_message_tool_call as openai_tool_call_t
 import pytest
 from aiconfig.eval import common
 from aiconfig.eval.api import metrics, run_test_suite_outputs_only
+from aiconfig.util.inference_cache import SQLiteInferenceCache
 from result import Ok, Result
 
 
@@ -120,3 +124,107 @@ async def test_bad_structured_eval_metric():
         "The following field_descriptions keys are not in the schema"
         in str(exc)
     )
+
+
+@pytest.mark.asyncio
+async def test_async_structured_eval_is_cached_and_concurrent(tmp_path):
+    requested_texts: list[str] = []
+    num_in_flight, peak_in_flight = 0, 0
+
+    async def _mock_async_create(
+        completion_params: lib_openai.OpenAIChatCompletionParams,
+    ) -> Result[openai_chat_types.ChatCompletion, str]:
+        nonlocal num_in_flight, peak_in_flight
+        text = cast(str, completion_params.messages[1]["content"])
+        requested_texts.append(text)
+        num_in_flight += 1
+        peak_in_flight = max(peak_in_flight, num_in_flight)
+        await asyncio.sleep(0.01)
+        num_in_flight -= 1
+        return Ok(
+            _mock_response(
+                common.SerializedJSON(
+                    json.dumps(
+                        {
+                            "conciseness_rating": len(text.split()),
+                            "conciseness_confidence": 0.9,
+                            "conciseness_reasoning": text,
+                        }
+                    )
+                )
+            )
+        )
+
+    def _make_metric(cache_path: str):
+        return metrics.make_openai_structured_llm_metric(
+            eval_llm_name="gpt-3.5-turbo-0613",
+            pydantic_basemodel_type=common.TextRatingsData,
+            metric_name="text_ratings",
+            metric_description="Text ratings",
+            openai_chat_completion_create=_mock_async_create,
+            judgment_cache=SQLiteInferenceCache(cache_path),
+            max_concurrency=2,
+        )
+
+    cache_path = os.path.join(tmp_path, "judgments.sqlite")
+    texts = ["one", "one two", "one two three", "one two three four"]
+    metric = _make_metric(cache_path)
+    df = await run_test_suite_outputs_only([(text, metric) for text in texts])
+    ratings = [value.data.conciseness_rating for value in df["value"]]
+    assert ratings == [1, 2, 3, 4]
+    assert sorted(requested_texts) == texts
+    assert peak_in_flight == 2
+
+    # A new metric with the same persistent cache only queries the judge for new texts
+    requested_texts.clear()
+    metric = _make_metric(cache_path)
+    df = await run_test_suite_outputs_only(
+        [(text, metric) for text in texts + ["five"]]
+    )
+    assert requested_texts == ["five"]
+    ratings = [value.data.conciseness_rating for value in df["value"]]
+    assert ratings == [1, 2, 3, 4, 1]
+
+
+@pytest.mark.asyncio
+async def test_async_callable_judge_is_queried_once_per_text():
+    class _MockAsyncCreate:
+        def __init__(self) -> None:
+            self.requested_texts: list[str] = []
+
+        async def __call__(
+            self, completion_params: lib_openai.OpenAIChatCompletionParams
+        ) -> Result[openai_chat_types.ChatCompletion, str]:
+            text = cast(str, completion_params.messages[1]["content"])
+            self.requested_texts.append(text)
+            await asyncio.sleep(0.01)
+            return Ok(
+                _mock_response(
+                    common.SerializedJSON(
+                        json.dumps(
+                            {
+                                "conciseness_rating": len(text.split()),
+                                "conciseness_confidence": 0.9,
+                                "conciseness_reasoning": text,
+                            }
+                        )
+                    )
+                )
+            )
+
+    mock_create = _MockAsyncCreate()
+    metric = metrics.make_openai_structured_llm_metric(
+        eval_llm_name="gpt-3.5-turbo-0613",
+        pydantic_basemodel_type=common.TextRatingsData,
+        metric_name="text_ratings",
+        metric_description="Text ratings",
+        openai_chat_completion_create=mock_create,
+    )
+
+    texts = ["one", "one two", "one", "one two", "one"]
+    df = await run_test_suite_outputs_only([(text, metric) for text in texts])
+
+    ratings = [value.data.conciseness_rating for value in df["value"]]
+    assert ratings == [1, 2, 1, 2, 1]
+    # Concurrent evaluations of the same text share one judge request
+    assert sorted(mock_create.requested_texts) == ["one", "one two"]
@@ -1,9 +1,12 @@
 # import ai_config_tools Config class
 
 
+import json
+
 import pytest
 
 from aiconfig import AIConfigRuntime
+from aiconfig.schema import ExecuteResult, Prompt, PromptMetadata
 
 from .util.file_path_utils import get_absolute_file_path_from_relative
 
@@ -139,3 +142,86 @@ async def test_resolve_system_prompt():
             {"content": "Hi! Please Count to 10", "role": "user"},
         ],
     }
+
+
+def test_load_yaml_matches_json(tmp_path):
+    """Test that a config saved as YAML loads back the same as its JSON counterpart"""
+    config_relative_path = "aiconfigs/travel_gpt_prompts_with_dependency.json"
+    config_absolute_path = get_absolute_file_path_from_relative(
+        __file__, config_relative_path
+    )
+    json_config = AIConfigRuntime.load(config_absolute_path)
+    yaml_path = str(tmp_path / "aiconfig.yaml")
+    json_config.save(yaml_path, include_outputs=True)
+
+    yaml_config = AIConfigRuntime.load(yaml_path)
+    with open(yaml_path) as file:
+        yaml_string_config = AIConfigRuntime.load_yaml(file.read())
+
+    assert yaml_config.file_path == yaml_path
+    for config in [yaml_config, yaml_string_config]:
+        assert config.model_dump(
+            exclude={"file_path", "callback_manager"}
+        ) == json_config.model_dump(exclude={"file_path", "callback_manager"})
+
+
+def _save_config_with_outputs(config_path: str) -> AIConfigRuntime:
+    config = AIConfigRuntime.create("outputs_config")
+    for i in range(3):
+        config.add_prompt(
+            f"prompt{i}",
+            Prompt(
+                name=f"prompt{i}",
+                input="Hi",
+                metadata=PromptMetadata(model="gpt-3.5-turbo"),
+            ),
+        )
+        for text in ["first", "latest"]:
+            config.add_output(
+                f"prompt{i}",
+                ExecuteResult(
+                    output_type="execute_result",
+                    execution_count=0,
+                    data=f"{text} {i}",
+                    metadata={"role": "assistant"},
+                ),
+            )
+    config.save(config_path, include_outputs=True)
+    return config
+
+
+@pytest.mark.parametrize("extension", ["json", "yaml"])
+def test_load_lazy_outputs(tmp_path, extension):
+    """Test that lazily loaded outputs are validated on first access"""
+    config_path = str(tmp_path / f"aiconfig.{extension}")
+    eager_config = _save_config_with_outputs(config_path)
+
+    config = AIConfigRuntime.load(config_path, lazy_outputs=True)
+
+    assert all(prompt.has_deferred_outputs() for prompt in config.prompts)
+    assert config.get_output_text("prompt0") == "latest 0"
+    assert config.get_latest_output(
+        "prompt1"
+    ) == eager_config.get_latest_output("prompt1")
+    assert [prompt.has_deferred_outputs() for prompt in config.prompts] == [
+        False,
+        False,
+        True,
+    ]
+    # Deferred outputs are saved as loaded, and stay deferred in run copies
+    assert json.loads(config.to_string()) == json.loads(
+        eager_config.to_string()
+    )
+    assert config.copy_for_run().prompts[2].has_deferred_outputs()
+    assert config.prompts[2].outputs == eager_config.prompts[2].outputs
+
+
+def test_load_without_outputs(tmp_path):
+    """Test loading a config without its outputs"""
+    config_path = str(tmp_path / "aiconfig.json")
+    _save_config_with_outputs(config_path)
+
+    config = AIConfigRuntime.load(config_path, include_outputs=False)
+
+    assert [prompt.outputs for prompt in config.prompts] == [[], [], []]
+    assert config.get_latest_output("prompt0") is None
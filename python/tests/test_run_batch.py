@@ -0,0 +1,189 @@
+import pytest
+from aiconfig.Config import AIConfigRuntime
+from aiconfig.model_parser import InferenceOptions
+from aiconfig.registry import ModelParserRegistry
+
+from .util import mock_parser
+from .util.mock_parser import EchoModelParser
+
+
+def test_copy_for_run_isolates_outputs_and_parameters(
+    echo_aiconfig: AIConfigRuntime,
+):
+    run_copy = echo_aiconfig.copy_for_run()
+
+    run_copy.delete_output("prompt1")
+    run_copy.set_parameter("greeting", "Bonjour")
+
+    assert echo_aiconfig.get_latest_output("prompt1").data == (
+        "a large previous output"
+    )
+    assert echo_aiconfig.get_global_parameters() == {"greeting": "Hello"}
+    assert run_copy.get_latest_output("prompt1") is None
+    # Inputs are shared with the original config rather than copied
+    assert run_copy.get_prompt("prompt1").input is (
+        echo_aiconfig.get_prompt("prompt1").input
+    )
+
+
+@pytest.mark.asyncio
+async def test_model_parser_run_batch_returns_isolated_copies(
+    echo_aiconfig: AIConfigRuntime,
+):
+    parser = ModelParserRegistry.get_model_parser("echo-model")
+    prompt = echo_aiconfig.get_prompt("prompt1")
+
+    results = await parser.run_batch(
+        prompt, echo_aiconfig, [{"name": "Ann"}, {"name": "Bob"}]
+    )
+
+    assert [
+        result.get_latest_output("prompt1").data for result in results
+    ] == ["Hello Ann", "Hello Bob"]
+    assert echo_aiconfig.get_latest_output("prompt1").data == (
+        "a large previous output"
+    )
+
+
+@pytest.mark.asyncio
+async def test_aiconfig_runtime_run_batch(echo_aiconfig: AIConfigRuntime):
+    parameters_list = [{"name": "Ann"}, {"name": "Bob"}]
+    results = await echo_aiconfig.run_batch("prompt1", parameters_list)
+
+    assert [
+        (outputs[0].data, resolved, params)
+        for outputs, resolved, params in results
+    ] == [
+        ("Hello Ann", {"prompt": "Hello Ann"}, {"name": "Ann"}),
+        ("Hello Bob", {"prompt": "Hello Bob"}, {"name": "Bob"}),
+    ]
+    assert results.stats.total_requests == 2
+    assert results.stats.succeeded == 2
+
+
+@pytest.mark.asyncio
+async def test_run_batch_resolves_each_item_once(
+    echo_aiconfig: AIConfigRuntime, mocker
+):
+    resolve_prompt_spy = mocker.spy(mock_parser, "resolve_prompt")
+    resolve_spy = mocker.spy(AIConfigRuntime, "resolve")
+    parameters_list = [{"name": str(i)} for i in range(5)]
+
+    results = await echo_aiconfig.run_batch(
+        "prompt1", parameters_list, InferenceOptions(stream=False)
+    )
+
+    assert [resolved for _, resolved, _ in results] == [
+        {"prompt": f"Hello {i}"} for i in range(5)
+    ]
+    # Runs reuse the completion params resolved for the batch item, and they aren't resolved again after
+    assert resolve_prompt_spy.call_count == len(parameters_list)
+    assert resolve_spy.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_aiconfig_runtime_run_batch_with_scheduling_options(
+    echo_aiconfig: AIConfigRuntime,
+):
+    parameters_list = [{"name": str(i)} for i in range(10)]
+    options = InferenceOptions(
+        stream=False, max_concurrency=3, tokens_per_minute=100_000
+    )
+    results = await echo_aiconfig.run_batch(
+        "prompt1", parameters_list, options
+    )
+
+    assert [outputs[0].data for outputs, _, _ in results] == [
+        f"Hello {i}" for i in range(10)
+    ]
+    assert results.stats.peak_in_flight <= 3
+    assert results.stats.estimated_tokens > 0
+
+
+@pytest.mark.asyncio
+async def test_run_batch_iter_yields_in_completion_order(
+    echo_aiconfig: AIConfigRuntime,
+):
+    parameters_list = [
+        {"name": "Slow", "delay_s": 0.05},
+        {"name": "Fast", "delay_s": 0},
+    ]
+
+    results = [
+        result
+        async for result in echo_aiconfig.run_batch_iter(
+            "prompt1", parameters_list
+        )
+    ]
+
+    assert [
+        (outputs[0].data, resolved, params)
+        for outputs, resolved, params in results
+    ] == [
+        ("Hello Fast", {"prompt": "Hello Fast"}, parameters_list[1]),
+        ("Hello Slow", {"prompt": "Hello Slow"}, parameters_list[0]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_batch_iter_with_async_iterable_input(
+    echo_aiconfig: AIConfigRuntime, mocker
+):
+    resolve_prompt_spy = mocker.spy(mock_parser, "resolve_prompt")
+    resolve_spy = mocker.spy(AIConfigRuntime, "resolve")
+
+    async def _generate_parameters():
+        for i in range(20):
+            yield {"name": str(i)}
+
+    outputs_by_name = {}
+    async for outputs, resolved, params in echo_aiconfig.run_batch_iter(
+        "prompt1",
+        _generate_parameters(),
+        InferenceOptions(stream=False, max_concurrency=4),
+    ):
+        assert resolved == {"prompt": f"Hello {params['name']}"}
+        outputs_by_name[params["name"]] = outputs[0].data
+
+    assert outputs_by_name == {str(i): f"Hello {i}" for i in range(20)}
+    # The resolved completion params are reused rather than resolved again
+    assert resolve_spy.call_count == 0
+    assert resolve_prompt_spy.call_count == 20
+
+
+class _NestedParamsEchoModelParser(EchoModelParser):
+    """
+    Resolves nested completion params, and changes them in place during the run like real parsers do.
+    """
+
+    async def deserialize(self, prompt, aiconfig, params={}):
+        completion_params = await super().deserialize(prompt, aiconfig, params)
+        return {**completion_params, "messages": [completion_params["prompt"]]}
+
+    async def run_inference_with_completion_params(
+        self, prompt, aiconfig, completion_params, options, parameters
+    ):
+        completion_params["messages"].append("(run)")
+        completion_params["stream"] = False
+        return await super().run_inference_with_completion_params(
+            prompt, aiconfig, completion_params, options, parameters
+        )
+
+
+@pytest.mark.asyncio
+async def test_run_batch_returns_completion_params_as_resolved(
+    echo_aiconfig: AIConfigRuntime,
+):
+    parser = _NestedParamsEchoModelParser()
+    prompt = echo_aiconfig.get_prompt("prompt1")
+
+    results = await parser.run_batch(
+        prompt, echo_aiconfig, [{"name": "Ann"}, {"name": "Bob"}]
+    )
+
+    # Each item was run once, with the completion params resolved for it
+    assert parser.num_inference_calls == 2
+    assert results.completion_params == [
+        {"prompt": "Hello Ann", "messages": ["Hello Ann"]},
+        {"prompt": "Hello Bob", "messages": ["Hello Bob"]},
+    ]
@@ -1,4 +1,4 @@
-from unittest.mock import Mock
+from unittest.mock import AsyncMock
 
 import openai
 import pytest
@@ -19,7 +19,7 @@ async def test_load_parametrized_data_config(set_temporary_env_vars):
     Config has 2 prompts. Prompt2 uses prompt1.output in its input.
     """
     with patch.object(
-        openai.resources.chat.Completions,
+        openai.resources.chat.AsyncCompletions,
         "create",
         side_effect=mock_openai_chat_completion,
     ):
@@ -59,12 +59,12 @@ async def test_load_parametrized_data_config(set_temporary_env_vars):
 async def test_running_prompt_with_dependencies(set_temporary_env_vars):
     """Test running a prompt with dependencies with the run_with_dependencies flag set to True"""
 
-    mock_openai = Mock(
+    mock_openai = AsyncMock(
         side_effect=mock_openai_chat_completion_with_dependencies
     )
 
     with patch.object(
-        openai.resources.chat.Completions,
+        openai.resources.chat.AsyncCompletions,
         "create",
         new=mock_openai,
     ):
@@ -0,0 +1,90 @@
+import pytest
+from aiconfig.callback import CallbackManager
+from aiconfig.Config import AIConfigRuntime
+from aiconfig.model_parser import InferenceOptions
+from aiconfig.registry import ModelParserRegistry
+
+from aiconfig.schema import Prompt, PromptMetadata
+
+
+@pytest.fixture
+def diamond_aiconfig(echo_aiconfig: AIConfigRuntime):
+    """
+    prompt1 <- (left, right) <- joined: left and right only depend on prompt1, and joined depends on both.
+    """
+    for name, template in [
+        ("left", "left {{prompt1.output}}"),
+        ("right", "right {{prompt1.output}}"),
+        ("joined", "{{left.output}} + {{right.output}}"),
+    ]:
+        echo_aiconfig.add_prompt(
+            name,
+            Prompt(
+                name=name,
+                input=template,
+                metadata=PromptMetadata(model="echo-model"),
+            ),
+        )
+    return echo_aiconfig
+
+
+@pytest.mark.asyncio
+async def test_run_with_dependencies_runs_independent_prompts_concurrently(
+    diamond_aiconfig: AIConfigRuntime,
+):
+    parser = ModelParserRegistry.get_model_parser("echo-model")
+    events = []
+
+    async def _record_event(event):
+        events.append(event)
+
+    diamond_aiconfig.set_callback_manager(
+        CallbackManager([_record_event], timeout=5)
+    )
+
+    outputs = await diamond_aiconfig.run(
+        "joined",
+        {"name": "Ann", "delay_s": 0.01},
+        InferenceOptions(stream=False),
+        run_with_dependencies=True,
+    )
+
+    assert outputs[0].data == "left Hello Ann + right Hello Ann"
+    # Every prompt runs once, and "left" and "right" run at the same time
+    assert parser.num_inference_calls == 4
+    assert parser.peak_in_flight == 2
+
+    [complete_event] = [
+        event
+        for event in events
+        if event.name == "on_run_with_dependencies_complete"
+    ]
+    assert [sorted(level) for level in complete_event.data["levels"]] == [
+        ["prompt1"],
+        ["left", "right"],
+        ["joined"],
+    ]
+    assert complete_event.data["critical_path"][0] == "prompt1"
+    assert complete_event.data["critical_path"][-1] == "joined"
+    assert len(complete_event.data["critical_path"]) == 3
+    assert complete_event.data["critical_path_latency_s"] <= sum(
+        complete_event.data["prompt_latencies_s"].values()
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_with_dependencies_respects_max_concurrency(
+    diamond_aiconfig: AIConfigRuntime,
+):
+    parser = ModelParserRegistry.get_model_parser("echo-model")
+
+    outputs = await diamond_aiconfig.run(
+        "joined",
+        {"name": "Ann", "delay_s": 0.01},
+        InferenceOptions(stream=False, max_concurrency=1),
+        run_with_dependencies=True,
+    )
+
+    assert outputs[0].data == "left Hello Ann + right Hello Ann"
+    assert parser.num_inference_calls == 4
+    assert parser.peak_in_flight == 1
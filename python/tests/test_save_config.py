@@ -0,0 +1,104 @@
+import json
+import os
+
+import pytest
+from aiconfig.util.atomic_file import AtomicFileWriter, get_text_digest
+
+from aiconfig import AIConfigRuntime
+from aiconfig.schema import Prompt, PromptMetadata
+
+
+def _create_config() -> AIConfigRuntime:
+    config = AIConfigRuntime.create("save_config")
+    config.add_prompt(
+        "prompt1",
+        Prompt(
+            name="prompt1",
+            input="Hi",
+            metadata=PromptMetadata(model="gpt-3.5-turbo"),
+        ),
+    )
+    return config
+
+
+@pytest.mark.parametrize("extension", ["json", "yaml"])
+def test_save_matches_to_string(tmp_path, extension):
+    """Test that the streamed save writes the same content as to_string"""
+    config = _create_config()
+    config_path = str(tmp_path / f"aiconfig.{extension}")
+
+    assert config.save(config_path)
+
+    with open(config_path) as file:
+        assert file.read() == config.to_string(mode=extension)
+    assert os.listdir(tmp_path) == [f"aiconfig.{extension}"]
+
+
+def test_save_skips_unchanged_content(tmp_path, mocker):
+    """Test that saving unchanged content leaves the file untouched, unless it changed on disk"""
+    config = _create_config()
+    config_path = str(tmp_path / "aiconfig.json")
+    config.save(config_path)
+    inode = os.stat(config_path).st_ino
+    enter_spy = mocker.spy(AtomicFileWriter, "__enter__")
+
+    assert not config.save(config_path)
+    assert os.stat(config_path).st_ino == inode
+    # The unchanged content isn't written to a temporary file either
+    assert enter_spy.call_count == 0
+
+    config.add_prompt(
+        "prompt2",
+        Prompt(
+            name="prompt2",
+            input="Bye",
+            metadata=PromptMetadata(model="gpt-3.5-turbo"),
+        ),
+    )
+    assert config.save(config_path)
+    assert len(AIConfigRuntime.load(config_path).prompts) == 2
+
+    with open(config_path, "w") as file:
+        file.write("{}")
+    assert config.save(config_path)
+    assert len(AIConfigRuntime.load(config_path).prompts) == 2
+
+
+def test_save_compact(tmp_path):
+    config = _create_config()
+    config_path = str(tmp_path / "aiconfig.json")
+
+    config.save(config_path, compact=True)
+
+    with open(config_path) as file:
+        content = file.read()
+    assert "\n" not in content and ", " not in content
+    assert json.loads(content) == json.loads(config.to_string())
+    assert content == config.to_string(compact=True)
+
+
+def test_atomic_file_writer_keeps_file_on_error(tmp_path):
+    """Test that a failed write leaves the previous file, and no temporary file, behind"""
+    path = str(tmp_path / "aiconfig.json")
+    with AtomicFileWriter(path) as file:
+        file.write("previous")
+
+    with pytest.raises(RuntimeError):
+        with AtomicFileWriter(path) as file:
+            file.write("partial")
+            raise RuntimeError("Serialization failed")
+
+    with open(path) as file:
+        assert file.read() == "previous"
+    assert os.listdir(tmp_path) == ["aiconfig.json"]
+
+
+def test_text_digest_matches_written_content(tmp_path):
+    path = str(tmp_path / "aiconfig.json")
+    with AtomicFileWriter(path) as file:
+        file.write("héllo " * 10_000)
+        digest = file.hexdigest
+
+    assert get_text_digest(lambda file: file.write("héllo " * 10_000)) == (
+        digest
+    )
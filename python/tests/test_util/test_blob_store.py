@@ -0,0 +1,112 @@
+import base64
+import os
+
+import pytest
+from aiconfig.default_parsers.dalle import construct_output
+from aiconfig.util.blob_store import (
+    LocalBlobStore,
+    is_blob_uri,
+    make_binary_output_data,
+    resolve_blob_data,
+    set_default_blob_store,
+)
+from openai.types import Image
+
+from aiconfig import AIConfigRuntime
+
+IMAGE_BYTES = os.urandom(1024)
+
+
+@pytest.fixture(autouse=True)
+def reset_default_blob_store():
+    yield
+    set_default_blob_store(None)
+
+
+def test_put_deduplicates_content(tmp_path):
+    blob_store = LocalBlobStore(str(tmp_path), min_size_bytes=0)
+
+    uri = blob_store.put(IMAGE_BYTES)
+
+    assert is_blob_uri(uri)
+    assert blob_store.put(IMAGE_BYTES) == uri
+    assert blob_store.get(uri) == IMAGE_BYTES
+    digest = uri.rsplit("/", 1)[1]
+    assert os.listdir(tmp_path) == [digest[:2]]
+    assert os.listdir(tmp_path / digest[:2]) == [digest]
+
+
+def test_get_missing_blob(tmp_path):
+    blob_store = LocalBlobStore(str(tmp_path))
+    uri = "aiconfig-blob://sha256/" + "0" * 64
+
+    assert not blob_store.exists(uri)
+    with pytest.raises(KeyError):
+        blob_store.get(uri)
+    with pytest.raises(ValueError):
+        blob_store.get("https://example.com/image.png")
+
+
+def test_binary_output_data_without_blob_store():
+    data = make_binary_output_data(IMAGE_BYTES)
+
+    assert data.kind == "base64"
+    assert base64.b64decode(data.value) == IMAGE_BYTES
+    assert resolve_blob_data(data) is data
+
+
+def test_binary_output_data_from_metadata_settings(tmp_path):
+    aiconfig = AIConfigRuntime.create()
+    aiconfig.metadata.blob_store = {
+        "backend": "local",
+        "path": str(tmp_path),
+        "min_size_bytes": 512,
+    }
+
+    data = make_binary_output_data(IMAGE_BYTES, aiconfig)
+    # Payloads under min_size_bytes stay inline
+    small_data = make_binary_output_data(IMAGE_BYTES[:100], aiconfig)
+
+    assert data.kind == "file_uri" and is_blob_uri(data.value)
+    assert small_data.kind == "base64"
+    resolved_data = resolve_blob_data(data, aiconfig)
+    assert resolved_data.kind == "base64"
+    assert base64.b64decode(resolved_data.value) == IMAGE_BYTES
+
+
+def test_relative_metadata_path_is_relative_to_the_config_file(
+    tmp_path, monkeypatch
+):
+    config_dir = tmp_path / "configs"
+    config_dir.mkdir()
+    monkeypatch.chdir(tmp_path)
+    aiconfig = AIConfigRuntime.create()
+    aiconfig.file_path = str(config_dir / "app.aiconfig.json")
+    aiconfig.metadata.blob_store = {"path": "blobs", "min_size_bytes": 0}
+
+    data = make_binary_output_data(IMAGE_BYTES, aiconfig)
+
+    digest = data.value.rsplit("/", 1)[1]
+    assert os.path.exists(config_dir / "blobs" / digest[:2] / digest)
+    assert not os.path.exists(tmp_path / "blobs")
+
+
+def test_metadata_settings_can_disable_default_blob_store(tmp_path):
+    set_default_blob_store(LocalBlobStore(str(tmp_path), min_size_bytes=0))
+    aiconfig = AIConfigRuntime.create()
+
+    assert make_binary_output_data(IMAGE_BYTES, aiconfig).kind == "file_uri"
+
+    aiconfig.metadata.blob_store = {"enabled": False}
+
+    assert make_binary_output_data(IMAGE_BYTES, aiconfig).kind == "base64"
+
+
+def test_dalle_output_in_blob_store(tmp_path):
+    set_default_blob_store(LocalBlobStore(str(tmp_path), min_size_bytes=0))
+    b64_json = base64.b64encode(IMAGE_BYTES).decode("utf-8")
+
+    output = construct_output(Image(b64_json=b64_json), 0)
+
+    assert output.data.kind == "file_uri"
+    assert resolve_blob_data(output.data).value == b64_json
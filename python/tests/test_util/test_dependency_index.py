@@ -0,0 +1,194 @@
+import copy
+
+from aiconfig.Config import AIConfigRuntime
+from aiconfig.util.dependency_index import PromptDependencyIndex
+from aiconfig.util.params import resolve_prompt
+
+from aiconfig.schema import ExecuteResult, Prompt, PromptMetadata
+
+
+def _add_prompts(aiconfig: AIConfigRuntime, num_prompts: int):
+    for i in range(num_prompts):
+        aiconfig.add_prompt(
+            f"step{i}",
+            Prompt(
+                name=f"step{i}",
+                input=f"step {i}",
+                metadata=PromptMetadata(model="echo-model"),
+                outputs=[
+                    ExecuteResult(
+                        output_type="execute_result",
+                        execution_count=0,
+                        data=f"output {i}",
+                        metadata={},
+                    )
+                ],
+            ),
+        )
+
+
+def test_referenced_parameters():
+    index = PromptDependencyIndex()
+
+    assert index.get_referenced_parameters(
+        "{{a.output}} and {{{b.input}}} {{c}}"
+    ) == frozenset({"a", "b", "c"})
+    # Block helpers and scoped paths can reference any prompt
+    assert index.get_referenced_parameters("{{#if a}}{{b}}{{/if}}") is None
+    assert index.get_referenced_parameters("{{../a.output}}") is None
+    # Plain text that looks like a keyword isn't a tag
+    assert index.get_referenced_parameters("Is this {{a}}?") == frozenset(
+        {"a"}
+    )
+
+
+def test_resolve_only_materializes_referenced_prompts(
+    echo_aiconfig: AIConfigRuntime, mocker
+):
+    _add_prompts(echo_aiconfig, 20)
+    echo_aiconfig.add_prompt(
+        "final",
+        Prompt(
+            name="final",
+            input="{{step3.output}} / {{step17.input}} / {{final.output}}",
+            metadata=PromptMetadata(model="echo-model"),
+        ),
+    )
+    get_output_text_spy = mocker.spy(echo_aiconfig, "get_output_text")
+
+    resolved = resolve_prompt(
+        echo_aiconfig.get_prompt("final"), {}, echo_aiconfig
+    )
+
+    # A prompt can't reference itself, so {{final.output}} resolves to nothing
+    assert resolved == "output 3 / step 17 / "
+    assert get_output_text_spy.call_count == 2
+
+
+def test_resolve_with_block_helpers_falls_back_to_every_earlier_prompt(
+    echo_aiconfig: AIConfigRuntime,
+):
+    _add_prompts(echo_aiconfig, 3)
+    echo_aiconfig.add_prompt(
+        "final",
+        Prompt(
+            name="final",
+            input="{{#if step1.output}}{{step1.output}}{{/if}}",
+            metadata=PromptMetadata(model="echo-model"),
+        ),
+        index=3,
+    )
+
+    resolved = resolve_prompt(
+        echo_aiconfig.get_prompt("final"), {}, echo_aiconfig
+    )
+
+    assert resolved == "output 1"
+
+
+def test_index_tracks_prompt_changes(echo_aiconfig: AIConfigRuntime):
+    _add_prompts(echo_aiconfig, 3)
+    index = echo_aiconfig.get_dependency_index()
+    prompts = echo_aiconfig.prompts
+
+    assert index.get_position(prompts, "step2") == 3
+    num_rebuilds = index.num_rebuilds
+    index.get_position(prompts, "step0")
+    index.get_position(prompts, "not_a_prompt")
+    assert index.num_rebuilds == num_rebuilds
+
+    echo_aiconfig.delete_prompt("step0")
+    assert index.get_position(echo_aiconfig.prompts, "step0") is None
+    assert index.get_position(echo_aiconfig.prompts, "step2") == 2
+
+    echo_aiconfig.update_prompt(
+        "step1",
+        Prompt(
+            name="renamed",
+            input="renamed",
+            metadata=PromptMetadata(model="echo-model"),
+        ),
+    )
+    assert index.get_position(echo_aiconfig.prompts, "renamed") == 1
+    assert index.get_position(echo_aiconfig.prompts, "step1") is None
+
+    # Prompts appended to the list directly are picked up too
+    echo_aiconfig.prompts.append(
+        Prompt(
+            name="appended",
+            input="appended",
+            metadata=PromptMetadata(model="echo-model"),
+        )
+    )
+    assert index.get_position(echo_aiconfig.prompts, "appended") == 3
+
+
+def test_deep_copy_of_config_has_its_own_index(
+    echo_aiconfig: AIConfigRuntime,
+):
+    _add_prompts(echo_aiconfig, 3)
+    index = echo_aiconfig.get_dependency_index()
+
+    config_copy = copy.deepcopy(echo_aiconfig)
+    config_copy.delete_prompt("step0")
+
+    assert config_copy.get_dependency_index() is not index
+    assert index.get_position(echo_aiconfig.prompts, "step0") == 1
+    assert (
+        config_copy.get_dependency_index().get_position(
+            config_copy.prompts, "step2"
+        )
+        == 2
+    )
+
+
+def test_resolve_picks_up_prompts_renamed_directly(
+    echo_aiconfig: AIConfigRuntime,
+):
+    _add_prompts(echo_aiconfig, 3)
+    echo_aiconfig.add_prompt(
+        "final",
+        Prompt(
+            name="final",
+            input="{{step1.output}}",
+            metadata=PromptMetadata(model="echo-model"),
+        ),
+    )
+    final_prompt = echo_aiconfig.get_prompt("final")
+    assert resolve_prompt(final_prompt, {}, echo_aiconfig) == "output 1"
+
+    echo_aiconfig.get_prompt("step1").name = "renamed"
+    final_prompt.input = "{{renamed.output}}"
+
+    assert resolve_prompt(final_prompt, {}, echo_aiconfig) == "output 1"
+
+
+class _IterationCountingList(list):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.num_iterations = 0
+
+    def __iter__(self):
+        self.num_iterations += 1
+        return super().__iter__()
+
+
+def test_lookups_of_parameters_dont_scan_prompts(
+    echo_aiconfig: AIConfigRuntime,
+):
+    _add_prompts(echo_aiconfig, 3)
+    index = PromptDependencyIndex()
+    prompts = _IterationCountingList(echo_aiconfig.prompts)
+    assert index.get_position(prompts, "step1") == 2
+    prompts.num_iterations = 0
+
+    for _ in range(10):
+        assert index.get_position(prompts, "not_a_prompt") is None
+    assert prompts.num_iterations == 0
+
+    # A rename is picked up with a single rebuild
+    echo_aiconfig.get_prompt("step1").name = "renamed"
+    assert index.get_position(prompts, "renamed") == 2
+    assert index.get_position(prompts, "not_a_prompt") is None
+    assert index.get_position(prompts, "step1") is None
+    assert prompts.num_iterations == 1
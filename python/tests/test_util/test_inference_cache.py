@@ -0,0 +1,257 @@
+from typing import Dict, List, Optional
+
+import pytest
+from aiconfig.callback import CallbackManager
+from aiconfig.Config import AIConfigRuntime
+from aiconfig.default_parsers.parameterized_model_parser import (
+    ParameterizedModelParser,
+)
+from aiconfig.model_parser import InferenceOptions
+from aiconfig.registry import ModelParserRegistry
+from aiconfig.util import inference_cache
+from aiconfig.util.inference_cache import (
+    InMemoryInferenceCache,
+    SQLiteInferenceCache,
+    make_inference_cache_key,
+)
+
+from aiconfig.util.params import resolve_prompt
+
+from aiconfig.schema import ExecuteResult, Output, Prompt, PromptMetadata
+
+
+def _make_outputs(text: str):
+    return [
+        ExecuteResult(
+            output_type="execute_result",
+            execution_count=0,
+            data=text,
+            metadata={"finish_reason": "stop"},
+        )
+    ]
+
+
+def test_cache_key_is_independent_of_dict_order():
+    assert make_inference_cache_key(
+        "model", {"a": 1, "b": [1, 2]}
+    ) == make_inference_cache_key("model", {"b": [1, 2], "a": 1})
+    assert make_inference_cache_key(
+        "model", {"a": 1}
+    ) != make_inference_cache_key("other-model", {"a": 1})
+
+
+def test_in_memory_cache_round_trip_and_stats():
+    cache = InMemoryInferenceCache(max_entries=2)
+
+    assert cache.get("key") is None
+    cache.set("key", _make_outputs("hello"))
+    cached_outputs = cache.get("key")
+
+    assert cached_outputs == _make_outputs("hello")
+    # Every lookup returns a fresh copy
+    assert cache.get("key") is not cached_outputs
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+    assert stats.hit_rate == pytest.approx(2 / 3)
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryInferenceCache(max_entries=2)
+    cache.set("a", _make_outputs("a"))
+    cache.set("b", _make_outputs("b"))
+    cache.get("a")
+    cache.set("c", _make_outputs("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats().evictions == 1
+
+
+def test_in_memory_cache_ttl(mocker):
+    mock_time = mocker.patch.object(
+        inference_cache.time, "time", return_value=1000.0
+    )
+    cache = InMemoryInferenceCache(ttl_s=10)
+    cache.set("key", _make_outputs("hello"))
+
+    mock_time.return_value = 1009.0
+    assert cache.get("key") is not None
+    mock_time.return_value = 1010.0
+    assert cache.get("key") is None
+
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteInferenceCache(path).set("key", _make_outputs("hello"))
+
+    cache = SQLiteInferenceCache(path)
+    assert cache.get("key") == _make_outputs("hello")
+    assert cache.stats().size == 1
+
+
+def test_sqlite_cache_ttl(tmp_path, mocker):
+    mock_time = mocker.patch.object(
+        inference_cache.time, "time", return_value=1000.0
+    )
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteInferenceCache(path, ttl_s=10).set("key", _make_outputs("hello"))
+
+    mock_time.return_value = 1011.0
+    cache = SQLiteInferenceCache(path, ttl_s=10)
+    assert cache.get("key") is None
+    assert cache.stats().size == 0
+
+
+def test_sqlite_cache_evicts_by_size(tmp_path, mocker):
+    mock_time = mocker.patch.object(
+        inference_cache.time, "time", return_value=1000.0
+    )
+    entry_size = len(inference_cache.serialize_outputs(_make_outputs("a")))
+    cache = SQLiteInferenceCache(
+        str(tmp_path / "cache.sqlite"), max_size_bytes=2 * entry_size
+    )
+    cache.set("a", _make_outputs("a"))
+    mock_time.return_value = 1001.0
+    cache.set("b", _make_outputs("b"))
+    mock_time.return_value = 1002.0
+    cache.get("a")
+    mock_time.return_value = 1003.0
+    cache.set("c", _make_outputs("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == _make_outputs("a")
+    assert cache.get("c") == _make_outputs("c")
+    assert cache.stats().evictions == 1
+
+
+def test_sqlite_cache_size_is_tracked(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteInferenceCache(path)
+    cache.set("a", _make_outputs("a"))
+    cache.set("a", _make_outputs("a2"))
+    cache.set("b", _make_outputs("b"))
+
+    assert cache.stats().size == 2
+    assert SQLiteInferenceCache(path).stats().size == 2
+    cache.clear()
+    assert cache.stats().size == 0
+
+
+@pytest.mark.asyncio
+async def test_run_uses_inference_cache_from_options(
+    echo_aiconfig: AIConfigRuntime,
+):
+    parser = ModelParserRegistry.get_model_parser("echo-model")
+    events = []
+
+    async def _record_event(event):
+        events.append(event)
+
+    echo_aiconfig.set_callback_manager(
+        CallbackManager([_record_event], timeout=5)
+    )
+    options = InferenceOptions(stream=False, cache=InMemoryInferenceCache())
+
+    first = await echo_aiconfig.run("prompt1", {"name": "Ann"}, options)
+    second = await echo_aiconfig.run("prompt1", {"name": "Ann"}, options)
+    await echo_aiconfig.run("prompt1", {"name": "Bob"}, options)
+
+    assert first[0].data == second[0].data == "Hello Ann"
+    assert parser.num_inference_calls == 2
+    assert [
+        event.name for event in events if "inference_cache" in event.name
+    ] == [
+        "on_inference_cache_miss",
+        "on_inference_cache_hit",
+        "on_inference_cache_miss",
+    ]
+    assert options.cache.stats().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_run_uses_inference_cache_from_metadata(
+    echo_aiconfig: AIConfigRuntime, tmp_path
+):
+    parser = ModelParserRegistry.get_model_parser("echo-model")
+    echo_aiconfig.metadata.inference_cache = {
+        "backend": "sqlite",
+        "path": str(tmp_path / "cache.sqlite"),
+    }
+
+    await echo_aiconfig.run("prompt1", {"name": "Ann"})
+    outputs = await echo_aiconfig.run("prompt1", {"name": "Ann"})
+
+    assert outputs[0].data == "Hello Ann"
+    assert echo_aiconfig.get_latest_output("prompt1").data == "Hello Ann"
+    assert parser.num_inference_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_resolves_completion_params_once(
+    echo_aiconfig: AIConfigRuntime, mocker
+):
+    parser = ModelParserRegistry.get_model_parser("echo-model")
+    deserialize_spy = mocker.spy(parser, "deserialize")
+    options = InferenceOptions(stream=False, cache=InMemoryInferenceCache())
+
+    await echo_aiconfig.run("prompt1", {"name": "Ann"}, options)
+
+    assert deserialize_spy.call_count == 1
+
+
+class _HuggingFaceStyleParser(ParameterizedModelParser):
+    """
+    Like the local Hugging Face parsers, resolves the completion params in run_inference() and doesn't
+    override run_inference_with_completion_params(). Its deserialize() takes an extra argument before
+    `params`, like theirs used to.
+    """
+
+    def id(self) -> str:
+        return "hf-style-model"
+
+    async def serialize(self, prompt_name, data, ai_config, parameters=None):
+        return []
+
+    async def deserialize(
+        self,
+        prompt: Prompt,
+        aiconfig: AIConfigRuntime,
+        _options: Optional[InferenceOptions] = None,
+        params: Optional[Dict] = {},
+    ) -> Dict:
+        return {"prompt": resolve_prompt(prompt, params, aiconfig)}
+
+    async def run_inference(
+        self, prompt, aiconfig, options, parameters
+    ) -> List[Output]:
+        completion_data = await self.deserialize(
+            prompt, aiconfig, options, parameters
+        )
+        prompt.outputs = _make_outputs(completion_data["prompt"])
+        return prompt.outputs
+
+    def get_output_text(self, prompt, aiconfig, output=None) -> str:
+        return (output or aiconfig.get_latest_output(prompt)).data
+
+
+@pytest.mark.asyncio
+async def test_inference_cache_key_uses_run_parameters():
+    ModelParserRegistry.register_model_parser(_HuggingFaceStyleParser())
+    config = AIConfigRuntime.create("hf_style")
+    config.add_prompt(
+        "p",
+        Prompt(
+            name="p",
+            input="hello {{x}}",
+            metadata=PromptMetadata(model="hf-style-model"),
+        ),
+    )
+    options = InferenceOptions(stream=False, cache=InMemoryInferenceCache())
+
+    outputs_a = await config.run("p", {"x": "A"}, options)
+    outputs_b = await config.run("p", {"x": "B"}, options)
+
+    assert outputs_a[0].data == "hello A"
+    assert outputs_b[0].data == "hello B"
+    assert options.cache.stats().misses == 2
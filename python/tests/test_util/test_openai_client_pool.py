@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from aiconfig.util import openai_client_pool
+from aiconfig.util.openai_client_pool import (
+    close_shared_openai_clients,
+    configure_openai_connection_pool,
+    get_connection_pool_settings,
+    get_shared_async_openai_client,
+    iterate_stream,
+)
+from openai import AsyncAzureOpenAI, AsyncOpenAI
+
+
+@pytest.fixture(autouse=True)
+def reset_connection_pool():
+    settings = get_connection_pool_settings()
+    yield
+    configure_openai_connection_pool(**settings.__dict__)
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_by_class_and_arguments():
+    client = get_shared_async_openai_client(api_key="key")
+
+    assert isinstance(client, AsyncOpenAI)
+    assert get_shared_async_openai_client(api_key="key") is client
+    assert get_shared_async_openai_client(api_key="other") is not client
+    assert (
+        get_shared_async_openai_client(
+            AsyncAzureOpenAI,
+            api_key="key",
+            api_version="2023-05-15",
+            azure_endpoint="https://example.openai.azure.com",
+        )
+        is not client
+    )
+    await close_shared_openai_clients()
+
+
+def test_clients_are_not_shared_across_event_loops():
+    async def _get_client():
+        return get_shared_async_openai_client(api_key="key")
+
+    assert asyncio.run(_get_client()) is not asyncio.run(_get_client())
+
+
+@pytest.mark.asyncio
+async def test_configure_connection_pool(mocker):
+    client = get_shared_async_openai_client(api_key="key")
+    mocker.patch.object(
+        openai_client_pool, "is_http2_available", return_value=False
+    )
+
+    settings = configure_openai_connection_pool(
+        max_connections=7, max_keepalive_connections=3
+    )
+
+    assert (settings.max_connections, settings.max_keepalive_connections) == (
+        7,
+        3,
+    )
+    # Existing clients are dropped so new ones pick up the settings
+    new_client = get_shared_async_openai_client(api_key="key")
+    assert new_client is not client
+    # ... and closed on their event loop
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert client.is_closed()
+    assert not new_client.is_closed()
+    pool = new_client._client._transport._pool
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    await close_shared_openai_clients()
+
+
+@pytest.mark.asyncio
+async def test_iterate_stream_supports_sync_and_async_streams():
+    async def _async_stream():
+        for i in range(3):
+            yield i
+
+    assert [chunk async for chunk in iterate_stream(iter(range(3)))] == [
+        0,
+        1,
+        2,
+    ]
+    assert [chunk async for chunk in iterate_stream(_async_stream())] == [
+        0,
+        1,
+        2,
+    ]
@@ -1,8 +1,12 @@
 import pytest
 from aiconfig.util.params import (
+    CompiledTemplateCache,
     find_dependencies_in_prompt,
+    get_critical_path,
     get_dependency_graph,
+    get_dependency_levels,
     get_parameters_in_template,
+    resolve_parametrized_prompt,
 )
 
 from aiconfig.schema import Prompt, PromptMetadata
@@ -223,3 +227,87 @@ def test_get_dependency_graph_with_no_dependencies():
 
     # Modified dep_graph
     assert dep_graph == {}
+
+
+""" Test cases for the CompiledTemplateCache class."""
+
+
+def test_compiled_template_cache_reuses_compiled_templates():
+    cache = CompiledTemplateCache(max_size=2)
+
+    template = cache.get("Hello {{name}}")
+    assert cache.get("Hello {{name}}") is template
+    assert template({"name": "world"}) == "Hello world"
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (
+        1,
+        1,
+        0,
+        1,
+    )
+
+
+def test_compiled_template_cache_evicts_least_recently_used():
+    cache = CompiledTemplateCache(max_size=2)
+
+    cache.get("{{a}}")
+    cache.get("{{b}}")
+    # Touch {{a}} so that {{b}} becomes the least recently used entry
+    cache.get("{{a}}")
+    cache.get("{{c}}")
+
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.size == 2
+
+    cache.get("{{b}}")
+    assert cache.stats().misses == 4
+
+
+def test_compiled_template_cache_with_zero_size_does_not_cache():
+    cache = CompiledTemplateCache(max_size=0)
+
+    assert cache.get("{{a}}")({"a": "1"}) == "1"
+    cache.get("{{a}}")
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (0, 2, 0)
+
+
+def test_resolve_parametrized_prompt_with_cached_template():
+    assert resolve_parametrized_prompt("Hi {{name}}", {"name": "a"}) == "Hi a"
+    assert resolve_parametrized_prompt("Hi {{name}}", {"name": "b"}) == "Hi b"
+
+
+def test_get_dependency_levels():
+    dependency_graph = {
+        "joined": ["left", "right"],
+        "left": ["root"],
+        "right": [],
+    }
+
+    assert get_dependency_levels(dependency_graph, "joined") == [
+        ["root", "right"],
+        ["left"],
+        ["joined"],
+    ]
+    assert get_dependency_levels({}, "single") == [["single"]]
+
+
+def test_get_critical_path():
+    dependency_graph = {
+        "joined": ["left", "right"],
+        "left": ["root"],
+        "right": [],
+    }
+    levels = get_dependency_levels(dependency_graph, "joined")
+
+    critical_path, latency_s = get_critical_path(
+        dependency_graph,
+        levels,
+        {"root": 1.0, "left": 1.0, "right": 3.0, "joined": 0.5},
+    )
+
+    assert critical_path == ["right", "joined"]
+    assert latency_s == 3.5
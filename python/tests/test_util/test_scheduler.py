@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from aiconfig.model_parser import InferenceOptions
+from aiconfig.util.scheduler import (
+    InferenceScheduler,
+    RateLimiter,
+    estimate_tokens,
+    is_retryable_error,
+)
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+
+
+def test_is_retryable_error():
+    assert is_retryable_error(FakeAPIError(429))
+    assert is_retryable_error(FakeAPIError(503))
+    assert not is_retryable_error(FakeAPIError(400))
+    assert not is_retryable_error(ValueError("not an API error"))
+
+
+def test_estimate_tokens_includes_max_output_tokens():
+    completion_params = {"prompt": "a" * 40, "max_tokens": 100}
+    assert estimate_tokens(completion_params) > 100
+
+
+def test_scheduler_from_options():
+    scheduler = InferenceScheduler.from_options(
+        InferenceOptions(max_concurrency=2, max_retries=3)
+    )
+    assert scheduler.max_concurrency == 2
+    assert scheduler.max_retries == 3
+    assert InferenceScheduler.from_options(None).max_concurrency is None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_bounds_requests_in_flight():
+    scheduler = InferenceScheduler(max_concurrency=2)
+
+    async def _request():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    results = await asyncio.gather(
+        *[scheduler.run(_request) for _ in range(6)]
+    )
+
+    stats = scheduler.stats()
+    assert results == ["done"] * 6
+    assert stats.peak_in_flight == 2
+    assert stats.succeeded == 6
+    assert stats.throughput_rps > 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_retries_rate_limited_requests():
+    scheduler = InferenceScheduler(max_retries=2, retry_base_delay_s=0.001)
+    attempts = []
+
+    async def _request():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeAPIError(429)
+        return "done"
+
+    assert await scheduler.run(_request) == "done"
+    stats = scheduler.stats()
+    assert (stats.retries, stats.succeeded, stats.failed) == (2, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_does_not_retry_client_errors():
+    scheduler = InferenceScheduler(max_retries=2, retry_base_delay_s=0.001)
+
+    async def _request():
+        raise FakeAPIError(400)
+
+    with pytest.raises(FakeAPIError):
+        await scheduler.run(_request)
+    assert scheduler.stats().retries == 0
+    assert scheduler.stats().failed == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_out_requests():
+    limiter = RateLimiter(rate=100, capacity=1)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    for _ in range(4):
+        await limiter.acquire()
+
+    # First request uses the initial burst, the next 3 wait ~10ms each
+    assert loop.time() - start >= 0.025
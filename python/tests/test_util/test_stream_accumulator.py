@@ -0,0 +1,151 @@
+import json
+
+from aiconfig.default_parsers.openai import (
+    build_output_data,
+    multi_choice_message_reducer,
+)
+from aiconfig.util.stream_accumulator import (
+    ChatCompletionStreamAccumulator,
+    StreamedMessage,
+    StreamedMessageView,
+)
+
+from aiconfig.schema import OutputDataWithToolCallsValue
+
+
+def _make_chunk(chunk_id: str, *choices):
+    return {
+        "id": chunk_id,
+        "model": "gpt-3.5-turbo",
+        "object": "chat.completion.chunk",
+        "choices": list(choices),
+    }
+
+
+def _make_choice(index: int, **delta):
+    return {"index": index, "delta": delta}
+
+
+def test_accumulates_content_of_each_choice():
+    chunks = [
+        _make_chunk("1", _make_choice(0, role="assistant", content="")),
+        _make_chunk("2", _make_choice(1, role="assistant", content="Bon")),
+        _make_chunk("3", _make_choice(0, content="Hel")),
+        _make_chunk(
+            "4", _make_choice(0, content="lo"), _make_choice(1, content="jour")
+        ),
+    ]
+    accumulator = ChatCompletionStreamAccumulator()
+    for chunk in chunks:
+        accumulator.add_chunk(chunk)
+
+    choices = accumulator.get_choices()
+
+    assert [(index, message) for index, message, _ in choices] == [
+        (0, {"role": "assistant", "content": "Hello"}),
+        (1, {"role": "assistant", "content": "Bonjour"}),
+    ]
+    # Metadata comes from the last chunk of each choice, without the choices
+    assert choices[0][2] == {
+        "id": "4",
+        "model": "gpt-3.5-turbo",
+        "object": "chat.completion.chunk",
+    }
+
+    # Same messages as the reducer
+    messages = {}
+    for chunk in chunks:
+        messages = multi_choice_message_reducer(messages, chunk)
+    assert messages == {index: message for index, message, _ in choices}
+
+
+def test_accumulates_tool_calls_by_index():
+    accumulator = ChatCompletionStreamAccumulator()
+    deltas = [
+        {
+            "role": "assistant",
+            "tool_calls": [
+                {
+                    "index": 0,
+                    "id": "call_1",
+                    "type": "function",
+                    "function": {"name": "get_weather", "arguments": ""},
+                }
+            ],
+        },
+        {"tool_calls": [{"index": 0, "function": {"arguments": '{"city": '}}]},
+        {
+            "tool_calls": [
+                {"index": 0, "function": {"arguments": '"Paris"}'}},
+                {
+                    "index": 1,
+                    "id": "call_2",
+                    "type": "function",
+                    "function": {"name": "get_time", "arguments": "{}"},
+                },
+            ]
+        },
+    ]
+    for delta in deltas:
+        accumulator.add_chunk(_make_chunk("1", _make_choice(0, **delta)))
+
+    [(_, message, _)] = accumulator.get_choices()
+    output_data = build_output_data(message)
+
+    assert isinstance(output_data, OutputDataWithToolCallsValue)
+    assert [
+        (tool_call.id, tool_call.function.name, tool_call.function.arguments)
+        for tool_call in output_data.value
+    ] == [
+        ("call_1", "get_weather", '{"city": "Paris"}'),
+        ("call_2", "get_time", "{}"),
+    ]
+
+
+def test_streamed_message_materializes_plain_dicts():
+    message = StreamedMessage()
+    message.add({"role": "assistant", "content": "Hel"})
+    first_snapshot = message.to_dict()
+
+    message.add({"content": "lo", "function_call": {"name": "f"}})
+
+    assert first_snapshot == {"role": "assistant", "content": "Hel"}
+    assert message.to_dict() == {
+        "role": "assistant",
+        "content": "Hello",
+        "function_call": {"name": "f"},
+    }
+    assert type(message.to_dict()["function_call"]) is dict
+
+
+def test_get_message_returns_a_plain_dict():
+    accumulator = ChatCompletionStreamAccumulator()
+    accumulator.add_chunk(
+        _make_chunk("1", _make_choice(0, role="assistant", content="Hi"))
+    )
+
+    message = accumulator.get_message(0)
+
+    # Stream callbacks get the same kind of value as before the accumulator (e.g. JSON serializable)
+    assert type(message) is dict
+    assert json.dumps(message) == '{"role": "assistant", "content": "Hi"}'
+
+
+def test_message_view_is_only_materialized_when_read():
+    accumulator = ChatCompletionStreamAccumulator()
+    views = []
+    for content in ["Hel", "lo"]:
+        accumulator.add_chunk(
+            _make_chunk("1", _make_choice(0, content=content))
+        )
+        views.append(accumulator.get_message_view(0))
+
+    # Nothing was joined while streaming
+    assert accumulator._messages[0]._snapshot is None
+    view = views[-1]
+    assert isinstance(view, StreamedMessageView)
+    assert view["content"] == "Hello"
+    assert view == {"content": "Hello"}
+    assert json.dumps(view.to_dict()) == '{"content": "Hello"}'
+    # Reads are served from one snapshot until the next delta
+    assert view.to_dict() is accumulator._messages[0]._snapshot
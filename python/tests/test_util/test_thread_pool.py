@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from aiconfig.util.thread_pool import (
+    DEFAULT_MAX_INFERENCE_THREADS,
+    configure_inference_thread_pool,
+    get_inference_thread_pool,
+    iterate_in_thread_pool,
+    run_in_thread_pool,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_thread_pool():
+    yield
+    configure_inference_thread_pool(DEFAULT_MAX_INFERENCE_THREADS)
+
+
+@pytest.mark.asyncio
+async def test_blocking_calls_run_concurrently_off_the_event_loop():
+    event_loop_thread = threading.get_ident()
+
+    def _blocking_call(value):
+        time.sleep(0.1)
+        return value, threading.get_ident()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_in_thread_pool(_blocking_call, i) for i in range(4))
+    )
+
+    assert time.perf_counter() - start < 0.35
+    assert [value for value, _ in results] == [0, 1, 2, 3]
+    assert all(thread != event_loop_thread for _, thread in results)
+
+
+@pytest.mark.asyncio
+async def test_thread_pool_size_is_configurable():
+    configure_inference_thread_pool(max_workers=1)
+    in_flight = 0
+    peak_in_flight = 0
+    lock = threading.Lock()
+
+    def _blocking_call():
+        nonlocal in_flight, peak_in_flight
+        with lock:
+            in_flight += 1
+            peak_in_flight = max(peak_in_flight, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+
+    await asyncio.gather(
+        *(run_in_thread_pool(_blocking_call) for _ in range(3))
+    )
+
+    assert peak_in_flight == 1
+    assert get_inference_thread_pool()._max_workers == 1
+    with pytest.raises(ValueError):
+        configure_inference_thread_pool(max_workers=0)
+
+
+@pytest.mark.asyncio
+async def test_iterate_in_thread_pool():
+    def _blocking_stream():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    assert [
+        item async for item in iterate_in_thread_pool(_blocking_stream())
+    ] == [
+        0,
+        1,
+        2,
+    ]
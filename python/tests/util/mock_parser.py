@@ -1,4 +1,16 @@
-from aiconfig.model_parser import ModelParser
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from aiconfig.default_parsers.parameterized_model_parser import (
+    ParameterizedModelParser,
+)
+from aiconfig.model_parser import InferenceOptions, ModelParser
+from aiconfig.util.params import resolve_prompt
+
+from aiconfig.schema import ExecuteResult, Output, Prompt
+
+if TYPE_CHECKING:
+    from aiconfig.Config import AIConfigRuntime
 
 
 class MockModelParser(ModelParser):
@@ -19,3 +31,82 @@ class MockModelParser(ModelParser):
 
     def get_output_text():
         return
+
+
+class EchoModelParser(ParameterizedModelParser):
+    """
+    A model parser that "runs inference" by echoing back the resolved prompt.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.num_inference_calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def id(self) -> str:
+        return "echo-model"
+
+    async def serialize(
+        self,
+        prompt_name: str,
+        data: Any,
+        ai_config: "AIConfigRuntime",
+        parameters: Optional[Dict] = None,
+        **kwargs,
+    ) -> List[Prompt]:
+        return []
+
+    async def deserialize(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        params: Optional[Dict] = {},
+    ) -> Dict:
+        return {"prompt": resolve_prompt(prompt, params or {}, aiconfig)}
+
+    async def run_inference(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        options: Optional[InferenceOptions],
+        parameters: Dict,
+    ) -> List[Output]:
+        completion_data = await self.deserialize(prompt, aiconfig, parameters)
+        return await self.run_inference_with_completion_params(
+            prompt, aiconfig, completion_data, options, parameters
+        )
+
+    async def run_inference_with_completion_params(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        completion_params: Dict,
+        options: Optional[InferenceOptions],
+        parameters: Dict,
+    ) -> List[Output]:
+        self.num_inference_calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        # Lets tests control the order in which batch items complete
+        await asyncio.sleep(float(parameters.get("delay_s", 0)))
+        self.in_flight -= 1
+        prompt.outputs = [
+            ExecuteResult(
+                output_type="execute_result",
+                execution_count=0,
+                data=completion_params["prompt"],
+                metadata={},
+            )
+        ]
+        return prompt.outputs
+
+    def get_output_text(
+        self,
+        prompt: Prompt,
+        aiconfig: "AIConfigRuntime",
+        output: Optional[Output] = None,
+    ) -> str:
+        if output is None:
+            output = aiconfig.get_latest_output(prompt)
+        return output.data if output is not None else ""